@@ -0,0 +1,103 @@
+"""Run a package's micro-benchmarks against its committed baseline.
+
+Each package keeps its cases in ``packages/<package>/benchmarks/
+micro_cases.py``: a ``cases()`` context manager yielding ``{name:
+callable}``, set up once against realistic inputs, and cleaned up after
+timing. This runner times every case and reports the best per-call time
+over ``--repeat`` rounds and its change against the package's committed
+baseline (micro_baseline.json next to the cases). ``--check`` exits
+non-zero when any case is slower than its baseline by more than
+``--tolerance``; ``--save`` records a new baseline. Baselines are
+machine-specific, so re-save on the machine that checks.
+
+Usage::
+
+    python benchmarks/micro.py allocator
+    python benchmarks/micro.py client --check --tolerance 0.3
+    python benchmarks/micro.py cli --save
+"""
+
+import argparse
+import importlib.util
+import json
+import platform
+import sys
+import timeit
+from pathlib import Path
+
+PACKAGES = Path(__file__).resolve().parent.parent / "packages"
+
+
+def load_cases(package: str):
+    """Import ``packages/<package>/benchmarks/micro_cases.py``."""
+    path = PACKAGES / package / "benchmarks" / "micro_cases.py"
+    spec = importlib.util.spec_from_file_location(f"{package}_micro_cases", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def measure(fn, repeat: int) -> float:
+    """Best seconds per call over `repeat` rounds of at least 0.2 s each."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "package",
+        choices=sorted(
+            p.parent.parent.name
+            for p in PACKAGES.glob("*/benchmarks/micro_cases.py")
+        ),
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--baseline", type=Path,
+        help="Baseline file (default: the package's micro_baseline.json)",
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25,
+        help="Allowed slowdown before --check fails (default: 0.25, i.e. 25%%)",
+    )
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument("--save", action="store_true")
+    args = parser.parse_args()
+    if args.baseline is None:
+        args.baseline = (
+            PACKAGES / args.package / "benchmarks" / "micro_baseline.json"
+        )
+
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())["cases"]
+
+    results, regressed = {}, []
+    with load_cases(args.package).cases() as cases:
+        for name, fn in cases.items():
+            us = measure(fn, args.repeat) * 1e6
+            results[name] = round(us, 2)
+            row = {"case": name, "us_per_call": round(us, 2)}
+            if name in baseline:
+                change = us / baseline[name] - 1
+                row["baseline_us"] = baseline[name]
+                row["change_pct"] = round(change * 100, 1)
+                if change > args.tolerance:
+                    regressed.append(name)
+            print(json.dumps(row))
+
+    if args.save:
+        args.baseline.write_text(json.dumps({
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cases": results,
+        }, indent=2) + "\n")
+    if args.check and regressed:
+        print(f"Slower than baseline: {', '.join(regressed)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,542 @@
+"""Drive the allocator with a simulated client fleet and a student burst.
+
+Serves the real app (every blueprint, plus admission control and
+report-interval hints as configured) on a local port against a scratch
+schema. ``--vms`` simulated client VMs each post heartbeats, GPU health,
+in-use status, session metrics and log batches at the client service's
+cadences, following any ``X-LabLink-Report-Interval`` hint, and their
+startup metrics once. Halfway through, ``--students`` students hit
+/api/request_vm at the same instant.
+
+Seats are manual-provider rows whose LAN IP is 127.0.0.1, so a claim
+rotates the VNC password through a stub agent on 127.0.0.1:7070 (the port
+LAN-direct connectivity posts to) and nothing outside the machine is
+touched. Every VM authenticates with one shared secret, verified once per
+VM during warm-up and cached after that, as in production.
+
+For each fleet size the report gives per-route p50/p99 latency and error
+rate (429 refusals counted apart), connection-pool checkout wait, and
+database statements per request, read from the allocator's own
+instrumentation and query stats. One JSON line per run is printed and the
+whole report is written to ``--output``.
+
+Needs a reachable Postgres; connection details come from the same
+``POSTGRES_*`` env vars the test suite's ``real_db`` fixture reads. The
+scratch schema is dropped afterwards. Port 7070 must be free.
+
+Usage::
+
+    python benchmarks/fleet_load.py
+    python benchmarks/fleet_load.py --vms 200 --students 100 \\
+        --duration 60 --speedup 4 --output fleet_200.json
+"""
+
+import argparse
+import heapq
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import psycopg2
+import psycopg2.pool
+import requests
+from werkzeug.serving import make_server
+
+from lablink_allocator_service import main as allocator
+from lablink_allocator_service.cadence import HEADER, TelemetryCadence
+from lablink_allocator_service.conf.structured_config import (
+    DB_USER,
+    VM_TABLE_NAME,
+)
+from lablink_allocator_service.db.metrics import MetricsDatabase
+from lablink_allocator_service.db.pool import POOL_MAX_SIZE
+from lablink_allocator_service.db.query_stats import QUERY_STATS
+from lablink_allocator_service.db.schedules import ScheduleDatabase
+from lablink_allocator_service.db.vms import VmDatabase
+from lablink_allocator_service.generate_init_sql import build_init_sql
+from lablink_allocator_service.instrumentation import (
+    POOL_CHECKOUT_SECONDS,
+    POOL_EXHAUSTED,
+)
+from lablink_allocator_service.providers.manual import ManualProvider
+from lablink_allocator_service.rate_limit import AdmissionControl
+from lablink_allocator_service.secret_hash import hash_secret
+
+SCHEMA = f"lablink_bench_{os.getpid()}"
+CLIENT_SECRET = "fleet-load-client-secret"
+AGENT_PORT = 7070
+
+# Seconds between reports, as the client service sends them by default
+# (vm-logs at log_shipper.sh's flush interval).
+CADENCES = {
+    "POST /api/heartbeat": 30,
+    "POST /api/gpu_health": 20,
+    "POST /api/update_inuse_status": 20,
+    "POST /api/session-metrics/<hostname>": 60,
+    "POST /api/vm-logs/<hostname>": 15,
+}
+STARTUP_METRICS = "POST /api/vm-metrics/<hostname>"
+REQUEST_VM = "POST /api/request_vm"
+# Status a route answers when it did its job; anything else but a 429
+# refusal counts as an error.
+EXPECTED = {REQUEST_VM: 303}
+
+
+def _percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def _report(route: str, hostname: str, rng: random.Random) -> tuple:
+    """Path and JSON body of one `route` report from `hostname`."""
+    if route == "POST /api/heartbeat":
+        return "/api/heartbeat", {
+            "vm_id": hostname,
+            "boot_id": f"boot-{hostname}",
+            "disk_free_pct": rng.randint(20, 90),
+        }
+    if route == "POST /api/gpu_health":
+        return "/api/gpu_health", {"hostname": hostname, "gpu_status": "Healthy"}
+    if route == "POST /api/update_inuse_status":
+        return "/api/update_inuse_status", {
+            "hostname": hostname,
+            "status": rng.random() < 0.5,
+        }
+    if route == "POST /api/session-metrics/<hostname>":
+        return f"/api/session-metrics/{hostname}", {
+            "session_started_at": datetime.now(timezone.utc).isoformat(),
+            "counters": {
+                "seconds_in_subject_software": rng.randint(0, 3600),
+                "seconds_in_terminal": rng.randint(0, 600),
+                "seconds_in_browser": rng.randint(0, 600),
+                "seconds_in_other": rng.randint(0, 600),
+                "gpu_active_seconds": rng.randint(0, 3600),
+                "gpu_util_peak": rng.randint(0, 100),
+                "vram_used_peak_mb": rng.randint(0, 16000),
+                "max_labeled_frames": rng.randint(0, 500),
+                "training_epochs_completed": rng.randint(0, 50),
+            },
+        }
+    if route == "POST /api/vm-logs/<hostname>":
+        return f"/api/vm-logs/{hostname}", {
+            "log_group": "lablink-docker",
+            "messages": [
+                f"{datetime.now(timezone.utc).isoformat()} sleap: step {i}"
+                for i in range(rng.randint(1, 20))
+            ],
+        }
+    now = time.time()
+    return f"/api/vm-metrics/{hostname}", {
+        "cloud_init_start": now - 300,
+        "cloud_init_end": now - 120,
+        "cloud_init_duration_seconds": 180,
+        "container_start": now - 120,
+        "container_end": now - 60,
+        "container_startup_duration_seconds": 60,
+    }
+
+
+class _Agent(BaseHTTPRequestHandler):
+    """Stand-in for the client agent: accepts every session start."""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        time.sleep(self.server.latency)
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Recorder:
+    """Latency and status of every request, per route."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = defaultdict(list)  # route -> [(ms, status or None)]
+        self.lag = []  # ms each fleet report went out after it was due
+
+    def add(self, route: str, ms: float, status) -> None:
+        with self._lock:
+            self.samples[route].append((ms, status))
+
+    def summary(self) -> dict:
+        routes = {}
+        for route, samples in sorted(self.samples.items()):
+            expected = EXPECTED.get(route, 200)
+            statuses = Counter(str(s) for _, s in samples)
+            refused = statuses.get("429", 0)
+            errors = sum(1 for _, s in samples if s not in (expected, 429))
+            latencies = [ms for ms, _ in samples]
+            routes[route] = {
+                "requests": len(samples),
+                "p50_ms": round(_percentile(latencies, 50), 2),
+                "p99_ms": round(_percentile(latencies, 99), 2),
+                "max_ms": round(max(latencies), 2),
+                "error_rate": round(errors / len(samples), 4),
+                "refused": refused,
+                "statuses": dict(statuses),
+            }
+        return routes
+
+
+class Fleet:
+    """Posts every VM's reports on its own cadence from a worker pool.
+
+    A report's next one is due its interval after the response arrives,
+    the way a client's report loop sleeps between posts.
+    """
+
+    def __init__(self, base_url, hostnames, recorder, *, speedup, workers):
+        self.base_url = base_url
+        self.hostnames = hostnames
+        self.recorder = recorder
+        self.speedup = speedup
+        self._rng = random.Random(0)
+        self._heap = []
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(workers)
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers["Authorization"] = f"Bearer {CLIENT_SECRET}"
+        return session
+
+    def post(self, route: str, hostname: str):
+        path, body = _report(route, hostname, self._rng)
+        started = time.perf_counter()
+        try:
+            resp = self._session().post(
+                self.base_url + path, json=body, timeout=30
+            )
+        except requests.RequestException:
+            self.recorder.add(route, (time.perf_counter() - started) * 1000, None)
+            return None
+        self.recorder.add(
+            route, (time.perf_counter() - started) * 1000, resp.status_code
+        )
+        return resp
+
+    def warm_up(self) -> None:
+        """One heartbeat per VM, so each secret is verified (and cached)
+        before timing starts."""
+        list(self._executor.map(
+            lambda h: self.post("POST /api/heartbeat", h), self.hostnames
+        ))
+
+    def _schedule(self, due: float, route: str, hostname: str) -> None:
+        with self._cond:
+            self._seq += 1
+            heapq.heappush(self._heap, (due, self._seq, route, hostname))
+            self._cond.notify()
+
+    def _send(self, due: float, route: str, hostname: str) -> None:
+        self.recorder.lag.append((time.monotonic() - due) * 1000)
+        resp = self.post(route, hostname)
+        if route not in CADENCES:
+            return
+        interval = CADENCES[route]
+        if resp is not None and resp.headers.get(HEADER):
+            interval = float(resp.headers[HEADER])
+        self._schedule(time.monotonic() + interval / self.speedup, route, hostname)
+
+    def run(self, seconds: float) -> None:
+        """Report for `seconds`. First reports are spread over each
+        route's interval, as a fleet that booted over a few minutes."""
+        now = time.monotonic()
+        for hostname in self.hostnames:
+            for route, interval in CADENCES.items():
+                offset = self._rng.uniform(0, interval / self.speedup)
+                self._schedule(now + offset, route, hostname)
+            offset = self._rng.uniform(0, seconds / 4)
+            self._schedule(now + offset, STARTUP_METRICS, hostname)
+
+        deadline = now + seconds
+        while True:
+            with self._cond:
+                while True:
+                    now = time.monotonic()
+                    if now >= deadline:
+                        break
+                    if self._heap and self._heap[0][0] <= now:
+                        due, _, route, hostname = heapq.heappop(self._heap)
+                        break
+                    wake = self._heap[0][0] if self._heap else deadline
+                    self._cond.wait(min(wake, deadline) - now)
+            if now >= deadline:
+                break
+            self._executor.submit(self._send, due, route, hostname)
+        self._executor.shutdown(wait=True)
+
+
+def _burst(base_url: str, students: int, recorder: Recorder) -> None:
+    """`students` seat requests released at the same instant."""
+    start_line = threading.Barrier(students)
+
+    def student(n: int) -> None:
+        start_line.wait()
+        started = time.perf_counter()
+        try:
+            resp = requests.post(
+                f"{base_url}/api/request_vm",
+                data={"email": f"student-{n}@example.com"},
+                allow_redirects=False,
+                timeout=60,
+            )
+            status = resp.status_code
+        except requests.RequestException:
+            status = None
+        recorder.add(REQUEST_VM, (time.perf_counter() - started) * 1000, status)
+
+    threads = [
+        threading.Thread(target=student, args=(n,)) for n in range(students)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def seed(database: VmDatabase, vms: int) -> list:
+    """Replace the fleet with `vms` registered, running, free seats."""
+    with database._cursor as cursor:
+        cursor.execute(f"DELETE FROM {VM_TABLE_NAME}")
+    secret_hash = hash_secret(CLIENT_SECRET)
+    hostnames = [f"lablink-vm-{i:05d}" for i in range(vms)]
+    for i, hostname in enumerate(hostnames):
+        database.register_client(
+            hostname=hostname,
+            machine_identity=f"bench-machine-{i}",
+            provider="manual",
+            endpoint_url=None,
+            provider_metadata={"lan_ip": "127.0.0.1"},
+            gpu_present=True,
+            gpu_model="NVIDIA T4",
+            client_secret_hash=secret_hash,
+        )
+    with database._cursor as cursor:
+        cursor.execute(
+            f"UPDATE {VM_TABLE_NAME} SET status = 'running', healthy = 'Healthy'"
+        )
+    return hostnames
+
+
+def _configure(args) -> None:
+    """Fresh admission control and cadence per run, as main() builds them."""
+    cfg = allocator.cfg
+    allocator.admission = None
+    allocator.telemetry_cadence = None
+    if cfg.rate_limit.enabled and not args.no_admission:
+        allocator.admission = AdmissionControl(
+            max_in_flight=cfg.rate_limit.max_in_flight,
+            public_rate=cfg.rate_limit.public_rate,
+            public_burst=cfg.rate_limit.public_burst,
+            client_rate=cfg.rate_limit.client_rate,
+            client_burst=cfg.rate_limit.client_burst,
+        )
+    if cfg.cadence.enabled and not args.no_cadence:
+        allocator.telemetry_cadence = TelemetryCadence(
+            target_qps=cfg.cadence.target_qps,
+            max_interval_seconds=cfg.cadence.max_interval_seconds,
+            heartbeat_max_interval_seconds=(
+                cfg.cadence.heartbeat_max_interval_seconds
+            ),
+            watch_interval_seconds=cfg.cadence.watch_interval_seconds,
+            jitter=cfg.cadence.jitter,
+        )
+
+
+def run(database: VmDatabase, base_url: str, vms: int, args) -> dict:
+    """One timed run at `vms` simulated VMs."""
+    hostnames = seed(database, vms)
+    _configure(args)
+    students = args.students if args.students is not None else vms // 2
+    recorder = Recorder()
+    fleet = Fleet(
+        base_url, hostnames, recorder,
+        speedup=args.speedup, workers=args.workers,
+    )
+    warm_start = time.perf_counter()
+    fleet.warm_up()
+    warmup_s = time.perf_counter() - warm_start
+    recorder.samples.clear()
+
+    QUERY_STATS.reset()
+    checkouts = POOL_CHECKOUT_SECONDS.count()
+    wait = POOL_CHECKOUT_SECONDS.sum()
+    exhausted = POOL_EXHAUSTED.value()
+
+    burst = threading.Timer(
+        args.duration / 2, _burst, args=(base_url, students, recorder)
+    )
+    started = time.perf_counter()
+    if students:
+        burst.start()
+    fleet.run(args.duration)
+    if students:
+        burst.join()
+    elapsed = time.perf_counter() - started
+
+    requests_made = sum(len(s) for s in recorder.samples.values())
+    checkouts = POOL_CHECKOUT_SECONDS.count() - checkouts
+    wait = POOL_CHECKOUT_SECONDS.sum() - wait
+    top = QUERY_STATS.top(limit=QUERY_STATS.max_fingerprints + 1)
+    statements = sum(row["calls"] for row in top)
+    per_request = max(requests_made, 1)
+    return {
+        "vms": vms,
+        "students": students,
+        "duration_s": round(elapsed, 1),
+        "warmup_s": round(warmup_s, 1),
+        "requests": requests_made,
+        "requests_per_s": round(requests_made / elapsed, 1),
+        "generator_lag_p99_ms": round(_percentile(recorder.lag or [0], 99), 2),
+        "routes": recorder.summary(),
+        "pool": {
+            "checkouts": checkouts,
+            "checkouts_per_request": round(checkouts / per_request, 2),
+            "mean_wait_ms": round(wait * 1000 / max(checkouts, 1), 3),
+            "exhausted": POOL_EXHAUSTED.value() - exhausted,
+        },
+        "db": {
+            "statements": statements,
+            "statements_per_request": round(statements / per_request, 2),
+            "heaviest": [
+                {k: row[k] for k in ("fingerprint", "calls", "mean_ms")}
+                for row in top[:5]
+            ],
+        },
+    }
+
+
+@contextmanager
+def serve(*, pool_size: int = POOL_MAX_SIZE, agent_latency: float = 0.02):
+    """Serve the allocator app on a free local port against a scratch
+    schema, with the stub agent on AGENT_PORT.
+
+    Yields:
+        (VmDatabase, base URL). The schema is dropped on exit.
+    """
+    conn = {
+        "dbname": os.getenv("POSTGRES_DB", "lablink_db"),
+        "user": os.getenv("POSTGRES_USER", "lablink"),
+        "password": os.getenv("POSTGRES_PASSWORD", "lablink"),
+        "host": os.getenv("POSTGRES_HOST", "localhost"),
+        "port": int(os.getenv("POSTGRES_PORT", "5432")),
+    }
+    admin = psycopg2.connect(**conn)
+    admin.autocommit = True
+    with admin.cursor() as cursor:
+        cursor.execute(f"CREATE SCHEMA {SCHEMA}")
+    pool = psycopg2.pool.ThreadedConnectionPool(
+        1, pool_size, options=f"-c search_path={SCHEMA}", **conn
+    )
+    agent = ThreadingHTTPServer(("127.0.0.1", AGENT_PORT), _Agent)
+    agent.daemon_threads = True
+    agent.latency = agent_latency
+    threading.Thread(target=agent.serve_forever, daemon=True).start()
+    server = None
+    try:
+        database = VmDatabase(**conn, table_name=VM_TABLE_NAME, pool=pool)
+        with database._cursor as cursor:
+            # The tables init.sql creates, minus the role and database setup.
+            cursor.execute(build_init_sql().split(f"SET ROLE {DB_USER};", 1)[1])
+        database.ensure_idle_columns()
+        database.ensure_staging_columns()
+        # request_vm's rejoin lookup reads reboot_count.
+        database.ensure_reboot_columns()
+        database.ensure_seat_index()
+        allocator.database = database
+        allocator.schedule_db = ScheduleDatabase(pool=pool)
+        allocator.metrics_db = MetricsDatabase(pool=pool, table_name=VM_TABLE_NAME)
+        allocator.app.config["DB_POOL"] = pool
+        allocator.app.config["VM_TABLE_NAME"] = VM_TABLE_NAME
+        allocator.app.config["LABLINK_PROVIDER"] = ManualProvider()
+
+        server = make_server("127.0.0.1", 0, allocator.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        yield database, f"http://127.0.0.1:{server.server_port}"
+    finally:
+        if server is not None:
+            server.shutdown()
+        agent.shutdown()
+        pool.closeall()
+        with admin.cursor() as cursor:
+            cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        admin.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--vms", type=int, action="append",
+        help="Simulated client VMs; repeatable (default: 50, 200 and 1000)",
+    )
+    parser.add_argument(
+        "--students", type=int,
+        help="Students in the seat-request burst (default: half the VMs)",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=120,
+        help="Seconds of load per run (default: 120)",
+    )
+    parser.add_argument(
+        "--speedup", type=float, default=1,
+        help="Divide every report interval by this (default: 1)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=128,
+        help="Concurrent fleet reports in flight (default: 128)",
+    )
+    parser.add_argument(
+        "--agent-latency-ms", type=float, default=20,
+        help="Stub agent's delay before accepting a session (default: 20)",
+    )
+    parser.add_argument("--pool-size", type=int, default=POOL_MAX_SIZE)
+    parser.add_argument("--no-admission", action="store_true")
+    parser.add_argument("--no-cadence", action="store_true")
+    parser.add_argument("--output", default="fleet_load.json")
+    args = parser.parse_args()
+
+    # Every request logs at INFO or DEBUG; keep the output to the results.
+    logging.getLogger("lablink_allocator_service").setLevel(logging.WARNING)
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+
+    with serve(
+        pool_size=args.pool_size, agent_latency=args.agent_latency_ms / 1000
+    ) as (database, base_url):
+        report = {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "admission": not args.no_admission
+            and allocator.cfg.rate_limit.enabled,
+            "cadence": not args.no_cadence and allocator.cfg.cadence.enabled,
+            "speedup": args.speedup,
+            "runs": [],
+        }
+        for vms in args.vms or [50, 200, 1000]:
+            result = run(database, base_url, vms, args)
+            report["runs"].append(result)
+            print(json.dumps(result))
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Micro-benchmarks for the allocator's per-request and per-log-line helpers.
+
+Times the pure functions that run on every client log batch, every admin
+log view or every tunnel authorization, against realistic inputs:
+
+* ``strip_ansi``, ``redact_secrets`` and ``filter_errors`` over 1 MB of
+  mixed client log (Python records, KasmVNC and shell noise, colour codes,
+  tracebacks, secret-looking assignments);
+* ``tunnel_manager._render`` over 250 clients' restriction entries;
+* ``db.metrics._build_summary`` over a 250-VM cohort.
+
+Run from the repository root with ``python benchmarks/micro.py allocator``,
+which times each case against micro_baseline.json next to this file.
+"""
+
+import hashlib
+import random
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from lablink_allocator_service import tunnel_manager
+from lablink_allocator_service.db.metrics import _build_summary
+from lablink_allocator_service.utils.ansi import strip_ansi
+from lablink_allocator_service.utils.log_filter import filter_errors
+from lablink_allocator_service.utils.log_tail import redact_secrets
+
+_TRACEBACK = [
+    "Traceback (most recent call last):",
+    '  File "/app/lablink_client_service/update_inuse_status.py", line 104,'
+    " in main",
+    "    response = requests.post(",
+    "requests.exceptions.ConnectionError: HTTPConnectionPool(host='alloc',"
+    " port=80): Max retries exceeded",
+]
+_NOISE = [
+    "[kasmvnc] 2026-05-28 14:23:01,118 [INFO] websocket 42: got client"
+    " connection from 10.0.0.7",
+    "[xfce] (xfce4-session:412): xfce4-session-WARNING **: no session",
+    "[start] \x1b[32m+ curl --retry-all-errors -sf http://alloc/api\x1b[0m",
+    "[sleap] \x1b[1;34mINFO\x1b[0m Labeled frame 118 of 1200",
+    "[client] 2026-05-28 14:23:02 - lablink_client_service.check_gpu - INFO"
+    " - GPU status: Healthy",
+    "[start] export AGENT_TOKEN=3f9a2c7d1b8e4f60 CLIENT_SECRET=9b7c6d5e4f3a2b1c",
+    "[kasmvnc] _XSERVTransmkdir: ERROR: euid != 0,directory /tmp/.X11-unix"
+    " will not be created.",
+]
+
+
+def client_log(size: int = 1 << 20, seed: int = 0) -> str:
+    """Roughly `size` bytes of a client VM's shipped output: mostly
+    routine lines, with an ERROR record and its traceback now and then."""
+    rng = random.Random(seed)
+    start = datetime(2026, 5, 28, 14, 0, tzinfo=timezone.utc)
+    lines, total, i = [], 0, 0
+    while total < size:
+        ts = (start + timedelta(milliseconds=250 * i)).strftime(
+            "%Y-%m-%dT%H:%M:%SZ"
+        )
+        if rng.random() < 0.02:
+            block = [
+                f"{ts} [client] ERROR - Failed to report in-use status: boom"
+            ] + [f"{ts} [client] {line}" for line in _TRACEBACK]
+        else:
+            block = [f"{ts} {rng.choice(_NOISE)}"]
+        lines.extend(block)
+        total += sum(len(line) + 1 for line in block)
+        i += 1
+    return "\n".join(lines)
+
+
+def restrictions(clients: int = 250) -> dict:
+    """Tunnel restriction entries as authorize_client leaves them."""
+    entries = {}
+    for i in range(clients):
+        client_id = f"lablink-vm-{i:05d}"
+        digest = hashlib.sha256(client_id.encode()).hexdigest()[:16]
+        entries[client_id] = (i + 1, f"tun-{client_id}-{digest}")
+    return entries
+
+
+def cohort(vms: int = 250, seed: int = 0) -> list:
+    """Session-metrics summary rows in _SUMMARY_COLUMNS order; later
+    funnel stages are reached by fewer students."""
+    rng = random.Random(seed)
+    started = datetime(2026, 5, 28, 9, 0, tzinfo=timezone.utc)
+    rows = []
+    for i in range(vms):
+        label = rng.randint(60, 900) if rng.random() < 0.9 else None
+        train = rng.randint(900, 3600) if label and rng.random() < 0.7 else None
+        track = rng.randint(3600, 7200) if train and rng.random() < 0.6 else None
+        rows.append((
+            f"lablink-vm-{i:05d}",
+            started,
+            label,
+            train,
+            track,
+            rng.randint(0, 10800),
+            rng.randint(0, 7200),
+            rng.randint(0, 400),
+            rng.randint(0, 100) if train else 0,
+        ))
+    return rows
+
+
+@contextmanager
+def cases():
+    log = client_log()
+    rows = cohort()
+    tunnel_manager._restrictions = restrictions()
+    yield {
+        "strip_ansi_1mb": lambda: strip_ansi(log),
+        "redact_secrets_1mb": lambda: redact_secrets(log),
+        "filter_errors_1mb": lambda: filter_errors(log),
+        "tunnel_render_250": tunnel_manager._render,
+        "build_summary_250": lambda: _build_summary(rows),
+    }
@@ -0,0 +1,149 @@
+"""Benchmark concurrent seat claims under each placement policy.
+
+Fills a scratch copy of the VM table with free seats, then has
+``--workers`` threads claim them all through ``VmDatabase.assign_vm`` at
+once, the way an arrival burst does. Under ``hostname`` every claim
+starts from the same leading rows and steps over the ones the others
+have locked; ``random`` keeps concurrent claims apart but has to sort
+every free seat on each claim. The numbers printed per policy are claim
+latency percentiles and throughput, so the two costs can be compared.
+
+Needs a reachable Postgres; connection details come from the same
+``POSTGRES_*`` env vars the test suite's ``real_db`` fixture reads. The
+scratch table is dropped afterwards.
+
+Usage::
+
+    python benchmarks/seat_contention.py
+    python benchmarks/seat_contention.py --seats 2000 --workers 64 \\
+        --policy hostname --policy random
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+from lablink_allocator_service.db.vms import PLACEMENT_POLICIES, VmDatabase
+
+TABLE = f"vms_seat_bench_{os.getpid()}"
+
+
+def _percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def _fill(database: VmDatabase, seats: int) -> None:
+    """(Re)create the scratch table with `seats` free, running seats."""
+    rng = random.Random(0)
+    with database._cursor as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+        cursor.execute(
+            f"CREATE TABLE {TABLE} ("
+            f"hostname TEXT PRIMARY KEY, useremail TEXT, "
+            f"inuse BOOLEAN NOT NULL DEFAULT FALSE, healthy TEXT, "
+            f"status TEXT, adminreservedat TIMESTAMPTZ, "
+            f"stagingat TIMESTAMPTZ, stagedvncpassword TEXT, "
+            f"gpu_present BOOLEAN, disk_free_pct SMALLINT, "
+            f"reboot_count INTEGER DEFAULT 0, "
+            f"totalstartupdurationseconds FLOAT)"
+        )
+        cursor.executemany(
+            f"INSERT INTO {TABLE} (hostname, status, gpu_present, "
+            f"disk_free_pct, reboot_count, totalstartupdurationseconds) "
+            f"VALUES (%s, 'running', %s, %s, %s, %s)",
+            [
+                (
+                    f"lablink-vm-{i:05d}",
+                    rng.random() < 0.9,
+                    rng.randint(5, 95),
+                    rng.choice([0, 0, 0, 1, 2]),
+                    rng.uniform(120, 400),
+                )
+                for i in range(seats)
+            ],
+        )
+
+
+def run(database: VmDatabase, policy: str, seats: int, workers: int) -> dict:
+    """Claim every seat with `workers` threads and return latency stats."""
+    _fill(database, seats)
+    database.placement_policy = policy
+    samples = []
+    lock = threading.Lock()
+    start_line = threading.Barrier(workers)
+
+    def worker(n: int) -> None:
+        mine = []
+        start_line.wait()
+        i = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                database.assign_vm(f"student-{n}-{i}@example.com")
+            except ValueError:
+                break
+            mine.append((time.perf_counter() - start) * 1000)
+            i += 1
+        with lock:
+            samples.extend(mine)
+
+    threads = [
+        threading.Thread(target=worker, args=(n,)) for n in range(workers)
+    ]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "policy": policy,
+        "seats": len(samples),
+        "workers": workers,
+        "claims_per_s": round(len(samples) / elapsed, 1),
+        "p50_ms": round(_percentile(samples, 50), 3),
+        "p90_ms": round(_percentile(samples, 90), 3),
+        "p99_ms": round(_percentile(samples, 99), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seats", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument(
+        "--policy", action="append", choices=list(PLACEMENT_POLICIES),
+        help="Policy to time; repeatable (default: all)",
+    )
+    args = parser.parse_args()
+
+    database = VmDatabase(
+        dbname=os.getenv("POSTGRES_DB", "lablink_db"),
+        user=os.getenv("POSTGRES_USER", "lablink"),
+        password=os.getenv("POSTGRES_PASSWORD", "lablink"),
+        host=os.getenv("POSTGRES_HOST", "localhost"),
+        port=int(os.getenv("POSTGRES_PORT", "5432")),
+        table_name=TABLE,
+        pool_min_size=1,
+        pool_max_size=args.workers,
+    )
+    # assign_vm logs every claim; keep the output to the results.
+    logging.getLogger("lablink_allocator_service").setLevel(logging.WARNING)
+    try:
+        for policy in args.policy or list(PLACEMENT_POLICIES):
+            print(json.dumps(run(database, policy, args.seats, args.workers)))
+    finally:
+        with database._cursor as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+
+
+if __name__ == "__main__":
+    main()
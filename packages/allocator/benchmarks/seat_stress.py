@@ -0,0 +1,230 @@
+"""Stress /api/request_vm with concurrent first and repeat joins.
+
+Serves the app the way fleet_load.py does (scratch schema, manual-provider
+seats, stub agent on 127.0.0.1:7070) with ``--seats`` free seats, then
+releases ``--requests`` joins at once. Their emails are drawn from a
+smaller set, so ``--repeat-fraction`` of them repeat an address whose
+first join is still in flight: a double-clicked button, or a student with
+two tabs open. Once that settles, every seated student joins again, all
+together, the way a class reloads after a network blip.
+
+The database is then checked for:
+
+* duplicate seats: an email holding more than one seat;
+* double assignment: an email that was sent to its desktop but holds no
+  seat, because a later claim took the seat it was given;
+* lost seats: a seat held by an email whose join failed;
+* an undrained pool: fewer seats taken than there were students to take
+  them;
+* moved rejoins: a student whose second join landed on a different seat.
+
+Claim latency and claims/sec are reported for each quarter of the pool
+as it drains, in completion order. The run exits non-zero when any check
+fails. Admission control is off unless ``--admission`` is given, so every
+join reaches the claim.
+
+Needs a reachable Postgres (``POSTGRES_*`` env vars, as fleet_load.py);
+the scratch schema is dropped afterwards. Port 7070 must be free.
+
+Usage::
+
+    python benchmarks/seat_stress.py
+    python benchmarks/seat_stress.py --seats 500 --requests 800 \\
+        --repeat-fraction 0.3
+"""
+
+import argparse
+import json
+import logging
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+import requests
+
+from fleet_load import seed, serve
+from lablink_allocator_service import main as allocator
+from lablink_allocator_service.conf.structured_config import VM_TABLE_NAME
+from lablink_allocator_service.rate_limit import AdmissionControl
+
+SEATED = 303
+
+
+def _percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def _join_all(base_url: str, emails: list) -> list:
+    """POST one join per entry of `emails`, all released together.
+
+    Returns:
+        list: ``(email, status or None, started, finished)`` per join,
+        times from time.perf_counter().
+    """
+    start_line = threading.Barrier(len(emails))
+    results = [None] * len(emails)
+
+    def join(i: int) -> None:
+        start_line.wait()
+        started = time.perf_counter()
+        try:
+            status = requests.post(
+                f"{base_url}/api/request_vm",
+                data={"email": emails[i]},
+                allow_redirects=False,
+                timeout=120,
+            ).status_code
+        except requests.RequestException:
+            status = None
+        results[i] = (emails[i], status, started, time.perf_counter())
+
+    threads = [threading.Thread(target=join, args=(i,)) for i in range(len(emails))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def _seats_by_email(database) -> dict:
+    """email -> hostnames of the seats it holds, in any status."""
+    with database._cursor as cursor:
+        cursor.execute(
+            f"SELECT useremail, hostname FROM {VM_TABLE_NAME} "
+            f"WHERE useremail IS NOT NULL"
+        )
+        rows = cursor.fetchall()
+    seats: dict = {}
+    for email, hostname in rows:
+        seats.setdefault(email, []).append(hostname)
+    return seats
+
+
+def _drain_profile(results: list, seats: int) -> list:
+    """Latency and claim rate per quarter of the pool, by completion."""
+    claims = sorted(
+        (finished, (finished - started) * 1000)
+        for _, status, started, finished in results
+        if status == SEATED
+    )[:seats]
+    if not claims:
+        return []
+    origin = min(started for _, _, started, _ in results)
+    quarters = []
+    for q in range(4):
+        chunk = claims[q * seats // 4:(q + 1) * seats // 4]
+        if not chunk:
+            continue
+        begin = origin if q == 0 else claims[q * seats // 4 - 1][0]
+        latencies = [ms for _, ms in chunk]
+        quarters.append({
+            "drained_pct": f"{q * 25}-{(q + 1) * 25}",
+            "claims": len(chunk),
+            "claims_per_s": round(len(chunk) / max(chunk[-1][0] - begin, 1e-6), 1),
+            "p50_ms": round(_percentile(latencies, 50), 1),
+            "p99_ms": round(_percentile(latencies, 99), 1),
+        })
+    return quarters
+
+
+def _latency(results: list) -> dict:
+    latencies = [(finished - started) * 1000 for _, _, started, finished in results]
+    return {
+        "statuses": dict(Counter(str(status) for _, status, _, _ in results)),
+        "p50_ms": round(_percentile(latencies, 50), 1),
+        "p99_ms": round(_percentile(latencies, 99), 1),
+        "max_ms": round(max(latencies), 1),
+    }
+
+
+def run(database, base_url: str, args) -> dict:
+    seed(database, args.seats)
+    allocator.telemetry_cadence = None
+    allocator.admission = None
+    if args.admission:
+        limits = allocator.cfg.rate_limit
+        allocator.admission = AdmissionControl(
+            max_in_flight=limits.max_in_flight,
+            public_rate=limits.public_rate,
+            public_burst=limits.public_burst,
+            client_rate=limits.client_rate,
+            client_burst=limits.client_burst,
+        )
+
+    rng = random.Random(args.seed)
+    distinct = max(1, round(args.requests * (1 - args.repeat_fraction)))
+    students = [f"student-{i:05d}@example.com" for i in range(distinct)]
+    emails = students + [
+        rng.choice(students) for _ in range(args.requests - distinct)
+    ]
+    rng.shuffle(emails)
+
+    joins = _join_all(base_url, emails)
+    after_joins = _seats_by_email(database)
+    seated = {email for email, status, _, _ in joins if status == SEATED}
+    rejoins = _join_all(base_url, sorted(seated)) if seated else []
+    after_rejoins = _seats_by_email(database)
+
+    checks = {
+        "duplicate_seats": sorted(
+            e for e, held in after_rejoins.items() if len(held) > 1
+        ),
+        "double_assigned": sorted(seated - set(after_joins)),
+        "lost_seats": sorted(set(after_joins) - seated),
+        "moved_rejoins": sorted(
+            e for e in seated
+            if e in after_joins and after_rejoins.get(e) != after_joins[e]
+        ),
+    }
+    expected = min(distinct, args.seats)
+    failed = [name for name, bad in checks.items() if bad]
+    if len(after_joins) != expected:
+        failed.append("undrained_pool")
+    return {
+        "seats": args.seats,
+        "requests": args.requests,
+        "distinct_emails": distinct,
+        "seats_taken": len(after_joins),
+        "seats_expected": expected,
+        "joins": _latency(joins),
+        "drain": _drain_profile(joins, args.seats),
+        "rejoins": _latency(rejoins) if rejoins else None,
+        "checks": {name: bad[:10] for name, bad in checks.items()},
+        "failed": failed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seats", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument(
+        "--repeat-fraction", type=float, default=0.2,
+        help="Share of joins repeating another join's email (default: 0.2)",
+    )
+    parser.add_argument(
+        "--agent-latency-ms", type=float, default=20,
+        help="Stub agent's delay before accepting a session (default: 20)",
+    )
+    parser.add_argument("--admission", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Every claim logs at INFO; keep the output to the results.
+    logging.getLogger("lablink_allocator_service").setLevel(logging.WARNING)
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+
+    with serve(agent_latency=args.agent_latency_ms / 1000) as (database, url):
+        result = run(database, url, args)
+    print(json.dumps(result, indent=2))
+    if result["failed"]:
+        print(f"Failed checks: {', '.join(result['failed'])}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
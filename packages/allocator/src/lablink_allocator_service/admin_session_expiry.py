@@ -15,6 +15,8 @@ import logging
 from threading import Event, Thread
 from typing import TYPE_CHECKING
 
+from lablink_allocator_service.instrumentation import timed_iteration
+
 if TYPE_CHECKING:
     from lablink_allocator_service.db.vms import VmDatabase
 
@@ -64,9 +66,10 @@ class AdminSessionExpiryService:
         """Main loop that periodically sweeps for expired reservations."""
         while not self._stop_event.is_set():
             try:
-                released = self.database.release_expired_admin_sessions(
-                    self.timeout_minutes
-                )
+                with timed_iteration("admin_session_expiry"):
+                    released = self.database.release_expired_admin_sessions(
+                        self.timeout_minutes
+                    )
                 if released:
                     logger.info("Released %d expired admin session(s)", released)
             except Exception as e:
@@ -23,6 +23,7 @@ from flask import jsonify, request
 from flask_httpauth import HTTPBasicAuth
 from werkzeug.security import check_password_hash
 
+from lablink_allocator_service.rate_limit import limit_client
 from lablink_allocator_service.secret_hash import verify_secret_cached
 
 auth = HTTPBasicAuth()
@@ -72,6 +73,9 @@ def require_client_secret(f):
         stored = main.database.get_client_secret_hash(hostname)
         if not stored or not verify_secret_cached(hostname, token, stored):
             return jsonify({"error": "Invalid client secret."}), 401
+        refused = limit_client(hostname)
+        if refused is not None:
+            return refused
         return f(*args, **kwargs)
 
     return decorated
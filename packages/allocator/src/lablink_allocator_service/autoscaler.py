@@ -0,0 +1,239 @@
+"""Demand-driven seat autoscaler.
+
+Keeps a buffer of free seats (running, unassigned client VMs) so students
+arriving during a class don't find the pool empty. The buffer is
+``autoscale.free_seats``, or the number of seat requests in the last
+``demand_window_seconds`` if that is larger, so a burst sizes the next
+launch. Seats still coming up (initializing, or rebooting and unassigned,
+which includes started warm spares) count toward it.
+
+Launches and scale-downs are submitted to OperationsWorker like the
+operator's own /api/launch and /destroy, so they show up on the
+Instances page and never overlap another apply or destroy. A scale-down
+first marks the seats 'draining' (see ``VmDatabase.mark_draining``) so
+they can't be handed out while tofu destroys them.
+
+Like the warm pool, the autoscaler only acts while a fleet is up, so
+destroying the fleet doesn't bring it back.
+"""
+
+import functools
+import json
+import logging
+import time
+from collections import deque
+from threading import Event, Lock, Thread
+from typing import Callable, Optional
+
+from lablink_allocator_service.db.operations import OperationInProgress
+from lablink_allocator_service.db.vms import VmDatabase
+from lablink_allocator_service.instrumentation import timed_iteration
+
+logger = logging.getLogger(__name__)
+
+
+class AutoscalerService:
+    """Background service that keeps a buffer of free seats.
+
+    Args:
+        database: VmDatabase instance for querying/updating VM state.
+        operations_worker: OperationsWorker the launches and destroys run on.
+        launch: Called as ``launch(count, progress_callback,
+            output_callback)`` to bring ``count`` more client VMs up;
+            returns the job output.
+        destroy: Called as ``destroy(hostnames, progress_callback,
+            output_callback)`` to destroy client VMs; returns the job
+            output.
+        free_seats: Free seats to keep ready.
+        max_vms: The fleet is never grown past this many client VMs.
+        demand_window_seconds: How far back seat requests are counted.
+        cooldown_seconds: Minimum time between two scaling actions.
+        scale_down_after_seconds: Quiet period before extra free seats are
+            destroyed.
+        check_interval_seconds: How often to check the buffer.
+        warm_pool: WarmPoolService, if one is running; its spares waiting
+            to be parked are not counted as seats.
+    """
+
+    def __init__(
+        self,
+        database: VmDatabase,
+        operations_worker,
+        launch: Callable[..., str],
+        destroy: Callable[..., str],
+        free_seats: int = 2,
+        max_vms: int = 20,
+        demand_window_seconds: int = 300,
+        cooldown_seconds: int = 300,
+        scale_down_after_seconds: int = 900,
+        check_interval_seconds: int = 30,
+        warm_pool=None,
+    ):
+        self.database = database
+        self.operations_worker = operations_worker
+        self.launch = launch
+        self.destroy = destroy
+        self.free_seats = free_seats
+        self.max_vms = max_vms
+        self.demand_window_seconds = demand_window_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self.scale_down_after_seconds = scale_down_after_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.warm_pool = warm_pool
+        self._requests: deque[float] = deque()
+        self._last_action: Optional[float] = None
+        self._lock = Lock()
+        self._wake_event = Event()
+        self._stop_event = Event()
+        self._thread = None
+        # Counts as the last request, so a freshly started allocator
+        # doesn't scale down before students have had a chance to arrive.
+        self._last_request = time.monotonic()
+
+    def start(self):
+        """Start the autoscaler thread."""
+        self._stop_event.clear()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+        logger.info(
+            f"Autoscaler started (free_seats={self.free_seats}, "
+            f"max_vms={self.max_vms}, interval={self.check_interval_seconds}s)"
+        )
+
+    def stop(self):
+        """Stop the autoscaler thread."""
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+        logger.info("Autoscaler stopped")
+
+    def record_seat_request(self, pool_empty: bool = False):
+        """Count a student asking for a seat.
+
+        Args:
+            pool_empty: The request found no free seat; check right away
+                rather than at the next interval.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._requests.append(now)
+            self._last_request = now
+        if pool_empty:
+            self._wake_event.set()
+
+    def _run(self):
+        """Main loop that periodically checks the free-seat buffer."""
+        while not self._stop_event.is_set():
+            try:
+                with timed_iteration("autoscaler"):
+                    self._check()
+            except Exception as e:
+                logger.error(f"Error in autoscaler check: {e}", exc_info=True)
+            self._wake_event.wait(self.check_interval_seconds)
+            self._wake_event.clear()
+
+    def _recent_requests(self, now: float) -> int:
+        with self._lock:
+            cutoff = now - self.demand_window_seconds
+            while self._requests and self._requests[0] < cutoff:
+                self._requests.popleft()
+            return len(self._requests)
+
+    def _check(self):
+        statuses = self.database.get_all_vm_status()
+        if not statuses:
+            return
+        fleet = sum(1 for status in statuses.values() if status != "warm")
+        if fleet == 0:
+            return
+        now = time.monotonic()
+        if (
+            self._last_action is not None
+            and now - self._last_action < self.cooldown_seconds
+        ):
+            return
+
+        pending = self.warm_pool.pending() if self.warm_pool else set()
+        free = sorted(
+            h for h in self.database.get_unassigned_vms() if h not in pending
+        )
+        starting = self.database.count_starting_vms()
+        target = max(self.free_seats, self._recent_requests(now))
+
+        shortfall = target - len(free) - starting
+        if shortfall > 0:
+            self._scale_up(min(shortfall, self.max_vms - fleet), target)
+            return
+
+        with self._lock:
+            quiet_for = now - self._last_request
+        excess = len(free) - target
+        if excess > 0 and quiet_for >= self.scale_down_after_seconds:
+            # assign_vm hands out the lowest hostnames first, so the
+            # highest are the ones most likely to have sat idle.
+            self._scale_down(free[-excess:])
+
+    def _scale_up(self, count: int, target: int):
+        if count <= 0:
+            logger.warning(
+                f"Autoscaler wants a buffer of {target} free seats but the "
+                f"fleet is at max_vms ({self.max_vms})"
+            )
+            return
+        try:
+            job_id = self.operations_worker.submit(
+                op_type="apply",
+                fn=functools.partial(self.launch, count),
+                params=json.dumps({"num_vms": count, "autoscale": True}),
+                created_by="autoscaler",
+            )
+        except OperationInProgress:
+            logger.debug("Autoscaler launch deferred: operation in progress")
+            return
+        self._last_action = time.monotonic()
+        logger.info(
+            f"Autoscaler launching {count} VM(s) for a buffer of {target} "
+            f"free seats (job #{job_id})"
+        )
+
+    def _scale_down(self, candidates: list[str]):
+        drained = self.database.mark_draining(candidates)
+        if not drained:
+            return
+        try:
+            job_id = self.operations_worker.submit(
+                op_type="destroy",
+                fn=functools.partial(self._destroy_drained, drained),
+                params=json.dumps({"hostnames": drained, "autoscale": True}),
+                created_by="autoscaler",
+            )
+        except OperationInProgress:
+            logger.debug("Autoscaler scale-down deferred: operation in progress")
+            self._undrain(drained)
+            return
+        self._last_action = time.monotonic()
+        logger.info(
+            f"Autoscaler destroying {len(drained)} idle VM(s): {drained} "
+            f"(job #{job_id})"
+        )
+
+    def _destroy_drained(
+        self,
+        hostnames: list[str],
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        output_callback: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """Runs on OperationsWorker's background thread."""
+        try:
+            return self.destroy(hostnames, progress_callback, output_callback)
+        except Exception:
+            self._undrain(hostnames)
+            raise
+
+    def _undrain(self, hostnames: list[str]):
+        """Put draining VMs back in service after a scale-down fell
+        through."""
+        for hostname in hostnames:
+            self.database.update_vm_status(hostname, "running")
+
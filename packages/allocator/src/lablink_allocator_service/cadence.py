@@ -0,0 +1,185 @@
+"""Server-driven report cadence for client VMs.
+
+Each periodic client reporter (heartbeat, GPU check, session-metrics
+push) has a built-in interval. The allocator overrides it on every
+response with an ``X-LabLink-Report-Interval`` header giving the seconds
+until that client's next report on that route, and the reporters follow
+it. That lets the allocator shape the fleet's aggregate report rate:
+
+* Each route's demand is the clients that reported on it recently divided
+  by its base interval. When the total across routes exceeds
+  ``target_qps``, every interval is stretched by the same factor, up to
+  that route's maximum. Below the target, clients keep their base
+  cadence.
+* The heartbeat's maximum stays within half of the silence window after
+  which the auto-reboot service reboots a running VM
+  (STALE_HEARTBEAT_MINUTES), so pacing never gets a healthy VM rebooted.
+  The other routes share ``max_interval_seconds``.
+* A watched VM (see ``watch``) reports every ``watch_interval_seconds``
+  instead, so an operator can follow one machine closely for a while.
+* Every recommendation carries ``jitter`` so clients that started
+  together drift apart instead of reporting in lockstep.
+"""
+
+import random
+import threading
+import time
+
+from flask import request
+
+from lablink_allocator_service.db.vms import STALE_HEARTBEAT_MINUTES
+from lablink_allocator_service.rate_limit import client_key
+
+HEADER = "X-LabLink-Report-Interval"
+
+# Base interval (seconds) per route, matching the client's built-in
+# default for the reporter that calls it. Only these routes get a hint.
+# The in-use reporter is left out: it only reports when the subject
+# software starts or quits, so it has no cadence to pace.
+REPORT_INTERVALS = {
+    "vm_telemetry.heartbeat": 30,
+    "vm_telemetry.update_gpu_health": 20,
+    "metrics.post_session_metrics": 60,
+}
+
+# Longest heartbeat interval that may ever be recommended, jitter
+# included: half the silence window get_failed_vms allows.
+HEARTBEAT_MAX_SECONDS = STALE_HEARTBEAT_MINUTES * 60 // 2
+
+# How often the fleet demand estimate is recomputed.
+DEMAND_REFRESH_SECONDS = 1.0
+
+
+class TelemetryCadence:
+    """Recommends each client's next report interval.
+
+    Args:
+        target_qps: Aggregate report rate the fleet is shaped to.
+        max_interval_seconds: Longest interval ever recommended on the
+            GPU and session-metrics routes.
+        heartbeat_max_interval_seconds: Longest heartbeat interval ever
+            recommended; never more than HEARTBEAT_MAX_SECONDS.
+        watch_interval_seconds: Interval for watched VMs.
+        jitter: Fractional spread applied to every recommendation
+            (0.1 means +/-10%).
+        clock: Monotonic clock; tests pass a fake.
+        rng: Random source for jitter; tests pass a seeded one.
+    """
+
+    def __init__(
+        self,
+        target_qps: float = 20.0,
+        max_interval_seconds: int = 300,
+        heartbeat_max_interval_seconds: int = HEARTBEAT_MAX_SECONDS,
+        watch_interval_seconds: int = 5,
+        jitter: float = 0.1,
+        clock=time.monotonic,
+        rng: random.Random | None = None,
+    ):
+        self.target_qps = target_qps
+        self.max_interval_seconds = max_interval_seconds
+        # endpoint -> longest interval recommended on it, jitter included
+        self.max_intervals = {
+            endpoint: max_interval_seconds for endpoint in REPORT_INTERVALS
+        }
+        self.max_intervals["vm_telemetry.heartbeat"] = min(
+            heartbeat_max_interval_seconds,
+            HEARTBEAT_MAX_SECONDS,
+            max_interval_seconds,
+        )
+        self.watch_interval_seconds = watch_interval_seconds
+        self.jitter = jitter
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        # endpoint -> {client: last report time}
+        self._seen: dict[str, dict[str, float]] = {
+            endpoint: {} for endpoint in REPORT_INTERVALS
+        }
+        self._watched: dict[str, float] = {}
+        self._factor = 1.0
+        self._factor_at = float("-inf")
+
+    def watch(self, hostname: str, seconds: float) -> None:
+        """Have `hostname` report every watch_interval_seconds for the next
+        `seconds`. Zero or less stops watching it."""
+        with self._lock:
+            if seconds > 0:
+                self._watched[hostname] = self._clock() + seconds
+            else:
+                self._watched.pop(hostname, None)
+
+    def watched(self) -> dict[str, float]:
+        """Watched hostnames and the seconds left on each."""
+        with self._lock:
+            now = self._clock()
+            return {
+                host: until - now
+                for host, until in self._watched.items()
+                if until > now
+            }
+
+    @property
+    def factor(self) -> float:
+        """Current stretch applied to base intervals (1.0 = none)."""
+        return self._factor
+
+    def next_interval(self, endpoint: str, client: str) -> int | None:
+        """Record a report from `client` on `endpoint` and return the
+        seconds until its next one, or None for routes without a cadence."""
+        base = REPORT_INTERVALS.get(endpoint)
+        if base is None:
+            return None
+        with self._lock:
+            now = self._clock()
+            self._seen[endpoint][client] = now
+            if now - self._factor_at >= DEMAND_REFRESH_SECONDS:
+                self._factor = self._compute_factor(now)
+                self._factor_at = now
+            longest = self.max_intervals[endpoint]
+            until = self._watched.get(client)
+            if until is not None and until > now:
+                interval = min(base, self.watch_interval_seconds)
+            else:
+                if until is not None:
+                    del self._watched[client]
+                # Leave room for the jitter below the route's maximum.
+                interval = min(
+                    base * self._factor, longest / (1 + self.jitter)
+                )
+            spread = self._rng.uniform(1 - self.jitter, 1 + self.jitter)
+        return max(1, min(longest, round(interval * spread)))
+
+    def _compute_factor(self, now: float) -> float:
+        # A client counts as active for a few of the longest intervals it
+        # could have been given, so stretching the cadence doesn't make
+        # the fleet look smaller and snap it straight back.
+        demand = 0.0
+        for endpoint, seen in self._seen.items():
+            horizon = 3 * self.max_intervals[endpoint]
+            stale = [c for c, at in seen.items() if now - at > horizon]
+            for c in stale:
+                del seen[c]
+            demand += len(seen) / REPORT_INTERVALS[endpoint]
+        return max(1.0, demand / self.target_qps)
+
+
+def install(app, get_cadence) -> None:
+    """Add the report-interval header to `app`'s telemetry responses.
+
+    `get_cadence` returns the TelemetryCadence in use, or None to leave
+    responses alone; it is called per request, as in rate_limit.install.
+    """
+
+    @app.after_request
+    def _add_interval(response):
+        cadence = get_cadence()
+        if (
+            cadence is None
+            or request.endpoint not in REPORT_INTERVALS
+            or response.status_code == 429
+        ):
+            return response
+        interval = cadence.next_interval(request.endpoint, client_key())
+        response.headers[HEADER] = str(interval)
+        return response
@@ -3,18 +3,71 @@ client and persist per-session state on the clients row.
 
 Called from /api/request_vm inside the seat-assignment transaction so
 rotation failure rolls back the assignment.
+
+Fresh assignments usually skip the agent round-trip: SessionStagingService
+rotates idle seats' passwords in the background (``stage_browser_session``)
+and ``prepare_browser_session(use_staged=True)`` just moves the staged
+credential into the session columns. Rejoins, admin sessions and seats with
+nothing staged rotate synchronously as before.
+
+Agent calls share one keep-alive ``requests.Session`` (the agent's threaded
+Werkzeug server speaks HTTP/1.1), so repeat rotations on a seat reuse its
+TCP connection. Addresses the provider's ``fallback_fn`` resolves (an EC2 API
+call on AWS) are cached per hostname; AWS launches seed the cache from the
+``vm_private_ips`` tofu output, and registration, destroys and failed
+rotations drop entries.
+
+Inside a trace (see tracing.py), each agent call attempt and each
+``fallback_fn`` lookup is a span, and agent calls carry the trace's
+``traceparent`` header.
 """
 import secrets
+import threading
 import time
 import uuid
 from dataclasses import dataclass
 from typing import Callable
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from lablink_allocator_service.tracing import CLIENT, TRACEPARENT, TRACER
 
 
 ROTATE_TIMEOUT = 5.0
 ROTATE_BACKOFF_SECONDS = 1.5
+# Per-host connection pools kept open. Sized for a large class; the least
+# recently used host's pool is closed past this.
+AGENT_POOL_HOSTS = 512
+
+
+def _make_agent_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=AGENT_POOL_HOSTS, pool_maxsize=2)
+    session.mount("http://", adapter)
+    return session
+
+
+_agent_http = _make_agent_session()
+
+_private_ips: dict[str, str] = {}
+_private_ips_lock = threading.Lock()
+
+
+def remember_private_ip(hostname: str, ip: str) -> None:
+    """Cache the address a client's agent is reached at."""
+    with _private_ips_lock:
+        _private_ips[hostname] = ip
+
+
+def forget_private_ip(hostname: str | None = None) -> None:
+    """Drop *hostname*'s cached address, or every address if None."""
+    with _private_ips_lock:
+        if hostname is None:
+            _private_ips.clear()
+        else:
+            _private_ips.pop(hostname, None)
 
 
 class RotationFailed(RuntimeError):
@@ -38,9 +91,11 @@ def _lookup_private_ip(
     Resolution order:
     1. ``database.get_lan_ip(hostname)`` — present for BYO/manual rows that
        record their LAN IP at registration time.
-    2. ``fallback_fn(hostname)`` — caller-supplied resolver (e.g. EC2 tag
-       lookup).  When omitted, falls through to step 3.
-    3. Raises :exc:`RotationFailed` with a descriptive message.
+    2. The address cache (see :func:`remember_private_ip`).
+    3. ``fallback_fn(hostname)`` — caller-supplied resolver (e.g. EC2 tag
+       lookup), whose answer is cached.  When omitted, falls through to
+       step 4.
+    4. Raises :exc:`RotationFailed` with a descriptive message.
 
     The fallback is intentionally not hard-coded here so that
     ``client_session`` has no dependency on AWS utilities.  Provider-specific
@@ -51,8 +106,15 @@ def _lookup_private_ip(
         stored = database.get_lan_ip(hostname)
         if stored:
             return stored
+    with _private_ips_lock:
+        cached = _private_ips.get(hostname)
+    if cached:
+        return cached
     if fallback_fn is not None:
-        return fallback_fn(hostname)
+        with TRACER.span("resolve agent address", hostname=hostname):
+            ip = fallback_fn(hostname)
+        remember_private_ip(hostname, ip)
+        return ip
     raise RotationFailed(
         f"no IP recorded for {hostname} and no fallback resolver provided"
     )
@@ -60,23 +122,91 @@ def _lookup_private_ip(
 
 def _post_rotate(url: str, body: dict, *, bearer: str) -> None:
     last_exc = None
+    name = f"agent POST {urlsplit(url).path}"
     for attempt in range(2):  # initial + one retry
-        try:
-            resp = requests.post(
-                url,
-                headers={"Authorization": f"Bearer {bearer}"},
-                json=body,
-                timeout=ROTATE_TIMEOUT,
-            )
-            resp.raise_for_status()
-            return
-        except requests.RequestException as exc:
-            last_exc = exc
-            if attempt == 0:
-                time.sleep(ROTATE_BACKOFF_SECONDS)
+        with TRACER.span(
+            name, kind=CLIENT, **{"http.url": url, "attempt": attempt + 1},
+        ) as span:
+            headers = {"Authorization": f"Bearer {bearer}"}
+            traceparent = TRACER.traceparent()
+            if traceparent:
+                headers[TRACEPARENT] = traceparent
+            try:
+                resp = _agent_http.post(
+                    url,
+                    headers=headers,
+                    json=body,
+                    timeout=ROTATE_TIMEOUT,
+                )
+                if span is not None:
+                    span.attributes["http.status_code"] = resp.status_code
+                resp.raise_for_status()
+                return
+            except requests.RequestException as exc:
+                last_exc = exc
+                if span is not None:
+                    span.error = str(exc)
+        if attempt == 0:
+            time.sleep(ROTATE_BACKOFF_SECONDS)
     raise RotationFailed(str(last_exc))
 
 
+def _rotate_agent(hostname: str, private_ip: str, password: str, *,
+                  bearer: str) -> None:
+    """POST a new VNC password to *hostname*'s agent at *private_ip*."""
+    try:
+        _post_rotate(
+            f"http://{private_ip}:7070/api/session/start",
+            {"password": password},
+            bearer=bearer,
+        )
+    except RotationFailed:
+        # The address may be stale (the host was replaced); resolve it
+        # afresh next time.
+        forget_private_ip(hostname)
+        raise
+
+
+def _store_staged(database, hostname: str, password: str, upstream: str) -> None:
+    """Record a staged credential, unless a session started on the seat
+    (or an admin reserved it) meanwhile."""
+    with database._cursor as cursor:
+        cursor.execute(
+            f"UPDATE {database.table_name} "
+            f"SET stagedvncpassword = %s, "
+            f"    stagedupstream = %s, "
+            f"    stagingat = NULL "
+            f"WHERE hostname = %s "
+            f"AND sessionid IS NULL AND adminreservedat IS NULL",
+            (password, upstream, hostname),
+        )
+
+
+def stage_browser_session(
+    *,
+    database,
+    hostname: str,
+    agent_token: str,
+    fallback_fn: Callable[[str], str] | None = None,
+) -> None:
+    """Rotate a seat's VNC password ahead of its session.
+
+    The new password and upstream are kept in the staged columns until
+    ``prepare_browser_session(use_staged=True)`` hands them to a session.
+    The caller holds the seat's staging lease (see
+    ``VmDatabase.claim_unstaged_seat`` and, for roster pre-assignments,
+    ``claim_unstaged_preassigned_seats``), which keeps ``assign_vm`` off it
+    while the rotation is in flight.
+
+    Raises:
+        RotationFailed: if the agent could not be reached.
+    """
+    private_ip = _lookup_private_ip(hostname, database, fallback_fn=fallback_fn)
+    password = secrets.token_urlsafe(24)
+    _rotate_agent(hostname, private_ip, password, bearer=agent_token)
+    _store_staged(database, hostname, password, f"{private_ip}:6080")
+
+
 def prepare_browser_session(
     *,
     database,
@@ -85,6 +215,7 @@ def prepare_browser_session(
     browser_token: str,
     agent_token: str,
     fallback_fn: Callable[[str], str] | None = None,
+    use_staged: bool = False,
 ) -> BrowserSessionTarget:
     """Rotate the assigned client's VNC password and persist per-session
     columns on the VM row. Must be called inside the seat-assignment
@@ -101,7 +232,31 @@ def prepare_browser_session(
     Provider-specific connectivity strategies supply this (e.g.
     ``AllocatorProxiedClientConnectivity`` passes an EC2 tag lookup).
     When omitted and no stored IP exists, :exc:`RotationFailed` is raised.
+
+    `use_staged` takes the seat's pre-rotated credential, if it has one,
+    instead of rotating; only fresh assignments should ask for it.
     """
+    ws_url = f"proxy/{browser_token}"
+    if use_staged:
+        with database._cursor as cursor:
+            cursor.execute(
+                f"UPDATE {database.table_name} "
+                f"SET sessionid = %s, "
+                f"    browsertoken = %s, "
+                f"    vncpassword = stagedvncpassword, "
+                f"    upstream = stagedupstream, "
+                f"    browser_ws_url = %s, "
+                f"    browser_credential = NULL, "
+                f"    sessionstartedat = NOW(), "
+                f"    stagedvncpassword = NULL, "
+                f"    stagedupstream = NULL "
+                f"WHERE hostname = %s AND stagedvncpassword IS NOT NULL "
+                f"RETURNING hostname",
+                (str(session_id), browser_token, ws_url, hostname),
+            )
+            if cursor.fetchone() is not None:
+                return BrowserSessionTarget(ws_url=ws_url, browser_credential=None)
+
     private_ip = _lookup_private_ip(hostname, database, fallback_fn=fallback_fn)
     password = secrets.token_urlsafe(24)
     upstream = f"{private_ip}:6080"
@@ -109,13 +264,9 @@ def prepare_browser_session(
     # Body shape matches the agent's contract (packages/client/.../agent/api.py):
     # a single `password` field. session_id and browser_token are bookkeeping
     # the *allocator* persists in its own DB; the agent doesn't need either.
-    _post_rotate(
-        f"http://{private_ip}:7070/api/session/start",
-        {"password": password},
-        bearer=agent_token,
-    )
+    _rotate_agent(hostname, private_ip, password, bearer=agent_token)
 
-    ws_url = f"proxy/{browser_token}"
+    # Rotating replaced any staged password, so drop it too.
     with database._cursor as cursor:
         cursor.execute(
             f"UPDATE {database.table_name} "
@@ -125,7 +276,9 @@ def prepare_browser_session(
             f"    upstream = %s, "
             f"    browser_ws_url = %s, "
             f"    browser_credential = NULL, "
-            f"    sessionstartedat = NOW() "
+            f"    sessionstartedat = NOW(), "
+            f"    stagedvncpassword = NULL, "
+            f"    stagedupstream = NULL "
             f"WHERE hostname = %s",
             (str(session_id), browser_token, password, upstream,
              ws_url, hostname),
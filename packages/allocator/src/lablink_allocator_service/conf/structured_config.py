@@ -195,6 +195,223 @@ class StartupConfig:
     success_check: str = field(default="")
 
 
+@dataclass
+class ProvisioningConfig:
+    """Configuration for how client VMs are provisioned with OpenTofu.
+
+    Attributes:
+        shards (int): Number of independent OpenTofu workspaces, each with
+            its own state file, that client VMs are spread across. A launch
+            is split over the shards and their applies run concurrently,
+            so one state lock no longer serializes a large fleet. 1 keeps
+            every client VM in the single original workspace.
+        parallelism (int): OpenTofu's -parallelism for each apply (the
+            number of resources it creates at once; OpenTofu's default
+            is 10).
+        warm_spares (int): Number of fully initialized client VMs to keep
+            stopped as a warm pool. A launch starts these before creating
+            anything new, and the pool is refilled in the background.
+            0 disables the pool.
+        warm_check_interval_seconds (int): How often the warm pool is
+            checked for spares to stop and for a shortfall to refill.
+    """
+
+    shards: int = field(default=1)
+    parallelism: int = field(default=10)
+    warm_spares: int = field(default=0)
+    warm_check_interval_seconds: int = field(default=60)
+
+
+@dataclass
+class AutoscaleConfig:
+    """Configuration for the demand-driven seat autoscaler.
+
+    Attributes:
+        enabled (bool): Launch and destroy client VMs automatically to keep
+            a buffer of free seats. Off by default.
+        free_seats (int): Free (running, unassigned) seats to keep ready.
+            During a burst the buffer grows to the number of seat requests
+            seen in the last demand_window_seconds.
+        max_vms (int): The autoscaler never grows the fleet past this many
+            client VMs (warm spares not included).
+        demand_window_seconds (int): How far back seat requests are counted
+            when sizing the buffer for a burst.
+        cooldown_seconds (int): Minimum time between two scaling actions,
+            so VMs launched by one have time to report in before the next.
+        scale_down_after_seconds (int): Free seats above free_seats are
+            destroyed once no seat has been requested for this long.
+        check_interval_seconds (int): How often the autoscaler checks the
+            buffer. It also checks right away when a student finds the
+            pool empty.
+    """
+
+    enabled: bool = field(default=False)
+    free_seats: int = field(default=2)
+    max_vms: int = field(default=20)
+    demand_window_seconds: int = field(default=300)
+    cooldown_seconds: int = field(default=300)
+    scale_down_after_seconds: int = field(default=900)
+    check_interval_seconds: int = field(default=30)
+
+
+@dataclass
+class IdleReclaimConfig:
+    """Configuration for idle-seat reclamation.
+
+    Attributes:
+        enabled (bool): Release seats nobody has used for idle_minutes and
+            recycle their VMs. Off by default.
+        idle_minutes (int): Minutes without activity (the subject software
+            starting or quitting, training or labeling progress, the student
+            rejoining) before a seat is warned. A seat with the subject
+            software open is never idle.
+        grace_minutes (int): Minutes between the warning and the release.
+            Any activity in between cancels it.
+        check_interval_seconds (int): How often seats are checked.
+    """
+
+    enabled: bool = field(default=False)
+    idle_minutes: int = field(default=30)
+    grace_minutes: int = field(default=5)
+    check_interval_seconds: int = field(default=60)
+
+
+@dataclass
+class SessionStagingConfig:
+    """Configuration for background session-credential staging.
+
+    Attributes:
+        enabled (bool): Rotate free seats' VNC passwords in the background
+            so a fresh seat assignment doesn't wait on the client agent.
+            On by default.
+        check_interval_seconds (int): How often free seats are checked for
+            a missing staged credential. A VM reporting 'running' also
+            triggers a check.
+        concurrency (int): How many seats are staged at once.
+    """
+
+    enabled: bool = field(default=True)
+    check_interval_seconds: int = field(default=15)
+    concurrency: int = field(default=8)
+
+
+@dataclass
+class PlacementConfig:
+    """Configuration for which free seat a student is given.
+
+    Attributes:
+        policy (str): How free seats are ranked when one is claimed.
+            Seats with a staged session credential always come first.
+            Options:
+            - "hostname": lowest hostname first (the default).
+            - "random": any eligible seat, which keeps concurrent claims
+              off each other's rows during an arrival burst.
+            - "gpu": hosts whose GPU check found a GPU first.
+            - "disk": most free disk first.
+            - "stable": fewest recovery reboots, then fastest startup.
+    """
+
+    policy: str = field(default="hostname")
+
+
+@dataclass
+class RateLimitConfig:
+    """Configuration for request admission control.
+
+    Attributes:
+        enabled (bool): Rate limit public and client-VM requests and cap
+            requests in flight. On by default. Admin requests are never
+            rate limited.
+        max_in_flight (int): Requests allowed to run at once. Client VM
+            reports are refused once half of this is in use and participant
+            requests at 80%, keeping the rest for admin requests.
+        public_rate (float): Requests per second allowed on each participant
+            route, shared by all participants.
+        public_burst (int): Participant requests a route absorbs at once.
+        client_rate (float): Requests per second each client VM may make on
+            each reporting route.
+        client_burst (int): Reports a client VM may make at once.
+    """
+
+    enabled: bool = field(default=True)
+    max_in_flight: int = field(default=150)
+    public_rate: float = field(default=20.0)
+    public_burst: int = field(default=100)
+    client_rate: float = field(default=1.0)
+    client_burst: int = field(default=10)
+
+
+@dataclass
+class CadenceConfig:
+    """Configuration for server-driven client report intervals.
+
+    Attributes:
+        enabled (bool): Tell client VMs when to report next on every
+            heartbeat, GPU, in-use and session-metrics response. On by
+            default. When off, clients keep their built-in intervals.
+        target_qps (float): Aggregate report rate to shape the fleet to.
+            Intervals are stretched when the fleet at its base cadence
+            would exceed it.
+        max_interval_seconds (int): Longest interval ever recommended to
+            the GPU check and session-metrics push.
+        heartbeat_max_interval_seconds (int): Longest heartbeat interval
+            ever recommended. At most half the 3-minute silence window
+            after which the auto-reboot service reboots a running VM.
+        watch_interval_seconds (int): Interval for a VM an operator is
+            watching (POST /api/vm-watch/<hostname>).
+        jitter (float): Fractional spread applied to every interval, so
+            clients drift apart (0.1 means +/-10%).
+    """
+
+    enabled: bool = field(default=True)
+    target_qps: float = field(default=20.0)
+    max_interval_seconds: int = field(default=300)
+    heartbeat_max_interval_seconds: int = field(default=90)
+    watch_interval_seconds: int = field(default=5)
+    jitter: float = field(default=0.1)
+
+
+@dataclass
+class MemoryReportConfig:
+    """Configuration for the periodic memory summary in the allocator log.
+
+    Attributes:
+        enabled (bool): Log RSS (and its growth since startup), the gc
+            object count and the most common object types periodically.
+            On by default.
+        interval_minutes (int): Minutes between summaries. Each one walks
+            every gc-tracked object, so keep this in minutes, not seconds.
+        top_types (int): How many of the most common object types to list.
+    """
+
+    enabled: bool = field(default=True)
+    interval_minutes: int = field(default=15)
+    top_types: int = field(default=5)
+
+
+@dataclass
+class TracingConfig:
+    """Configuration for request tracing (see tracing.py).
+
+    Attributes:
+        enabled (bool): Trace every request and background operation,
+            keep the slow ones in memory for /admin/traces, and send the
+            trace ID to client agents. On by default.
+        buffer_traces (int): How many traces to keep; the oldest go first.
+        min_duration_ms (float): Traces shorter than this are dropped when
+            they finish, so heartbeats do not push the slow requests out
+            of the buffer. 0 keeps everything.
+        otlp_file (str): When set, also append each kept trace to this file
+            as OTLP/JSON, one ExportTraceServiceRequest per line, for an
+            OpenTelemetry collector's file receiver or offline analysis.
+    """
+
+    enabled: bool = field(default=True)
+    buffer_traces: int = field(default=500)
+    min_duration_ms: float = field(default=100.0)
+    otlp_file: str = field(default="")
+
+
 @dataclass
 class ManualConfig:
     """Configuration for the manual provider's client connectivity and
@@ -248,6 +465,44 @@ class ManualConfig:
     public_hostname: str = field(default="")
 
 
+@dataclass
+class SimulatedConfig:
+    """Configuration for the simulated provider, a fake fleet for scale
+    testing the allocator on one machine. Only read when provider is
+    "simulated".
+
+    Latencies are drawn per host from a log-normal distribution with the
+    given median; ``latency_spread`` is its sigma (0 makes every host take
+    exactly the median).
+
+    Attributes:
+        create_seconds (float): Median time to create a host, the stand-in
+            for its tofu apply. At most provisioning.parallelism hosts are
+            created at once.
+        boot_seconds (float): Median time from creation (or a reboot or
+            start) until the host reports 'running'.
+        destroy_seconds (float): Median time to destroy a host.
+        latency_spread (float): Sigma of the log-normal latencies.
+        create_failure_rate (float): Probability that creating a host
+            fails. A launch with any failed host ends in an error.
+        boot_failure_rate (float): Probability that a boot ends in status
+            'error' instead of 'running'.
+        hang_rate (float): Probability, per heartbeat, that a running host
+            stops heartbeating until it is recovered.
+        heartbeat_seconds (float): Interval between a running host's
+            heartbeats.
+    """
+
+    create_seconds: float = field(default=40.0)
+    boot_seconds: float = field(default=120.0)
+    destroy_seconds: float = field(default=30.0)
+    latency_spread: float = field(default=0.25)
+    create_failure_rate: float = field(default=0.0)
+    boot_failure_rate: float = field(default=0.0)
+    hang_rate: float = field(default=0.0)
+    heartbeat_seconds: float = field(default=30.0)
+
+
 @dataclass
 class MonitoringConfig:
     enabled: bool = False
@@ -288,6 +543,8 @@ class Config:
             - "aws": EC2 via OpenTofu (the existing behavior).
             - "manual": no automated provisioning — BYO clients
               register themselves via `lablink client register`.
+            - "simulated": a fake in-process fleet for scale testing
+              (see SimulatedConfig).
         db (DatabaseConfig): The database configuration.
         machine (MachineConfig): The machine configuration.
         app (AppConfig): The application configuration.
@@ -312,3 +569,15 @@ class Config:
     startup_script: StartupConfig = field(default_factory=StartupConfig)
     monitoring: MonitoringConfig = field(default_factory=MonitoringConfig)
     manual: ManualConfig = field(default_factory=ManualConfig)
+    simulated: SimulatedConfig = field(default_factory=SimulatedConfig)
+    provisioning: ProvisioningConfig = field(default_factory=ProvisioningConfig)
+    autoscale: AutoscaleConfig = field(default_factory=AutoscaleConfig)
+    idle_reclaim: IdleReclaimConfig = field(default_factory=IdleReclaimConfig)
+    session_staging: SessionStagingConfig = field(
+        default_factory=SessionStagingConfig
+    )
+    placement: PlacementConfig = field(default_factory=PlacementConfig)
+    rate_limit: RateLimitConfig = field(default_factory=RateLimitConfig)
+    cadence: CadenceConfig = field(default_factory=CadenceConfig)
+    memory_report: MemoryReportConfig = field(default_factory=MemoryReportConfig)
+    tracing: TracingConfig = field(default_factory=TracingConfig)
@@ -115,6 +115,11 @@ class MetricsDatabase:
         classifies the failure as ``LookupError`` (no such row) or
         ``ValueError`` (row exists but is sealed).
 
+        LastActivityAt is touched when a progress counter (GPU time,
+        labeled frames, training epochs) moved since the last report; the
+        time-in-window counters accrue whether or not anyone is there, so
+        they don't count as activity.
+
         Raises:
             LookupError: if hostname unknown.
             ValueError: if the row is already sealed.
@@ -124,6 +129,11 @@ class MetricsDatabase:
             cursor.execute(
                 f"""
                 UPDATE {self.table_name} SET
+                  LastActivityAt               = CASE
+                    WHEN GpuActiveSeconds IS DISTINCT FROM %s
+                      OR MaxLabeledFrames IS DISTINCT FROM %s
+                      OR TrainingEpochsCompleted IS DISTINCT FROM %s
+                    THEN NOW() ELSE LastActivityAt END,
                   SessionMetricsStartedAt      = COALESCE(SessionMetricsStartedAt, %s),
                   SessionMetricsLastReportedAt = NOW(),
                   SecondsInSubjectSoftware     = %s,
@@ -143,6 +153,9 @@ class MetricsDatabase:
                 WHERE HostName = %s AND SessionMetricsSealedAt IS NULL
                 """,
                 (
+                    counters.get("gpu_active_seconds"),
+                    counters.get("max_labeled_frames"),
+                    counters.get("training_epochs_completed"),
                     payload.get("session_started_at"),
                     counters.get("seconds_in_subject_software"),
                     counters.get("seconds_in_terminal"),
@@ -175,17 +188,27 @@ class MetricsDatabase:
                 raise LookupError(f"VM {hostname} not found")
             raise ValueError(f"VM {hostname} session is sealed")
 
-    def bulk_seal_session_metrics(self) -> int:
+    def bulk_seal_session_metrics(
+        self, hostnames: list[str] | None = None
+    ) -> int:
         """Seal every unsealed VM (called from the destroy paths).
 
+        Args:
+            hostnames: restrict the seal to these VMs (a targeted destroy);
+                None seals the whole table.
+
         Returns:
             int: number of rows sealed.
         """
+        query = (
+            f"UPDATE {self.table_name} SET SessionMetricsSealedAt = NOW() "
+            "WHERE SessionMetricsSealedAt IS NULL"
+        )
         with self._cursor as cursor:
-            cursor.execute(
-                f"UPDATE {self.table_name} SET SessionMetricsSealedAt = NOW() "
-                "WHERE SessionMetricsSealedAt IS NULL"
-            )
+            if hostnames is None:
+                cursor.execute(query)
+            else:
+                cursor.execute(query + " AND HostName = ANY(%s)", (hostnames,))
             return cursor.rowcount or 0
 
     def get_session_metrics_summary(self) -> dict:
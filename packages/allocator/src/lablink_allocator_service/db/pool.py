@@ -8,6 +8,7 @@ from __future__ import annotations
 
 import logging
 import os
+import time
 
 import psycopg2
 import psycopg2.pool
@@ -18,6 +19,13 @@ from lablink_allocator_service.conf.structured_config import (
     DB_PORT,
     DB_USER,
 )
+from lablink_allocator_service.instrumentation import (
+    POOL_CHECKOUT_SECONDS,
+    POOL_EXHAUSTED,
+    POOL_WAITING,
+)
+from lablink_allocator_service.db.query_stats import TimedCursor
+from lablink_allocator_service.tracing import TRACER
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +63,10 @@ class PooledCursor:
     """Checks out an autocommit connection from the pool, opens a cursor,
     and returns both to the pool/closes on exit. Preserves the per-call
     context-manager API previously provided by _LockedCursor.
+
+    The cursor handed out is a TimedCursor, so every statement lands in
+    the per-fingerprint stats (see query_stats.py). Inside a trace, the
+    checkout wait is recorded as a span.
     """
 
     def __init__(self, pool):
@@ -63,7 +75,23 @@ class PooledCursor:
         self._cur = None
 
     def __enter__(self):
-        self._conn = self._pool.getconn()
+        started = time.perf_counter()
+        traced_from = time.time_ns() if TRACER.active() else None
+        error = None
+        POOL_WAITING.inc()
+        try:
+            self._conn = self._pool.getconn()
+        except psycopg2.pool.PoolError:
+            POOL_EXHAUSTED.inc()
+            error = "pool exhausted"
+            raise
+        finally:
+            POOL_WAITING.dec()
+            POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - started)
+            if traced_from is not None:
+                TRACER.record(
+                    "db checkout", traced_from, time.time_ns(), error=error,
+                )
         try:
             # Mirror pre-refactor behavior: every connection runs in
             # autocommit. Applied per checkout — cheap, and defensive
@@ -73,7 +101,7 @@ class PooledCursor:
                 psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT
             )
             self._cur = self._conn.cursor()
-            return self._cur
+            return TimedCursor(self._cur)
         except Exception:
             self._pool.putconn(self._conn)
             self._conn = None
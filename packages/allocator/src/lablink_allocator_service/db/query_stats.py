@@ -0,0 +1,219 @@
+"""Per-statement timing for every query run through PooledCursor.
+
+PooledCursor hands out a TimedCursor, whose execute/executemany record
+wall time and row count against the statement's fingerprint (its SQL with
+literals, placeholders and value lists collapsed) in QUERY_STATS, and log
+any statement slower than SLOW_QUERY_MS together with the line of
+allocator code that issued it. /admin/query-stats renders the table.
+Inside a trace (see tracing.py), each statement is also a span naming
+that line.
+
+Stats are per process and since start (or the last reset); nothing is
+written to the database.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+import sys
+import threading
+import time
+
+from lablink_allocator_service.tracing import TRACER
+
+logger = logging.getLogger(__name__)
+
+
+def _slow_query_ms_from_env(default: float) -> float:
+    """LABLINK_SLOW_QUERY_MS override; 0 logs every statement. Invalid or
+    negative values fall through to the default."""
+    raw = os.environ.get("LABLINK_SLOW_QUERY_MS")
+    if not raw:
+        return default
+    try:
+        parsed = float(raw)
+    except ValueError:
+        logger.warning(
+            "Ignoring invalid LABLINK_SLOW_QUERY_MS=%r; using %g", raw, default
+        )
+        return default
+    if parsed < 0:
+        logger.warning(
+            "Ignoring LABLINK_SLOW_QUERY_MS=%g (<0); using %g", parsed, default
+        )
+        return default
+    return parsed
+
+
+SLOW_QUERY_MS = _slow_query_ms_from_env(default=250.0)
+
+# Distinct fingerprints kept; anything past this is pooled under OVERFLOW
+# so a query built with inlined values can't grow the table without bound.
+MAX_FINGERPRINTS = 500
+OVERFLOW = "<other statements>"
+_MAX_FINGERPRINT_CHARS = 1000
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER = re.compile(r"%(?:\(\w+\))?s")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_REPEATED_LIST = re.compile(r"\(\?\.\.\.\)(?:\s*,\s*\(\?\.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql) -> str:
+    """Normalize a statement so calls differing only in values group
+    together: literals and placeholders become ``?``, parenthesized value
+    lists ``(?...)``, and runs of such lists (multi-row VALUES) one
+    ``(?...), ...``."""
+    if isinstance(sql, bytes):
+        sql = sql.decode("utf-8", "replace")
+    text = _WHITESPACE.sub(" ", str(sql)).strip()
+    text = _STRING.sub("?", text)
+    text = _PLACEHOLDER.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    text = _LIST.sub("(?...)", text)
+    text = _REPEATED_LIST.sub("(?...), ...", text)
+    return text[:_MAX_FINGERPRINT_CHARS]
+
+
+class QueryStats:
+    """Thread-safe table of calls, time and rows per fingerprint."""
+
+    def __init__(self, max_fingerprints: int = MAX_FINGERPRINTS):
+        self.max_fingerprints = max_fingerprints
+        self._lock = threading.Lock()
+        self._stats: dict[str, list] = {}
+        self.since = time.time()
+
+    def record(self, fp: str, seconds: float, rows: int, failed: bool) -> None:
+        with self._lock:
+            entry = self._stats.get(fp)
+            if entry is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    fp = OVERFLOW
+                    entry = self._stats.get(fp)
+                if entry is None:
+                    # [calls, total seconds, max seconds, rows, errors]
+                    entry = self._stats[fp] = [0, 0.0, 0.0, 0, 0]
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+            entry[3] += rows
+            entry[4] += int(failed)
+
+    def top(self, limit: int = 50) -> list[dict]:
+        """Fingerprints ordered by total time, heaviest first."""
+        with self._lock:
+            items = [(fp, list(entry)) for fp, entry in self._stats.items()]
+        items.sort(key=lambda item: item[1][1], reverse=True)
+        return [
+            {
+                "fingerprint": fp,
+                "calls": calls,
+                "total_ms": total * 1000,
+                "mean_ms": total * 1000 / calls,
+                "max_ms": peak * 1000,
+                "rows": rows,
+                "errors": errors,
+            }
+            for fp, (calls, total, peak, rows, errors) in items[:limit]
+        ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self.since = time.time()
+
+
+QUERY_STATS = QueryStats()
+
+# Frames in these files are plumbing, not the caller worth reporting.
+_PLUMBING = (__file__, os.path.join(os.path.dirname(__file__), "pool.py"))
+
+
+def _call_site() -> str:
+    """First frame outside the cursor plumbing: where the statement was
+    issued from. Walks the stack, so it is only computed for statements
+    that get reported: slow ones, and every one inside a trace."""
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code.co_filename in _PLUMBING:
+        frame = frame.f_back
+    if frame is None:
+        return "unknown"
+    filename = frame.f_code.co_filename
+    _, sep, tail = filename.rpartition("lablink_allocator_service" + os.sep)
+    return f"{tail if sep else filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+
+
+class TimedCursor:
+    """Wraps a psycopg2 cursor, timing execute/executemany into
+    QUERY_STATS. Every other attribute passes straight through."""
+
+    def __init__(self, cursor, stats: QueryStats = QUERY_STATS):
+        self._cursor = cursor
+        self._stats = stats
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    # Arguments are forwarded exactly as given, so the wrapped cursor sees
+    # the same call it would have without the wrapper.
+    def execute(self, query, *args, **kwargs):
+        return self._timed(self._cursor.execute, query, *args, **kwargs)
+
+    def executemany(self, query, *args, **kwargs):
+        return self._timed(self._cursor.executemany, query, *args, **kwargs)
+
+    def _timed(self, method, query, *args, **kwargs):
+        started = time.perf_counter()
+        traced_from = time.time_ns() if TRACER.active() else None
+        failed = True
+        try:
+            result = method(query, *args, **kwargs)
+            failed = False
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            rows = self._cursor.rowcount
+            # rowcount is -1 when psycopg2 can't tell (and after errors).
+            rows = rows if isinstance(rows, int) and rows > 0 else 0
+            fp = fingerprint(self._sql_text(query))
+            self._stats.record(fp, elapsed, rows, failed)
+            caller = None
+            if traced_from is not None:
+                caller = _call_site()
+                TRACER.record(
+                    f"db {fp.split(' ', 1)[0]}",
+                    traced_from,
+                    time.time_ns(),
+                    error="failed" if failed else None,
+                    **{
+                        "db.statement": fp,
+                        "db.rows": rows,
+                        "code.caller": caller,
+                    },
+                )
+            if elapsed * 1000 >= SLOW_QUERY_MS:
+                logger.warning(
+                    "Slow query: %.0f ms, %d rows%s, at %s: %s",
+                    elapsed * 1000,
+                    rows,
+                    " (failed)" if failed else "",
+                    caller or _call_site(),
+                    fp,
+                )
+
+    def _sql_text(self, query):
+        if isinstance(query, (str, bytes)):
+            return query
+        # psycopg2.sql.Composable needs a real cursor or connection to
+        # render its identifiers.
+        try:
+            return query.as_string(self._cursor)
+        except Exception:
+            return repr(query)
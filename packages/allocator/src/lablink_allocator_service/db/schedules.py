@@ -1,8 +1,9 @@
-"""Persistence for the scheduled_destructions table.
+"""Persistence for the scheduled_destructions and scheduled_launches tables.
 
-A standalone table: no foreign key to, and no shared columns with, the VM
-table. The scheduled *job* clears VM rows (see scheduler.py), but that is
-job behavior, not schema coupling — this class touches only its own table.
+Standalone tables: no foreign key to, and no shared columns with, the VM
+table. The scheduled *jobs* clear or add VM rows (see scheduler.py), but
+that is job behavior, not schema coupling — this class touches only its
+own tables.
 
 Shares the connection pool with the other classes in this package (see
 db.pool.make_pool) rather than opening a second one, since POOL_MAX_SIZE is
@@ -39,6 +40,40 @@ _SCHEDULE_COLUMNS = (
     "updated_at",
 )
 
+# Same contract for scheduled_launches (see generate_init_sql.py and
+# ensure_scheduled_launches_table below, which must agree).
+_LAUNCH_COLUMNS = (
+    "id",
+    "schedule_name",
+    "ready_by",
+    "target_seats",
+    "launch_time",
+    "lead_seconds",
+    "created_by",
+    "status",
+    "execution_count",
+    "last_execution_time",
+    "last_execution_result",
+    "created_at",
+)
+
+_CREATE_SCHEDULED_LAUNCHES = """
+    CREATE TABLE IF NOT EXISTS scheduled_launches (
+        id SERIAL PRIMARY KEY,
+        schedule_name VARCHAR(255) NOT NULL UNIQUE,
+        ready_by TIMESTAMP NOT NULL,
+        target_seats INTEGER NOT NULL,
+        launch_time TIMESTAMP NOT NULL,
+        lead_seconds INTEGER NOT NULL,
+        created_by VARCHAR(255),
+        status VARCHAR(50) NOT NULL DEFAULT 'scheduled',
+        execution_count INTEGER DEFAULT 0,
+        last_execution_time TIMESTAMP,
+        last_execution_result TEXT,
+        created_at TIMESTAMP DEFAULT NOW()
+    );
+"""
+
 
 def _naive_utc(dt: datetime) -> datetime:
     """Convert a datetime to naive UTC.
@@ -201,3 +236,127 @@ class ScheduleDatabase:
         )
         with self._cursor as cursor:
             cursor.execute(query, (schedule_id,))
+
+    def ensure_scheduled_launches_table(self) -> None:
+        """Create scheduled_launches on deployments initialized before it
+        existed."""
+        with self._cursor as cursor:
+            try:
+                cursor.execute(_CREATE_SCHEDULED_LAUNCHES)
+            except Exception as e:
+                logger.error(f"Failed to create scheduled_launches: {e}")
+
+    def create_scheduled_launch(
+        self,
+        schedule_name: str,
+        ready_by: datetime,
+        target_seats: int,
+        launch_time: datetime,
+        lead_seconds: int,
+        created_by: str = None,
+    ) -> int:
+        """Create a scheduled launch entry and return its ID.
+
+        Raises:
+            ValueError: If a schedule with the same name already exists
+            RuntimeError: If database operation fails
+        """
+        query = """
+            INSERT INTO scheduled_launches
+            (schedule_name, ready_by, target_seats, launch_time,
+            lead_seconds, created_by, status)
+            VALUES (%s, %s, %s, %s, %s, %s, 'scheduled')
+            RETURNING id;
+        """
+        with self._cursor as cursor:
+            try:
+                cursor.execute(
+                    query,
+                    (
+                        schedule_name,
+                        _naive_utc(ready_by),
+                        target_seats,
+                        _naive_utc(launch_time),
+                        lead_seconds,
+                        created_by,
+                    ),
+                )
+                launch_id = cursor.fetchone()[0]
+                logger.info(
+                    f"Created scheduled launch '{schedule_name}' "
+                    f"(ID: {launch_id})"
+                )
+                return launch_id
+
+            except psycopg2.IntegrityError as e:
+                error_msg = f"Schedule '{schedule_name}' already exists"
+                logger.warning(error_msg)
+                raise ValueError(error_msg) from e
+
+            except Exception as e:
+                logger.error(
+                    f"Failed to create scheduled launch "
+                    f"'{schedule_name}': {e}"
+                )
+                raise RuntimeError(
+                    f"Failed to create scheduled launch: {e}"
+                ) from e
+
+    def get_scheduled_launch(self, schedule_id: int) -> Optional[dict]:
+        """Get scheduled launch by ID."""
+        query = (
+            f"SELECT {', '.join(_LAUNCH_COLUMNS)} "
+            f"FROM scheduled_launches WHERE id = %s;"
+        )
+        with self._cursor as cursor:
+            cursor.execute(query, (schedule_id,))
+            row = cursor.fetchone()
+        if row:
+            return dict(zip(_LAUNCH_COLUMNS, row))
+        return None
+
+    def get_all_scheduled_launches(
+        self, status: Optional[str] = None
+    ) -> List[dict]:
+        """Get all scheduled launches, optionally filtered by status."""
+        query = f"SELECT {', '.join(_LAUNCH_COLUMNS)} FROM scheduled_launches"
+        with self._cursor as cursor:
+            if status:
+                cursor.execute(
+                    query + " WHERE status = %s ORDER BY ready_by;", (status,)
+                )
+            else:
+                cursor.execute(query + " ORDER BY ready_by;")
+            return [
+                dict(zip(_LAUNCH_COLUMNS, row))
+                for row in cursor.fetchall()
+            ]
+
+    def update_scheduled_launch_status(
+        self,
+        schedule_id: int,
+        status: str,
+        execution_result: Optional[str] = None,
+    ) -> None:
+        """Update launch execution status."""
+        query = """
+            UPDATE scheduled_launches
+            SET status = %s,
+                execution_count = execution_count + 1,
+                last_execution_time = NOW(),
+                last_execution_result = %s
+            WHERE id = %s;
+        """
+        with self._cursor as cursor:
+            cursor.execute(
+                query, (status, execution_result, schedule_id)
+            )
+
+    def cancel_scheduled_launch(self, schedule_id: int) -> None:
+        """Cancel a scheduled launch."""
+        query = (
+            "UPDATE scheduled_launches "
+            "SET status = 'cancelled' WHERE id = %s;"
+        )
+        with self._cursor as cursor:
+            cursor.execute(query, (schedule_id,))
@@ -26,6 +26,70 @@ from lablink_allocator_service.secret_hash import (
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# How long a background credential staging keeps its seat away from
+# assign_vm. Covers _post_rotate's worst case (two 5 s attempts and the
+# backoff) with room to spare; a lease older than this is abandoned.
+STAGING_LEASE_SECONDS = 30
+
+# Seat placement policies: how assign_vm and preassign_seats rank the free
+# seats they may claim, as an ORDER BY fragment evaluated inside the claim
+# statement. Staged seats always come first (see assign_vm). Must stay in
+# sync with VALID_PLACEMENT_POLICIES in validate_config.py.
+PLACEMENT_POLICIES = {
+    # Lowest hostname first: predictable, and the cheapest ranking.
+    "hostname": "hostname",
+    # Any eligible seat. Concurrent claims rarely meet on a row, but every
+    # claim sorts the whole free pool, which costs more than SKIP LOCKED
+    # saves (see benchmarks/seat_contention.py).
+    "random": "random()",
+    # Hosts whose GPU check found a GPU first.
+    "gpu": "gpu_present IS NOT TRUE, hostname",
+    # Most free disk first; hosts that never reported last.
+    "disk": "disk_free_pct DESC NULLS LAST, hostname",
+    # Fewest recovery reboots, then fastest startup.
+    "stable": (
+        "COALESCE(reboot_count, 0), "
+        "totalstartupdurationseconds NULLS LAST, hostname"
+    ),
+}
+DEFAULT_PLACEMENT_POLICY = "hostname"
+
+# Startup phases reported by get_startup_report, in display order, with the
+# VM-table column each one reads.
+STARTUP_PHASES = (
+    ("tofu_apply", "TofuApplyDurationSeconds"),
+    ("cloud_init", "CloudInitDurationSeconds"),
+    ("container", "ContainerStartupDurationSeconds"),
+    ("total", "TotalStartupDurationSeconds"),
+)
+
+# A host is a startup outlier in a phase when it is past the Tukey fence
+# (p75 + 1.5 * IQR) of its launch and at least this many seconds slower
+# than the launch's median, so a tight launch does not flag hosts over a
+# few seconds of jitter. Launches with fewer hosts than
+# STARTUP_OUTLIER_MIN_HOSTS are too small to call anything an outlier.
+STARTUP_OUTLIER_MIN_SECONDS = 10
+STARTUP_OUTLIER_MIN_HOSTS = 4
+
+# Minutes a running VM may go without a heartbeat before get_failed_vms
+# hands it to the auto-reboot service. The report cadence keeps the
+# heartbeat interval well inside it (see cadence.py).
+STALE_HEARTBEAT_MINUTES = 3
+
+# Runs of preassign_seats' statement before a unique violation (a student
+# seated by their own join mid-statement) is given up on.
+PREASSIGN_ATTEMPTS = 3
+
+
+class SeatNotReady(Exception):
+    """Raised by assign_vm when the email already holds a seat that isn't
+    running (rebooting, initializing), so no other seat is claimed."""
+
+    def __init__(self, hostname: str, status: Optional[str]):
+        self.hostname = hostname
+        self.status = status
+        super().__init__(f"Seat '{hostname}' is {status}")
+
 
 class VmDatabase:
     """Persistence for the VM table: rows, client registration and auth,
@@ -46,6 +110,7 @@ class VmDatabase:
         pool_min_size: int = POOL_MIN_SIZE,
         pool_max_size: int = POOL_MAX_SIZE,
         pool=None,
+        placement_policy: str = DEFAULT_PLACEMENT_POLICY,
     ):
         """Initialize the database connection pool.
 
@@ -76,17 +141,25 @@ class VmDatabase:
                 consumers that share one pool across several instances —
                 without this, garbage-collecting any one of them would
                 close the pool out from under the others.
+            placement_policy (str): Which free seat a claim takes; a key
+                of PLACEMENT_POLICIES. Defaults to "hostname".
 
         Raises:
             ValueError: If pool sizing is invalid and `pool` was not
-                provided.
+                provided, or `placement_policy` is unknown.
         """
+        if placement_policy not in PLACEMENT_POLICIES:
+            raise ValueError(
+                f"Unknown placement policy '{placement_policy}'; expected "
+                f"one of: {', '.join(PLACEMENT_POLICIES)}"
+            )
         self.dbname = dbname
         self.user = user
         self.password = password
         self.host = host
         self.port = port
         self.table_name = table_name
+        self.placement_policy = placement_policy
 
         if pool is not None:
             self._pool = pool
@@ -120,6 +193,10 @@ class VmDatabase:
         """
         return PooledCursor(self._pool)
 
+    @property
+    def _placement_order(self) -> str:
+        return PLACEMENT_POLICIES[self.placement_policy]
+
     @property
     def pool(self):
         """The underlying connection pool, shared with other classes that
@@ -562,6 +639,95 @@ class VmDatabase:
             logger.error(f"Failed to retrieve unassigned VMs: {e}")
             return []
 
+    def count_starting_vms(self) -> int:
+        """Count unassigned VMs that are on their way to becoming free
+        seats: still initializing, or rebooting (which includes warm spares
+        just started).
+
+        Returns:
+            int: the number of such VMs (0 if the query failed).
+        """
+        query = (
+            f"SELECT COUNT(*) FROM {self.table_name} WHERE "
+            f"useremail IS NULL AND status IN ('initializing', 'rebooting') "
+            f"AND adminreservedat IS NULL"
+        )
+        try:
+            with self._cursor as cursor:
+                cursor.execute(query)
+                return cursor.fetchone()[0]
+        except Exception as e:
+            logger.error(f"Failed to count starting VMs: {e}")
+            return 0
+
+    def get_fleet_counts(self) -> dict:
+        """Count VMs by status and seats by state, in one pass.
+
+        Returns:
+            dict: ``{"status": {status: n}, "free": n, "assigned": n,
+            "unhealthy": n}``. "free" counts seats ``assign_vm`` could hand
+            out now.
+        """
+        query = (
+            f"SELECT COALESCE(status, 'unknown'), COUNT(*), "
+            f"COUNT(*) FILTER (WHERE useremail IS NULL "
+            f"AND status = 'running' AND adminreservedat IS NULL "
+            f"AND (healthy IS NULL OR healthy <> 'Unhealthy')), "
+            f"COUNT(*) FILTER (WHERE useremail IS NOT NULL), "
+            f"COUNT(*) FILTER (WHERE healthy = 'Unhealthy') "
+            f"FROM {self.table_name} GROUP BY 1"
+        )
+        counts = {"status": {}, "free": 0, "assigned": 0, "unhealthy": 0}
+        with self._cursor as cursor:
+            cursor.execute(query)
+            for status, total, free, assigned, unhealthy in cursor.fetchall():
+                counts["status"][status] = total
+                counts["free"] += free
+                counts["assigned"] += assigned
+                counts["unhealthy"] += unhealthy
+        return counts
+
+    def get_statement_stats(self, limit: int = 20) -> list[dict] | None:
+        """Top statements by total execution time from pg_stat_statements.
+
+        The extension is optional: it needs ``shared_preload_libraries`` and
+        ``CREATE EXTENSION pg_stat_statements``, which the stock image does
+        not do.
+
+        Args:
+            limit (int): Maximum number of statements to return.
+
+        Returns:
+            list[dict] | None: Rows with ``query``, ``calls``, ``total_ms``,
+            ``mean_ms`` and ``rows``, heaviest first, or None when the
+            extension is not installed in this database.
+        """
+        with self._cursor as cursor:
+            cursor.execute(
+                "SELECT EXISTS (SELECT 1 FROM pg_extension "
+                "WHERE extname = 'pg_stat_statements')"
+            )
+            if not cursor.fetchone()[0]:
+                return None
+            cursor.execute(
+                "SELECT query, calls, total_exec_time, mean_exec_time, rows "
+                "FROM pg_stat_statements "
+                "WHERE dbid = (SELECT oid FROM pg_database "
+                "WHERE datname = current_database()) "
+                "ORDER BY total_exec_time DESC LIMIT %s",
+                (limit,),
+            )
+            return [
+                {
+                    "query": query,
+                    "calls": calls,
+                    "total_ms": total_ms,
+                    "mean_ms": mean_ms,
+                    "rows": rows,
+                }
+                for query, calls, total_ms, mean_ms, rows in cursor.fetchall()
+            ]
+
     def vm_exists(self, hostname) -> bool:
         """Check if a VM with the given hostname exists in the table.
 
@@ -599,14 +765,17 @@ class VmDatabase:
             email: The student's email address.
 
         Returns:
-            A dict with hostname, status, reboot_count if an assignment
-            exists, or None if the email has no VM.
+            A dict with hostname, status, reboot_count and
+            ``session_started`` (False for a roster pre-assignment the
+            student hasn't joined yet) if an assignment exists, or None if
+            the email has no VM.
 
         Raises:
             Exception: on DB connection or query failure.
         """
         query = f"""
-            SELECT hostname, status, COALESCE(reboot_count, 0)
+            SELECT hostname, status, COALESCE(reboot_count, 0),
+                   sessionid IS NOT NULL
             FROM {self.table_name}
             WHERE useremail = %s
             LIMIT 1;
@@ -621,6 +790,7 @@ class VmDatabase:
                 "hostname": row[0],
                 "status": row[1],
                 "reboot_count": row[2],
+                "session_started": row[3],
             }
         except Exception as e:
             logger.error(
@@ -628,6 +798,23 @@ class VmDatabase:
             )
             raise
 
+    def _held_seats(self, email: str) -> str:
+        """SELECT of the seats `email` holds, for use as a subquery.
+
+        A seat is held whatever its status: a rebooting or initializing
+        VM stays its student's. Draining rows never carry an email and a
+        destroyed VM's row is deleted. The ``<table>_useremail_idx``
+        partial unique index (see ``ensure_seat_index``) keeps it to one
+        row per email.
+
+        Args:
+            email: SQL for the email, e.g. a ``%s`` placeholder.
+        """
+        return (
+            f"SELECT hostname, status FROM {self.table_name} "
+            f"WHERE useremail = {email}"
+        )
+
     def assign_vm(self, email) -> str:
         """Atomically claim an available VM for a user and return its hostname.
 
@@ -642,35 +829,67 @@ class VmDatabase:
         failed, etc.) isn't handed to the next student to wedge in turn —
         the reboot service picks it back up.
 
+        Prefers seats with a staged credential, so the session can start
+        without an agent round-trip, and skips seats whose credential is
+        being staged right now (see ``claim_unstaged_seat``). Among the
+        rest, the placement policy picks (see PLACEMENT_POLICIES).
+
+        One seat per email: if `email` already holds one (see
+        ``_held_seats``), nothing is claimed and that seat's hostname is
+        returned if it is running. Two claims for the same email that both
+        miss the held seat are settled by the useremail unique index: the
+        second fails, and the seat the first one claimed is read back.
+
         Args:
             email (str): The email of the user.
 
         Returns:
-            str: The hostname of the claimed VM.
+            str: The hostname of the claimed (or already held) VM.
 
         Raises:
             ValueError: If no VM is available to assign.
+            SeatNotReady: If `email` holds a seat that isn't running (e.g.
+                rebooting). The caller should have the student wait for it
+                rather than start a session or claim another.
         """
         query = f"""
-        UPDATE {self.table_name}
-        SET useremail = %s,
-            inuse = FALSE
-        WHERE hostname = (
-            SELECT hostname FROM {self.table_name}
-            WHERE useremail IS NULL
-            AND status = 'running'
-            AND (healthy IS NULL OR healthy <> 'Unhealthy')
-            AND adminreservedat IS NULL
-            ORDER BY hostname
-            FOR UPDATE SKIP LOCKED
+        WITH held AS (
+            {self._held_seats("%s")}
             LIMIT 1
+        ), claimed AS (
+            UPDATE {self.table_name}
+            SET useremail = %s,
+                inuse = FALSE
+            WHERE NOT EXISTS (SELECT 1 FROM held)
+            AND hostname = (
+                SELECT hostname FROM {self.table_name}
+                WHERE useremail IS NULL
+                AND status = 'running'
+                AND (healthy IS NULL OR healthy <> 'Unhealthy')
+                AND adminreservedat IS NULL
+                AND (stagingat IS NULL
+                     OR stagingat < NOW() - INTERVAL '{STAGING_LEASE_SECONDS} seconds')
+                ORDER BY stagedvncpassword IS NULL, {self._placement_order}
+                FOR UPDATE SKIP LOCKED
+                LIMIT 1
+            )
+            RETURNING hostname, status
         )
-        RETURNING hostname;
+        SELECT hostname, status, FALSE FROM claimed
+        UNION ALL
+        SELECT hostname, status, TRUE FROM held;
         """
         with self._cursor as cursor:
             try:
-                cursor.execute(query, (email,))
+                cursor.execute(query, (email, email))
                 row = cursor.fetchone()
+            except psycopg2.IntegrityError:
+                # A concurrent claim for the same email committed first;
+                # hand back the seat it took.
+                logger.info(f"Concurrent claim for '{email}'; re-reading it")
+                cursor.execute(f"{self._held_seats('%s')} LIMIT 1", (email,))
+                held = cursor.fetchone()
+                row = None if held is None else (*held, True)
             except Exception as e:
                 logger.error(f"Failed to assign VM to '{email}': {e}")
                 raise
@@ -679,16 +898,142 @@ class VmDatabase:
             logger.warning("No available VMs to assign")
             raise ValueError("No available VMs to assign.")
 
-        hostname = row[0]
-        logger.info(f"Assigned VM '{hostname}' to user '{email}'")
+        hostname, status, already_held = row
+        if already_held:
+            logger.info(f"User '{email}' already holds VM '{hostname}'")
+            if status != "running":
+                raise SeatNotReady(hostname, status)
+        else:
+            logger.info(f"Assigned VM '{hostname}' to user '{email}'")
         return hostname
 
+    def preassign_seats(self, emails: list[str]) -> dict:
+        """Bind a roster of emails to free seats in one statement.
+
+        Pairs the n-th roster email without a seat with the n-th free seat,
+        picked and locked the same way ``assign_vm`` picks one (staged
+        seats first, then the placement policy, ``FOR UPDATE SKIP
+        LOCKED``), so a roster upload racing
+        students' own requests never hands a seat out twice. Duplicate
+        emails and emails that already hold a seat (see ``_held_seats``)
+        are skipped. When the roster is longer than the free pool, the
+        emails past the end stay unseated.
+
+        A student whose own join lands between this statement's snapshot
+        and its update trips the useremail unique index; the statement is
+        then run again, and that student is skipped as already seated.
+
+        Args:
+            emails: Normalized email addresses, in roster order.
+
+        Returns:
+            dict: email -> hostname for every email seated by this call.
+        """
+        if not emails:
+            return {}
+        query = f"""
+            WITH roster AS (
+                SELECT email, MIN(ord) AS ord
+                FROM unnest(%s::text[]) WITH ORDINALITY AS r(email, ord)
+                WHERE NOT EXISTS ({self._held_seats("r.email")})
+                GROUP BY email
+            ), pending AS (
+                SELECT email, row_number() OVER (ORDER BY ord) AS n
+                FROM roster
+            ), free AS (
+                -- Numbered in the order the seats were picked, so the
+                -- first roster email gets the most preferred seat. FOR
+                -- UPDATE rules out the window function in the subquery.
+                SELECT hostname,
+                       row_number() OVER (
+                           ORDER BY stagedvncpassword IS NULL,
+                                    {self._placement_order}
+                       ) AS n
+                FROM (
+                    SELECT *
+                    FROM {self.table_name}
+                    WHERE useremail IS NULL
+                    AND status = 'running'
+                    AND (healthy IS NULL OR healthy <> 'Unhealthy')
+                    AND adminreservedat IS NULL
+                    AND (stagingat IS NULL
+                         OR stagingat
+                         < NOW() - INTERVAL '{STAGING_LEASE_SECONDS} seconds')
+                    ORDER BY stagedvncpassword IS NULL,
+                             {self._placement_order}
+                    LIMIT (SELECT COUNT(*) FROM pending)
+                    FOR UPDATE SKIP LOCKED
+                ) locked
+            )
+            UPDATE {self.table_name}
+            SET useremail = pending.email,
+                inuse = FALSE
+            FROM free JOIN pending USING (n)
+            WHERE {self.table_name}.hostname = free.hostname
+            RETURNING pending.email, {self.table_name}.hostname;
+        """
+        for attempt in range(PREASSIGN_ATTEMPTS):
+            with self._cursor as cursor:
+                try:
+                    cursor.execute(query, (list(emails),))
+                    rows = cursor.fetchall()
+                    break
+                except psycopg2.IntegrityError as e:
+                    if attempt + 1 == PREASSIGN_ATTEMPTS:
+                        logger.error(f"Failed to pre-assign roster seats: {e}")
+                        raise
+                    logger.info("A roster email was seated concurrently; retrying")
+                except Exception as e:
+                    logger.error(f"Failed to pre-assign roster seats: {e}")
+                    raise
+
+        seated = {row[0]: row[1] for row in rows}
+        logger.info(f"Pre-assigned {len(seated)} seats from a roster")
+        return seated
+
+    def get_seats_for_emails(self, emails: list[str]) -> dict:
+        """Look up the seats held by a list of emails.
+
+        Args:
+            emails: Normalized email addresses.
+
+        Returns:
+            dict: email -> hostname for every email that holds a seat.
+        """
+        if not emails:
+            return {}
+        query = (
+            f"SELECT useremail, hostname FROM {self.table_name} "
+            f"WHERE useremail = ANY(%s)"
+        )
+        with self._cursor as cursor:
+            cursor.execute(query, (list(emails),))
+            return {row[0]: row[1] for row in cursor.fetchall()}
+
     def release_seat(self, *, hostname: str) -> None:
         """Clear useremail and every per-session column on a VM row,
         returning the seat to the available pool. Also clears
         AdminReservedAt — a no-op for ordinary student releases (already
         NULL there), but what actually frees a VM an admin reserved for
         troubleshooting."""
+        self._release("hostname = %s", (hostname,))
+
+    def release_unclaimed_seat(self, *, hostname: str, email: str) -> bool:
+        """Release a seat handed to `email` that never had a session
+        started on it (the seat queue's unclaimed seats).
+
+        Returns:
+            bool: False, leaving the row alone, when the seat has changed
+                hands or `email` has since started a session on it.
+        """
+        return self._release(
+            "hostname = %s AND useremail = %s AND sessionid IS NULL",
+            (hostname, email),
+        )
+
+    def _release(self, where: str, params: tuple) -> bool:
+        """Clear the assignment and session columns of the rows matching
+        `where`; True if any row was released."""
         query = (
             f"UPDATE {self.table_name} "
             f"SET useremail = NULL, "
@@ -700,10 +1045,11 @@ class VmDatabase:
             f"    browser_credential = NULL, "
             f"    sessionstartedat = NULL, "
             f"    adminreservedat = NULL "
-            f"WHERE hostname = %s"
+            f"WHERE {where}"
         )
         with self._cursor as cursor:
-            cursor.execute(query, (hostname,))
+            cursor.execute(query, params)
+            return cursor.rowcount > 0
 
     def get_session_for_peek(self, hostname: str) -> Optional[dict]:
         """Look up the live session_id for an in-use VM, for admin peek.
@@ -751,6 +1097,9 @@ class VmDatabase:
             f"AND useremail IS NULL "
             f"AND adminreservedat IS NULL "
             f"AND status = 'running' "
+            f"AND (stagingat IS NULL "
+            f"     OR stagingat < NOW() - "
+            f"INTERVAL '{STAGING_LEASE_SECONDS} seconds') "
             f"RETURNING hostname"
         )
         with self._cursor as cursor:
@@ -788,13 +1137,16 @@ class VmDatabase:
     def update_vm_in_use(self, hostname: str, in_use: bool) -> None:
         """Update the in-use status of a VM.
 
+        Starting or quitting the subject software counts as activity for
+        idle-seat reclamation, so LastActivityAt is touched too.
+
         Args:
             hostname (str): The hostname of the VM.
             in_use (bool): The in-use status to set.
         """
         query = (
             f"UPDATE {self.table_name} "
-            f"SET inuse = %s WHERE hostname = %s"
+            f"SET inuse = %s, lastactivityat = NOW() WHERE hostname = %s"
         )
         with self._cursor as cursor:
             try:
@@ -1029,11 +1381,17 @@ class VmDatabase:
             )
             return
 
+        # A client reporting anything but 'running' is (re)starting, and
+        # start.sh reseeds the VNC password, so a staged one is stale.
         query = f"""
         INSERT INTO {self.table_name} (hostname, status)
         VALUES (%s, %s)
         ON CONFLICT (hostname) DO UPDATE
-            SET status = EXCLUDED.status;
+            SET status = EXCLUDED.status,
+                stagedvncpassword = CASE WHEN EXCLUDED.status = 'running'
+                    THEN {self.table_name}.stagedvncpassword END,
+                stagedupstream = CASE WHEN EXCLUDED.status = 'running'
+                    THEN {self.table_name}.stagedupstream END;
         """
         with self._cursor as cursor:
             try:
@@ -1188,6 +1546,135 @@ class VmDatabase:
                 )
                 raise
 
+    def get_startup_duration_percentile(
+        self, fraction: float = 0.9
+    ) -> Optional[float]:
+        """Percentile of TotalStartupDurationSeconds across the VM table.
+
+        Args:
+            fraction: The percentile as a fraction (0.9 for p90).
+
+        Returns:
+            The interpolated percentile in seconds, or None when no VM has
+            reported a startup duration (or the query failed).
+        """
+        query = f"""
+            SELECT percentile_cont(%s) WITHIN GROUP
+                (ORDER BY TotalStartupDurationSeconds)
+            FROM {self.table_name}
+            WHERE TotalStartupDurationSeconds > 0;
+        """
+        try:
+            with self._cursor as cursor:
+                cursor.execute(query, (fraction,))
+                row = cursor.fetchone()
+        except Exception as e:
+            logger.error(f"Failed to compute startup duration percentile: {e}")
+            return None
+        if row is None or row[0] is None:
+            return None
+        return float(row[0])
+
+    def get_startup_report(self, launches: int = 10) -> Optional[List[dict]]:
+        """p50/p90/p99 per startup phase for each recent launch, with the
+        outlier hosts of each.
+
+        A VM belongs to the latest apply operation started at or before
+        its row was created (hostnames are never reused, so CreatedAt is
+        the launch that made it). VMs from before any apply, such as BYO
+        registrations, are grouped under operation_id None. Only VMs
+        with a TotalStartupDurationSeconds are counted.
+
+        Args:
+            launches: How many of the most recent launches to report.
+
+        Returns:
+            Launches newest first, each a dict with operation_id,
+            started_at, finished_at, created_by, num_vms, hosts, phases
+            (phase name -> hosts, p50, p90, p99, max) and outliers
+            (hostname, phase, seconds, fence). None when the query failed.
+        """
+        values = ",\n                    ".join(
+            f"('{phase}', h.{column})" for phase, column in STARTUP_PHASES
+        )
+        columns = ", ".join(f"v.{column}" for _, column in STARTUP_PHASES)
+        with_clause = f"""
+            WITH hosts AS (
+                SELECT v.hostname, op.id AS operation_id, {columns}
+                FROM {self.table_name} v
+                LEFT JOIN LATERAL (
+                    SELECT id FROM operations
+                    WHERE op_type = 'apply' AND started_at <= v.CreatedAt
+                    ORDER BY started_at DESC
+                    LIMIT 1
+                ) op ON TRUE
+                WHERE v.TotalStartupDurationSeconds > 0
+            ),
+            launches AS (
+                SELECT DISTINCT operation_id FROM hosts
+                ORDER BY operation_id DESC NULLS LAST
+                LIMIT %s
+            ),
+            phases AS (
+                SELECT h.operation_id, h.hostname, p.phase, p.seconds
+                FROM hosts h
+                JOIN launches l
+                    ON l.operation_id IS NOT DISTINCT FROM h.operation_id
+                CROSS JOIN LATERAL (VALUES
+                    {values}
+                ) AS p(phase, seconds)
+                WHERE p.seconds IS NOT NULL
+            ),
+            stats AS (
+                SELECT operation_id, phase, COUNT(*) AS host_count,
+                    percentile_cont(0.25) WITHIN GROUP (ORDER BY seconds) AS p25,
+                    percentile_cont(0.5) WITHIN GROUP (ORDER BY seconds) AS p50,
+                    percentile_cont(0.75) WITHIN GROUP (ORDER BY seconds) AS p75,
+                    percentile_cont(0.9) WITHIN GROUP (ORDER BY seconds) AS p90,
+                    percentile_cont(0.99) WITHIN GROUP (ORDER BY seconds) AS p99,
+                    MAX(seconds) AS max_seconds
+                FROM phases
+                GROUP BY operation_id, phase
+            )
+        """
+        stats_query = with_clause + """
+            SELECT s.operation_id, o.started_at, o.finished_at, o.created_by,
+                   o.params, s.phase, s.host_count, s.p50, s.p90, s.p99,
+                   s.max_seconds
+            FROM stats s
+            LEFT JOIN operations o ON o.id = s.operation_id
+            ORDER BY s.operation_id DESC NULLS LAST;
+        """
+        outliers_query = with_clause + """
+            SELECT p.operation_id, p.hostname, p.phase, p.seconds,
+                   GREATEST(s.p75 + 1.5 * (s.p75 - s.p25), s.p50 + %s) AS fence
+            FROM phases p
+            JOIN stats s
+                ON s.operation_id IS NOT DISTINCT FROM p.operation_id
+                AND s.phase = p.phase
+            WHERE s.host_count >= %s
+              AND p.seconds > GREATEST(s.p75 + 1.5 * (s.p75 - s.p25), s.p50 + %s)
+            ORDER BY p.operation_id DESC NULLS LAST, p.seconds DESC;
+        """
+        try:
+            with self._cursor as cursor:
+                cursor.execute(stats_query, (launches,))
+                stat_rows = cursor.fetchall()
+                cursor.execute(
+                    outliers_query,
+                    (
+                        launches,
+                        STARTUP_OUTLIER_MIN_SECONDS,
+                        STARTUP_OUTLIER_MIN_HOSTS,
+                        STARTUP_OUTLIER_MIN_SECONDS,
+                    ),
+                )
+                outlier_rows = cursor.fetchall()
+        except Exception as e:
+            logger.error(f"Failed to compute startup report: {e}")
+            return None
+        return _build_startup_report(stat_rows, outlier_rows)
+
     def ensure_reboot_columns(self) -> None:
         """Add reboot tracking columns to vm_table if they don't exist."""
         columns = {
@@ -1207,6 +1694,258 @@ class VmDatabase:
                         f"Failed to add column {col_name}: {e}"
                     )
 
+    def ensure_idle_columns(self) -> None:
+        """Add idle-seat tracking columns to vm_table if they don't exist."""
+        columns = {
+            "lastactivityat": "TIMESTAMPTZ",
+            "idlewarnedat": "TIMESTAMPTZ",
+        }
+        for col_name, col_type in columns.items():
+            with self._cursor as cursor:
+                try:
+                    cursor.execute(
+                        f"ALTER TABLE {self.table_name} "
+                        f"ADD COLUMN IF NOT EXISTS "
+                        f"{col_name} {col_type};"
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Failed to add column {col_name}: {e}"
+                    )
+
+    def ensure_staging_columns(self) -> None:
+        """Add credential-staging columns to vm_table if they don't exist."""
+        columns = {
+            "stagedvncpassword": "TEXT",
+            "stagedupstream": "TEXT",
+            "stagingat": "TIMESTAMPTZ",
+        }
+        for col_name, col_type in columns.items():
+            with self._cursor as cursor:
+                try:
+                    cursor.execute(
+                        f"ALTER TABLE {self.table_name} "
+                        f"ADD COLUMN IF NOT EXISTS "
+                        f"{col_name} {col_type};"
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Failed to add column {col_name}: {e}"
+                    )
+
+    def ensure_seat_index(self) -> None:
+        """Create the one-seat-per-email unique index if it doesn't exist.
+
+        ``assign_vm`` and ``preassign_seats`` rely on it to settle
+        concurrent claims for the same email. Creating it fails, and is
+        logged, while some email holds two seats; release one and restart.
+        """
+        with self._cursor as cursor:
+            try:
+                cursor.execute(
+                    f"CREATE UNIQUE INDEX IF NOT EXISTS "
+                    f"{self.table_name}_useremail_idx "
+                    f"ON {self.table_name}(useremail) "
+                    f"WHERE useremail IS NOT NULL;"
+                )
+            except Exception as e:
+                logger.error(f"Failed to create the seat index: {e}")
+
+    def claim_unstaged_seat(self, retry_seconds: int = 60) -> Optional[str]:
+        """Take the staging lease on a free seat with no staged credential.
+
+        Sets StagingAt, which keeps ``assign_vm`` and ``admin_reserve_vm``
+        off the seat for STAGING_LEASE_SECONDS while its password is
+        rotated; storing the staged credential clears it. A failed staging
+        leaves it set, so the seat isn't retried for `retry_seconds`.
+
+        Args:
+            retry_seconds: Seconds before a seat whose staging failed is
+                tried again.
+
+        Returns:
+            Optional[str]: The seat's hostname, or None if every free seat
+                is staged (or being staged).
+        """
+        query = f"""
+            UPDATE {self.table_name}
+            SET stagingat = NOW()
+            WHERE hostname = (
+                SELECT hostname FROM {self.table_name}
+                WHERE useremail IS NULL
+                AND status = 'running'
+                AND (healthy IS NULL OR healthy <> 'Unhealthy')
+                AND adminreservedat IS NULL
+                AND stagedvncpassword IS NULL
+                AND (stagingat IS NULL
+                     OR stagingat < NOW() - (%s || ' seconds')::interval)
+                ORDER BY hostname
+                FOR UPDATE SKIP LOCKED
+                LIMIT 1
+            )
+            RETURNING hostname;
+        """
+        with self._cursor as cursor:
+            cursor.execute(query, (max(retry_seconds, STAGING_LEASE_SECONDS),))
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    def claim_unstaged_preassigned_seats(
+        self, hostnames: list[str]
+    ) -> list[str]:
+        """Take the staging lease on pre-assigned seats nobody has joined.
+
+        The roster counterpart of ``claim_unstaged_seat``: the seats
+        already belong to a student, but their session hasn't started, so
+        the password can still be rotated ahead of arrival.
+
+        Args:
+            hostnames: Seats handed out by ``preassign_seats``.
+
+        Returns:
+            list: hostnames claimed, sorted.
+        """
+        if not hostnames:
+            return []
+        query = f"""
+            UPDATE {self.table_name}
+            SET stagingat = NOW()
+            WHERE hostname = ANY(%s)
+            AND useremail IS NOT NULL
+            AND sessionid IS NULL
+            AND status = 'running'
+            AND adminreservedat IS NULL
+            AND stagedvncpassword IS NULL
+            AND (stagingat IS NULL
+                 OR stagingat < NOW() - INTERVAL '{STAGING_LEASE_SECONDS} seconds')
+            RETURNING hostname;
+        """
+        with self._cursor as cursor:
+            cursor.execute(query, (list(hostnames),))
+            return sorted(row[0] for row in cursor.fetchall())
+
+    def get_idle_seats(
+        self, idle_minutes: int, grace_minutes: int
+    ) -> List[dict]:
+        """Get assigned seats nobody has used for `idle_minutes`.
+
+        A seat's last activity is the later of LastActivityAt (the
+        subject software starting or quitting, or session-metrics progress)
+        and SessionStartedAt (the student joining or rejoining). Seats with
+        the subject software open (InUse) never count as idle, nor do
+        admin-reserved ones or roster pre-assignments nobody has joined
+        yet.
+
+        Args:
+            idle_minutes: Minutes without activity before a seat is idle.
+            grace_minutes: Minutes a seat must have been warned before it
+                may be reclaimed.
+
+        Returns:
+            list: Dicts with hostname, useremail, ``warned`` (warned since
+                the last activity) and ``grace_over`` (warned at least
+                grace_minutes ago), ordered by hostname.
+        """
+        query = f"""
+            SELECT hostname, useremail,
+                   COALESCE(idlewarnedat > last_activity, FALSE) AS warned,
+                   COALESCE(
+                       idlewarnedat > last_activity
+                       AND idlewarnedat
+                       < NOW() - (%s || ' minutes')::interval,
+                       FALSE
+                   ) AS grace_over
+            FROM (
+                SELECT hostname, useremail, idlewarnedat,
+                       GREATEST(lastactivityat, sessionstartedat)
+                       AS last_activity
+                FROM {self.table_name}
+                WHERE useremail IS NOT NULL
+                AND sessionstartedat IS NOT NULL
+                AND adminreservedat IS NULL
+                AND status = 'running'
+                AND inuse IS NOT TRUE
+            ) seats
+            WHERE last_activity < NOW() - (%s || ' minutes')::interval
+            ORDER BY hostname;
+        """
+        with self._cursor as cursor:
+            cursor.execute(query, (grace_minutes, idle_minutes))
+            rows = cursor.fetchall()
+        return [
+            {
+                "hostname": row[0],
+                "useremail": row[1],
+                "warned": row[2],
+                "grace_over": row[3],
+            }
+            for row in rows
+        ]
+
+    def mark_idle_warned(self, hostname: str) -> None:
+        """Start the grace period before an idle seat is reclaimed.
+
+        Any activity after this moment cancels the warning.
+
+        Args:
+            hostname: The hostname of the idle VM.
+        """
+        query = (
+            f"UPDATE {self.table_name} "
+            f"SET idlewarnedat = NOW() WHERE hostname = %s"
+        )
+        with self._cursor as cursor:
+            cursor.execute(query, (hostname,))
+
+    def reclaim_idle_seat(
+        self, hostname: str, email: str, grace_minutes: int
+    ) -> bool:
+        """Release an idle seat whose grace period ran out.
+
+        Clears the assignment and every per-session column like
+        ``release_seat``, and marks the VM 'rebooting' so it can't be handed
+        out before it is recycled. The WHERE clause repeats the idle checks,
+        so a student who came back since ``get_idle_seats`` (or a seat that
+        changed hands) is left alone. reboot_count is not touched: this is
+        not a failure.
+
+        Args:
+            hostname: The hostname of the idle VM.
+            email: The student it was idle for.
+            grace_minutes: Minutes the seat must have been warned.
+
+        Returns:
+            bool: True if the seat was released.
+        """
+        query = f"""
+            UPDATE {self.table_name}
+            SET useremail = NULL,
+                sessionid = NULL,
+                browsertoken = NULL,
+                vncpassword = NULL,
+                upstream = NULL,
+                browser_ws_url = NULL,
+                browser_credential = NULL,
+                sessionstartedat = NULL,
+                lastactivityat = NULL,
+                idlewarnedat = NULL,
+                status = 'rebooting',
+                last_reboot_time = NOW()
+            WHERE hostname = %s
+            AND useremail = %s
+            AND adminreservedat IS NULL
+            AND status = 'running'
+            AND inuse IS NOT TRUE
+            AND idlewarnedat < NOW() - (%s || ' minutes')::interval
+            AND idlewarnedat > COALESCE(
+                GREATEST(lastactivityat, sessionstartedat), '-infinity'
+            )
+            RETURNING hostname;
+        """
+        with self._cursor as cursor:
+            cursor.execute(query, (hostname, email, grace_minutes))
+            return cursor.fetchone() is not None
+
     def set_setting(self, key: str, value: str) -> None:
         """UPSERT a row in the settings (key, value) table."""
         with self._cursor as cursor:
@@ -1314,13 +2053,14 @@ class VmDatabase:
         self,
         stale_initializing_minutes: int = 25,
         stale_rebooting_minutes: int = 10,
-        stale_heartbeat_minutes: int = 3,
+        stale_heartbeat_minutes: int = STALE_HEARTBEAT_MINUTES,
     ) -> List[dict]:
         """Get VMs that need a reboot attempt.
 
         Detects VMs in error state, with unhealthy GPUs, stuck initializing,
         stuck in rebooting state (failed to come back after a reboot), or
         running but silent (no heartbeat within the staleness window).
+        Warm spares and VMs draining for a scale-down never match.
 
         Args:
             stale_initializing_minutes: Minutes after which an initializing VM
@@ -1352,7 +2092,7 @@ class VmDatabase:
             FROM {self.table_name}
             WHERE status = 'error'
                OR (healthy = 'Unhealthy'
-                   AND status NOT IN ('rebooting', 'error'))
+                   AND status NOT IN ('rebooting', 'error', 'warm', 'draining'))
                OR (status = 'initializing'
                    AND createdat IS NOT NULL
                    AND createdat < NOW()
@@ -1419,6 +2159,128 @@ class VmDatabase:
                 )
                 raise
 
+    def get_warm_vms(self) -> list:
+        """Get the stopped spare VMs held by the warm pool.
+
+        Returns:
+            list: hostnames of VMs with status 'warm'.
+        """
+        query = (
+            f"SELECT hostname FROM {self.table_name} "
+            f"WHERE status = 'warm' ORDER BY hostname"
+        )
+        try:
+            with self._cursor as cursor:
+                cursor.execute(query)
+                return [row[0] for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Failed to retrieve warm VMs: {e}")
+            return []
+
+    def mark_warm(self, hostnames: list[str]) -> list[str]:
+        """Move idle running VMs into the warm pool.
+
+        Only rows that are still running, unassigned and unreserved are
+        taken, in one statement, so a VM that a student was handed in the
+        meantime is left alone. The caller stops exactly the hostnames
+        returned.
+
+        Args:
+            hostnames: Candidate VMs.
+
+        Returns:
+            list: hostnames now marked 'warm'.
+        """
+        if not hostnames:
+            return []
+        query = f"""
+            UPDATE {self.table_name}
+            SET status = 'warm'
+            WHERE hostname = ANY(%s)
+            AND status = 'running'
+            AND useremail IS NULL
+            AND adminreservedat IS NULL
+            RETURNING hostname;
+        """
+        with self._cursor as cursor:
+            try:
+                cursor.execute(query, (list(hostnames),))
+                return [row[0] for row in cursor.fetchall()]
+            except Exception as e:
+                logger.error(f"Failed to mark VMs warm: {e}")
+                raise
+
+    def claim_warm_vms(self, count: int) -> list[str]:
+        """Atomically take up to `count` spares out of the warm pool.
+
+        Claimed rows go to 'rebooting' with last_reboot_time set, the
+        same state a stop/start recovery leaves behind: start.sh flips
+        them to 'running' once the container is back, and the auto-reboot
+        service's stuck-rebooting check covers a spare that never returns.
+        reboot_count is not touched.
+
+        Args:
+            count: Maximum number of spares to claim.
+
+        Returns:
+            list: hostnames claimed, possibly fewer than `count`.
+        """
+        if count <= 0:
+            return []
+        query = f"""
+            UPDATE {self.table_name}
+            SET status = 'rebooting',
+                last_reboot_time = NOW()
+            WHERE hostname IN (
+                SELECT hostname FROM {self.table_name}
+                WHERE status = 'warm'
+                ORDER BY hostname
+                FOR UPDATE SKIP LOCKED
+                LIMIT %s
+            )
+            RETURNING hostname;
+        """
+        with self._cursor as cursor:
+            try:
+                cursor.execute(query, (count,))
+                return sorted(row[0] for row in cursor.fetchall())
+            except Exception as e:
+                logger.error(f"Failed to claim warm VMs: {e}")
+                raise
+
+    def mark_draining(self, hostnames: list[str]) -> list[str]:
+        """Take idle running VMs out of service ahead of a scale-down.
+
+        Like ``mark_warm``, only rows that are still running, unassigned
+        and unreserved are taken, so a VM a student was handed in the
+        meantime is left alone. The caller destroys exactly the hostnames
+        returned.
+
+        Args:
+            hostnames: Candidate VMs.
+
+        Returns:
+            list: hostnames now marked 'draining'.
+        """
+        if not hostnames:
+            return []
+        query = f"""
+            UPDATE {self.table_name}
+            SET status = 'draining'
+            WHERE hostname = ANY(%s)
+            AND status = 'running'
+            AND useremail IS NULL
+            AND adminreservedat IS NULL
+            RETURNING hostname;
+        """
+        with self._cursor as cursor:
+            try:
+                cursor.execute(query, (list(hostnames),))
+                return sorted(row[0] for row in cursor.fetchall())
+            except Exception as e:
+                logger.error(f"Failed to mark VMs draining: {e}")
+                raise
+
     def release_assignment(self, hostname: str) -> None:
         """Release a VM's student assignment when it is deemed unrecoverable.
 
@@ -1464,3 +2326,51 @@ class VmDatabase:
             except Exception:
                 # Pool may already be closed; nothing to do.
                 pass
+
+
+def _build_startup_report(stat_rows: list, outlier_rows: list) -> List[dict]:
+    """Group get_startup_report's rows into one dict per launch, keeping
+    the query's newest-first order and STARTUP_PHASES order within each."""
+    order = [phase for phase, _ in STARTUP_PHASES]
+    launches: dict = {}
+    for (operation_id, started_at, finished_at, created_by, params,
+         phase, hosts, p50, p90, p99, max_seconds) in stat_rows:
+        launch = launches.get(operation_id)
+        if launch is None:
+            try:
+                num_vms = json.loads(params or "{}").get("num_vms")
+            except (ValueError, AttributeError):
+                num_vms = None
+            launch = launches[operation_id] = {
+                "operation_id": operation_id,
+                "started_at": started_at,
+                "finished_at": finished_at,
+                "created_by": created_by,
+                "num_vms": num_vms,
+                "hosts": 0,
+                "phases": {},
+                "outliers": [],
+            }
+        launch["phases"][phase] = {
+            "hosts": hosts,
+            "p50": round(p50, 1),
+            "p90": round(p90, 1),
+            "p99": round(p99, 1),
+            "max": round(max_seconds, 1),
+        }
+        launch["hosts"] = max(launch["hosts"], hosts)
+    for launch in launches.values():
+        launch["phases"] = {
+            phase: launch["phases"][phase]
+            for phase in order
+            if phase in launch["phases"]
+        }
+    for operation_id, hostname, phase, seconds, fence in outlier_rows:
+        if operation_id in launches:
+            launches[operation_id]["outliers"].append({
+                "hostname": hostname,
+                "phase": phase,
+                "seconds": round(seconds, 1),
+                "fence": round(fence, 1),
+            })
+    return list(launches.values())
@@ -62,6 +62,21 @@ CREATE TRIGGER scheduled_destructions_updated_at
     FOR EACH ROW
     EXECUTE FUNCTION update_scheduled_destructions_updated_at();
 
+CREATE TABLE IF NOT EXISTS scheduled_launches (
+    id SERIAL PRIMARY KEY,
+    schedule_name VARCHAR(255) NOT NULL UNIQUE,
+    ready_by TIMESTAMP NOT NULL,
+    target_seats INTEGER NOT NULL,
+    launch_time TIMESTAMP NOT NULL,
+    lead_seconds INTEGER NOT NULL,
+    created_by VARCHAR(255),
+    status VARCHAR(50) NOT NULL DEFAULT 'scheduled',
+    execution_count INTEGER DEFAULT 0,
+    last_execution_time TIMESTAMP,
+    last_execution_result TEXT,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
 CREATE TABLE IF NOT EXISTS operations (
     id SERIAL PRIMARY KEY,
     op_type VARCHAR(16) NOT NULL,
@@ -113,6 +128,11 @@ CREATE TABLE IF NOT EXISTS {VM_TABLE_NAME} (
     Upstream TEXT,
     SessionStartedAt TIMESTAMPTZ,
     AdminReservedAt TIMESTAMPTZ,
+    LastActivityAt TIMESTAMPTZ,
+    IdleWarnedAt TIMESTAMPTZ,
+    StagedVncPassword TEXT,
+    StagedUpstream TEXT,
+    StagingAt TIMESTAMPTZ,
     machine_identity   TEXT,
     provider           TEXT NOT NULL DEFAULT 'aws',
     endpoint_url       TEXT,
@@ -148,6 +168,10 @@ CREATE UNIQUE INDEX {VM_TABLE_NAME}_session_id_idx
     ON {VM_TABLE_NAME}(SessionId) WHERE SessionId IS NOT NULL;
 CREATE UNIQUE INDEX {VM_TABLE_NAME}_machine_identity_idx
     ON {VM_TABLE_NAME}(machine_identity) WHERE machine_identity IS NOT NULL;
+-- One seat per student: settles concurrent claims for the same email
+-- (see VmDatabase.assign_vm).
+CREATE UNIQUE INDEX {VM_TABLE_NAME}_useremail_idx
+    ON {VM_TABLE_NAME}(UserEmail) WHERE UserEmail IS NOT NULL;
 CREATE INDEX {VM_TABLE_NAME}_provider_idx ON {VM_TABLE_NAME}(provider);
 CREATE INDEX {VM_TABLE_NAME}_assignable_idx
     ON {VM_TABLE_NAME}(status, useremail, last_release_time)
@@ -0,0 +1,128 @@
+"""Idle-seat reclamation.
+
+A seat stays bound to its student until someone releases it, so in an
+oversubscribed workshop a student who wandered off holds a VM others are
+queueing for. This service releases seats nobody has used for
+``idle_reclaim.idle_minutes``.
+
+Activity is the subject software starting or quitting (the client's in-use
+reports), session-metrics progress (GPU time, labeled frames, training
+epochs), and the student joining or rejoining the seat. A seat with the
+subject software open is never idle. The first check that finds a seat idle
+only warns: it logs and records IdleWarnedAt. Any activity in the next
+``grace_minutes`` cancels the warning, including the student asking for a
+seat again, which puts them back on the same VM. After the grace period the
+seat is released and the VM is cold-rebooted through AutoRebootService so
+the next student gets a fresh container, then the seat queue is told a seat
+may be coming free.
+"""
+
+import logging
+from threading import Event, Thread
+
+from lablink_allocator_service.db.vms import VmDatabase
+from lablink_allocator_service.instrumentation import timed_iteration
+
+logger = logging.getLogger(__name__)
+
+
+class IdleReclaimService:
+    """Background service that releases seats left idle.
+
+    Args:
+        database: VmDatabase instance for querying/updating VM state.
+        reboot_service: AutoRebootService used to recycle released VMs. If
+            it is None, or the provider can't reboot hosts, the VM goes
+            straight back to the pool.
+        seat_queue: SeatQueue to notify when a seat is released, if one is
+            running.
+        idle_minutes: Minutes without activity before a seat is warned.
+        grace_minutes: Minutes between the warning and the release.
+        check_interval_seconds: How often to look for idle seats.
+    """
+
+    def __init__(
+        self,
+        database: VmDatabase,
+        reboot_service=None,
+        seat_queue=None,
+        idle_minutes: int = 30,
+        grace_minutes: int = 5,
+        check_interval_seconds: int = 60,
+    ):
+        self.database = database
+        self.reboot_service = reboot_service
+        self.seat_queue = seat_queue
+        self.idle_minutes = idle_minutes
+        self.grace_minutes = grace_minutes
+        self.check_interval_seconds = check_interval_seconds
+        self._stop_event = Event()
+        self._thread = None
+
+    def start(self):
+        """Start the idle-seat monitoring thread."""
+        self.database.ensure_idle_columns()
+        self._stop_event.clear()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+        logger.info(
+            f"Idle-seat reclamation started (idle={self.idle_minutes}m, "
+            f"grace={self.grace_minutes}m, "
+            f"interval={self.check_interval_seconds}s)"
+        )
+
+    def stop(self):
+        """Stop the idle-seat monitoring thread."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+        logger.info("Idle-seat reclamation stopped")
+
+    def _run(self):
+        """Main loop that periodically checks for idle seats."""
+        while not self._stop_event.is_set():
+            try:
+                with timed_iteration("idle_reclaim"):
+                    self._check()
+            except Exception as e:
+                logger.error(f"Error in idle-seat check: {e}", exc_info=True)
+            self._stop_event.wait(self.check_interval_seconds)
+
+    def _check(self):
+        seats = self.database.get_idle_seats(
+            self.idle_minutes, self.grace_minutes
+        )
+        for seat in seats:
+            hostname = seat["hostname"]
+            if not seat["warned"]:
+                self.database.mark_idle_warned(hostname)
+                logger.warning(
+                    f"Seat '{hostname}' held by '{seat['useremail']}' has "
+                    f"been idle for {self.idle_minutes} minutes; releasing "
+                    f"it in {self.grace_minutes} minutes unless it is used"
+                )
+            elif seat["grace_over"]:
+                self._reclaim(hostname, seat["useremail"])
+
+    def _reclaim(self, hostname: str, email: str):
+        if not self.database.reclaim_idle_seat(
+            hostname, email, self.grace_minutes
+        ):
+            # The student came back (or the seat changed hands) since the
+            # check; leave it alone.
+            return
+        logger.info(f"Released idle seat '{hostname}' held by '{email}'")
+
+        recycled = False
+        if self.reboot_service is not None:
+            try:
+                recycled = self.reboot_service.recycle(hostname)
+            except Exception as e:
+                logger.error(f"Failed to recycle VM '{hostname}': {e}")
+        if not recycled:
+            # Nothing will bring the VM back from 'rebooting', so hand it
+            # out as it is rather than lose the seat.
+            self.database.update_vm_status(hostname, "running")
+
+        if self.seat_queue is not None:
+            self.seat_queue.notify()
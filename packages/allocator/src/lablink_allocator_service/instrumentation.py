@@ -0,0 +1,258 @@
+"""In-process metrics, rendered in the Prometheus text format by /metrics.
+
+A deliberately small registry (counters, gauges, histograms with labels)
+rather than a client-library dependency: the allocator only needs to
+count and time a handful of things and print them. Code that wants to be
+measured imports the instruments below and updates them; values that are
+cheaper to read at scrape time than to maintain (pool usage, cache sizes,
+fleet counts) are supplied by collectors registered with
+``REGISTRY.add_collector`` (see routes/prometheus.py).
+
+Nothing here imports Flask or psycopg2, so any module can use it.
+"""
+
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds, spanning a cache hit to a long poll.
+DEFAULT_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60,
+)
+
+
+def _escape(value) -> str:
+    return (
+        str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    )
+
+
+def _format_labels(names, values, extra=()) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in (*zip(names, values), *extra)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple, object] = {}
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key, value) -> list[str]:
+        labels = _format_labels(self.labelnames, key)
+        return [f"{self.name}{labels} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def set(self, value: float, **labels) -> None:
+        """Set the value outright: a gauge reading, or a counter mirrored
+        at scrape time from a total kept elsewhere."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                # [per-bucket counts..., sum, count]
+                entry = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[i] += 1
+                    break
+            entry[-2] += value
+            entry[-1] += 1
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return entry[-1] if entry else 0
+
+    def sum(self, **labels) -> float:
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return entry[-2] if entry else 0.0
+
+    def _render_sample(self, key, entry) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, n in zip(self.buckets, entry):
+            cumulative += n
+            labels = _format_labels(
+                self.labelnames, key, (("le", _format_value(bound)),)
+            )
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key, (("le", "+Inf"),))
+        lines.append(f"{self.name}_bucket{labels} {entry[-1]}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(entry[-2])}")
+        lines.append(f"{self.name}_count{labels} {entry[-1]}")
+        return lines
+
+
+class Registry:
+    """Holds every metric and scrape-time collector."""
+
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+        self._collectors: list = []
+
+    def counter(self, name, help, labelnames=()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name, help, labelnames=()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collect) -> None:
+        """Register `collect()`, called on every scrape to refresh gauges
+        whose values are read rather than maintained. A collector that
+        raises is skipped; its gauges keep their last values."""
+        self._collectors.append(collect)
+
+    def render(self) -> str:
+        for collect in self._collectors:
+            try:
+                collect()
+            except Exception:
+                logger.warning("Metrics collector failed", exc_info=True)
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "lablink_http_requests_total",
+    "HTTP requests handled, by route, method and status code.",
+    ("endpoint", "method", "status"),
+)
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "lablink_http_request_duration_seconds",
+    "Time spent handling HTTP requests, by route.",
+    ("endpoint",),
+)
+POOL_CHECKOUT_SECONDS = REGISTRY.histogram(
+    "lablink_db_pool_checkout_seconds",
+    "Time taken to check a connection out of the pool.",
+)
+POOL_WAITING = REGISTRY.gauge(
+    "lablink_db_pool_waiting",
+    "Threads currently waiting to check out a pooled connection.",
+)
+POOL_EXHAUSTED = REGISTRY.counter(
+    "lablink_db_pool_exhausted_total",
+    "Checkouts refused because every pooled connection was in use.",
+)
+ARGON2_VERIFY_SECONDS = REGISTRY.histogram(
+    "lablink_argon2_verify_duration_seconds",
+    "argon2 secret verifications (uncached), by outcome.",
+    ("result",),
+)
+LOOP_SECONDS = REGISTRY.histogram(
+    "lablink_background_iteration_duration_seconds",
+    "Duration of one background-loop iteration or scheduled job.",
+    ("loop", "outcome"),
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 1800),
+)
+OPERATIONS_ACTIVE = REGISTRY.gauge(
+    "lablink_operations_active",
+    "Apply/destroy operations currently running in this process.",
+)
+OPERATION_SECONDS = REGISTRY.histogram(
+    "lablink_operation_duration_seconds",
+    "Duration of finished apply/destroy operations.",
+    ("type", "status"),
+    buckets=(1, 10, 30, 60, 120, 300, 600, 900, 1800, 3600),
+)
+
+
+@contextmanager
+def timed_iteration(loop: str):
+    """Time one iteration of a background loop into LOOP_SECONDS.
+
+    Usage::
+
+        with timed_iteration("reboot"):
+            self._check_and_reboot()
+
+    Also works as a decorator, timing each call (scheduled jobs).
+    """
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        LOOP_SECONDS.observe(
+            time.perf_counter() - started, loop=loop, outcome=outcome
+        )
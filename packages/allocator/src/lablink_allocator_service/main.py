@@ -1,3 +1,4 @@
+import functools
 import os
 import logging
 import secrets
@@ -26,10 +27,20 @@ from lablink_allocator_service.utils.config_helpers import should_use_https
 from lablink_allocator_service.scheduler import ScheduledDestructionService
 from lablink_allocator_service.reboot import AutoRebootService
 from lablink_allocator_service.admin_session_expiry import AdminSessionExpiryService
+from lablink_allocator_service.warm_pool import WarmPoolService
+from lablink_allocator_service.autoscaler import AutoscalerService
+from lablink_allocator_service.seat_queue import SeatQueue
+from lablink_allocator_service.idle_reclaim import IdleReclaimService
+from lablink_allocator_service.memory import MemoryReportService
+from lablink_allocator_service.session_staging import SessionStagingService
 from lablink_allocator_service.operations import OperationsWorker
 from lablink_allocator_service.db.operations import OperationsDatabase
 from lablink_allocator_service.providers.registry import get_provider
+from lablink_allocator_service import cadence, rate_limit
+from lablink_allocator_service.cadence import TelemetryCadence
+from lablink_allocator_service.rate_limit import AdmissionControl
 from lablink_allocator_service.secret_hash import hash_secret
+from lablink_allocator_service.tracing import TRACER
 from lablink_allocator_service.routes.admin_pages import bp as admin_pages_bp
 from lablink_allocator_service.routes.admin_sessions import (
     bp as admin_sessions_bp,
@@ -42,13 +53,21 @@ from lablink_allocator_service.routes.health import bp as health_bp
 from lablink_allocator_service.routes.internal_proxy_auth import (
     bp as internal_proxy_auth_bp,
 )
+from lablink_allocator_service.routes.memory import bp as memory_bp
 from lablink_allocator_service.routes.metrics import bp as metrics_bp
+from lablink_allocator_service.routes.profiling import bp as profiling_bp
+from lablink_allocator_service.routes.prometheus import bp as prometheus_bp
 from lablink_allocator_service.routes.provisioning import (
     bp as provisioning_bp,
+    destroy_clients,
+    launch_clients,
+    provision_clients,
 )
 from lablink_allocator_service.routes.public import bp as public_bp
 from lablink_allocator_service.routes.registration import bp as registration_bp
+from lablink_allocator_service.routes.roster import bp as roster_bp
 from lablink_allocator_service.routes.schedules import bp as schedules_bp
+from lablink_allocator_service.routes.tracing import bp as tracing_bp
 from lablink_allocator_service.routes.vm_telemetry import bp as vm_telemetry_bp
 
 # Install the root handler before anything at module scope logs — get_config()
@@ -94,17 +113,27 @@ class _ProxyFixWhenTrusted:
 app.wsgi_app = _ProxyFixWhenTrusted(
     app.wsgi_app, trust_headers=lambda: should_use_https(cfg)
 )
+# Admission control; `admission` is set in main() when rate_limit.enabled.
+rate_limit.install(app, lambda: admission)
+# Report-interval hints; `telemetry_cadence` is set in main() when
+# cadence.enabled.
+cadence.install(app, lambda: telemetry_cadence)
 app.register_blueprint(admin_pages_bp)
 app.register_blueprint(admin_sessions_bp)
 app.register_blueprint(allocator_logs_bp)
 app.register_blueprint(desktop_bp)
 app.register_blueprint(health_bp)
 app.register_blueprint(internal_proxy_auth_bp)
+app.register_blueprint(memory_bp)
 app.register_blueprint(metrics_bp)
+app.register_blueprint(profiling_bp)
+app.register_blueprint(prometheus_bp)
 app.register_blueprint(provisioning_bp)
 app.register_blueprint(public_bp)
 app.register_blueprint(registration_bp)
+app.register_blueprint(roster_bp)
 app.register_blueprint(schedules_bp)
+app.register_blueprint(tracing_bp)
 app.register_blueprint(vm_telemetry_bp)
 
 # Define the tofu directory relative to this file (now inside the package)
@@ -120,6 +149,9 @@ app.config["LABLINK_PROVIDER"] = get_provider(
     region=cfg.app.region,
     tofu_dir=str(TOFU_DIR),
     connectivity=cfg.manual.connectivity,
+    shards=cfg.provisioning.shards,
+    parallelism=cfg.provisioning.parallelism,
+    simulation=cfg.simulated,
 )
 
 os.environ["DATABASE_URL"] = (
@@ -196,6 +228,38 @@ reboot_service = None
 # Admin-session expiry service (initialized in main())
 admin_session_expiry_service = None
 
+# Warm pool of stopped spare client VMs (initialized in main() when
+# provisioning.warm_spares > 0; /api/launch starts spares from it first).
+warm_pool = None
+
+# Waiting room for students who find the pool empty (initialized in
+# main(); without it /api/request_vm answers 503 no_seats instead).
+seat_queue = None
+
+# Free-seat autoscaler (initialized in main() when autoscale.enabled;
+# /api/request_vm reports each seat request to it).
+autoscaler = None
+
+# Idle-seat reclamation (initialized in main() when idle_reclaim.enabled).
+idle_reclaim_service = None
+
+# Background VNC-password staging for free seats (initialized in main()
+# when session_staging.enabled; /api/request_vm falls back to rotating
+# synchronously without it).
+session_staging = None
+
+# Request admission control: token buckets and the in-flight cap
+# (initialized in main() when rate_limit.enabled; see rate_limit).
+admission = None
+
+# Recommends client VMs' next report interval (initialized in main() when
+# cadence.enabled; see cadence).
+telemetry_cadence = None
+
+# Periodic RSS/object-count summary in the log (initialized in main() when
+# memory_report.enabled; see memory).
+memory_report = None
+
 # Operations worker for on-demand apply/destroy jobs (initialized in
 # main()). Unlike the other three services, this has no persistent
 # background thread/loop of its own — start() just runs a one-time
@@ -224,6 +288,7 @@ def init_database():
         host=DB_HOST,
         port=DB_PORT,
         table_name=VM_TABLE_NAME,
+        placement_policy=cfg.placement.policy,
     )
     global schedule_db
     schedule_db = ScheduleDatabase(pool=database.pool)
@@ -237,6 +302,17 @@ def init_database():
     # Persist the deployment register-token as an argon2 hash at rest
     # (SR-F14). Validation reads this back via settings (Option A).
     database.set_setting("register_token_hash", hash_secret(REGISTER_TOKEN))
+    # Activity tracking for idle-seat reclamation is written by the
+    # in-use and session-metrics routes whether or not reclamation is on.
+    database.ensure_idle_columns()
+    # Read by assign_vm whether or not session staging is on.
+    database.ensure_staging_columns()
+    # assign_vm and preassign_seats rely on it for one seat per email.
+    database.ensure_seat_index()
+    # The "stable" placement policy ranks seats by reboot_count, which is
+    # otherwise only created when auto-reboot or the warm pool runs.
+    if cfg.placement.policy == "stable":
+        database.ensure_reboot_columns()
 
 
 _log_level = (
@@ -263,11 +339,54 @@ if not app.config["LABLINK_PROVIDER"].can_provision_hosts:
     logger.info("REGISTER_TOKEN=%s", REGISTER_TOKEN)
 
 
+def _tofu_init(workdir: Path, state_prefix: str) -> None:
+    """Run `tofu init` in a client workspace, using the S3 backend under
+    `<deployment>/<env>/<state_prefix>/` outside dev environments."""
+    logger.info(f"Initializing OpenTofu in {workdir}...")
+    if ENVIRONMENT not in ["prod", "test", "ci-test"]:
+        (workdir / "backend.tf").unlink(missing_ok=True)
+        subprocess.run(
+            ["tofu", "init"],
+            cwd=workdir,
+            check=True,
+        )
+        return
+    # Use bucket_name from config for client VM tofu state
+    default_bucket = "tf-state-lablink-allocator-bucket"
+    bucket_name = (
+        cfg.bucket_name if hasattr(cfg, "bucket_name") else default_bucket
+    )
+    # Derive deployment_name for state key scoping
+    deployment_name = (
+        cfg.deployment_name
+        if hasattr(cfg, "deployment_name") and cfg.deployment_name
+        else "lablink"
+    )
+    state_key = f"{deployment_name}/{ENVIRONMENT}/{state_prefix}/terraform.tfstate"
+    logger.info(
+        f"Initializing OpenTofu with S3 backend: {bucket_name} "
+        f"(key: {state_key})"
+    )
+    subprocess.run(
+        [
+            "tofu",
+            "init",
+            f"-backend-config=backend-client-{ENVIRONMENT}.hcl",
+            f"-backend-config=key={state_key}",
+            f"-backend-config=bucket={bucket_name}",
+            f"-backend-config=region={cfg.app.region}",
+        ],
+        cwd=workdir,
+        check=True,
+    )
+
+
 def main():
     """Main entry point for the allocator service."""
     global scheduler_service, reboot_service, admin_session_expiry_service
-    global operations_worker, operations_db
-    global _startup_time
+    global operations_worker, operations_db, warm_pool, autoscaler
+    global seat_queue, idle_reclaim_service, session_staging
+    global admission, telemetry_cadence, memory_report, _startup_time
 
     verify_secrets_resolved()
 
@@ -276,6 +395,45 @@ def main():
         with app.app_context():
             init_database()
 
+        if cfg.rate_limit.enabled:
+            logger.info("Initializing admission control...")
+            admission = AdmissionControl(
+                max_in_flight=cfg.rate_limit.max_in_flight,
+                public_rate=cfg.rate_limit.public_rate,
+                public_burst=cfg.rate_limit.public_burst,
+                client_rate=cfg.rate_limit.client_rate,
+                client_burst=cfg.rate_limit.client_burst,
+            )
+
+        if cfg.cadence.enabled:
+            logger.info("Initializing telemetry cadence...")
+            telemetry_cadence = TelemetryCadence(
+                target_qps=cfg.cadence.target_qps,
+                max_interval_seconds=cfg.cadence.max_interval_seconds,
+                heartbeat_max_interval_seconds=(
+                    cfg.cadence.heartbeat_max_interval_seconds
+                ),
+                watch_interval_seconds=cfg.cadence.watch_interval_seconds,
+                jitter=cfg.cadence.jitter,
+            )
+
+        if cfg.memory_report.enabled:
+            logger.info("Initializing memory report...")
+            memory_report = MemoryReportService(
+                interval_minutes=cfg.memory_report.interval_minutes,
+                top_types=cfg.memory_report.top_types,
+            )
+            memory_report.start()
+            atexit.register(memory_report.stop)
+
+        if cfg.tracing.enabled:
+            logger.info("Initializing request tracing...")
+            TRACER.configure(
+                buffer_traces=cfg.tracing.buffer_traces,
+                min_duration_ms=cfg.tracing.min_duration_ms,
+                otlp_file=cfg.tracing.otlp_file,
+            )
+
         # Initialize scheduler service
         logger.info("Initializing scheduler service...")
         db_url = (
@@ -285,6 +443,7 @@ def main():
         scheduler_service = ScheduledDestructionService(
             schedule_db=schedule_db,
             db_url=db_url,
+            database=database,
         )
         scheduler_service.start()
         atexit.register(scheduler_service.stop)
@@ -312,6 +471,43 @@ def main():
         atexit.register(admin_session_expiry_service.stop)
         logger.info("Admin-session expiry service started successfully")
 
+        # Initialize seat-queue dispatcher
+        logger.info("Initializing seat queue...")
+        seat_queue = SeatQueue(database=database)
+        seat_queue.start()
+        atexit.register(seat_queue.stop)
+        logger.info("Seat queue started successfully")
+
+        # Session-credential staging for free seats
+        if cfg.session_staging.enabled:
+            logger.info("Initializing session staging...")
+            session_staging = SessionStagingService(
+                database=database,
+                connectivity=app.config["LABLINK_PROVIDER"].client_connectivity,
+                agent_token=AGENT_TOKEN,
+                check_interval_seconds=cfg.session_staging.check_interval_seconds,
+                concurrency=cfg.session_staging.concurrency,
+            )
+            session_staging.start()
+            atexit.register(session_staging.stop)
+            logger.info("Session staging started successfully")
+
+        # Idle-seat reclamation — recycles released VMs through the
+        # auto-reboot service and hands their seats to the queue above.
+        if cfg.idle_reclaim.enabled:
+            logger.info("Initializing idle-seat reclamation...")
+            idle_reclaim_service = IdleReclaimService(
+                database=database,
+                reboot_service=reboot_service,
+                seat_queue=seat_queue,
+                idle_minutes=cfg.idle_reclaim.idle_minutes,
+                grace_minutes=cfg.idle_reclaim.grace_minutes,
+                check_interval_seconds=cfg.idle_reclaim.check_interval_seconds,
+            )
+            idle_reclaim_service.start()
+            atexit.register(idle_reclaim_service.stop)
+            logger.info("Idle-seat reclamation started successfully")
+
         # Initialize operations worker (on-demand apply/destroy jobs).
         # No atexit registration: see the module-level comment on
         # operations_worker — there's no background loop to stop.
@@ -331,44 +527,74 @@ def main():
                 "Skipping tofu init: provider %s does not provision hosts.",
                 getattr(provider, "name", type(provider).__name__),
             )
-        elif not (TOFU_DIR / "terraform.runtime.tfvars").exists():
-            logger.info("Initializing OpenTofu...")
-            if ENVIRONMENT not in ["prod", "test", "ci-test"]:
-                (TOFU_DIR / "backend.tf").unlink(missing_ok=True)
-                subprocess.run(
-                    ["tofu", "init"],
-                    cwd=TOFU_DIR,
-                    check=True,
+        else:
+            # The primary workspace plus one per extra provisioning shard;
+            # each keeps its own state.
+            for workdir, state_prefix in provider.tofu_workspaces():
+                if not (workdir / "terraform.runtime.tfvars").exists():
+                    _tofu_init(workdir, state_prefix)
+
+        # Warm pool — needs the tofu workspaces above for its refills.
+        if cfg.provisioning.warm_spares > 0:
+            if not (provider.can_provision_hosts and provider.can_stop_hosts):
+                logger.warning(
+                    "Ignoring provisioning.warm_spares: provider %s cannot "
+                    "provision and stop hosts.",
+                    getattr(provider, "name", type(provider).__name__),
+                )
+            elif not allocator_ip or not key_name:
+                logger.warning(
+                    "Ignoring provisioning.warm_spares: allocator outputs "
+                    "not found."
                 )
             else:
-                # Use bucket_name from config for client VM tofu state
-                default_bucket = "tf-state-lablink-allocator-bucket"
-                bucket_name = (
-                    cfg.bucket_name if hasattr(cfg, "bucket_name") else default_bucket
+                logger.info("Initializing warm pool...")
+                warm_pool = WarmPoolService(
+                    database=database,
+                    provider=provider,
+                    operations_worker=operations_worker,
+                    provision=functools.partial(provision_clients, provider),
+                    size=cfg.provisioning.warm_spares,
+                    check_interval_seconds=(
+                        cfg.provisioning.warm_check_interval_seconds
+                    ),
                 )
-                # Derive deployment_name for state key scoping
-                deployment_name = (
-                    cfg.deployment_name
-                    if hasattr(cfg, "deployment_name") and cfg.deployment_name
-                    else "lablink"
+                warm_pool.start()
+                atexit.register(warm_pool.stop)
+                logger.info("Warm pool started successfully")
+
+        # Autoscaler — launches through the warm pool above when there is one.
+        if cfg.autoscale.enabled:
+            if not (provider.can_provision_hosts and provider.can_destroy_hosts):
+                logger.warning(
+                    "Ignoring autoscale.enabled: provider %s cannot "
+                    "provision and destroy hosts.",
+                    getattr(provider, "name", type(provider).__name__),
                 )
-                state_key = f"{deployment_name}/{ENVIRONMENT}/client/terraform.tfstate"
-                logger.info(
-                    f"Initializing OpenTofu with S3 backend: {bucket_name} "
-                    f"(key: {state_key})"
+            elif not allocator_ip or not key_name:
+                logger.warning(
+                    "Ignoring autoscale.enabled: allocator outputs not found."
                 )
-                subprocess.run(
-                    [
-                        "tofu",
-                        "init",
-                        f"-backend-config=backend-client-{ENVIRONMENT}.hcl",
-                        f"-backend-config=key={state_key}",
-                        f"-backend-config=bucket={bucket_name}",
-                        f"-backend-config=region={cfg.app.region}",
-                    ],
-                    cwd=TOFU_DIR,
-                    check=True,
+            else:
+                logger.info("Initializing autoscaler...")
+                autoscaler = AutoscalerService(
+                    database=database,
+                    operations_worker=operations_worker,
+                    launch=functools.partial(launch_clients, provider),
+                    destroy=functools.partial(destroy_clients, provider),
+                    free_seats=cfg.autoscale.free_seats,
+                    max_vms=cfg.autoscale.max_vms,
+                    demand_window_seconds=cfg.autoscale.demand_window_seconds,
+                    cooldown_seconds=cfg.autoscale.cooldown_seconds,
+                    scale_down_after_seconds=(
+                        cfg.autoscale.scale_down_after_seconds
+                    ),
+                    check_interval_seconds=cfg.autoscale.check_interval_seconds,
+                    warm_pool=warm_pool,
                 )
+                autoscaler.start()
+                atexit.register(autoscaler.stop)
+                logger.info("Autoscaler started successfully")
 
         logger.info("Auto-generated API token for machine-to-machine auth")
         logger.info("Starting Flask application...")
@@ -380,6 +606,24 @@ def main():
         logger.error(f"Failed to start allocator service: {e}", exc_info=True)
 
         # Clean up services if they were initialized
+        if autoscaler is not None:
+            try:
+                logger.info("Stopping autoscaler due to startup failure...")
+                autoscaler.stop()
+            except Exception as cleanup_error:
+                logger.error(
+                    f"Error stopping autoscaler during cleanup: {cleanup_error}"
+                )
+
+        if warm_pool is not None:
+            try:
+                logger.info("Stopping warm pool due to startup failure...")
+                warm_pool.stop()
+            except Exception as cleanup_error:
+                logger.error(
+                    f"Error stopping warm pool during cleanup: {cleanup_error}"
+                )
+
         if reboot_service is not None:
             try:
                 logger.info("Stopping auto-reboot service due to startup failure...")
@@ -398,6 +642,37 @@ def main():
                     f"Error stopping scheduler during cleanup: {cleanup_error}"
                 )
 
+        if idle_reclaim_service is not None:
+            try:
+                logger.info(
+                    "Stopping idle-seat reclamation due to startup failure..."
+                )
+                idle_reclaim_service.stop()
+            except Exception as cleanup_error:
+                logger.error(
+                    f"Error stopping idle-seat reclamation during cleanup: "
+                    f"{cleanup_error}"
+                )
+
+        if session_staging is not None:
+            try:
+                logger.info("Stopping session staging due to startup failure...")
+                session_staging.stop()
+            except Exception as cleanup_error:
+                logger.error(
+                    f"Error stopping session staging during cleanup: "
+                    f"{cleanup_error}"
+                )
+
+        if seat_queue is not None:
+            try:
+                logger.info("Stopping seat queue due to startup failure...")
+                seat_queue.stop()
+            except Exception as cleanup_error:
+                logger.error(
+                    f"Error stopping seat queue during cleanup: {cleanup_error}"
+                )
+
         if admin_session_expiry_service is not None:
             try:
                 logger.info(
@@ -410,6 +685,15 @@ def main():
                     f"cleanup: {cleanup_error}"
                 )
 
+        if memory_report is not None:
+            try:
+                logger.info("Stopping memory report due to startup failure...")
+                memory_report.stop()
+            except Exception as cleanup_error:
+                logger.error(
+                    f"Error stopping memory report during cleanup: {cleanup_error}"
+                )
+
         # Re-raise the exception to exit with error code
         raise
 
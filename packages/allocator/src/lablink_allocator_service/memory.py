@@ -0,0 +1,216 @@
+"""Memory diagnostics for the long-running allocator process.
+
+The allocator lives as long as its deployment, so anything that grows
+without bound (a module-level cache, per-operation output, scheduler
+state) shows up as RSS creeping over a multi-day workshop. Two tools to
+find it without a restart:
+
+- ``SNAPSHOTS``: tracemalloc started on demand, named snapshots, and a
+  top-N diff between two of them by allocation site. Served by
+  routes/memory.py.
+- ``MemoryReportService``: a background loop that logs RSS, the gc object
+  count and the most common object types every few minutes, so growth
+  can be dated and attributed from the log alone.
+"""
+
+import gc
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import Counter, OrderedDict
+from threading import Event, Thread
+
+from lablink_allocator_service.instrumentation import timed_iteration
+
+logger = logging.getLogger(__name__)
+
+MAX_SNAPSHOTS = 10
+GROUP_BY = ("lineno", "filename", "traceback")
+
+# Allocations made by the import machinery and by tracemalloc itself are
+# noise in a leak hunt.
+_FILTERS = (
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+)
+
+
+def rss_bytes() -> int | None:
+    """Current resident set size, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def object_counts(top: int = 5) -> tuple[int, list[tuple[str, int]]]:
+    """Objects tracked by the garbage collector: the total, and the `top`
+    most common types with their counts."""
+    objects = gc.get_objects()
+    types = Counter(type(o).__name__ for o in objects)
+    return len(objects), types.most_common(top)
+
+
+class SnapshotStore:
+    """Named tracemalloc snapshots, oldest evicted past ``max_snapshots``.
+
+    Snapshots outlive ``stop()``, so two already taken can still be
+    compared after tracing is switched off.
+    """
+
+    def __init__(self, max_snapshots: int = MAX_SNAPSHOTS):
+        self.max_snapshots = max_snapshots
+        self._lock = threading.Lock()
+        self._snapshots: OrderedDict = OrderedDict()
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 10) -> None:
+        """Start tracing allocations, keeping `frames` frames of each
+        traceback. Tracing slows allocation noticeably, so switch it off
+        once the snapshots needed are taken."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            logger.info(f"tracemalloc started ({frames} frames)")
+
+    def stop(self) -> None:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            logger.info("tracemalloc stopped")
+
+    def take(self, name: str) -> dict:
+        """Take a snapshot and store it as `name`, replacing any snapshot
+        of that name.
+
+        Raises:
+            RuntimeError: If tracing is not running.
+        """
+        snapshot = self._take()
+        summary = self._summarize(name, snapshot)
+        with self._lock:
+            self._snapshots.pop(name, None)
+            self._snapshots[name] = (snapshot, summary)
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return summary
+
+    def summaries(self) -> list[dict]:
+        with self._lock:
+            return [summary for _, summary in self._snapshots.values()]
+
+    def diff(
+        self,
+        base: str,
+        current: str | None = None,
+        limit: int = 25,
+        group_by: str = "lineno",
+    ) -> list[dict]:
+        """Allocation sites that grew (or shrank) most from `base` to
+        `current`, or to a fresh snapshot when `current` is None.
+
+        Raises:
+            KeyError: If a named snapshot does not exist.
+            RuntimeError: If `current` is None and tracing is not running.
+        """
+        with self._lock:
+            old = self._snapshots[base][0]
+            new = self._snapshots[current][0] if current is not None else None
+        if new is None:
+            new = self._take()
+        rows = []
+        for stat in new.compare_to(old, group_by)[:limit]:
+            row = {
+                "site": str(stat.traceback[0]),
+                "size_kb": round(stat.size / 1024, 1),
+                "size_diff_kb": round(stat.size_diff / 1024, 1),
+                "count": stat.count,
+                "count_diff": stat.count_diff,
+            }
+            if group_by == "traceback":
+                row["traceback"] = [str(frame) for frame in stat.traceback]
+            rows.append(row)
+        return rows
+
+    @staticmethod
+    def _take():
+        return tracemalloc.take_snapshot().filter_traces(_FILTERS)
+
+    @staticmethod
+    def _summarize(name, snapshot) -> dict:
+        traced = sum(stat.size for stat in snapshot.statistics("filename"))
+        return {"name": name, "taken_at": time.time(), "traced_bytes": traced}
+
+
+SNAPSHOTS = SnapshotStore()
+
+
+class MemoryReportService:
+    """Background service that logs a memory summary periodically.
+
+    Args:
+        interval_minutes: Minutes between summaries.
+        top_types: How many of the most common object types to list.
+    """
+
+    def __init__(self, interval_minutes: int = 15, top_types: int = 5):
+        self.interval_minutes = interval_minutes
+        self.top_types = top_types
+        self._baseline_rss = None
+        self._stop_event = Event()
+        self._thread = None
+
+    def start(self):
+        """Start the memory report thread."""
+        self._baseline_rss = rss_bytes()
+        self._stop_event.clear()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+        logger.info(
+            f"Memory report started (interval={self.interval_minutes}m)"
+        )
+
+    def stop(self):
+        """Stop the memory report thread."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+        logger.info("Memory report stopped")
+
+    def _run(self):
+        """Main loop: one summary per interval, the first straight away."""
+        while not self._stop_event.is_set():
+            try:
+                with timed_iteration("memory_report"):
+                    self._report()
+            except Exception as e:
+                logger.error(f"Error in memory report: {e}", exc_info=True)
+            self._stop_event.wait(self.interval_minutes * 60)
+
+    def _report(self):
+        rss = rss_bytes()
+        total, common = object_counts(self.top_types)
+        parts = []
+        if rss is not None:
+            growth = ""
+            if self._baseline_rss is not None:
+                delta = (rss - self._baseline_rss) / 2**20
+                growth = f" ({delta:+.1f} since start)"
+            parts.append(f"rss={rss / 2**20:.1f} MiB{growth}")
+        parts.append(f"gc objects={total}")
+        parts.append(
+            "top types: " + ", ".join(f"{name}={n}" for name, n in common)
+        )
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            parts.append(
+                f"traced={current / 2**20:.1f} MiB (peak {peak / 2**20:.1f})"
+            )
+        logger.info("Memory: " + "; ".join(parts))
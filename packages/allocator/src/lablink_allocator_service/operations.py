@@ -3,19 +3,118 @@
 Runs each operation on its own daemon thread, off the Flask request
 thread, so a slow `tofu apply`/`destroy` doesn't hold an HTTP
 connection open long enough to hit Cloudflare's edge timeout.
+
+While a job runs, its tofu output lines, progress counts and status
+changes are also published to an in-memory `OperationEvents` buffer,
+which GET /api/operations/<id>/stream relays to the dashboard and CLI.
+Each job is also the root span of its own trace (see tracing.py).
 """
 from __future__ import annotations
 
 import logging
-from threading import Thread
+import time
+from collections import OrderedDict, deque
+from threading import Condition, Thread
 from typing import TYPE_CHECKING, Callable, Optional
 
+from lablink_allocator_service.instrumentation import (
+    OPERATION_SECONDS,
+    OPERATIONS_ACTIVE,
+)
+from lablink_allocator_service.tracing import TRACER
+
 if TYPE_CHECKING:
     from lablink_allocator_service.db.operations import OperationsDatabase
 
 logger = logging.getLogger(__name__)
 
 
+TERMINAL_STATUSES = ("succeeded", "failed", "interrupted")
+
+
+class _EventBuffer:
+    def __init__(self, max_events: int):
+        self.events: deque[dict] = deque(maxlen=max_events)
+        self.last_id = 0
+        self.closed = False
+
+
+class OperationEvents:
+    """Recent live events of each operation, numbered from 1.
+
+    Every event is ``{"id": n, "event": kind, "data": {...}}`` where kind
+    is ``output`` (one tofu stdout line), ``progress`` (completed/total
+    resources) or ``status``. Each operation keeps at most `max_events`
+    events, so a reader that falls further behind than that skips ahead
+    to the oldest one still held — it can tell from the ids. Buffers of
+    finished operations are dropped beyond the newest `keep_finished`;
+    the operations table stays the durable record.
+
+    Args:
+        max_events: Ring-buffer size per operation.
+        keep_finished: Closed buffers kept for late readers.
+    """
+
+    def __init__(self, max_events: int = 2000, keep_finished: int = 10):
+        self._max_events = max_events
+        self._keep_finished = keep_finished
+        self._buffers: OrderedDict[int, _EventBuffer] = OrderedDict()
+        self._cond = Condition()
+
+    def open(self, operation_id: int) -> None:
+        with self._cond:
+            self._buffers[operation_id] = _EventBuffer(self._max_events)
+
+    def publish(self, operation_id: int, event: str, data: dict) -> None:
+        with self._cond:
+            buffer = self._buffers.get(operation_id)
+            if buffer is None or buffer.closed:
+                return
+            buffer.last_id += 1
+            buffer.events.append(
+                {"id": buffer.last_id, "event": event, "data": data}
+            )
+            self._cond.notify_all()
+
+    def close(self, operation_id: int) -> None:
+        """Mark the operation finished: no more events will follow."""
+        with self._cond:
+            buffer = self._buffers.get(operation_id)
+            if buffer is None:
+                return
+            buffer.closed = True
+            self._cond.notify_all()
+            finished = [
+                op_id for op_id, b in self._buffers.items() if b.closed
+            ]
+            for op_id in finished[:-self._keep_finished or None]:
+                del self._buffers[op_id]
+
+    def read(
+        self, operation_id: int, after: int = 0, timeout: float = 15.0,
+    ) -> Optional[tuple[list[dict], bool]]:
+        """Return the events numbered above `after`, waiting up to
+        `timeout` seconds for one if there are none yet, plus whether the
+        operation is finished (so no later read will return more).
+
+        Returns None if nothing is buffered for this operation — it ran
+        in an earlier allocator process, or was dropped as too old.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                buffer = self._buffers.get(operation_id)
+                if buffer is None:
+                    return None
+                if buffer.last_id > after or buffer.closed:
+                    events = [e for e in buffer.events if e["id"] > after]
+                    return events, buffer.closed
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return [], False
+                self._cond.wait(remaining)
+
+
 class OperationsWorker:
     """Submits apply/destroy jobs to run on a background thread.
 
@@ -25,6 +124,7 @@ class OperationsWorker:
 
     def __init__(self, database: "OperationsDatabase"):
         self.database = database
+        self.events = OperationEvents()
 
     def start(self) -> None:
         """Mark any operation left queued/running from a prior process as
@@ -48,6 +148,10 @@ class OperationsWorker:
     ) -> int:
         """Queue a new operation and run it on a background thread.
 
+        `fn` is called as ``fn(progress_callback, output_callback)``: the
+        first takes (completed, total) resource counts, the second one
+        line of tool output at a time.
+
         Returns immediately after the operation row is created — does not
         wait for `fn` to complete.
 
@@ -58,15 +162,49 @@ class OperationsWorker:
         operation_id = self.database.create_operation(
             op_type=op_type, params=params, created_by=created_by
         )
+        # Opened before the thread starts, so a stream request made as
+        # soon as submit() returns finds the buffer.
+        self.events.open(operation_id)
+        OPERATIONS_ACTIVE.inc()
         Thread(
-            target=self._run, args=(operation_id, fn), daemon=True
+            target=self._run, args=(operation_id, fn, op_type), daemon=True
         ).start()
         return operation_id
 
-    def _run(self, operation_id: int, fn: Callable[..., str]) -> None:
+    def _run(
+        self, operation_id: int, fn: Callable[..., str], op_type: str = "",
+    ) -> None:
+        started = time.monotonic()
+        status = "failed"
+        try:
+            with TRACER.trace(
+                f"operation {op_type}", **{"operation.id": operation_id},
+            ) as span:
+                status = self._run_and_record(operation_id, fn)
+                if span is not None and status != "succeeded":
+                    span.error = status
+        finally:
+            self.events.close(operation_id)
+            OPERATIONS_ACTIVE.dec()
+            OPERATION_SECONDS.observe(
+                time.monotonic() - started, type=op_type, status=status
+            )
+
+    def _run_and_record(
+        self, operation_id: int, fn: Callable[..., str],
+    ) -> str:
+        """Run `fn` and record its outcome; returns the final status."""
         progress_disabled = False
 
+        def _output_callback(line: str) -> None:
+            self.events.publish(operation_id, "output", {"line": line})
+
         def _progress_callback(completed: int, total: int) -> None:
+            self.events.publish(
+                operation_id,
+                "progress",
+                {"completed": completed, "total": total},
+            )
             # Best-effort: a transient DB failure here must never abort a
             # live tofu apply/destroy (which _run_streamed would do by
             # killing the subprocess if this raised). Once a write fails,
@@ -89,7 +227,8 @@ class OperationsWorker:
 
         try:
             self.database.start_operation(operation_id)
-            output = fn(_progress_callback)
+            self.events.publish(operation_id, "status", {"status": "running"})
+            output = fn(_progress_callback, _output_callback)
         except Exception as e:
             logger.error(
                 "Operation #%d failed: %s", operation_id, e, exc_info=True
@@ -97,7 +236,10 @@ class OperationsWorker:
             self.database.finish_operation(
                 operation_id, status="failed", error=str(e)
             )
-            return
+            self.events.publish(
+                operation_id, "status", {"status": "failed", "error": str(e)}
+            )
+            return "failed"
         # Deliberately outside the try: if tofu genuinely succeeded but
         # this final status write fails, folding it into the except above
         # would mislabel a successful run as "failed". Leaving the row at
@@ -106,3 +248,5 @@ class OperationsWorker:
         self.database.finish_operation(
             operation_id, status="succeeded", output=output
         )
+        self.events.publish(operation_id, "status", {"status": "succeeded"})
+        return "succeeded"
@@ -0,0 +1,161 @@
+"""Sampling profiler over every thread of the running allocator.
+
+``sample`` polls ``sys._current_frames()`` at a fixed interval and counts
+each thread's stack, so a profile shows where request handlers, the
+scheduler, the reboot/expiry loops and operation threads are spending
+their time -- including time blocked in C (argon2, psycopg2 socket waits),
+which shows up as the Python frame that made the call. It costs one stack
+walk per thread per sample and needs no native tooling, so it is safe to
+run against production for tens of seconds.
+
+The result renders either as collapsed stacks (``thread;outer;...;inner
+count`` lines, the input format of flamegraph.pl and speedscope) or as a
+self-contained SVG flamegraph.
+"""
+from __future__ import annotations
+
+import html
+import os
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+
+# Leaf frames of threads parked waiting for work. Dropped unless idle
+# stacks are asked for; otherwise a dozen sleeping threads bury the few
+# doing something.
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("socket.py", "accept"),
+    ("queue.py", "get"),
+    ("socketserver.py", "serve_forever"),
+}
+
+
+def _label(code) -> str:
+    filename = os.path.basename(code.co_filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _is_idle(frame) -> bool:
+    code = frame.f_code
+    return (os.path.basename(code.co_filename), code.co_name) in _IDLE_LEAVES
+
+
+def sample(
+    seconds: float,
+    interval: float = 0.01,
+    *,
+    include_idle: bool = False,
+    clock=time.monotonic,
+    sleep=time.sleep,
+) -> Counter:
+    """Sample every thread's stack for `seconds`, once per `interval`.
+
+    The calling thread is left out: it would only ever show this loop.
+
+    Returns:
+        Counter: ``{(thread name, outermost label, ..., innermost label):
+        samples}``.
+    """
+    own = threading.get_ident()
+    counts: Counter = Counter()
+    deadline = clock() + seconds
+    while clock() < deadline:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own or (not include_idle and _is_idle(frame)):
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_label(frame.f_code))
+                frame = frame.f_back
+            stack.append(names.get(ident, f"thread-{ident}"))
+            counts[tuple(reversed(stack))] += 1
+        sleep(interval)
+    return counts
+
+
+def collapse(counts: Counter) -> str:
+    """Render samples as collapsed stacks, heaviest first."""
+    return "".join(
+        f"{';'.join(stack)} {n}\n" for stack, n in counts.most_common()
+    )
+
+
+_WIDTH = 1200
+_ROW = 16
+_PAD = 10
+_CHAR = 7  # approximate advance of the 12px monospace font
+_MIN_WIDTH = 0.5  # frames narrower than this many pixels are omitted
+
+
+def _tree(counts: Counter) -> dict:
+    root = {"name": "all", "value": 0, "children": {}}
+    for stack, n in counts.items():
+        root["value"] += n
+        node = root
+        for name in stack:
+            node = node["children"].setdefault(
+                name, {"name": name, "value": 0, "children": {}}
+            )
+            node["value"] += n
+    return root
+
+
+def _depth(node) -> int:
+    return 1 + max((_depth(c) for c in node["children"].values()), default=0)
+
+
+def _color(name: str) -> str:
+    # Stable warm palette: the same frame gets the same colour every run.
+    h = zlib.crc32(name.encode())
+    return f"rgb({205 + h % 50},{80 + (h >> 8) % 120},{(h >> 16) % 60})"
+
+
+def render_flamegraph(counts: Counter, title: str = "Allocator profile") -> str:
+    """Render samples as a standalone SVG flamegraph (root at the bottom,
+    width proportional to samples; hover a frame for its count)."""
+    root = _tree(counts)
+    total = max(root["value"], 1)
+    depth = _depth(root)
+    height = depth * _ROW + 3 * _PAD + _ROW
+    scale = (_WIDTH - 2 * _PAD) / total
+    rects = []
+
+    def place(node, x, level):
+        width = node["value"] * scale
+        if width < _MIN_WIDTH:
+            return
+        y = height - _PAD - (level + 1) * _ROW
+        name = html.escape(node["name"])
+        pct = 100 * node["value"] / total
+        chars = int((width - 6) / _CHAR)
+        text = node["name"] if len(node["name"]) <= chars else (
+            node["name"][: chars - 2] + ".." if chars > 2 else ""
+        )
+        rects.append(
+            f'<g><title>{name} ({node["value"]} samples, {pct:.1f}%)</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{width:.1f}" height="{_ROW - 1}" '
+            f'fill="{_color(node["name"])}" rx="2"/>'
+            f'<text x="{x + 3:.1f}" y="{y + _ROW - 4}">{html.escape(text)}</text>'
+            f"</g>"
+        )
+        child_x = x
+        for child in sorted(node["children"].values(), key=lambda c: c["name"]):
+            place(child, child_x, level + 1)
+            child_x += child["value"] * scale
+
+    place(root, _PAD, 0)
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{_WIDTH}" '
+        f'height="{height}" font-family="monospace" font-size="12">'
+        f'<rect width="100%" height="100%" fill="#f8f8f8"/>'
+        f'<text x="{_WIDTH / 2}" y="{_PAD + 12}" text-anchor="middle" '
+        f'font-size="16">{html.escape(title)} ({root["value"]} samples)</text>'
+        + "".join(rects)
+        + "</svg>\n"
+    )
@@ -1,13 +1,20 @@
 """AWSProvider — behavior-preserving wrapper over existing AWS utilities."""
 from __future__ import annotations
 
+import contextvars
 import json
 import re
 import subprocess
 import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import Callable, Optional
 
+from lablink_allocator_service.providers.common import (
+    hostname_sort_key,
+    next_hostnames,
+    Progress,
+)
 from lablink_allocator_service.providers.connectivity.allocator_proxied import (
     AllocatorProxiedClientConnectivity,
 )
@@ -16,6 +23,7 @@ from lablink_allocator_service.providers.protocol import (
     DestroyResult,
     ProvisionResult,
 )
+from lablink_allocator_service.tracing import TRACER
 from lablink_allocator_service.utils.ansi import strip_ansi
 from lablink_allocator_service.utils.aws_utils import (
     check_support_nvidia,
@@ -23,6 +31,8 @@ from lablink_allocator_service.utils.aws_utils import (
     get_instance_id_by_name,
     get_instance_public_ip,
     NotOnEC2Error,
+    start_ec2_instances,
+    stop_ec2_instances,
     stop_start_ec2_instance,
     upload_to_s3,
 )
@@ -30,8 +40,13 @@ from lablink_allocator_service.utils.sg_audit import audit_tofu_plan
 from lablink_allocator_service.utils.tofu_utils import (
     get_instance_ids,
     get_instance_names,
+    get_instance_private_ips,
     get_instance_timings,
+    get_shared_resources,
     get_ssh_private_key,
+    get_state_addresses,
+    prepare_shard_dir,
+    shard_dir,
 )
 
 # Matches OpenTofu's per-resource completion lines in `apply`/`destroy`
@@ -48,65 +63,194 @@ _DURATION_RE = r"(?:\d+h)?(?:\d+m)?\d+s"
 _CREATE_COMPLETE_RE = re.compile(rf": Creation complete after {_DURATION_RE}")
 _DESTROY_COMPLETE_RE = re.compile(rf": Destruction complete after {_DURATION_RE}")
 
+# Per-host resources in terraform/main.tf, all keyed by hostname via
+# for_each. Targeted plans address exactly these for the hosts being
+# added or removed, so their cost scales with the change, not the fleet.
+_HOST_RESOURCES = (
+    "aws_instance.lablink_vm",
+    "time_static.start",
+    "time_static.end",
+)
+_KEYED_INSTANCE_RE = re.compile(r'^aws_instance\.lablink_vm\["([^"]+)"\]$')
+# Workspaces created before the switch to for_each carry count indexes.
+_INDEXED_HOST_RE = re.compile(
+    r"^(aws_instance\.lablink_vm|time_static\.start|time_static\.end)"
+    r"\[(\d+)\]$"
+)
+# Resources the primary workspace creates once for every client VM; shard
+# workspaces are handed their IDs instead (see terraform/main.tf).
+_SHARED_RESOURCES = (
+    "aws_security_group.lablink_sg",
+    "aws_key_pair.lablink_key_pair",
+    "aws_iam_instance_profile.lablink_instance_profile",
+)
+_RUNTIME_TFVARS = "terraform.runtime.tfvars"
+
+
+def _target_args(hostnames: list[str]) -> list[str]:
+    return [
+        f'-target={resource}["{hostname}"]'
+        for hostname in hostnames
+        for resource in _HOST_RESOURCES
+    ]
+
+
+def _write_runtime_tfvars(
+    runtime_file: Path, common: str, hostnames: list[str],
+) -> None:
+    hostnames = sorted(hostnames, key=hostname_sort_key)
+    runtime_file.write_text(
+        common + f"instance_names = {json.dumps(hostnames)}\n"
+    )
+
+
+def _write_instance_names(runtime_file: Path, hostnames: list[str]) -> None:
+    """Replace the `instance_names` line of an existing runtime tfvars."""
+    lines = [
+        line for line in runtime_file.read_text().splitlines()
+        if not line.startswith("instance_names = ")
+    ]
+    lines.append(f"instance_names = {json.dumps(hostnames)}")
+    runtime_file.write_text("\n".join(lines) + "\n")
+
+
+def _in_parallel(fn: Callable, items: list) -> list:
+    """Call fn on every item on its own thread and return the results in
+    order. Waits for all calls before re-raising the first failure, so no
+    tofu process is left running unobserved. A single item runs inline.
+    Each call runs in a copy of the caller's context, so its spans join
+    the caller's trace."""
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=len(items)) as pool:
+        futures = [
+            pool.submit(contextvars.copy_context().run, fn, item)
+            for item in items
+        ]
+        wait(futures)
+    return [f.result() for f in futures]
+
+
+def _private_ips_by_name(workdir: str, names: list) -> dict:
+    """Map hostnames to private IPs from the ``vm_private_ips`` output.
+
+    Only seeds the agent-address cache, so a workspace whose state predates
+    the output (or any other failure) just yields nothing.
+    """
+    try:
+        ips = get_instance_private_ips(tofu_dir=workdir)
+    except Exception:
+        return {}
+    return {n: ip for n, ip in zip(names, ips) if ip}
+
+
+def _command_span(cmd: list[str], cwd):
+    """Trace span for one tofu subprocess, named by its subcommand."""
+    return TRACER.span(
+        f"exec {' '.join(cmd[:2])}",
+        **{
+            "process.command_line": " ".join(map(str, cmd)),
+            "process.cwd": str(cwd),
+        },
+    )
+
+
+def _plan_workspace(
+    workdir: Path,
+    plan_cmd: list[str],
+    plan_file: str,
+    *,
+    action: str,
+    audit: bool,
+) -> int:
+    """Run plan_cmd (which saves plan_file) in workdir and return how many
+    resource changes in the saved plan include `action`. With audit, the
+    plan must also pass audit_tofu_plan (may raise SGAuditFailure)."""
+    with _command_span(plan_cmd, workdir):
+        subprocess.run(
+            plan_cmd, cwd=workdir, check=True, capture_output=True, text=True,
+        )
+    show_cmd = ["tofu", "show", "-json", plan_file]
+    with _command_span(show_cmd, workdir):
+        show = subprocess.run(
+            show_cmd, cwd=workdir, check=True, capture_output=True, text=True,
+        )
+    plan_json = json.loads(show.stdout)
+    if audit:
+        audit_tofu_plan(plan_json)
+    return sum(
+        1
+        for rc in plan_json.get("resource_changes", [])
+        if action in (rc.get("change") or {}).get("actions", [])
+    )
+
 
 def _run_streamed(
     cmd: list[str],
     cwd: Path,
     resource_complete_re: "re.Pattern[str]",
     on_resource_complete: Optional[Callable[[], None]] = None,
+    on_line: Optional[Callable[[str], None]] = None,
 ) -> subprocess.CompletedProcess:
     """Run cmd via Popen, invoking on_resource_complete once for each
     stdout line matching resource_complete_re (ANSI-stripped before
     matching only — the returned CompletedProcess's stdout/stderr are
     raw, unstripped, exactly like subprocess.run(capture_output=True,
     text=True) would return, so callers' existing ANSI-stripping code
-    is unaffected).
+    is unaffected). on_line, if given, receives every stdout line as it
+    arrives, ANSI-stripped and without its trailing newline.
 
     Raises subprocess.CalledProcessError on nonzero exit, with .output
     and .stderr populated — matching subprocess.run(..., check=True).
     """
-    proc = subprocess.Popen(
-        cmd,
-        cwd=cwd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-    )
+    with _command_span(cmd, cwd) as span:
+        proc = subprocess.Popen(
+            cmd,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
 
-    stderr_chunks: list[str] = []
+        stderr_chunks: list[str] = []
 
-    def _drain_stderr() -> None:
-        stderr_chunks.append(proc.stderr.read())
+        def _drain_stderr() -> None:
+            stderr_chunks.append(proc.stderr.read())
 
-    stderr_thread = threading.Thread(target=_drain_stderr, daemon=True)
-    stderr_thread.start()
+        stderr_thread = threading.Thread(target=_drain_stderr, daemon=True)
+        stderr_thread.start()
 
-    stdout_lines: list[str] = []
-    try:
-        for line in proc.stdout:
-            stdout_lines.append(line)
-            if on_resource_complete and resource_complete_re.search(
-                strip_ansi(line)
-            ):
-                on_resource_complete()
-    except BaseException:
-        proc.kill()
-        raise
-    finally:
-        proc.stdout.close()
-        returncode = proc.wait()
-        stderr_thread.join()
-
-    stdout_text = "".join(stdout_lines)
-    stderr_text = "".join(stderr_chunks)
-
-    if returncode != 0:
-        raise subprocess.CalledProcessError(
-            returncode, cmd, output=stdout_text, stderr=stderr_text,
+        stdout_lines: list[str] = []
+        try:
+            for line in proc.stdout:
+                stdout_lines.append(line)
+                clean_line = strip_ansi(line)
+                if on_line:
+                    on_line(clean_line.rstrip("\n"))
+                if on_resource_complete and resource_complete_re.search(
+                    clean_line
+                ):
+                    on_resource_complete()
+        except BaseException:
+            proc.kill()
+            raise
+        finally:
+            proc.stdout.close()
+            returncode = proc.wait()
+            stderr_thread.join()
+            if span is not None:
+                span.attributes["process.exit_code"] = returncode
+
+        stdout_text = "".join(stdout_lines)
+        stderr_text = "".join(stderr_chunks)
+
+        if returncode != 0:
+            raise subprocess.CalledProcessError(
+                returncode, cmd, output=stdout_text, stderr=stderr_text,
+            )
+        return subprocess.CompletedProcess(
+            cmd, returncode, stdout=stdout_text, stderr=stderr_text,
         )
-    return subprocess.CompletedProcess(
-        cmd, returncode, stdout=stdout_text, stderr=stderr_text,
-    )
 
 
 class AWSProvider:
@@ -114,10 +258,15 @@ class AWSProvider:
     can_provision_hosts = True
     can_destroy_hosts = True
     can_recover_hosts = True
+    can_stop_hosts = True
 
-    def __init__(self, *, region=None, tofu_dir=None, **_):
+    def __init__(
+        self, *, region=None, tofu_dir=None, shards=1, parallelism=10, **_,
+    ):
         self._region = region
         self._tofu_dir = tofu_dir
+        self._shards = max(1, shards)
+        self._parallelism = parallelism
         self.client_connectivity = AllocatorProxiedClientConnectivity()
 
     def recover_hosts(self, handles: list[ClientHandle]) -> bool:
@@ -132,6 +281,32 @@ class AWSProvider:
                 all_ok = False
         return all_ok
 
+    def _instance_ids_by_region(
+        self, handles: list[ClientHandle],
+    ) -> dict[str, list[str]]:
+        by_region: dict[str, list[str]] = {}
+        for h in handles:
+            region = h.provider_metadata.get("region", self._region)
+            by_region.setdefault(region, []).append(h.id)
+        return by_region
+
+    def stop_hosts(self, handles: list[ClientHandle]) -> bool:
+        """Stop instances, keeping their volumes, to hold them as warm
+        spares. Returns True iff every stop request was accepted."""
+        return all([
+            stop_ec2_instances(ids, region=region)
+            for region, ids in self._instance_ids_by_region(handles).items()
+        ])
+
+    def start_hosts(self, handles: list[ClientHandle]) -> bool:
+        """Start stopped instances. user_data re-runs on every boot and
+        takes its warm path, restarting the existing client container.
+        Returns True iff every start request was accepted."""
+        return all([
+            start_ec2_instances(ids, region=region)
+            for region, ids in self._instance_ids_by_region(handles).items()
+        ])
+
     def get_host_access(
         self, hostname: str
     ) -> tuple[str | None, str | None, str | None]:
@@ -158,18 +333,25 @@ class AWSProvider:
         return (instance_id, ip, key_path)
 
     def list_hosts(self) -> list[ClientHandle]:
-        ids = get_instance_ids(tofu_dir=self._tofu_dir)
-        names = get_instance_names(tofu_dir=self._tofu_dir)
-        return [
-            ClientHandle(id=i, hostname=n, provider_metadata={"region": self._region})
-            for i, n in zip(ids, names)
-        ]
+        handles = []
+        for workdir in self._launched_workspaces():
+            ids = get_instance_ids(tofu_dir=str(workdir))
+            names = get_instance_names(tofu_dir=str(workdir))
+            handles.extend(
+                ClientHandle(
+                    id=i, hostname=n, provider_metadata={"region": self._region},
+                )
+                for i, n in zip(ids, names)
+            )
+        return handles
 
     def provision_hosts(
         self,
         count: int,
         spec: dict,
         progress_callback: Optional[Callable[[int, int], None]] = None,
+        output_callback: Optional[Callable[[str], None]] = None,
+        vm_number_callback: Optional[Callable[[int], None]] = None,
     ) -> ProvisionResult:
         """Run `tofu plan + audit + apply` for `count` new client hosts.
 
@@ -177,6 +359,20 @@ class AWSProvider:
         handler behind the provider seam (SR-F1). `spec` is a dict of
         runtime values that used to be assembled inline in the route.
 
+        `count` is the number of hosts to add, not the fleet size: new
+        hostnames are appended to the ones already in state and the plan
+        targets only their resources, so existing hosts are neither
+        re-planned nor refreshed. Only the new hosts are returned. New
+        numbers also start after spec["last_vm_number"], the highest any
+        launch has handed out, and `vm_number_callback` is given the new
+        highest before anything is created, so the caller can persist it.
+
+        With more than one workspace shard, the new hosts are spread over
+        the least-loaded shards and every shard's plan runs before any
+        apply starts, so one shard's audit failure stops the whole launch;
+        the applies then run concurrently and report progress into a
+        single (completed, total) count.
+
         Raises:
             RuntimeError: if tofu_dir is None
             SGAuditFailure: propagated from audit_tofu_plan when
@@ -188,8 +384,9 @@ class AWSProvider:
             raise RuntimeError(
                 "AWSProvider not configured with tofu_dir — cannot provision."
             )
-        tofu_dir = Path(self._tofu_dir)
-        runtime_file = tofu_dir / "terraform.runtime.tfvars"
+        workspaces = self._prepare_workspaces()
+        primary = workspaces[0]
+        runtime_file = primary / _RUNTIME_TFVARS
 
         # GPU detection (moved from main.py)
         gpu_support_bool = check_support_nvidia(
@@ -197,44 +394,33 @@ class AWSProvider:
         )
         gpu_support = "true" if gpu_support_bool else "false"
 
-        # Write runtime tfvars (moved verbatim from main.py)
-        with runtime_file.open("w") as f:
-            f.write(f'allocator_ip = "{spec["allocator_ip"]}"\n')
-            f.write(f'allocator_url = "{spec["allocator_url"]}"\n')
-            f.write(f'machine_type = "{spec["machine_type"]}"\n')
-            f.write(f'image_name = "{spec["image_name"]}"\n')
-            # cfg.machine.repository is Optional and defaults to None; an
-            # f-string over Python None writes the literal string "None",
-            # which reaches client start.sh as TUTORIAL_REPO_TO_CLONE="None"
-            # and makes every VM boot attempt `git clone None` (and log its
-            # failure). Empty string is the "no repo" value start.sh skips.
-            f.write(f'repository = "{spec["repository"] or ""}"\n')
-            f.write(f'client_ami_id = "{spec["client_ami_id"]}"\n')
-            f.write(f'subject_software = "{spec["subject_software"]}"\n')
-            f.write(f'resource_prefix = "{spec["resource_prefix"]}"\n')
-            f.write(f'gpu_support = "{gpu_support}"\n')
-            f.write(
-                f'cloud_init_output_log_group = '
-                f'"{spec["cloud_init_output_log_group"]}"\n'
-            )
-            f.write(f'region = "{self._region}"\n')
-            f.write(f'startup_on_error = "{spec["startup_on_error"]}"\n')
-            f.write(f'startup_max_attempts = {spec["startup_max_attempts"]}\n')
-            f.write(
-                f'startup_base_delay_seconds = '
-                f'{spec["startup_base_delay_seconds"]}\n'
-            )
-            f.write(
-                f'startup_success_check_b64 = '
-                f'"{spec["startup_success_check_b64"]}"\n'
+        prefix = spec["resource_prefix"]
+        owned = _in_parallel(
+            lambda w: self._existing_hostnames(
+                w, prefix if w == primary else None,
+            ),
+            workspaces,
+        )
+        new_hostnames = next_hostnames(
+            prefix, [h for hosts in owned for h in hosts], count,
+            spec.get("last_vm_number", 0),
+        )
+        if vm_number_callback and new_hostnames:
+            # Before anything is created, so even a failed apply can't
+            # free these numbers for the next launch.
+            vm_number_callback(hostname_sort_key(new_hostnames[-1])[0])
+        assigned: list[list[str]] = [[] for _ in workspaces]
+        for hostname in new_hostnames:
+            least_loaded = min(
+                range(len(workspaces)),
+                key=lambda i: len(owned[i]) + len(assigned[i]),
             )
-            f.write(f'agent_token = "{spec["agent_token"]}"\n')
-            f.write(f'register_token = "{spec["register_token"]}"\n')
+            assigned[least_loaded].append(hostname)
 
-        tf_vars = [
-            "-var-file=terraform.runtime.tfvars",
-            f"-var=instance_count={count}",
-        ]
+        common_tfvars = self._runtime_tfvars(spec, gpu_support)
+        _write_runtime_tfvars(runtime_file, common_tfvars, owned[0] + assigned[0])
+
+        tf_vars = [f"-var-file={_RUNTIME_TFVARS}"]
         try:
             sg_id = current_instance_security_group(region=self._region)
             tf_vars.append(f"-var=allocator_sg_id={sg_id}")
@@ -242,47 +428,52 @@ class AWSProvider:
             # Caller may log; we just skip the SG var.
             pass
 
-        # Plan + audit + apply sequence (verbatim from main.py:542-602)
-        plan_file = "tfplan.binary"
-        plan_file_path = tofu_dir / plan_file
-        try:
-            subprocess.run(
-                ["tofu", "plan", "-no-color", "-out", plan_file, *tf_vars],
-                cwd=tofu_dir, check=True, capture_output=True, text=True,
+        if any(assigned[1:]):
+            shared = self._ensure_shared_resources(
+                primary, tf_vars, output_callback,
             )
-            show = subprocess.run(
-                ["tofu", "show", "-json", plan_file],
-                cwd=tofu_dir, check=True, capture_output=True, text=True,
+            shard_tfvars = common_tfvars + "".join(
+                f'shared_{name} = "{value}"\n'
+                for name, value in shared.items()
             )
-            plan_json = json.loads(show.stdout)
-            audit_tofu_plan(plan_json)  # may raise SGAuditFailure
-
-            resources_total = sum(
-                1
-                for rc in plan_json.get("resource_changes", [])
-                if "create" in (rc.get("change") or {}).get("actions", [])
+            for i in range(1, len(workspaces)):
+                if assigned[i]:
+                    _write_runtime_tfvars(
+                        workspaces[i] / _RUNTIME_TFVARS,
+                        shard_tfvars,
+                        owned[i] + assigned[i],
+                    )
+
+        # Plan + audit every shard, then apply them concurrently.
+        active = [i for i in range(len(workspaces)) if assigned[i]]
+        plan_file = "tfplan.binary"
+        try:
+            totals = _in_parallel(
+                lambda i: _plan_workspace(
+                    workspaces[i],
+                    ["tofu", "plan", "-no-color", "-out", plan_file, *tf_vars,
+                     *_target_args(assigned[i])],
+                    plan_file,
+                    action="create",
+                    audit=True,
+                ),
+                active,
             )
-            if progress_callback:
-                progress_callback(0, resources_total)
-
-            completed = 0
-
-            def _on_resource_complete() -> None:
-                nonlocal completed
-                completed += 1
-                if progress_callback:
-                    progress_callback(completed, resources_total)
-
-            apply_result = _run_streamed(
-                ["tofu", "apply", "-auto-approve", plan_file],
-                cwd=tofu_dir,
-                resource_complete_re=_CREATE_COMPLETE_RE,
-                on_resource_complete=_on_resource_complete,
+            progress = Progress(sum(totals), progress_callback)
+            apply_results = _in_parallel(
+                lambda i: self._apply(
+                    workspaces[i], plan_file, _CREATE_COMPLETE_RE, progress,
+                    output_callback,
+                ),
+                active,
             )
         finally:
-            plan_file_path.unlink(missing_ok=True)
+            for i in active:
+                (workspaces[i] / plan_file).unlink(missing_ok=True)
 
-        clean_stdout = strip_ansi(apply_result.stdout)
+        clean_stdout = "".join(
+            strip_ansi(r.stdout) for r in apply_results
+        )
 
         # Upload runtime tfvars to S3 (moved from main.py:614-620)
         upload_to_s3(
@@ -293,18 +484,36 @@ class AWSProvider:
             deployment_name=spec.get("deployment_name", "lablink"),
         )
 
-        # Read back the freshly-created instances + timings
-        ids = get_instance_ids(tofu_dir=str(tofu_dir))
-        names = get_instance_names(tofu_dir=str(tofu_dir))
-        timings = get_instance_timings(tofu_dir=str(tofu_dir))
-
-        handles = [
-            ClientHandle(
-                id=i, hostname=n,
-                provider_metadata={"region": self._region},
+        # Read back the freshly-created instances + timings; the outputs
+        # cover each shard's whole fleet, so keep only the hosts this call
+        # added.
+        added = set(new_hostnames)
+        handles: list[ClientHandle] = []
+        timings: dict = {}
+        for i in active:
+            workdir = str(workspaces[i])
+            ids = get_instance_ids(tofu_dir=workdir)
+            names = get_instance_names(tofu_dir=workdir)
+            private_ips = (
+                _private_ips_by_name(workdir, names)
+                if added.intersection(names) else {}
+            )
+            handles.extend(
+                ClientHandle(
+                    id=iid, hostname=n,
+                    provider_metadata={
+                        "region": self._region,
+                        **({"private_ip": private_ips[n]}
+                           if n in private_ips else {}),
+                    },
+                )
+                for iid, n in zip(ids, names)
+                if n in added
+            )
+            timings.update(
+                (n, t) for n, t in get_instance_timings(tofu_dir=workdir).items()
+                if n in added
             )
-            for i, n in zip(ids, names)
-        ]
         return ProvisionResult(
             handles=handles, timings=timings, apply_stdout=clean_stdout,
         )
@@ -313,15 +522,21 @@ class AWSProvider:
         self,
         handles: list[ClientHandle],
         progress_callback: Optional[Callable[[int, int], None]] = None,
+        output_callback: Optional[Callable[[str], None]] = None,
     ) -> DestroyResult:
-        """Plan, then apply, a full-workspace destroy. `handles` is
-        accepted for protocol consistency but not used for per-handle
-        filtering — OpenTofu destroy operates against the whole state
-        file. Mirrors provision_hosts's plan+show+apply sequence (added
-        so resources_total can be computed exactly the same way
+        """Plan, then apply, a destroy of `handles` — or of the whole
+        workspace when `handles` is empty. A non-empty list targets only
+        those hosts' resources and drops them from the runtime tfvars'
+        `instance_names`, leaving the rest of the fleet untouched.
+        Mirrors provision_hosts's plan+show+apply sequence (added so
+        resources_total can be computed exactly the same way
         provision_hosts computes it for creates) instead of the single
         `tofu destroy` call this method used before.
 
+        Every launched shard is planned first; on a full destroy the shard
+        applies run concurrently and the primary workspace goes last,
+        since it owns the security group the shards' instances use.
+
         Raises FileNotFoundError if no runtime tfvars exists (signals
         "no client VMs were ever launched" — route handler maps this to 404).
         """
@@ -329,14 +544,13 @@ class AWSProvider:
             raise RuntimeError(
                 "AWSProvider not configured with tofu_dir — cannot destroy."
             )
-        tofu_dir = Path(self._tofu_dir)
-        runtime_file = tofu_dir / "terraform.runtime.tfvars"
-        if not runtime_file.exists():
+        if not (Path(self._tofu_dir) / _RUNTIME_TFVARS).exists():
             raise FileNotFoundError(
                 "tfvars does not exist — no client VMs were launched"
             )
+        workspaces = self._launched_workspaces()
 
-        var_args = ["-var-file=terraform.runtime.tfvars"]
+        var_args = [f"-var-file={_RUNTIME_TFVARS}"]
         try:
             sg_id = current_instance_security_group(region=self._region)
             var_args.append(f"-var=allocator_sg_id={sg_id}")
@@ -344,42 +558,200 @@ class AWSProvider:
             # Caller may log; we just skip the SG var.
             pass
 
+        # No handles = whole workspace; otherwise only those hosts.
+        hostnames = [h.hostname for h in handles]
+        if not hostnames:
+            targets: list[list[str]] = [[] for _ in workspaces]
+            stages = [list(range(1, len(workspaces))), [0]]
+        elif len(workspaces) == 1:
+            targets = [hostnames]
+            stages = [[0]]
+        else:
+            owned = _in_parallel(self._existing_hostnames, workspaces)
+            targets = [
+                [h for h in hostnames if h in hosts] for hosts in owned
+            ]
+            stages = [[i for i, t in enumerate(targets) if t]]
+        involved = [i for stage in stages for i in stage]
+
         plan_file = "tfplan-destroy.binary"
-        plan_file_path = tofu_dir / plan_file
+        results = []
         try:
-            subprocess.run(
-                ["tofu", "plan", "-destroy", "-no-color",
-                 "-out", plan_file, *var_args],
-                cwd=tofu_dir, check=True, capture_output=True, text=True,
+            totals = _in_parallel(
+                lambda i: _plan_workspace(
+                    workspaces[i],
+                    ["tofu", "plan", "-destroy", "-no-color",
+                     "-out", plan_file, *var_args, *_target_args(targets[i])],
+                    plan_file,
+                    action="delete",
+                    audit=False,
+                ),
+                involved,
             )
-            show = subprocess.run(
-                ["tofu", "show", "-json", plan_file],
-                cwd=tofu_dir, check=True, capture_output=True, text=True,
-            )
-            plan_json = json.loads(show.stdout)
-            resources_total = sum(
-                1
-                for rc in plan_json.get("resource_changes", [])
-                if "delete" in (rc.get("change") or {}).get("actions", [])
+            progress = Progress(sum(totals), progress_callback)
+            for stage in stages:
+                results.extend(_in_parallel(
+                    lambda i: self._apply(
+                        workspaces[i], plan_file, _DESTROY_COMPLETE_RE,
+                        progress, output_callback,
+                    ),
+                    stage,
+                ))
+        finally:
+            for i in involved:
+                (workspaces[i] / plan_file).unlink(missing_ok=True)
+
+        if hostnames:
+            for i in involved:
+                _write_instance_names(
+                    workspaces[i] / _RUNTIME_TFVARS,
+                    self._existing_hostnames(workspaces[i]),
+                )
+
+        return DestroyResult(
+            stdout="".join(strip_ansi(r.stdout) for r in results),
+        )
+
+    def _workspaces(self) -> list[Path]:
+        """The primary workspace followed by its shard workspaces. Only
+        computes the paths; see _prepare_workspaces."""
+        tofu_dir = Path(self._tofu_dir)
+        return [tofu_dir] + [
+            shard_dir(str(tofu_dir), index) for index in range(1, self._shards)
+        ]
+
+    def _prepare_workspaces(self) -> list[Path]:
+        """_workspaces, with every shard directory created and its links
+        to the primary's configuration refreshed."""
+        tofu_dir = Path(self._tofu_dir)
+        return [tofu_dir] + [
+            prepare_shard_dir(str(tofu_dir), index)
+            for index in range(1, self._shards)
+        ]
+
+    def tofu_workspaces(self) -> list[tuple[Path, str]]:
+        """(working directory, state key prefix) of every workspace, for
+        `tofu init` at allocator startup. Shard directories are created
+        on the way."""
+        return [
+            (workdir, "client" if index == 0 else f"client/shard-{index}")
+            for index, workdir in enumerate(self._prepare_workspaces())
+        ]
+
+    def _launched_workspaces(self) -> list[Path]:
+        """Workspaces that have been launched into (have a runtime tfvars).
+        The primary is always included."""
+        workspaces = self._workspaces()
+        return workspaces[:1] + [
+            w for w in workspaces[1:] if (w / _RUNTIME_TFVARS).exists()
+        ]
+
+    def _apply(
+        self,
+        workdir: Path,
+        plan_file: str,
+        resource_complete_re: "re.Pattern[str]",
+        progress: "Progress",
+        output_callback: Optional[Callable[[str], None]] = None,
+    ) -> subprocess.CompletedProcess:
+        return _run_streamed(
+            ["tofu", "apply", "-auto-approve",
+             f"-parallelism={self._parallelism}", plan_file],
+            cwd=workdir,
+            resource_complete_re=resource_complete_re,
+            on_resource_complete=progress.step,
+            on_line=output_callback,
+        )
+
+    def _ensure_shared_resources(
+        self,
+        primary: Path,
+        tf_vars: list[str],
+        output_callback: Optional[Callable[[str], None]] = None,
+    ) -> dict:
+        """Return the primary workspace's shared resource IDs, creating the
+        resources first (a plan targeting only them) if this deployment
+        has never launched into the primary."""
+        shared = get_shared_resources(str(primary))
+        if shared.get("security_group_id"):
+            return shared
+        plan_file = "tfplan-shared.binary"
+        try:
+            _plan_workspace(
+                primary,
+                ["tofu", "plan", "-no-color", "-out", plan_file, *tf_vars,
+                 *(f"-target={r}" for r in _SHARED_RESOURCES)],
+                plan_file,
+                action="create",
+                audit=True,
             )
-            if progress_callback:
-                progress_callback(0, resources_total)
-
-            completed = 0
-
-            def _on_resource_complete() -> None:
-                nonlocal completed
-                completed += 1
-                if progress_callback:
-                    progress_callback(completed, resources_total)
-
-            result = _run_streamed(
-                ["tofu", "apply", "-auto-approve", plan_file],
-                cwd=tofu_dir,
-                resource_complete_re=_DESTROY_COMPLETE_RE,
-                on_resource_complete=_on_resource_complete,
+            self._apply(
+                primary, plan_file, _CREATE_COMPLETE_RE, Progress(0),
+                output_callback,
             )
         finally:
-            plan_file_path.unlink(missing_ok=True)
-
-        return DestroyResult(stdout=strip_ansi(result.stdout))
+            (primary / plan_file).unlink(missing_ok=True)
+        return get_shared_resources(str(primary))
+
+    def _runtime_tfvars(self, spec: dict, gpu_support: str) -> str:
+        """Runtime tfvars shared by every workspace (moved verbatim from
+        main.py); `instance_names` is appended per workspace."""
+        return "".join([
+            f'allocator_ip = "{spec["allocator_ip"]}"\n',
+            f'allocator_url = "{spec["allocator_url"]}"\n',
+            f'machine_type = "{spec["machine_type"]}"\n',
+            f'image_name = "{spec["image_name"]}"\n',
+            # cfg.machine.repository is Optional and defaults to None; an
+            # f-string over Python None writes the literal string "None",
+            # which reaches client start.sh as TUTORIAL_REPO_TO_CLONE="None"
+            # and makes every VM boot attempt `git clone None` (and log its
+            # failure). Empty string is the "no repo" value start.sh skips.
+            f'repository = "{spec["repository"] or ""}"\n',
+            f'client_ami_id = "{spec["client_ami_id"]}"\n',
+            f'subject_software = "{spec["subject_software"]}"\n',
+            f'resource_prefix = "{spec["resource_prefix"]}"\n',
+            f'gpu_support = "{gpu_support}"\n',
+            f'cloud_init_output_log_group = '
+            f'"{spec["cloud_init_output_log_group"]}"\n',
+            f'region = "{self._region}"\n',
+            f'startup_on_error = "{spec["startup_on_error"]}"\n',
+            f'startup_max_attempts = {spec["startup_max_attempts"]}\n',
+            f'startup_base_delay_seconds = '
+            f'{spec["startup_base_delay_seconds"]}\n',
+            f'startup_success_check_b64 = '
+            f'"{spec["startup_success_check_b64"]}"\n',
+            f'agent_token = "{spec["agent_token"]}"\n',
+            f'register_token = "{spec["register_token"]}"\n',
+        ])
+
+    def _existing_hostnames(
+        self, tofu_dir: Path, resource_prefix: str | None = None,
+    ) -> list[str]:
+        """Hostnames of the client VMs currently in state.
+
+        When `resource_prefix` is given, count-indexed addresses left by a
+        workspace created before the switch to for_each are first moved
+        to their hostname keys (index N held `<prefix>-vm-<N+1>`), so the
+        upgrade neither recreates nor orphans running VMs.
+        """
+        addresses = get_state_addresses(str(tofu_dir))
+        if resource_prefix is not None:
+            for address in addresses:
+                m = _INDEXED_HOST_RE.match(address)
+                if not m:
+                    continue
+                resource, index = m.group(1), int(m.group(2))
+                subprocess.run(
+                    ["tofu", "state", "mv", address,
+                     f'{resource}["{resource_prefix}-vm-{index + 1}"]'],
+                    cwd=tofu_dir, check=True, capture_output=True, text=True,
+                )
+            if any(_INDEXED_HOST_RE.match(a) for a in addresses):
+                addresses = get_state_addresses(str(tofu_dir))
+        return sorted(
+            (
+                m.group(1) for m in map(_KEYED_INSTANCE_RE.match, addresses)
+                if m
+            ),
+            key=hostname_sort_key,
+        )
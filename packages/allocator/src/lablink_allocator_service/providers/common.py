@@ -0,0 +1,61 @@
+"""Helpers shared by the compute providers.
+
+Hostname numbering and progress counting are part of the behavior every
+provider promises the allocator core (see `protocol.py`), so they live
+here rather than inside any one backend.
+"""
+from __future__ import annotations
+
+import re
+import threading
+from typing import Callable, Optional
+
+_VM_SUFFIX_RE = re.compile(r"-vm-(\d+)$")
+
+
+def hostname_sort_key(hostname: str) -> tuple[int, str]:
+    """Order `<prefix>-vm-<n>` hostnames numerically (vm-2 before vm-10)."""
+    m = _VM_SUFFIX_RE.search(hostname)
+    return (int(m.group(1)) if m else 0, hostname)
+
+
+def next_hostnames(
+    prefix: str, existing: list[str], count: int, last_number: int = 0,
+) -> list[str]:
+    """Pick `count` new hostnames numbered after the highest existing one,
+    or after `last_number` (the highest ever handed out) when that is
+    higher.
+
+    Numbers freed by a targeted destroy are deliberately not reused, so a
+    replacement VM never shares a name with a host that might still be
+    shutting down and reporting in. `existing` alone can't guarantee that
+    once the highest-numbered host is gone, so callers pass the
+    persisted `last_number` too.
+    """
+    highest = max(
+        [last_number, *(hostname_sort_key(h)[0] for h in existing)],
+    )
+    return [f"{prefix}-vm-{highest + i}" for i in range(1, count + 1)]
+
+
+class Progress:
+    """(completed, total) resource counter shared by concurrent applies."""
+
+    def __init__(
+        self,
+        total: int,
+        callback: Optional[Callable[[int, int], None]] = None,
+    ):
+        self._lock = threading.Lock()
+        self._total = total
+        self._completed = 0
+        self._callback = callback
+        if callback:
+            callback(0, total)
+
+    def step(self) -> None:
+        with self._lock:
+            self._completed += 1
+            # Report under the lock so the callback sees a monotonic count.
+            if self._callback:
+                self._callback(self._completed, self._total)
@@ -5,6 +5,7 @@ from lablink_allocator_service.client_session import (
     BrowserSessionTarget,
     RotationFailed,
     prepare_browser_session,
+    stage_browser_session,
 )
 from lablink_allocator_service.providers.protocol import ClientJoinMaterial
 from lablink_allocator_service.get_config import get_config
@@ -44,6 +45,10 @@ class AllocatorProxiedClientConnectivity:
         kwargs.setdefault("fallback_fn", _aws_fallback_ip)
         return prepare_browser_session(**kwargs)
 
+    def stage_browser_session(self, **kwargs) -> None:
+        kwargs.setdefault("fallback_fn", _aws_fallback_ip)
+        stage_browser_session(**kwargs)
+
     def make_join_material(
         self,
         *,
@@ -28,10 +28,48 @@ class LANDirectClientConnectivity:
             client_image=client_image,
         )
 
+    def stage_browser_session(
+        self, *, database, hostname: str, agent_token: str,
+    ) -> None:
+        lan_ip = database.get_lan_ip(hostname)
+        if not lan_ip:
+            raise RotationFailed(
+                f"no LAN IP recorded for manual client {hostname}"
+            )
+        # 8 chars, for the same reason as in prepare_browser_session.
+        password = secrets.token_urlsafe(6)
+        client_session._post_rotate(
+            f"http://{lan_ip}:7070/api/session/start",
+            {"password": password},
+            bearer=agent_token,
+        )
+        client_session._store_staged(
+            database, hostname, password, f"{lan_ip}:6080"
+        )
+
     def prepare_browser_session(
         self, *, database, hostname: str, session_id: uuid.UUID,
-        browser_token: str, agent_token: str,
+        browser_token: str, agent_token: str, use_staged: bool = False,
     ) -> BrowserSessionTarget:
+        if use_staged:
+            with database._cursor as cursor:
+                cursor.execute(
+                    f"UPDATE {database.table_name} "
+                    f"SET sessionid = %s, browsertoken = %s, "
+                    f"    browser_ws_url = 'ws://' || stagedupstream, "
+                    f"    browser_credential = stagedvncpassword, "
+                    f"    sessionstartedat = NOW(), "
+                    f"    stagedvncpassword = NULL, stagedupstream = NULL "
+                    f"WHERE hostname = %s AND stagedvncpassword IS NOT NULL "
+                    f"RETURNING browser_ws_url, browser_credential",
+                    (str(session_id), browser_token, hostname),
+                )
+                row = cursor.fetchone()
+            if row is not None:
+                return BrowserSessionTarget(
+                    ws_url=row[0], browser_credential=row[1]
+                )
+
         lan_ip = database.get_lan_ip(hostname)
         if not lan_ip:
             raise RotationFailed(
@@ -56,7 +94,8 @@ class LANDirectClientConnectivity:
                 f"UPDATE {database.table_name} "
                 f"SET sessionid = %s, browsertoken = %s, "
                 f"    browser_ws_url = %s, browser_credential = %s, "
-                f"    sessionstartedat = NOW() "
+                f"    sessionstartedat = NOW(), "
+                f"    stagedvncpassword = NULL, stagedupstream = NULL "
                 f"WHERE hostname = %s",
                 (str(session_id), browser_token, ws_url, password, hostname),
             )
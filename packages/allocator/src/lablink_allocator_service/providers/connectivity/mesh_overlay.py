@@ -9,6 +9,7 @@ from lablink_allocator_service.client_session import (
     BrowserSessionTarget,
     RotationFailed,
     prepare_browser_session,
+    stage_browser_session,
 )
 from lablink_allocator_service.providers.protocol import ClientJoinMaterial
 from lablink_allocator_service.get_config import get_config
@@ -46,6 +47,10 @@ class MeshOverlayClientConnectivity:
         kwargs.setdefault("fallback_fn", _resolve_overlay_host)
         return prepare_browser_session(**kwargs)
 
+    def stage_browser_session(self, **kwargs) -> None:
+        kwargs.setdefault("fallback_fn", _resolve_overlay_host)
+        stage_browser_session(**kwargs)
+
     def make_join_material(
         self,
         *,
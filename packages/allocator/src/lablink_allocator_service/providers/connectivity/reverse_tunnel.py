@@ -12,6 +12,7 @@ from lablink_allocator_service.client_session import (
     BrowserSessionTarget,
     RotationFailed,
     prepare_browser_session,
+    stage_browser_session,
 )
 from lablink_allocator_service.providers.protocol import ClientJoinMaterial
 
@@ -45,6 +46,10 @@ class ReverseTunnelClientConnectivity:
         kwargs.setdefault("fallback_fn", _resolve_tunnel_alias)
         return prepare_browser_session(**kwargs)
 
+    def stage_browser_session(self, **kwargs) -> None:
+        kwargs.setdefault("fallback_fn", _resolve_tunnel_alias)
+        stage_browser_session(**kwargs)
+
     def make_join_material(
         self,
         *,
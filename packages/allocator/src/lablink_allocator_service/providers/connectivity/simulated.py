@@ -0,0 +1,51 @@
+"""Simulated connectivity for SimulatedProvider hosts: the same session
+bookkeeping as lan_direct, minus the agent call. A simulated host has no
+agent or KasmVNC, so every rotation succeeds and the desktop URL points
+at a reserved ``.invalid`` name the browser will never reach."""
+from __future__ import annotations
+
+import secrets
+import uuid
+
+from lablink_allocator_service import client_session
+from lablink_allocator_service.client_session import BrowserSessionTarget
+from lablink_allocator_service.providers.connectivity.lan_direct import (
+    LANDirectClientConnectivity,
+)
+
+
+def _upstream(hostname: str) -> str:
+    return f"{hostname}.invalid:6080"
+
+
+class SimulatedClientConnectivity(LANDirectClientConnectivity):
+    name = "simulated"
+    requires_tailscale_check = False
+
+    def stage_browser_session(
+        self, *, database, hostname: str, agent_token: str,
+    ) -> None:
+        client_session._store_staged(
+            database, hostname, secrets.token_urlsafe(6), _upstream(hostname)
+        )
+
+    def prepare_browser_session(
+        self, *, database, hostname: str, session_id: uuid.UUID,
+        browser_token: str, agent_token: str, use_staged: bool = False,
+    ) -> BrowserSessionTarget:
+        # Nothing to rotate, so a staged credential saves nothing: always
+        # mint a fresh one (which clears the staged columns, as a real
+        # rotation does).
+        password = secrets.token_urlsafe(6)
+        ws_url = f"ws://{_upstream(hostname)}"
+        with database._cursor as cursor:
+            cursor.execute(
+                f"UPDATE {database.table_name} "
+                f"SET sessionid = %s, browsertoken = %s, "
+                f"    browser_ws_url = %s, browser_credential = %s, "
+                f"    sessionstartedat = NOW(), "
+                f"    stagedvncpassword = NULL, stagedupstream = NULL "
+                f"WHERE hostname = %s",
+                (str(session_id), browser_token, ws_url, password, hostname),
+            )
+        return BrowserSessionTarget(ws_url=ws_url, browser_credential=password)
@@ -22,6 +22,7 @@ class ManualProvider:
     can_provision_hosts = False
     can_destroy_hosts = False
     can_recover_hosts = False
+    can_stop_hosts = False
 
     def __init__(self, *, region=None, tofu_dir=None,
                  client_connectivity=None, **_):
@@ -31,13 +32,18 @@ class ManualProvider:
             else LANDirectClientConnectivity()
         )
 
-    def provision_hosts(self, count, spec, progress_callback=None):
+    def provision_hosts(
+        self, count, spec, progress_callback=None, output_callback=None,
+        vm_number_callback=None,
+    ):
         raise ProvisioningNotSupported(
             "ManualProvider doesn't provision — instructor brings the "
             "machines. Use 'lablink launch' for the registration command."
         )
 
-    def destroy_hosts(self, handles, progress_callback=None):
+    def destroy_hosts(
+        self, handles, progress_callback=None, output_callback=None,
+    ):
         raise ProvisioningNotSupported(
             "ManualProvider cannot destroy BYO machines."
         )
@@ -48,6 +54,16 @@ class ManualProvider:
             "via docker --restart + idempotent re-registration."
         )
 
+    def stop_hosts(self, handles):
+        raise ProvisioningNotSupported(
+            "ManualProvider cannot stop BYO machines."
+        )
+
+    def start_hosts(self, handles):
+        raise ProvisioningNotSupported(
+            "ManualProvider cannot start BYO machines."
+        )
+
     def get_host_access(self, hostname):
         # ManualProvider.can_recover_hosts is False; _reboot_vm gates on
         # this capability flag before ever calling get_host_access, so
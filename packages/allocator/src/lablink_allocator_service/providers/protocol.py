@@ -66,6 +66,10 @@ class ClientConnectivity(Protocol):
 
     def prepare_browser_session(self, **kwargs) -> BrowserSessionTarget: ...
 
+    # Rotates an idle seat's password ahead of assignment (see
+    # SessionStagingService); raises RotationFailed like the above.
+    def stage_browser_session(self, **kwargs) -> None: ...
+
     def make_join_material(self, **kwargs) -> ClientJoinMaterial: ...
 
 
@@ -76,20 +80,28 @@ class ComputeProvider(Protocol):
     can_provision_hosts: bool
     can_destroy_hosts: bool
     can_recover_hosts: bool
+    can_stop_hosts: bool
 
     def provision_hosts(
         self,
         count: int,
         spec: dict,
         progress_callback: Callable[[int, int], None] | None = None,
+        output_callback: Callable[[str], None] | None = None,
+        vm_number_callback: Callable[[int], None] | None = None,
     ) -> ProvisionResult: ...
     def destroy_hosts(
         self,
         handles: list[ClientHandle],
         progress_callback: Callable[[int, int], None] | None = None,
+        output_callback: Callable[[str], None] | None = None,
     ) -> DestroyResult: ...
     # recover_hosts returns True iff every handle recycled OK
     def recover_hosts(self, handles: list[ClientHandle]) -> bool: ...
+    # stop_hosts/start_hosts return True iff every request was accepted;
+    # a stopped host keeps its disk, so starting it skips provisioning.
+    def stop_hosts(self, handles: list[ClientHandle]) -> bool: ...
+    def start_hosts(self, handles: list[ClientHandle]) -> bool: ...
     def list_hosts(self) -> list[ClientHandle]: ...
     def get_host_access(
         self, hostname: str
@@ -8,6 +8,7 @@ from importlib.metadata import entry_points
 
 from lablink_allocator_service.providers.aws import AWSProvider
 from lablink_allocator_service.providers.manual import ManualProvider
+from lablink_allocator_service.providers.simulated import SimulatedProvider
 from lablink_allocator_service.providers.connectivity.lan_direct import (
     LANDirectClientConnectivity,
 )
@@ -25,7 +26,11 @@ DEFAULT_PROVIDER = "aws"
 
 # Built-in fallback so the allocator works in editable/test installs where
 # entry-point metadata may not be regenerated.
-_BUILTIN: dict[str, type] = {"aws": AWSProvider, "manual": ManualProvider}
+_BUILTIN: dict[str, type] = {
+    "aws": AWSProvider,
+    "manual": ManualProvider,
+    "simulated": SimulatedProvider,
+}
 
 # Connectivity choices selectable for the "manual" provider only. Not an
 # entry-point-discovered registry (unlike _BUILTIN/providers) — this is a
@@ -59,6 +64,9 @@ def get_provider(
     region: str,
     tofu_dir: str,
     connectivity: str | None = None,
+    shards: int = 1,
+    parallelism: int = 10,
+    simulation=None,
 ) -> ComputeProvider:
     name = name or DEFAULT_PROVIDER
     providers = _discover()
@@ -80,4 +88,18 @@ def get_provider(
             tofu_dir=tofu_dir,
             client_connectivity=conn_cls(),
         )
-    return cls(region=region, tofu_dir=tofu_dir)
+    if name == "simulated":
+        # `simulation` is the `simulated` config section: latency medians,
+        # spread and failure rates, passed through as keyword arguments.
+        return cls(
+            region=region,
+            tofu_dir=tofu_dir,
+            parallelism=parallelism,
+            **dict(simulation or {}),
+        )
+    return cls(
+        region=region,
+        tofu_dir=tofu_dir,
+        shards=shards,
+        parallelism=parallelism,
+    )
@@ -0,0 +1,410 @@
+"""SimulatedProvider — a fake fleet for exercising the allocator at scale on
+one machine, with no cloud account and no client containers.
+
+Hosts exist only in this process. Creating or destroying one sleeps for a
+latency drawn from a log-normal distribution (median and spread from the
+``simulated`` config section), with at most ``provisioning.parallelism``
+in flight, and streams tofu-style lines and (completed, total) progress
+exactly as AWSProvider does. A created host registers itself in the VM
+table as 'initializing'; once its boot latency has passed, a background
+thread reports it 'running' and Healthy and then heartbeats every
+``heartbeat_seconds``, so OperationsWorker, AutoRebootService, the warm
+pool and the admin UI all see a live fleet.
+
+Failures are injected per host: a create can fail (the launch then ends
+in an error, keeping the hosts that did come up, like a partial apply), a
+boot can end in status 'error', and a running host can stop heartbeating
+until it is recovered. Recovering, stopping and starting hosts work like
+their EC2 counterparts, with a reboot reporting a fresh boot_id.
+
+Nothing survives an allocator restart: hosts the VM table still lists
+are no longer known to the provider, stop heartbeating, and can only be
+cleared with a full destroy.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from lablink_allocator_service.instrumentation import timed_iteration
+from lablink_allocator_service.providers.common import (
+    hostname_sort_key,
+    next_hostnames,
+    Progress,
+)
+from lablink_allocator_service.providers.connectivity.simulated import (
+    SimulatedClientConnectivity,
+)
+from lablink_allocator_service.providers.protocol import (
+    ClientHandle,
+    DestroyResult,
+    ProvisionResult,
+)
+
+logger = logging.getLogger(__name__)
+
+# How often the fleet thread looks for boots to finish and heartbeats due.
+TICK_SECONDS = 1.0
+
+
+def _db():
+    from lablink_allocator_service import main
+    return main.database
+
+
+def _resource(hostname: str) -> str:
+    return f'simulated_instance.client["{hostname}"]'
+
+
+def _iso(dt: datetime) -> str:
+    return dt.isoformat().replace("+00:00", "Z")
+
+
+@dataclass
+class _Host:
+    instance_id: str
+    boot_id: str
+    disk_free_pct: int
+    # "booting" -> "running" | "failed"; "running" -> "hung";
+    # any -> "stopped" -> "booting"
+    state: str
+    # Clock time the boot finishes ("booting") or the next heartbeat is
+    # sent ("running").
+    due: float
+
+
+class SimulatedProvider:
+    name = "simulated"
+    can_provision_hosts = True
+    can_destroy_hosts = True
+    can_recover_hosts = True
+    can_stop_hosts = True
+
+    def __init__(
+        self,
+        *,
+        region=None,
+        tofu_dir=None,
+        parallelism: int = 10,
+        create_seconds: float = 40.0,
+        boot_seconds: float = 120.0,
+        destroy_seconds: float = 30.0,
+        latency_spread: float = 0.25,
+        create_failure_rate: float = 0.0,
+        boot_failure_rate: float = 0.0,
+        hang_rate: float = 0.0,
+        heartbeat_seconds: float = 30.0,
+        clock=time.monotonic,
+        sleep=time.sleep,
+        rng: random.Random | None = None,
+        **_,
+    ):
+        self._parallelism = max(1, parallelism)
+        self.create_seconds = create_seconds
+        self.boot_seconds = boot_seconds
+        self.destroy_seconds = destroy_seconds
+        self.latency_spread = latency_spread
+        self.create_failure_rate = create_failure_rate
+        self.boot_failure_rate = boot_failure_rate
+        self.hang_rate = hang_rate
+        self.heartbeat_seconds = heartbeat_seconds
+        self.client_connectivity = SimulatedClientConnectivity()
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._hosts: dict[str, _Host] = {}
+        # Every hostname ever created, so a destroyed host's name is never
+        # handed out again (see next_hostnames).
+        self._names: set[str] = set()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def tofu_workspaces(self) -> list:
+        # No OpenTofu state to initialize.
+        return []
+
+    def stop(self):
+        """Stop the fleet thread. Hosts keep their state."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def provision_hosts(
+        self,
+        count: int,
+        spec: dict,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        output_callback: Optional[Callable[[str], None]] = None,
+        vm_number_callback: Optional[Callable[[int], None]] = None,
+    ) -> ProvisionResult:
+        """Create `count` hosts, at most `parallelism` at a time.
+
+        Each host takes its sampled create latency, then registers in the
+        VM table as 'initializing' and boots in the background. Only
+        spec["resource_prefix"] and spec["last_vm_number"] are used, to
+        name the hosts as AWSProvider does.
+
+        Raises:
+            RuntimeError: if any create failed. The hosts that were
+                created stay up, as after a partially failed apply.
+        """
+        with self._lock:
+            hostnames = next_hostnames(
+                spec.get("resource_prefix", "simulated"),
+                sorted(self._names),
+                count,
+                spec.get("last_vm_number", 0),
+            )
+            self._names.update(hostnames)
+        if vm_number_callback and hostnames:
+            vm_number_callback(hostname_sort_key(hostnames[-1])[0])
+        progress = Progress(count, progress_callback)
+        out = _Output(output_callback)
+        with ThreadPoolExecutor(
+            max_workers=min(self._parallelism, max(1, count)),
+        ) as pool:
+            created = [
+                r for r in pool.map(
+                    lambda h: self._create(h, progress, out), hostnames,
+                )
+                if r is not None
+            ]
+        self._ensure_running()
+        failed = count - len(created)
+        if failed:
+            raise RuntimeError(
+                f"Simulated create failed for {failed} of {count} host(s)"
+            )
+        out(
+            f"Apply complete! Resources: {count} added, 0 changed, "
+            f"0 destroyed."
+        )
+        return ProvisionResult(
+            handles=[handle for handle, _ in created],
+            timings={handle.hostname: t for handle, t in created},
+            apply_stdout=out.text(),
+        )
+
+    def destroy_hosts(
+        self,
+        handles: list[ClientHandle],
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        output_callback: Optional[Callable[[str], None]] = None,
+    ) -> DestroyResult:
+        """Destroy `handles`, or every host when `handles` is empty.
+        Unknown hosts are skipped."""
+        with self._lock:
+            hostnames = (
+                [h.hostname for h in handles if h.hostname in self._hosts]
+                if handles else sorted(self._hosts)
+            )
+        progress = Progress(len(hostnames), progress_callback)
+        out = _Output(output_callback)
+        with ThreadPoolExecutor(
+            max_workers=min(self._parallelism, max(1, len(hostnames))),
+        ) as pool:
+            list(pool.map(
+                lambda h: self._destroy(h, progress, out), hostnames,
+            ))
+        out(f"Destroy complete! Resources: {len(hostnames)} destroyed.")
+        return DestroyResult(stdout=out.text())
+
+    def recover_hosts(self, handles: list[ClientHandle]) -> bool:
+        """Reboot hosts, hung or failed ones included; each comes back
+        with a new boot_id after its boot latency. Returns True iff every
+        host is known and not stopped."""
+        return self._reboot(handles, from_states=("booting", "running",
+                                                  "failed", "hung"))
+
+    def stop_hosts(self, handles: list[ClientHandle]) -> bool:
+        """Stop hosts; they send nothing until started. Returns True iff
+        every host is known."""
+        all_ok = True
+        with self._lock:
+            for h in handles:
+                host = self._hosts.get(h.hostname)
+                if host is None:
+                    all_ok = False
+                    continue
+                host.state = "stopped"
+        return all_ok
+
+    def start_hosts(self, handles: list[ClientHandle]) -> bool:
+        """Start stopped hosts. Returns True iff every host is known and
+        was stopped."""
+        return self._reboot(handles, from_states=("stopped",))
+
+    def list_hosts(self) -> list[ClientHandle]:
+        with self._lock:
+            return [
+                ClientHandle(id=host.instance_id, hostname=hostname)
+                for hostname, host in sorted(self._hosts.items())
+            ]
+
+    def get_host_access(
+        self, hostname: str
+    ) -> tuple[str | None, str | None, str | None]:
+        # No address or key, so reboot.py skips SSH and recovers through
+        # recover_hosts.
+        with self._lock:
+            host = self._hosts.get(hostname)
+        return (host.instance_id if host else None, None, None)
+
+    def _latency(self, median: float) -> float:
+        if median <= 0 or self.latency_spread <= 0:
+            return max(median, 0.0)
+        return self._rng.lognormvariate(math.log(median), self.latency_spread)
+
+    def _create(self, hostname: str, progress: Progress, out: _Output):
+        """Create one host. Returns (handle, timing), or None on failure."""
+        out(f"{_resource(hostname)}: Creating...")
+        seconds = self._latency(self.create_seconds)
+        started = datetime.now(timezone.utc)
+        self._sleep(seconds)
+        if self._rng.random() < self.create_failure_rate:
+            out(
+                f"Error: creating {_resource(hostname)}: simulated "
+                f"create failure"
+            )
+            return None
+
+        instance_id = f"sim-{uuid.uuid4().hex[:17]}"
+        _db().register_client(
+            hostname=hostname,
+            machine_identity=instance_id,
+            provider=self.name,
+            endpoint_url=None,
+            provider_metadata={"instance_id": instance_id},
+            gpu_present=True,
+            gpu_model="Simulated GPU",
+            client_secret_hash=None,
+        )
+        _db().update_vm_status(hostname, "initializing")
+        with self._lock:
+            self._hosts[hostname] = _Host(
+                instance_id=instance_id,
+                boot_id=uuid.uuid4().hex,
+                disk_free_pct=self._rng.randint(40, 90),
+                state="booting",
+                due=self._clock() + self._latency(self.boot_seconds),
+            )
+        progress.step()
+        out(
+            f"{_resource(hostname)}: Creation complete after "
+            f"{seconds:.0f}s [id={instance_id}]"
+        )
+        timing = {
+            "start_time": _iso(started),
+            "end_time": _iso(started + timedelta(seconds=seconds)),
+            "seconds": seconds,
+        }
+        return ClientHandle(id=instance_id, hostname=hostname), timing
+
+    def _destroy(self, hostname: str, progress: Progress, out: _Output):
+        out(f"{_resource(hostname)}: Destroying...")
+        seconds = self._latency(self.destroy_seconds)
+        self._sleep(seconds)
+        with self._lock:
+            self._hosts.pop(hostname, None)
+        progress.step()
+        out(
+            f"{_resource(hostname)}: Destruction complete after "
+            f"{seconds:.0f}s"
+        )
+
+    def _reboot(self, handles: list[ClientHandle], from_states) -> bool:
+        all_ok = True
+        with self._lock:
+            for h in handles:
+                host = self._hosts.get(h.hostname)
+                if host is None or host.state not in from_states:
+                    all_ok = False
+                    continue
+                host.state = "booting"
+                host.boot_id = uuid.uuid4().hex
+                host.due = self._clock() + self._latency(self.boot_seconds)
+        self._ensure_running()
+        return all_ok
+
+    def _ensure_running(self):
+        """Start the fleet thread on first use, not at construction:
+        main.py builds the provider at import time."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        logger.info("Simulated fleet started")
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                with timed_iteration("simulated_fleet"):
+                    self._tick()
+            except Exception as e:
+                logger.error(f"Error in simulated fleet: {e}", exc_info=True)
+            self._stop_event.wait(TICK_SECONDS)
+
+    def _tick(self):
+        """Finish due boots and send due heartbeats."""
+        now = self._clock()
+        booted, failed, beats = [], [], []
+        with self._lock:
+            for hostname, host in self._hosts.items():
+                if host.due > now:
+                    continue
+                if host.state == "booting":
+                    if self._rng.random() < self.boot_failure_rate:
+                        host.state = "failed"
+                        failed.append(hostname)
+                        continue
+                    host.state = "running"
+                    booted.append(hostname)
+                elif host.state == "running":
+                    if self._rng.random() < self.hang_rate:
+                        host.state = "hung"
+                        logger.info(f"Simulated host {hostname} hung")
+                        continue
+                else:
+                    continue
+                host.due = now + self.heartbeat_seconds
+                beats.append((hostname, host.boot_id, host.disk_free_pct))
+
+        database = _db()
+        for hostname in failed:
+            database.update_vm_status(hostname, "error")
+        for hostname in booted:
+            database.update_vm_status(hostname, "running")
+            database.update_health(hostname, "Healthy")
+        for hostname, boot_id, disk_free_pct in beats:
+            database.record_heartbeat(hostname, boot_id, disk_free_pct)
+
+
+class _Output:
+    """Collects streamed output lines and forwards each to the callback."""
+
+    def __init__(self, callback: Optional[Callable[[str], None]] = None):
+        self._lock = threading.Lock()
+        self._lines: list[str] = []
+        self._callback = callback
+
+    def __call__(self, line: str) -> None:
+        with self._lock:
+            self._lines.append(line)
+            if self._callback:
+                self._callback(line)
+
+    def text(self) -> str:
+        with self._lock:
+            return "".join(line + "\n" for line in self._lines)
@@ -0,0 +1,273 @@
+"""Admission control for allocator requests.
+
+Every request holds a Flask thread, and most hold a pool connection, for
+as long as it runs. Without a limit, a client stuck in a report loop or
+a room full of students refreshing the landing page can take every
+connection and leave admin actions and auth callbacks to time out. Each
+request gets a priority class:
+
+* ``admin``: admin pages and APIs, and the proxy/tunnel auth callbacks
+  the desktop depends on. Never rate limited.
+* ``public``: the participant routes. One token bucket per route, shared
+  by everyone, since a classroom usually sits behind one NAT address.
+* ``telemetry``: client VM reports. One token bucket per route and
+  client, so one misbehaving client only throttles itself. The bucket is
+  taken once require_client_secret has authenticated the client, so a
+  caller cannot drain another VM's bucket by naming it.
+
+On top of the buckets, a global cap on requests in flight reserves the
+last slots for higher classes: telemetry is turned away once half of
+``max_in_flight`` is in use, public requests at 80%, and admin requests
+only at the cap itself. Long-lived requests that hold no pool connection
+(seat-queue long polls, operation streams, health probes) are exempt.
+
+A refused request gets 429 with Retry-After; the client reporters wait
+that long before trying again.
+"""
+
+import logging
+import math
+import threading
+import time
+
+from flask import g, jsonify, render_template, request
+
+logger = logging.getLogger(__name__)
+
+ADMIN = "admin"
+PUBLIC = "public"
+TELEMETRY = "telemetry"
+EXEMPT = "exempt"
+
+# Endpoint names (blueprint.view) per class; anything unlisted is admin.
+PUBLIC_ENDPOINTS = frozenset({
+    "public.home",
+    "public.submit_vm_details",
+    "public.claim_queued_seat",
+    "public.get_unassigned_instance_counts",
+    "registration.register_client",
+})
+TELEMETRY_ENDPOINTS = frozenset({
+    "vm_telemetry.update_inuse_status",
+    "vm_telemetry.update_gpu_health",
+    "vm_telemetry.heartbeat",
+    "vm_telemetry.update_vm_status",
+    "vm_telemetry.receive_vm_logs",
+    "vm_telemetry.receive_vm_metrics",
+    "metrics.post_session_metrics",
+    "registration.client_status",
+    "registration.report_overlay_hostname",
+})
+EXEMPT_ENDPOINTS = frozenset({
+    "public.seat_queue_status",
+    "provisioning.stream_operation",
+    "health.health_check",
+    "prometheus.metrics",
+    "static",
+})
+
+# Share of max_in_flight each class may fill.
+IN_FLIGHT_SHARE = {ADMIN: 1.0, PUBLIC: 0.8, TELEMETRY: 0.5}
+
+# Participant pages answer a refusal with the landing page, not JSON.
+PUBLIC_PAGES = frozenset({
+    "public.home",
+    "public.submit_vm_details",
+    "public.claim_queued_seat",
+})
+
+# Buckets idle long enough to have refilled are dropped once there are
+# more than this many.
+MAX_BUCKETS = 10000
+
+
+class TokenBucket:
+    """A token bucket holding up to `burst` tokens, refilled at `rate` per
+    second. Not thread-safe; AdmissionControl serializes access."""
+
+    def __init__(self, rate: float, burst: int, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+
+    def take(self, now: float) -> float:
+        """Take a token. Returns 0 if one was available, else the seconds
+        until one will be."""
+        self.tokens = min(
+            self.burst, self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def full(self, now: float) -> bool:
+        return self.tokens + (now - self.updated) * self.rate >= self.burst
+
+
+class AdmissionControl:
+    """Decides whether a request may run now.
+
+    Args:
+        max_in_flight: Requests allowed to run at once, across classes.
+        public_rate: Requests per second allowed on each public route.
+        public_burst: Public requests a route absorbs at once.
+        client_rate: Requests per second each client VM may make on each
+            telemetry route.
+        client_burst: Telemetry requests a client may make at once.
+        clock: Monotonic clock; tests pass a fake.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 150,
+        public_rate: float = 20.0,
+        public_burst: int = 100,
+        client_rate: float = 1.0,
+        client_burst: int = 10,
+        clock=time.monotonic,
+    ):
+        self.max_in_flight = max_in_flight
+        self.public_rate = public_rate
+        self.public_burst = public_burst
+        self.client_rate = client_rate
+        self.client_burst = client_burst
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buckets: dict[tuple, TokenBucket] = {}
+        self._in_flight = 0
+        self.rejected = {PUBLIC: 0, TELEMETRY: 0, ADMIN: 0}
+
+    @staticmethod
+    def classify(endpoint: str | None) -> str:
+        if endpoint in EXEMPT_ENDPOINTS or endpoint is None:
+            return EXEMPT
+        if endpoint in TELEMETRY_ENDPOINTS:
+            return TELEMETRY
+        if endpoint in PUBLIC_ENDPOINTS:
+            return PUBLIC
+        return ADMIN
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def admit(self, priority: str, endpoint: str):
+        """Admit one request, counting it as in flight.
+
+        Returns None if the request may run (the caller must then call
+        ``release``), or the number of whole seconds it should wait.
+        Telemetry requests are only held to the in-flight cap here; their
+        per-client bucket is ``admit_client``.
+        """
+        with self._lock:
+            now = self._clock()
+            limit = self.max_in_flight * IN_FLIGHT_SHARE[priority]
+            if self._in_flight >= limit:
+                self.rejected[priority] += 1
+                return 1
+            wait = 0.0
+            if priority == PUBLIC:
+                wait = self._bucket(
+                    (endpoint,), self.public_rate, self.public_burst, now
+                ).take(now)
+            if wait > 0:
+                self.rejected[priority] += 1
+                return max(1, math.ceil(wait))
+            self._in_flight += 1
+            return None
+
+    def admit_client(self, endpoint: str, client: str):
+        """Take a token from an authenticated client's bucket for a
+        telemetry route. Returns None, or the whole seconds to wait."""
+        with self._lock:
+            now = self._clock()
+            wait = self._bucket(
+                (endpoint, client), self.client_rate, self.client_burst, now
+            ).take(now)
+            if wait > 0:
+                self.rejected[TELEMETRY] += 1
+                return max(1, math.ceil(wait))
+            return None
+
+    def release(self) -> None:
+        """Mark an admitted request as finished."""
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+
+    def _bucket(self, key, rate, burst, now) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= MAX_BUCKETS:
+                self._buckets = {
+                    k: b for k, b in self._buckets.items() if not b.full(now)
+                }
+            bucket = self._buckets[key] = TokenBucket(rate, burst, now)
+        return bucket
+
+
+def client_key() -> str:
+    """Identify the client VM behind a telemetry request: the hostname
+    require_client_secret authenticated, else the peer address."""
+    return str(g.get("client_hostname") or request.remote_addr)
+
+
+def limit_client(hostname: str):
+    """Record the authenticated client of this request and take a token
+    from its telemetry bucket.
+
+    Called by require_client_secret once the secret checks out. Returns
+    the 429 response to send if the client is over its rate, else None.
+    """
+    g.client_hostname = hostname
+    admission = g.get("admitted_by")
+    if admission is None or admission.classify(request.endpoint) != TELEMETRY:
+        return None
+    retry_after = admission.admit_client(request.endpoint, hostname)
+    if retry_after is None:
+        return None
+    return _refuse(TELEMETRY, retry_after)
+
+
+def _refuse(priority: str, retry_after: int):
+    message = "The allocator is busy. Please try again in a few seconds."
+    if request.endpoint in PUBLIC_PAGES:
+        resp = render_template("index.html", error=message), 429
+    else:
+        resp = jsonify({"error": "Too many requests."}), 429
+    logger.debug(
+        f"Refused {priority} request to {request.endpoint} "
+        f"(retry after {retry_after}s)"
+    )
+    return resp[0], resp[1], {"Retry-After": str(retry_after)}
+
+
+def install(app, get_admission) -> None:
+    """Run every request of `app` through admission control.
+
+    `get_admission` returns the AdmissionControl in use, or None to let
+    everything through; it is called per request so the instance can be
+    set up (or swapped in tests) after the app is built.
+    """
+
+    @app.before_request
+    def _admit():
+        admission = get_admission()
+        if admission is None:
+            return None
+        priority = admission.classify(request.endpoint)
+        if priority == EXEMPT:
+            return None
+        retry_after = admission.admit(priority, request.endpoint)
+        if retry_after is not None:
+            return _refuse(priority, retry_after)
+        g.admitted_by = admission
+        return None
+
+    @app.teardown_request
+    def _release(exc):
+        admission = g.pop("admitted_by", None)
+        if admission is not None:
+            admission.release()
@@ -17,6 +17,7 @@ from datetime import datetime, timezone
 from threading import Thread, Event
 
 from lablink_allocator_service.db.vms import VmDatabase
+from lablink_allocator_service.instrumentation import timed_iteration
 
 logger = logging.getLogger(__name__)
 
@@ -75,7 +76,8 @@ class AutoRebootService:
         """Main loop that periodically checks for failed VMs."""
         while not self._stop_event.is_set():
             try:
-                self._check_and_reboot()
+                with timed_iteration("reboot"):
+                    self._check_and_reboot()
             except Exception as e:
                 logger.error(f"Error in auto-reboot check: {e}", exc_info=True)
             self._stop_event.wait(self.check_interval_seconds)
@@ -191,7 +193,26 @@ class AutoRebootService:
         """
         return self._ssh_reboot(ip, key_path, "sudo reboot")
 
-    def _reboot_vm(self, hostname: str, assigned: bool = False) -> bool:
+    def recycle(self, hostname: str) -> bool:
+        """Cold-reboot a VM whose seat was just released so the next
+        student gets a fresh container.
+
+        Unlike a failed-VM reboot this is not recorded as an attempt, so
+        recycling never counts toward max_attempts. The caller marks the
+        VM 'rebooting' first; a VM that then never reports back is picked
+        up by the stale-rebooting check like any other.
+
+        Args:
+            hostname: The VM hostname (matches EC2 Name tag).
+
+        Returns:
+            True if the reboot was initiated, False otherwise.
+        """
+        return self._reboot_vm(hostname, assigned=False, record=False)
+
+    def _reboot_vm(
+        self, hostname: str, assigned: bool = False, record: bool = True
+    ) -> bool:
         """Reboot a single VM by hostname.
 
         Tries two methods in order:
@@ -204,6 +225,8 @@ class AutoRebootService:
             hostname: The VM hostname (matches EC2 Name tag).
             assigned: True if the VM has a student assigned (useremail set).
                 Assigned VMs get a warm reboot to preserve the container.
+            record: Record the attempt (status 'rebooting', reboot_count)
+                once the reboot is initiated.
 
         Returns:
             True if reboot was initiated, False otherwise.
@@ -244,7 +267,8 @@ class AutoRebootService:
                 else self._ssh_cold_reboot
             )
             if ssh_reboot(ip, key_path):
-                self.database.record_reboot(hostname)
+                if record:
+                    self.database.record_reboot(hostname)
                 logger.info(
                     f"SSH {reboot_type} reboot initiated for VM "
                     f"'{hostname}' ({instance_id})"
@@ -266,7 +290,8 @@ class AutoRebootService:
             )
         ])
         if success:
-            self.database.record_reboot(hostname)
+            if record:
+                self.database.record_reboot(hostname)
             logger.info(
                 f"Stop/start initiated for VM '{hostname}' "
                 f"({instance_id})"
@@ -8,7 +8,12 @@ import logging
 from flask import Blueprint, current_app, jsonify, render_template, request
 
 from lablink_allocator_service.auth import auth
-from lablink_allocator_service.routes.health import connection_stats
+from lablink_allocator_service.db.query_stats import QUERY_STATS, SLOW_QUERY_MS
+from lablink_allocator_service.routes.health import (
+    connection_stats,
+    pg_statement_stats,
+)
+from lablink_allocator_service.tracing import TRACER, waterfall
 from lablink_allocator_service.utils.config_helpers import (
     canonical_base_url,
     is_self_signed_ssl,
@@ -44,6 +49,50 @@ def admin():
     )
 
 
+@bp.route("/admin/query-stats")
+@auth.login_required
+def query_stats():
+    """Statement fingerprints by total time, with pg_stat_statements beside
+    them when the extension is installed."""
+    return render_template(
+        "query-stats.html",
+        statements=QUERY_STATS.top(50),
+        since=QUERY_STATS.since,
+        slow_query_ms=SLOW_QUERY_MS,
+        pg_statements=pg_statement_stats(20),
+    )
+
+
+@bp.route("/admin/traces")
+@auth.login_required
+def traces():
+    """The kept request and operation traces, newest first."""
+    return render_template(
+        "traces.html",
+        traces=TRACER.recent(200),
+        enabled=TRACER.enabled,
+        min_duration_ms=TRACER.min_duration_ms,
+        buffer_traces=TRACER.buffer_traces,
+    )
+
+
+@bp.route("/admin/traces/<trace_id>")
+@auth.login_required
+def trace_detail(trace_id):
+    """One trace as a waterfall of its spans."""
+    spans = TRACER.get(trace_id.lower())
+    if spans is None:
+        return jsonify({"error": "Trace not found."}), 404
+    rows = waterfall(spans)
+    return render_template(
+        "trace.html",
+        trace_id=trace_id.lower(),
+        rows=rows,
+        total_ms=max(r["offset_ms"] + r["duration_ms"] for r in rows),
+        start=min(s.start_ns for s in spans) / 1e9,
+    )
+
+
 @bp.route("/admin/byo-onboarding")
 @auth.login_required
 def byo_onboarding():
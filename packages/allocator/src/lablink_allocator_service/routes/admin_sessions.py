@@ -126,6 +126,10 @@ def admin_release_vm(hostname):
     from lablink_allocator_service import main
 
     main.database.release_seat(hostname=hostname)
+    if main.seat_queue is not None:
+        main.seat_queue.notify()
+    if main.session_staging is not None:
+        main.session_staging.notify()
     return redirect("/admin/instances")
 
 
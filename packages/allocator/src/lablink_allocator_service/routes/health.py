@@ -8,16 +8,21 @@ a deployment stuck mid-startup is distinguishable from a healthy one: 200 +
 configured maximum. Deliberately a *separate* route: /api/health is polled in
 a tight loop by start.sh during boot and by `lablink deploy` afterwards, and
 neither should pay for a Postgres aggregate to learn whether the service is up.
+
+`GET /api/health/queries` reports where database time goes: this process's
+per-statement stats (see db/query_stats.py) and, when the extension is
+installed, pg_stat_statements.
 """
 import logging
 import subprocess
 import time
 
 import psycopg2
-from flask import Blueprint, current_app, jsonify
+from flask import Blueprint, current_app, jsonify, request
 
 from lablink_allocator_service.auth import auth
 from lablink_allocator_service.db.pool import PooledCursor
+from lablink_allocator_service.db.query_stats import QUERY_STATS
 
 bp = Blueprint("health", __name__)
 logger = logging.getLogger(__name__)
@@ -188,3 +193,39 @@ def connection_health():
     if stats is None:
         return jsonify({"status": "unavailable"}), 503
     return jsonify({"status": "ok", **stats}), 200
+
+
+def pg_statement_stats(limit: int = 20) -> list[dict] | None:
+    """pg_stat_statements' heaviest statements, or None if the extension is
+    missing or unreadable. Same degrade-don't-raise contract as
+    connection_stats()."""
+    from lablink_allocator_service import main
+
+    try:
+        return main.database.get_statement_stats(limit)
+    except Exception:
+        logger.warning("pg_stat_statements unavailable", exc_info=True)
+        return None
+
+
+@bp.route("/api/health/queries", methods=["GET"])
+@auth.login_required
+def query_health():
+    """Top statement fingerprints by total time in this process, alongside
+    pg_stat_statements (null when not installed). ``?limit=`` caps both."""
+    limit = min(max(request.args.get("limit", 50, type=int), 1), 500)
+    return jsonify(
+        {
+            "since": QUERY_STATS.since,
+            "statements": QUERY_STATS.top(limit),
+            "pg_stat_statements": pg_statement_stats(limit),
+        }
+    ), 200
+
+
+@bp.route("/api/health/queries/reset", methods=["POST"])
+@auth.login_required
+def reset_query_health():
+    """Clear this process's statement stats, e.g. before a load test."""
+    QUERY_STATS.reset()
+    return jsonify({"status": "reset"}), 200
@@ -0,0 +1,97 @@
+"""Memory diagnostics: RSS, on-demand tracemalloc, and snapshot diffs.
+
+All admin-only. A typical leak hunt: start tracing, take a "before"
+snapshot, let the workshop run, then diff "before" against now (or
+against a later named snapshot) to see which allocation sites grew. See
+memory.py for the store and the periodic log summary.
+"""
+import logging
+import tracemalloc
+
+from flask import Blueprint, jsonify, request
+
+from lablink_allocator_service.auth import auth
+from lablink_allocator_service.memory import GROUP_BY, SNAPSHOTS, rss_bytes
+
+bp = Blueprint("memory", __name__)
+logger = logging.getLogger(__name__)
+
+_NOT_TRACING = "tracemalloc is not running; POST /api/memory/tracing/start first."
+
+
+@bp.route("/api/memory", methods=["GET"])
+@auth.login_required
+def memory_status():
+    """RSS, tracing state and the stored snapshots."""
+    payload = {
+        "rss_bytes": rss_bytes(),
+        "tracing": SNAPSHOTS.tracing,
+        "snapshots": SNAPSHOTS.summaries(),
+    }
+    if SNAPSHOTS.tracing:
+        current, peak = tracemalloc.get_traced_memory()
+        payload["traced_bytes"] = current
+        payload["traced_peak_bytes"] = peak
+    return jsonify(payload), 200
+
+
+@bp.route("/api/memory/tracing/start", methods=["POST"])
+@auth.login_required
+def start_tracing():
+    """Start tracemalloc. Optional JSON body ``{"frames": 1-50}``."""
+    frames = (request.get_json(silent=True) or {}).get("frames", 10)
+    if not isinstance(frames, int) or not 1 <= frames <= 50:
+        return jsonify({"error": "frames must be an integer from 1 to 50."}), 400
+    SNAPSHOTS.start(frames)
+    return jsonify({"tracing": True}), 200
+
+
+@bp.route("/api/memory/tracing/stop", methods=["POST"])
+@auth.login_required
+def stop_tracing():
+    """Stop tracemalloc. Stored snapshots are kept."""
+    SNAPSHOTS.stop()
+    return jsonify({"tracing": False}), 200
+
+
+@bp.route("/api/memory/snapshots", methods=["POST"])
+@auth.login_required
+def take_snapshot():
+    """Take a named snapshot. JSON body ``{"name": "..."}``."""
+    name = (request.get_json(silent=True) or {}).get("name")
+    if not isinstance(name, str) or not name.strip():
+        return jsonify({"error": "name is required."}), 400
+    if not SNAPSHOTS.tracing:
+        return jsonify({"error": _NOT_TRACING}), 409
+    summary = SNAPSHOTS.take(name.strip())
+    logger.info(f"Took memory snapshot '{summary['name']}'")
+    return jsonify(summary), 201
+
+
+@bp.route("/api/memory/diff", methods=["GET"])
+@auth.login_required
+def diff_snapshots():
+    """Top allocation sites by growth from ``base`` to ``current`` (a fresh
+    snapshot when omitted). Optional ``limit`` (default 25, at most 200)
+    and ``group_by`` (lineno, filename or traceback)."""
+    base = request.args.get("base")
+    current = request.args.get("current")
+    limit = request.args.get("limit", 25, type=int)
+    group_by = request.args.get("group_by", "lineno")
+    if not base:
+        return jsonify({"error": "base is required."}), 400
+    if group_by not in GROUP_BY:
+        return jsonify(
+            {"error": f"group_by must be one of: {', '.join(GROUP_BY)}."}
+        ), 400
+    if current is None and not SNAPSHOTS.tracing:
+        return jsonify({"error": _NOT_TRACING}), 409
+    try:
+        rows = SNAPSHOTS.diff(
+            base, current, limit=min(max(limit, 1), 200), group_by=group_by
+        )
+    except KeyError as e:
+        return jsonify({"error": f"No snapshot named {e}."}), 404
+    return jsonify(
+        {"base": base, "current": current, "group_by": group_by, "top": rows}
+    ), 200
@@ -1,8 +1,11 @@
-"""Session metrics: client push, operator summary, and full export.
+"""Session metrics: client push, operator summary, and full export; and
+the per-launch startup-phase report.
 
 ``_session_metrics_view_model`` is shared by the HTML page and the JSON
 summary endpoint so the two cannot disagree on monitoring-enabled state,
-subject-software label, or summary numbers.
+subject-software label, or summary numbers. ``_startup_report_view_model``
+does the same for /admin/startup-report and /api/startup-report, which
+``lablink stats --startup`` reads.
 """
 import csv
 import io
@@ -112,6 +115,59 @@ def get_session_metrics_summary_json():
     return jsonify(_session_metrics_view_model()), 200
 
 
+def _startup_report_view_model(launches: int = 10) -> dict:
+    """Return the shared startup-report view model: per-launch phase
+    percentiles (see VmDatabase.get_startup_report), each phase's p50
+    change against the previous launch, and the client image, AMI and
+    machine type the launches used. ``launches`` is None when the query
+    failed."""
+    from lablink_allocator_service import main
+
+    cfg = main.cfg
+    machine = getattr(cfg, "machine", None)
+    report = main.database.get_startup_report(launches)
+    if report is not None:
+        for newer, older in zip(report, report[1:] + [None]):
+            for phase, stats in newer["phases"].items():
+                before = (older or {}).get("phases", {}).get(phase)
+                stats["p50_change_pct"] = (
+                    round(100 * (stats["p50"] - before["p50"]) / before["p50"], 1)
+                    if before and before["p50"]
+                    else None
+                )
+            for key in ("started_at", "finished_at"):
+                if hasattr(newer[key], "isoformat"):
+                    newer[key] = newer[key].isoformat()
+    return {
+        "deployment_name": getattr(cfg, "deployment_name", None),
+        "client_image": getattr(machine, "image", None),
+        "ami_id": getattr(machine, "ami_id", None),
+        "machine_type": getattr(machine, "machine_type", None),
+        "launches": report,
+    }
+
+
+@bp.route("/admin/startup-report", methods=["GET"])
+@auth.login_required
+def admin_startup_report():
+    """Render startup-phase percentiles and outlier hosts per launch."""
+    return render_template(
+        "startup-report.html", **_startup_report_view_model()
+    )
+
+
+@bp.route("/api/startup-report", methods=["GET"])
+@auth.login_required
+def get_startup_report_json():
+    """JSON startup report — same view model as /admin/startup-report.
+    Optional ``launches`` (default 10, at most 50)."""
+    launches = request.args.get("launches", 10, type=int)
+    body = _startup_report_view_model(min(max(launches, 1), 50))
+    if body["launches"] is None:
+        return jsonify({"error": "Failed to compute startup report."}), 500
+    return jsonify(body), 200
+
+
 @bp.route("/api/export-metrics", methods=["GET"])
 @auth.login_required
 def export_metrics():
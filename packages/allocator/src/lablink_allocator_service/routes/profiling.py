@@ -0,0 +1,66 @@
+"""On-demand CPU profile of the running allocator: ``GET /api/profile``.
+
+Holds the request open while profiler.sample() watches every thread, then
+answers with collapsed stacks or an SVG flamegraph. One profile at a time:
+overlapping ones would each sample the other's sampler.
+"""
+import logging
+import threading
+
+from flask import Blueprint, Response, jsonify, request
+
+from lablink_allocator_service import profiler
+from lablink_allocator_service.auth import auth
+
+bp = Blueprint("profiling", __name__)
+logger = logging.getLogger(__name__)
+
+MAX_SECONDS = 60
+_running = threading.Lock()
+
+
+@bp.route("/api/profile", methods=["GET"])
+@auth.login_required
+def profile():
+    """Sample all threads and return the profile.
+
+    Query parameters: ``seconds`` (default 10, at most 60), ``interval_ms``
+    (default 10, 1-1000), ``format`` (``svg``, the default, or
+    ``collapsed``), and ``idle=1`` to keep threads parked waiting for work.
+    """
+    seconds = request.args.get("seconds", 10, type=float)
+    interval_ms = request.args.get("interval_ms", 10, type=float)
+    fmt = request.args.get("format", "svg")
+    if not 0 < seconds <= MAX_SECONDS:
+        return jsonify(
+            {"error": f"seconds must be between 0 and {MAX_SECONDS}."}
+        ), 400
+    if not 1 <= interval_ms <= 1000:
+        return jsonify({"error": "interval_ms must be between 1 and 1000."}), 400
+    if fmt not in ("svg", "collapsed"):
+        return jsonify({"error": "format must be 'svg' or 'collapsed'."}), 400
+
+    if not _running.acquire(blocking=False):
+        return jsonify({"error": "A profile is already running."}), 409
+    try:
+        logger.info(
+            "Profiling all threads for %gs every %gms", seconds, interval_ms
+        )
+        counts = profiler.sample(
+            seconds,
+            interval_ms / 1000,
+            include_idle=request.args.get("idle") == "1",
+        )
+    finally:
+        _running.release()
+
+    if fmt == "collapsed":
+        return Response(
+            profiler.collapse(counts), content_type="text/plain; charset=utf-8"
+        )
+    return Response(
+        profiler.render_flamegraph(
+            counts, title=f"LabLink allocator, {seconds:g}s"
+        ),
+        content_type="image/svg+xml",
+    )
@@ -0,0 +1,187 @@
+"""Prometheus-format metrics: ``GET /metrics``.
+
+Answers scrapes from the allocator host itself without credentials, and
+anyone else only with admin Basic auth. "Local" means a loopback peer
+with no X-Forwarded-For/X-Real-IP header: nginx sets those on everything
+it proxies, so a request relayed from outside never passes as local.
+
+Besides serving the registry (see instrumentation.py), this blueprint
+times every request the app handles and registers the collectors that
+read pool, cache, admission, cadence, process memory and fleet state at
+scrape time.
+"""
+import time
+
+from flask import Blueprint, Response, g, request
+
+from lablink_allocator_service import instrumentation
+from lablink_allocator_service.auth import auth
+from lablink_allocator_service.instrumentation import REGISTRY
+from lablink_allocator_service.memory import rss_bytes
+
+bp = Blueprint("prometheus", __name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+_LOOPBACK = ("127.0.0.1", "::1")
+
+POOL_CONNECTIONS = REGISTRY.gauge(
+    "lablink_db_pool_connections",
+    "Connections held by the main pool, by state.",
+    ("state",),
+)
+POOL_MAX = REGISTRY.gauge(
+    "lablink_db_pool_max_connections",
+    "Maximum size of the main connection pool.",
+)
+CACHE_HITS = REGISTRY.counter(
+    "lablink_cache_hits_total",
+    "Lookups answered from an in-process cache.",
+    ("cache",),
+)
+CACHE_MISSES = REGISTRY.counter(
+    "lablink_cache_misses_total",
+    "Lookups an in-process cache could not answer.",
+    ("cache",),
+)
+CACHE_ENTRIES = REGISTRY.gauge(
+    "lablink_cache_entries",
+    "Entries held by an in-process cache.",
+    ("cache",),
+)
+REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "lablink_requests_in_flight",
+    "Requests admitted by admission control and still running.",
+)
+REQUESTS_REJECTED = REGISTRY.counter(
+    "lablink_requests_rejected_total",
+    "Requests refused with 429 by admission control, by priority class.",
+    ("priority",),
+)
+REPORT_INTERVAL_FACTOR = REGISTRY.gauge(
+    "lablink_report_interval_factor",
+    "Stretch applied to client report intervals (1 = base cadence).",
+)
+VMS = REGISTRY.gauge(
+    "lablink_vms",
+    "Client VMs by reported status.",
+    ("status",),
+)
+RESIDENT_MEMORY = REGISTRY.gauge(
+    "lablink_process_resident_memory_bytes",
+    "Resident set size of the allocator process.",
+)
+SEATS = REGISTRY.gauge(
+    "lablink_seats",
+    "Seats that are free (assignable now), assigned, or unhealthy.",
+    ("state",),
+)
+
+
+def _collect_pool():
+    from lablink_allocator_service import main
+
+    if main.database is None:
+        return
+    pool = main.database.pool
+    # psycopg2's pools keep these as private attributes; there is no
+    # public accessor.
+    POOL_CONNECTIONS.set(len(pool._used), state="in_use")
+    POOL_CONNECTIONS.set(len(pool._pool), state="idle")
+    POOL_MAX.set(pool.maxconn)
+
+
+def _collect_caches():
+    from lablink_allocator_service import main
+    from lablink_allocator_service.secret_hash import _verify_cache
+
+    caches = {"verify_result": _verify_cache}
+    if main.database is not None:
+        caches["secret_hash"] = main.database._secret_hash_cache
+    for name, cache in caches.items():
+        CACHE_HITS.set(cache.hits, cache=name)
+        CACHE_MISSES.set(cache.misses, cache=name)
+        CACHE_ENTRIES.set(len(cache), cache=name)
+
+
+def _collect_admission():
+    from lablink_allocator_service import main
+
+    if main.admission is not None:
+        REQUESTS_IN_FLIGHT.set(main.admission.in_flight)
+        for priority, count in main.admission.rejected.items():
+            REQUESTS_REJECTED.set(count, priority=priority)
+    if main.telemetry_cadence is not None:
+        REPORT_INTERVAL_FACTOR.set(main.telemetry_cadence.factor)
+
+
+def _collect_process():
+    rss = rss_bytes()
+    if rss is not None:
+        RESIDENT_MEMORY.set(rss)
+
+
+def _collect_fleet():
+    from lablink_allocator_service import main
+
+    if main.database is None:
+        return
+    counts = main.database.get_fleet_counts()
+    VMS.clear()
+    for status, n in counts["status"].items():
+        VMS.set(n, status=status)
+    for state in ("free", "assigned", "unhealthy"):
+        SEATS.set(counts[state], state=state)
+
+
+for _collect in (
+    _collect_pool,
+    _collect_caches,
+    _collect_admission,
+    _collect_process,
+    _collect_fleet,
+):
+    REGISTRY.add_collector(_collect)
+
+
+@bp.before_app_request
+def _start_timer():
+    g.request_started = time.perf_counter()
+
+
+@bp.after_app_request
+def _record_request(response):
+    endpoint = request.endpoint or "unmatched"
+    instrumentation.HTTP_REQUESTS.inc(
+        endpoint=endpoint, method=request.method, status=response.status_code
+    )
+    started = g.get("request_started")
+    if started is not None:
+        instrumentation.HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started, endpoint=endpoint
+        )
+    return response
+
+
+def _is_local() -> bool:
+    return (
+        request.remote_addr in _LOOPBACK
+        and "X-Forwarded-For" not in request.headers
+        and "X-Real-IP" not in request.headers
+    )
+
+
+def _exposition():
+    return Response(REGISTRY.render(), content_type=CONTENT_TYPE)
+
+
+@auth.login_required
+def _admin_exposition():
+    return _exposition()
+
+
+@bp.route("/metrics", methods=["GET"])
+def metrics():
+    """Serve every metric in the Prometheus text format."""
+    if _is_local():
+        return _exposition()
+    return _admin_exposition()
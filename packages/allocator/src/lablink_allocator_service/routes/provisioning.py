@@ -2,24 +2,37 @@
 
 ``/api/launch`` and ``/destroy`` do not run tofu inline — they submit a
 job to ``OperationsWorker`` and return 202 (or a redirect), and the admin
-dashboard polls ``/api/operations`` for progress. Both are capability-gated
-on the provider (``can_provision_hosts`` / ``can_destroy_hosts``) rather than
-on provider type.
+dashboard and CLI follow progress on ``/api/operations/<id>/stream``
+(Server-Sent Events), falling back to polling ``/api/operations/<id>``.
+Both are capability-gated on the provider (``can_provision_hosts`` /
+``can_destroy_hosts``) rather than on provider type.
 
 Every handler answers twice: JSON when the caller prefers it (the CLI), a
 redirect back to /admin/instances otherwise (the dashboard's HTML forms).
 """
 import base64
+import functools
 import json
 import logging
 import subprocess
 from datetime import datetime
 from typing import Callable, Optional
 
-from flask import Blueprint, current_app, jsonify, redirect, request
-
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    jsonify,
+    redirect,
+    request,
+    stream_with_context,
+)
+
+from lablink_allocator_service import client_session
 from lablink_allocator_service.auth import auth
 from lablink_allocator_service.db.operations import OperationInProgress
+from lablink_allocator_service.operations import TERMINAL_STATUSES
+from lablink_allocator_service.providers.protocol import ProvisionResult
 from lablink_allocator_service.utils.ansi import strip_ansi
 from lablink_allocator_service.utils.config_helpers import get_allocator_url
 from lablink_allocator_service.utils.sg_audit import SGAuditFailure
@@ -27,12 +40,203 @@ from lablink_allocator_service.utils.sg_audit import SGAuditFailure
 bp = Blueprint("provisioning", __name__)
 logger = logging.getLogger(__name__)
 
+# Settings key holding the highest client VM number any launch has handed
+# out, so a number freed by destroying the newest host isn't reused.
+LAST_VM_NUMBER_SETTING = "last_vm_number"
+
 
 def _wants_json():
     """Return True if the client prefers a JSON response."""
     return request.accept_mimetypes.best == "application/json"
 
 
+def launch_spec() -> dict:
+    """Build the client-VM spec for ``provider.provision_hosts`` from the
+    allocator's config and outputs."""
+    from lablink_allocator_service import main
+
+    allocator_url, scheme = get_allocator_url(main.cfg, main.allocator_ip)
+    logger.info(f"Using allocator URL: {allocator_url} (protocol: {scheme})")
+
+    return {
+        "allocator_ip": main.allocator_ip,
+        "allocator_url": allocator_url,
+        "machine_type": main.cfg.machine.machine_type,
+        "image_name": main.cfg.machine.image,
+        "repository": main.cfg.machine.repository,
+        "client_ami_id": main.cfg.machine.ami_id,
+        "subject_software": main.cfg.machine.software,
+        "resource_prefix": (
+            f"{main.cfg.machine.software}-lablink-client-{main.ENVIRONMENT}"
+        ),
+        "cloud_init_output_log_group": main.cloud_init_output_log_group,
+        "startup_on_error": main.cfg.startup_script.on_error,
+        "startup_max_attempts": main.cfg.startup_script.max_attempts,
+        "startup_base_delay_seconds": main.cfg.startup_script.base_delay_seconds,
+        "startup_success_check_b64": (
+            base64.b64encode(
+                main.cfg.startup_script.success_check.encode()
+            ).decode()
+            if main.cfg.startup_script.success_check
+            else ""
+        ),
+        "agent_token": main.AGENT_TOKEN,
+        "register_token": main.REGISTER_TOKEN,
+        "environment": main.ENVIRONMENT,
+        "bucket_name": main.cfg.bucket_name,
+        "deployment_name": getattr(main.cfg, "deployment_name", "lablink"),
+        "last_vm_number": int(
+            main.database.get_setting(LAST_VM_NUMBER_SETTING) or 0
+        ),
+    }
+
+
+def provision_clients(
+    provider,
+    count: int,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    output_callback: Optional[Callable[[str], None]] = None,
+) -> ProvisionResult:
+    """Create `count` client VMs and record their tofu timings.
+
+    Shared by /api/launch and the warm pool's refill job; both run it on
+    OperationsWorker's background thread. Reformats known failure types
+    into RuntimeError with the same user-facing text the old synchronous
+    route used, so that text ends up in the operation's `error` column.
+    """
+    from lablink_allocator_service import main
+
+    try:
+        result = provider.provision_hosts(
+            count=count,
+            spec=launch_spec(),
+            progress_callback=progress_callback,
+            output_callback=output_callback,
+            vm_number_callback=lambda number: main.database.set_setting(
+                LAST_VM_NUMBER_SETTING, str(number)
+            ),
+        )
+    except SGAuditFailure as exc:
+        raise RuntimeError(
+            f"Security-group audit refused the plan: {exc}"
+        ) from exc
+    except subprocess.CalledProcessError as e:
+        clean_err = strip_ansi(e.stderr or "").strip()
+        raise RuntimeError(f"OpenTofu failed: {clean_err}") from e
+
+    # Spare the first session on each new VM an EC2 lookup for its agent.
+    for handle in result.handles:
+        private_ip = handle.provider_metadata.get("private_ip")
+        if private_ip:
+            client_session.remember_private_ip(handle.hostname, private_ip)
+
+    for hostname, times in result.timings.items():
+        start_time = datetime.fromisoformat(
+            times["start_time"].replace("Z", "+00:00")
+        )
+        end_time = datetime.fromisoformat(
+            times["end_time"].replace("Z", "+00:00")
+        )
+        main.database.update_tofu_timing(
+            hostname=hostname,
+            per_instance_seconds=float(times["seconds"]),
+            per_instance_start_time=start_time,
+            per_instance_end_time=end_time,
+        )
+    return result
+
+
+def launch_clients(
+    provider,
+    count: int,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    output_callback: Optional[Callable[[str], None]] = None,
+) -> str:
+    """Bring `count` more client VMs up: start warm spares first, then
+    provision the remainder. Runs on OperationsWorker's background thread
+    for /api/launch and for scheduled launches."""
+    from lablink_allocator_service import main
+
+    started = []
+    if main.warm_pool is not None:
+        started = main.warm_pool.take(count)
+    lines = [f"Started warm spare {hostname}" for hostname in started]
+    if output_callback is not None:
+        for line in lines:
+            output_callback(line)
+    if len(started) < count:
+        result = provision_clients(
+            provider,
+            count - len(started),
+            progress_callback=progress_callback,
+            output_callback=output_callback,
+        )
+        lines.append(result.apply_stdout)
+    return "\n".join(lines)
+
+
+def destroy_clients(
+    provider,
+    hostnames: list[str],
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    output_callback: Optional[Callable[[str], None]] = None,
+) -> str:
+    """Destroy the named client VMs, or the whole fleet when `hostnames` is
+    empty. Runs on OperationsWorker's background thread for /destroy and
+    for autoscaler scale-downs."""
+    from lablink_allocator_service import main
+
+    handles = []
+    if hostnames:
+        known = {h.hostname: h for h in provider.list_hosts()}
+        unknown = sorted(set(hostnames) - set(known))
+        if unknown:
+            raise RuntimeError(
+                f"Unknown client VM(s): {', '.join(unknown)}"
+            )
+        handles = [known[h] for h in hostnames]
+
+    # Seal any open session-metrics rows before tearing down VMs, so the
+    # final sessions get a duration even though the client agents are
+    # about to be killed. Best-effort: never block destroy on a seal
+    # failure.
+    try:
+        if hostnames:
+            sealed = main.metrics_db.bulk_seal_session_metrics(hostnames)
+        else:
+            sealed = main.metrics_db.bulk_seal_session_metrics()
+        logger.info("Sealed %d session-metrics rows before destroy", sealed)
+    except Exception as e:
+        logger.warning("Could not bulk-seal session metrics: %s", e)
+
+    # An empty handle list destroys the whole workspace.
+    try:
+        result = provider.destroy_hosts(
+            handles,
+            progress_callback=progress_callback,
+            output_callback=output_callback,
+        )
+    except FileNotFoundError as e:
+        # No terraform.runtime.tfvars → no client VMs were ever launched.
+        raise RuntimeError(str(e)) from e
+    except subprocess.CalledProcessError as e:
+        error_output = strip_ansi(e.stderr or e.stdout or "")
+        raise RuntimeError(error_output) from e
+
+    if hostnames:
+        for hostname in hostnames:
+            main.database.unregister_client(hostname)
+            client_session.forget_private_ip(hostname)
+        logger.debug("Removed %d destroyed VMs from the database.",
+                     len(hostnames))
+    else:
+        logger.debug("Clearing the database...")
+        main.database.clear_database()
+        client_session.forget_private_ip()
+        logger.debug("Database cleared successfully.")
+    return result.stdout
+
+
 @bp.route("/api/launch", methods=["POST"])
 @auth.login_required
 def launch():
@@ -78,77 +282,10 @@ def launch():
             ), 500
         return redirect("/admin/instances?error=allocator_outputs_missing")
 
-    total_vms = num_vms + main.database.get_row_count()
-    allocator_url, scheme = get_allocator_url(main.cfg, main.allocator_ip)
-    logger.info(f"Using allocator URL: {allocator_url} (protocol: {scheme})")
-
-    spec = {
-        "allocator_ip": main.allocator_ip,
-        "allocator_url": allocator_url,
-        "machine_type": main.cfg.machine.machine_type,
-        "image_name": main.cfg.machine.image,
-        "repository": main.cfg.machine.repository,
-        "client_ami_id": main.cfg.machine.ami_id,
-        "subject_software": main.cfg.machine.software,
-        "resource_prefix": (
-            f"{main.cfg.machine.software}-lablink-client-{main.ENVIRONMENT}"
-        ),
-        "cloud_init_output_log_group": main.cloud_init_output_log_group,
-        "startup_on_error": main.cfg.startup_script.on_error,
-        "startup_max_attempts": main.cfg.startup_script.max_attempts,
-        "startup_base_delay_seconds": main.cfg.startup_script.base_delay_seconds,
-        "startup_success_check_b64": (
-            base64.b64encode(
-                main.cfg.startup_script.success_check.encode()
-            ).decode()
-            if main.cfg.startup_script.success_check
-            else ""
-        ),
-        "agent_token": main.AGENT_TOKEN,
-        "register_token": main.REGISTER_TOKEN,
-        "environment": main.ENVIRONMENT,
-        "bucket_name": main.cfg.bucket_name,
-        "deployment_name": getattr(main.cfg, "deployment_name", "lablink"),
-    }
-
-    def _run_launch(
-        progress_callback: Optional[Callable[[int, int], None]] = None,
-    ) -> str:
-        """Runs on OperationsWorker's background thread, not the request
-        thread. Reformats known failure types into RuntimeError with the
-        same user-facing text the old synchronous route used, so that
-        text ends up in the operation's `error` column."""
-        try:
-            result = provider.provision_hosts(
-                count=total_vms, spec=spec, progress_callback=progress_callback,
-            )
-        except SGAuditFailure as exc:
-            raise RuntimeError(
-                f"Security-group audit refused the plan: {exc}"
-            ) from exc
-        except subprocess.CalledProcessError as e:
-            clean_err = strip_ansi(e.stderr or "").strip()
-            raise RuntimeError(f"OpenTofu failed: {clean_err}") from e
-
-        for hostname, times in result.timings.items():
-            start_time = datetime.fromisoformat(
-                times["start_time"].replace("Z", "+00:00")
-            )
-            end_time = datetime.fromisoformat(
-                times["end_time"].replace("Z", "+00:00")
-            )
-            main.database.update_tofu_timing(
-                hostname=hostname,
-                per_instance_seconds=float(times["seconds"]),
-                per_instance_start_time=start_time,
-                per_instance_end_time=end_time,
-            )
-        return result.apply_stdout
-
     try:
         job_id = main.operations_worker.submit(
             op_type="apply",
-            fn=_run_launch,
+            fn=functools.partial(launch_clients, provider, num_vms),
             params=json.dumps({"num_vms": num_vms}),
             created_by=auth.current_user(),
         )
@@ -179,44 +316,15 @@ def destroy():
             return jsonify({"status": "error", "error": error_msg}), 405
         return redirect("/admin/instances?error=destroy_unsupported")
 
-    def _run_destroy(
-        progress_callback: Optional[Callable[[int, int], None]] = None,
-    ) -> str:
-        """Runs on OperationsWorker's background thread, not the request
-        thread."""
-        # Seal any open session-metrics rows before tearing down VMs, so the
-        # final sessions get a duration even though the client agents are
-        # about to be killed. Best-effort: never block destroy on a seal
-        # failure.
-        try:
-            sealed = main.metrics_db.bulk_seal_session_metrics()
-            logger.info("Sealed %d session-metrics rows before destroy", sealed)
-        except Exception as e:
-            logger.warning("Could not bulk-seal session metrics: %s", e)
-
-        # destroy_hosts ignores the handles arg (tofu destroy operates
-        # on the whole workspace); skip the list_hosts() call.
-        try:
-            result = provider.destroy_hosts(
-                [], progress_callback=progress_callback,
-            )
-        except FileNotFoundError as e:
-            # No terraform.runtime.tfvars → no client VMs were ever launched.
-            raise RuntimeError(str(e)) from e
-        except subprocess.CalledProcessError as e:
-            error_output = strip_ansi(e.stderr or e.stdout or "")
-            raise RuntimeError(error_output) from e
-
-        logger.debug("Clearing the database...")
-        main.database.clear_database()
-        logger.debug("Database cleared successfully.")
-        return result.stdout
+    # Optional repeated `hostname` field: destroy just those client VMs
+    # (e.g. to replace one sick host) instead of the whole fleet.
+    hostnames = request.form.getlist("hostname")
 
     try:
         job_id = main.operations_worker.submit(
             op_type="destroy",
-            fn=_run_destroy,
-            params=None,
+            fn=functools.partial(destroy_clients, provider, hostnames),
+            params=json.dumps({"hostnames": hostnames}) if hostnames else None,
             created_by=auth.current_user(),
         )
     except OperationInProgress as exc:
@@ -253,3 +361,96 @@ def get_operation(operation_id):
     if operation is None:
         return jsonify({"error": "Operation not found"}), 404
     return jsonify(operation)
+
+
+# How long one stream read waits for a new event before sending an SSE
+# comment instead, so idle proxies don't close the connection.
+_STREAM_KEEPALIVE_SECONDS = 15.0
+
+
+def _sse(event: dict) -> str:
+    return (
+        f"id: {event['id']}\nevent: {event['event']}\n"
+        f"data: {json.dumps(event['data'])}\n\n"
+    )
+
+
+def _stored_status_event(operation_id: int, after: int) -> str:
+    """Closing event once no live events are left: the row's terminal
+    status, or ``unavailable`` (poll the row instead) if it has none."""
+    from lablink_allocator_service import main
+
+    operation = main.operations_db.get_operation(operation_id)
+    if not operation or operation["status"] not in TERMINAL_STATUSES:
+        return "event: unavailable\ndata: {}\n\n"
+    data = {"status": operation["status"]}
+    if operation.get("error"):
+        data["error"] = operation["error"]
+    return _sse({"id": after + 1, "event": "status", "data": data})
+
+
+@bp.route("/api/operations/<int:operation_id>/stream", methods=["GET"])
+@auth.login_required
+def stream_operation(operation_id):
+    """Server-Sent Events feed of one operation: every tofu output line,
+    progress count and status change, ending after a terminal status.
+
+    Events carry increasing ids; a reconnecting client sends the last one
+    it saw as ``Last-Event-ID`` (EventSource does this itself) or the
+    ``after`` query parameter and gets only newer events. Lines are
+    buffered in memory by OperationsWorker, so an operation this process
+    did not run (or one long finished) streams just its final status.
+    The full output is always in the /api/operations/<id> response.
+    """
+    from lablink_allocator_service import main
+
+    operation = main.operations_db.get_operation(operation_id)
+    if operation is None:
+        return jsonify({"error": "Operation not found"}), 404
+    try:
+        after = int(
+            request.headers.get("Last-Event-ID")
+            or request.args.get("after")
+            or 0
+        )
+    except ValueError:
+        return jsonify({"error": "Invalid event id"}), 400
+    events = main.operations_worker.events
+
+    def generate():
+        cursor = after
+        while True:
+            batch = events.read(
+                operation_id, cursor, timeout=_STREAM_KEEPALIVE_SECONDS,
+            )
+            if batch is None:
+                # Nothing buffered in this process for the operation.
+                yield _stored_status_event(operation_id, cursor)
+                return
+            new_events, closed = batch
+            if not new_events and not closed:
+                yield ": keepalive\n\n"
+                continue
+            for event in new_events:
+                cursor = event["id"]
+                yield _sse(event)
+                if (
+                    event["event"] == "status"
+                    and event["data"]["status"] in TERMINAL_STATUSES
+                ):
+                    return
+            if closed:
+                # Worker stopped without publishing a terminal status
+                # (its final DB write failed); defer to the row.
+                yield _stored_status_event(operation_id, cursor)
+                return
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # nginx in front of Flask would otherwise buffer the stream.
+            "X-Accel-Buffering": "no",
+        },
+    )
@@ -2,7 +2,10 @@
 
 ``/api/request_vm`` is the only unauthenticated state-changing endpoint in
 the allocator — it claims a seat by email. Rejoin is idempotent: an email
-that already owns a running seat keeps it rather than consuming a second.
+that already owns a seat keeps it rather than consuming a second; while
+that seat isn't running (rebooting, say) the student is asked to wait.
+When the pool is empty the student is queued in the seat-queue waiting
+room (see ``seat_queue``) instead of being turned away.
 """
 import logging
 import secrets
@@ -10,6 +13,7 @@ import secrets
 from flask import Blueprint, current_app, jsonify, render_template, request
 
 from lablink_allocator_service.client_session import RotationFailed
+from lablink_allocator_service.db.vms import SeatNotReady
 from lablink_allocator_service.providers.registry import get_provider
 from lablink_allocator_service.routes.session_cookie import (
     sign_session_cookie_and_redirect,
@@ -28,8 +32,6 @@ def home():
 def submit_vm_details():
     from lablink_allocator_service import main
 
-    import uuid
-
     try:
         email = (request.form.get("email") or "").strip().lower()
         if not email:
@@ -37,73 +39,90 @@ def submit_vm_details():
 
         # Idempotent rejoin: if this email already owns a running seat,
         # keep them on it and continue to prep a fresh browser session.
+        # A roster pre-assignment nobody has joined yet is a first arrival,
+        # so it may start on the seat's staged credential. A seat that is
+        # still coming back stays theirs; they wait for it.
         existing = main.database.get_assigned_vm_for_email(email=email)
-        if existing is not None and existing["status"] == "running":
-            hostname = existing["hostname"]
-        else:
-            # Fresh assignment. assign_vm atomically claims a seat and
-            # returns its hostname, or raises ValueError if the pool is
-            # empty; we treat that as 503 (no seats). Because the claim is
-            # atomic (FOR UPDATE SKIP LOCKED), there's no separate lookup
-            # to race against.
+        if existing is not None and existing["status"] != "running":
+            return _seat_not_ready(email, existing["hostname"])
+        if existing is not None:
+            return _start_session(
+                main, email, existing["hostname"],
+                use_staged=not existing["session_started"],
+            )
+
+        # Fresh assignment. assign_vm atomically claims a seat and returns
+        # its hostname, or raises ValueError if the pool is empty. Because
+        # the claim is atomic (FOR UPDATE SKIP LOCKED), there's no separate
+        # lookup to race against. While others are already waiting, skip
+        # it and queue behind them, so seats go out in arrival order.
+        hostname = None
+        if main.seat_queue is None or not main.seat_queue.has_waiters():
             try:
                 hostname = main.database.assign_vm(email=email)
+            except SeatNotReady as e:
+                return _seat_not_ready(email, e.hostname)
             except ValueError:
                 logger.warning("Pool empty when '%s' asked for a seat", email)
+
+        if hostname is None:
+            if main.autoscaler is not None:
+                main.autoscaler.record_seat_request(pool_empty=True)
+            if main.seat_queue is None:
                 return render_template("no_seats.html"), 503
+            ticket = main.seat_queue.join(email)
+            position = main.seat_queue.status(ticket.id)
+            return render_template(
+                "waiting_room.html",
+                ticket=ticket.id,
+                position=(position or {}).get("position"),
+            ), 202
+
+        if main.autoscaler is not None:
+            main.autoscaler.record_seat_request()
+        return _start_session(main, email, hostname)
 
-        # Mint per-session identifiers and rotate the VNC password on the
-        # assigned client. RotationFailed → mark unhealthy and ask the
-        # student to retry; the failed-VM recovery loop will pick it up.
-        session_id = uuid.uuid4()
-        browser_token = secrets.token_urlsafe(16)
-        try:
-            provider = current_app.config.get("LABLINK_PROVIDER") or get_provider(
-                main.cfg.provider,
-                region=main.cfg.app.region,
-                tofu_dir=str(main.TOFU_DIR),
-                connectivity=main.cfg.manual.connectivity,
-            )
-            provider.client_connectivity.prepare_browser_session(
-                database=main.database,
-                hostname=hostname,
-                session_id=session_id,
-                browser_token=browser_token,
-                agent_token=main.AGENT_TOKEN,
-            )
-        except RotationFailed as exc:
-            logger.warning(
-                "Password rotation failed for '%s' on '%s': %s",
-                email, hostname, exc,
-            )
-            # Release the seat so the student isn't permanently wedged
-            # on the rotation_failed page: without this, the rejoin
-            # branch at the top of this handler keeps matching the
-            # same row (status is still 'running') and re-enters
-            # prepare_browser_session, which keeps failing.
-            try:
-                main.database.update_health(hostname=hostname, healthy="Unhealthy")
-                main.database.release_seat(hostname=hostname)
-            except Exception:
-                logger.exception("Could not mark '%s' unhealthy", hostname)
-            return render_template("rotation_failed.html"), 503
-
-        # Rotation succeeded, so the client is reachable — clear any
-        # Unhealthy flag a previous transient failure left behind. Reachable
-        # here via the rejoin branch above, which matches on status='running'
-        # rather than going through assign_vm and so can land on a row still
-        # marked Unhealthy (lablink#404).
-        try:
-            main.database.clear_unhealthy(hostname=hostname)
-        except Exception:
-            logger.exception(
-                "Could not clear unhealthy flag for '%s'", hostname
-            )
+    except Exception as e:
+        logger.error("Error in submit_vm_details: %s", e, exc_info=True)
+        return render_template(
+            "index.html",
+            error="An unexpected error occurred while processing your request. "
+            "Please ask your instructor for help.",
+        )
+
+
+@bp.route("/api/seat_queue/<ticket>", methods=["GET"])
+def seat_queue_status(ticket):
+    """Long-poll a waiting-room ticket. ``?wait=`` holds the request open
+    (up to 25 s) until the ticket has a seat."""
+    from lablink_allocator_service import main
 
-        return sign_session_cookie_and_redirect(session_id)
+    if main.seat_queue is None:
+        return jsonify(status="expired"), 404
+    wait = request.args.get("wait", default=0, type=float)
+    status = main.seat_queue.status(ticket, wait=max(wait, 0))
+    if status is None:
+        return jsonify(status="expired"), 404
+    return jsonify(status), 200
 
+
+@bp.route("/api/seat_queue/<ticket>/claim", methods=["POST"])
+def claim_queued_seat(ticket):
+    """Start the session on the seat the waiting room was handed."""
+    from lablink_allocator_service import main
+
+    try:
+        claimed = main.seat_queue.claim(ticket) if main.seat_queue else None
+        if claimed is None:
+            return render_template(
+                "index.html",
+                error="Your place in the queue expired. Please ask for a "
+                "seat again.",
+            )
+        email, hostname = claimed
+        return _start_session(main, email, hostname)
     except Exception as e:
-        logger.error("Error in submit_vm_details: %s", e, exc_info=True)
+        logger.error("Error in claim_queued_seat: %s", e, exc_info=True)
         return render_template(
             "index.html",
             error="An unexpected error occurred while processing your request. "
@@ -111,6 +130,81 @@ def submit_vm_details():
         )
 
 
+def _seat_not_ready(email: str, hostname: str):
+    """Ask a student whose seat isn't running yet to come back shortly."""
+    logger.info("Seat '%s' held by '%s' is not running yet", hostname, email)
+    return render_template(
+        "index.html",
+        error="Your desktop is restarting. Please try again in a minute.",
+    ), 503
+
+
+def _start_session(main, email: str, hostname: str, use_staged: bool = True):
+    """Prepare a browser session on `email`'s seat and redirect to it.
+
+    Fresh assignments (and first arrivals on a roster seat) take the
+    seat's staged credential when it has one (see ``session_staging``); a
+    rejoin passes ``use_staged=False`` so the password is rotated again.
+    """
+    import uuid
+
+    # Mint per-session identifiers and rotate the VNC password on the
+    # assigned client. RotationFailed → mark unhealthy and ask the
+    # student to retry; the failed-VM recovery loop will pick it up.
+    session_id = uuid.uuid4()
+    browser_token = secrets.token_urlsafe(16)
+    try:
+        provider = current_app.config.get("LABLINK_PROVIDER") or get_provider(
+            main.cfg.provider,
+            region=main.cfg.app.region,
+            tofu_dir=str(main.TOFU_DIR),
+            connectivity=main.cfg.manual.connectivity,
+        )
+        provider.client_connectivity.prepare_browser_session(
+            database=main.database,
+            hostname=hostname,
+            session_id=session_id,
+            browser_token=browser_token,
+            agent_token=main.AGENT_TOKEN,
+            use_staged=use_staged,
+        )
+    except RotationFailed as exc:
+        logger.warning(
+            "Password rotation failed for '%s' on '%s': %s",
+            email, hostname, exc,
+        )
+        # Release the seat so the student isn't permanently wedged
+        # on the rotation_failed page: without this, the rejoin
+        # branch in submit_vm_details keeps matching the same row
+        # (status is still 'running') and re-enters
+        # prepare_browser_session, which keeps failing.
+        try:
+            main.database.update_health(hostname=hostname, healthy="Unhealthy")
+            main.database.release_seat(hostname=hostname)
+        except Exception:
+            logger.exception("Could not mark '%s' unhealthy", hostname)
+        return render_template("rotation_failed.html"), 503
+
+    # The session is live, so a waiting-room ticket for this email (say
+    # they asked again instead of claiming) must not release the seat.
+    if main.seat_queue is not None:
+        main.seat_queue.forget(email)
+
+    # Rotation succeeded, so the client is reachable — clear any
+    # Unhealthy flag a previous transient failure left behind. Reachable
+    # here via the rejoin branch of submit_vm_details, which matches on
+    # status='running' rather than going through assign_vm and so can
+    # land on a row still marked Unhealthy (lablink#404).
+    try:
+        main.database.clear_unhealthy(hostname=hostname)
+    except Exception:
+        logger.exception(
+            "Could not clear unhealthy flag for '%s'", hostname
+        )
+
+    return sign_session_cookie_and_redirect(session_id)
+
+
 @bp.route("/api/unassigned_vms_count", methods=["GET"])
 def get_unassigned_instance_counts():
     """Get the counts of all instance types."""
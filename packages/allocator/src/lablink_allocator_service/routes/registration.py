@@ -16,8 +16,10 @@ import secrets
 
 from flask import Blueprint, current_app, jsonify, request
 
+from lablink_allocator_service import client_session
 from lablink_allocator_service.auth import auth, require_client_secret
 from lablink_allocator_service.providers.registry import get_provider
+from lablink_allocator_service.rate_limit import limit_client
 from lablink_allocator_service.secret_hash import (
     REGISTER_TOKEN_SUBJECT,
     hash_secret,
@@ -168,6 +170,9 @@ def register_client():
         return jsonify({"error": "registration conflict"}), 409
     if client_id is None:
         return jsonify({"error": "registration conflict"}), 409
+    # A re-registering host may be reachable somewhere new (a new LAN IP or
+    # tunnel alias); resolve its agent address afresh.
+    client_session.forget_private_ip(hostname)
 
     if tunnel_prefix is not None:
         # Authorize AFTER the row exists: the restrictions file is what lets
@@ -284,6 +289,9 @@ def client_status(client_id):
     stored = main.database.get_client_secret_hash(client_id)
     if not stored or not verify_secret_cached(client_id, token, stored):
         return jsonify({"error": "Invalid client secret."}), 401
+    refused = limit_client(client_id)
+    if refused is not None:
+        return refused
 
     status = main.database.get_status_by_hostname(client_id)
     return jsonify(client_id=client_id, status=status), 200
@@ -408,6 +416,7 @@ def report_overlay_hostname():
 
     if not updated:
         return jsonify({"error": "Not a mesh-overlay client."}), 404
+    client_session.forget_private_ip(hostname)
 
     current_app.logger.info(
         "Client '%s' reported overlay hostname '%s'",
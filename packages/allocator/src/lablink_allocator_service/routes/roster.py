@@ -0,0 +1,89 @@
+"""Roster pre-assignment.
+
+An instructor who knows the class list can bind every student to a seat
+before the workshop starts: ``POST /api/roster`` seats the whole roster in
+one set-based statement (``VmDatabase.preassign_seats``), and with
+``prestage`` also rotates each seat's VNC password ahead of time. A
+student's arrival at ``/api/request_vm`` is then only a lookup of the seat
+already held for their email.
+"""
+import logging
+
+from flask import Blueprint, jsonify, request
+
+from lablink_allocator_service.auth import auth
+
+bp = Blueprint("roster", __name__)
+logger = logging.getLogger(__name__)
+
+
+@bp.route("/api/roster", methods=["POST"])
+@auth.login_required
+def preassign_roster():
+    """Pre-assign seats to a list of emails.
+
+    Request JSON:
+    {
+        "emails": ["a@example.edu", "b@example.edu"],
+        "prestage": false  // also stage session credentials on the seats
+    }
+
+    Emails are normalized the way /api/request_vm normalizes them.
+    Re-posting the same roster is safe: emails that already hold a seat
+    keep it.
+
+    Returns:
+        JSON with ``seats`` (email -> hostname for every roster email that
+        holds a seat), ``assigned`` (how many of those this call handed
+        out), ``unseated`` (emails left without a seat because the pool
+        ran out) and ``staged``.
+    """
+    from lablink_allocator_service import main
+
+    data = request.get_json(silent=True) or {}
+    emails = data.get("emails")
+    if not isinstance(emails, list) or not all(
+        isinstance(e, str) for e in emails
+    ):
+        return jsonify(
+            {"status": "error", "error": "emails must be a list of strings"}
+        ), 400
+    roster = list(dict.fromkeys(
+        e.strip().lower() for e in emails if e.strip()
+    ))
+    if not roster:
+        return jsonify({"status": "error", "error": "emails is empty"}), 400
+
+    prestage = bool(data.get("prestage", False))
+    if prestage and main.session_staging is None:
+        return jsonify({
+            "status": "error",
+            "error": "prestage needs session_staging.enabled: true",
+        }), 400
+
+    try:
+        assigned = main.database.preassign_seats(roster)
+        seats = main.database.get_seats_for_emails(roster)
+    except Exception as e:
+        logger.error(f"Error pre-assigning roster: {e}", exc_info=True)
+        return jsonify(
+            {"status": "error", "error": "Failed to pre-assign seats"}
+        ), 500
+
+    staged = 0
+    if prestage:
+        staged = main.session_staging.stage_seats(list(seats.values()))
+
+    unseated = [email for email in roster if email not in seats]
+    if unseated:
+        logger.warning(
+            f"Roster pre-assignment left {len(unseated)} of {len(roster)} "
+            f"emails without a seat"
+        )
+    return jsonify({
+        "status": "success",
+        "seats": seats,
+        "assigned": len(assigned),
+        "unseated": unseated,
+        "staged": staged,
+    }), 200
@@ -1,4 +1,4 @@
-"""Scheduled destruction CRUD.
+"""Scheduled destruction and scheduled launch CRUD.
 
 Writes go through ``ScheduledDestructionService`` (it owns the APScheduler
 job registration alongside the DB row); reads go straight to
@@ -184,3 +184,163 @@ def cancel_scheduled_destruction(schedule_id: int):
     except Exception as e:
         logger.error(f"Failed to cancel scheduled destruction: {e}")
         return jsonify({"success": False, "message": str(e)}), 500
+
+
+@bp.route("/api/schedule-launch", methods=["POST"])
+@auth.login_required
+def create_scheduled_launch() -> Response | tuple[Response, int]:
+    """
+    Create a new scheduled launch.
+
+    Request JSON:
+    {
+        "schedule_name": "Monday Tutorial",
+        "ready_by": "2025-12-01T09:00:00Z",
+        "target_seats": 30
+    }
+
+    The launch starts early enough, based on recent startup times, for the
+    seats to be up by ready_by.
+
+    Returns:
+        Response: JSON with schedule_id, launch_time and lead_seconds, or
+            error with status code.
+    """
+    from lablink_allocator_service import main
+
+    data = request.get_json()
+
+    if not data.get("schedule_name"):
+        return jsonify({"success": False, "message": "schedule_name is required"}), 400
+
+    if not data.get("ready_by"):
+        return jsonify({"success": False, "message": "ready_by is required"}), 400
+
+    target_seats = data.get("target_seats")
+    if (
+        not isinstance(target_seats, int)
+        or isinstance(target_seats, bool)
+        or target_seats <= 0
+    ):
+        return jsonify(
+            {"success": False, "message": "target_seats must be a positive integer"}
+        ), 400
+
+    try:
+        ready_by = datetime.fromisoformat(data["ready_by"].replace("Z", "+00:00"))
+    except ValueError as e:
+        return jsonify(
+            {"success": False, "message": f"Invalid ready_by format: {str(e)}"}
+        ), 400
+
+    if ready_by <= datetime.now(ready_by.tzinfo):
+        return jsonify(
+            {"success": False, "message": "ready_by must be in the future"}
+        ), 400
+
+    if main.scheduler_service is None:
+        return jsonify(
+            {"success": False, "message": "Scheduler service not initialized"}
+        ), 500
+
+    try:
+        scheduled = main.scheduler_service.schedule_launch(
+            schedule_name=data["schedule_name"],
+            ready_by=ready_by,
+            target_seats=target_seats,
+            created_by=auth.current_user(),
+        )
+    except ValueError as e:
+        # Duplicate schedule name (from database unique constraint)
+        return jsonify({"success": False, "message": str(e)}), 409
+    except RuntimeError as e:
+        logger.error(f"Failed to create scheduled launch: {e}")
+        return jsonify({"success": False, "message": str(e)}), 500
+
+    return jsonify(
+        {
+            "success": True,
+            "schedule_id": scheduled["schedule_id"],
+            "launch_time": scheduled["launch_time"].isoformat(),
+            "lead_seconds": scheduled["lead_seconds"],
+            "message": "Scheduled launch created successfully",
+        }
+    ), 200
+
+
+@bp.route("/api/schedule-launch/<int:schedule_id>", methods=["GET"])
+@auth.login_required
+def get_scheduled_launch(schedule_id: int):
+    """Get details of a scheduled launch."""
+    from lablink_allocator_service import main
+
+    schedule = main.schedule_db.get_scheduled_launch(schedule_id)
+
+    if not schedule:
+        return jsonify({"success": False, "message": "Schedule not found"}), 404
+
+    return jsonify({"success": True, "schedule": schedule})
+
+
+@bp.route("/api/schedule-launch", methods=["GET"])
+@auth.login_required
+def list_scheduled_launches() -> Response | tuple[Response, int]:
+    """
+    List all scheduled launches.
+
+    Query parameters:
+        status (optional): Filter by status (scheduled, executing, completed,
+            failed, cancelled)
+
+    Returns:
+        Response: JSON with list of schedules, or error with status code.
+    """
+    from lablink_allocator_service import main
+
+    status_filter = request.args.get("status")
+
+    if status_filter and status_filter not in VALID_STATUS_FILTERS:
+        return jsonify(
+            {"success": False, "message": f"Invalid status filter: {status_filter}"}
+        ), 400
+
+    schedules = main.schedule_db.get_all_scheduled_launches(status=status_filter)
+
+    return jsonify({"success": True, "schedules": schedules, "count": len(schedules)})
+
+
+@bp.route("/api/schedule-launch/<int:schedule_id>", methods=["DELETE"])
+@auth.login_required
+def cancel_scheduled_launch(schedule_id: int):
+    """Cancel a scheduled launch."""
+    from lablink_allocator_service import main
+
+    schedule = main.schedule_db.get_scheduled_launch(schedule_id)
+    if not schedule:
+        return jsonify({"success": False, "message": "Schedule not found"}), 404
+
+    if schedule["status"] != "scheduled":
+        return jsonify(
+            {
+                "success": False,
+                "message": f"Cannot cancel schedule with status '{schedule['status']}'",
+            }
+        ), 400
+
+    if main.scheduler_service is None:
+        return jsonify(
+            {"success": False, "message": "Scheduler service not initialized"}
+        ), 500
+
+    try:
+        main.scheduler_service.cancel_scheduled_launch(schedule_id)
+    except Exception as e:
+        logger.error(f"Failed to cancel scheduled launch: {e}")
+        return jsonify({"success": False, "message": str(e)}), 500
+
+    return jsonify(
+        {
+            "success": True,
+            "message": f"Scheduled launch {schedule_id} cancelled successfully",
+        }
+    )
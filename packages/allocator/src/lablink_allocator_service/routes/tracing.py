@@ -0,0 +1,80 @@
+"""Request tracing: a root span per request, and the kept traces as JSON.
+
+Every request the app handles opens a trace (or joins the caller's when
+it sends a ``traceparent`` header) and answers with its ID in
+``X-LabLink-Trace-Id``, so a slow response can be looked up at
+/admin/traces/<id>. See tracing.py for what the spans cover.
+"""
+from flask import Blueprint, g, jsonify, request
+
+from lablink_allocator_service.auth import auth
+from lablink_allocator_service.tracing import (
+    SERVER,
+    TRACEPARENT,
+    TRACER,
+    to_otlp,
+)
+
+bp = Blueprint("tracing", __name__)
+
+TRACE_ID_HEADER = "X-LabLink-Trace-Id"
+
+
+@bp.before_app_request
+def _start_trace():
+    rule = request.url_rule.rule if request.url_rule else request.path
+    g.trace = TRACER.start(
+        f"{request.method} {rule}",
+        kind=SERVER,
+        traceparent=request.headers.get(TRACEPARENT),
+        **{"http.method": request.method, "http.target": request.path},
+    )
+
+
+@bp.after_app_request
+def _tag_response(response):
+    root = g.get("trace")
+    if root is not None:
+        root.span.attributes["http.status_code"] = response.status_code
+        if response.status_code >= 500 and root.span.error is None:
+            root.span.error = f"HTTP {response.status_code}"
+        response.headers[TRACE_ID_HEADER] = root.span.trace_id
+    return response
+
+
+@bp.teardown_app_request
+def _finish_trace(exc):
+    root = g.pop("trace", None)
+    if root is not None:
+        TRACER.finish(root, error=exc)
+
+
+@bp.route("/api/traces", methods=["GET"])
+@auth.login_required
+def list_traces():
+    """Summaries of the kept traces, newest first. Optional ``limit``
+    (default 100, at most the buffer size)."""
+    limit = request.args.get("limit", 100, type=int)
+    return jsonify({
+        "enabled": TRACER.enabled,
+        "min_duration_ms": TRACER.min_duration_ms,
+        "traces": TRACER.recent(max(limit, 1)),
+    }), 200
+
+
+@bp.route("/api/traces/<trace_id>", methods=["GET"])
+@auth.login_required
+def get_trace(trace_id):
+    """One kept trace as an OTLP/JSON ExportTraceServiceRequest."""
+    spans = TRACER.get(trace_id.lower())
+    if spans is None:
+        return jsonify({"error": f"No trace {trace_id} is kept."}), 404
+    return jsonify(to_otlp(spans)), 200
+
+
+@bp.route("/api/traces/clear", methods=["POST"])
+@auth.login_required
+def clear_traces():
+    """Drop every kept trace."""
+    TRACER.clear()
+    return jsonify({"cleared": True}), 200
@@ -111,6 +111,13 @@ def update_vm_status():
 
         main.database.touch_last_seen(hostname=hostname)
         main.database.update_vm_status(hostname=hostname, status=status)
+        # A VM coming up may be the seat a queued student is waiting for,
+        # and has no staged credential yet.
+        if status == "running":
+            if main.seat_queue is not None:
+                main.seat_queue.notify()
+            if main.session_staging is not None:
+                main.session_staging.notify()
 
         return jsonify({"message": "VM status updated successfully."}), 200
     except Exception as e:
@@ -134,6 +141,29 @@ def get_all_vm_status():
         return jsonify({"error": "Failed to get VM status."}), 500
 
 
+@bp.route("/api/vm-watch/<hostname>", methods=["POST"])
+@auth.login_required
+def watch_vm(hostname):
+    """Have a VM report at the watch cadence for a while.
+
+    Body: ``{"minutes": 10}`` (default 10); 0 stops watching.
+    """
+    from lablink_allocator_service import main
+
+    if main.telemetry_cadence is None:
+        return jsonify({"error": "Telemetry cadence is disabled."}), 409
+    data = request.get_json(silent=True) or {}
+    minutes = data.get("minutes", 10)
+    if isinstance(minutes, bool) or not isinstance(minutes, (int, float)):
+        return jsonify({"error": "minutes must be a number."}), 400
+    main.telemetry_cadence.watch(hostname, minutes * 60)
+    logger.info(f"Watching {hostname} for {minutes} minute(s)")
+    return jsonify({
+        "hostname": hostname,
+        "watched": main.telemetry_cadence.watched(),
+    }), 200
+
+
 @bp.route("/api/vm-logs/<hostname>", methods=["POST"])
 @require_client_secret
 def receive_vm_logs(hostname):
@@ -1,5 +1,8 @@
+import functools
+import json
 import logging
-from datetime import datetime
+import math
+from datetime import datetime, timedelta, timezone
 import subprocess
 import os
 from typing import Optional
@@ -12,9 +15,26 @@ from dateutil import rrule
 
 from lablink_allocator_service.db.schedules import ScheduleDatabase
 from lablink_allocator_service.db.metrics import MetricsDatabase
+from lablink_allocator_service.instrumentation import timed_iteration
 
 logger = logging.getLogger(__name__)
 
+# Lead time for a scheduled launch when no VM has reported a startup
+# duration yet: the same 25 minutes after which get_failed_vms treats an
+# initializing VM as stuck.
+DEFAULT_LAUNCH_LEAD_SECONDS = 25 * 60
+# Added to the p90 startup duration, for planning the whole batch and for
+# scheduler jitter.
+LAUNCH_LEAD_MARGIN_SECONDS = 5 * 60
+# How long a scheduled launch waits before retrying when another
+# operation holds the single-flight slot.
+LAUNCH_RETRY_SECONDS = 60
+# The VM table is cleared when the fleet is destroyed, so the last p90
+# seen is kept in the settings table for the next schedule.
+_LAUNCH_LEAD_SETTING = "launch_lead_p90_seconds"
+# Statuses that count toward a scheduled launch's target seat count.
+_SEAT_STATUSES = ("running", "initializing", "rebooting")
+
 
 def run_scheduled_destroy(handles: list, metrics_db, provider) -> None:
     """Seal session-metrics rows, then tear down the VMs."""
@@ -28,6 +48,7 @@ def run_scheduled_destroy(handles: list, metrics_db, provider) -> None:
 
 # Standalone function for scheduled destruction execution
 # This avoids pickling issues with the database connection
+@timed_iteration("scheduled_destroy")
 def execute_scheduled_destruction_job(
     schedule_id: int,
     tofu_dir: str,
@@ -89,6 +110,8 @@ def execute_scheduled_destruction_job(
             cfg.provider,
             region=cfg.app.region,
             tofu_dir=tofu_dir,
+            shards=cfg.provisioning.shards,
+            parallelism=cfg.provisioning.parallelism,
         )
 
         logger.info(f"Executing scheduled destruction ID: {schedule_id}")
@@ -167,12 +190,100 @@ def execute_scheduled_destruction_job(
         logger.debug("Scheduled-job connection pool closed.")
 
 
+@timed_iteration("scheduled_launch")
+def execute_scheduled_launch_job(schedule_id: int):
+    """Execute a scheduled launch job.
+
+    Unlike the destruction job this runs against the live allocator
+    (``main``): it submits to the same OperationsWorker as /api/launch, so
+    it shares its single-flight guard, warm pool and progress stream. Only
+    the schedule id is stored in the job store.
+
+    Launches just enough VMs to bring the fleet up to the schedule's
+    target seat count. If another operation is running, the job retries
+    every LAUNCH_RETRY_SECONDS until the ready-by time.
+
+    Args:
+        schedule_id: ID of the scheduled launch
+    """
+    from lablink_allocator_service import main
+    from lablink_allocator_service.db.operations import OperationInProgress
+    from lablink_allocator_service.routes.provisioning import launch_clients
+
+    schedule_db = main.schedule_db
+    schedule = schedule_db.get_scheduled_launch(schedule_id)
+    if schedule is None or schedule["status"] != "scheduled":
+        logger.info(f"Scheduled launch {schedule_id} is no longer scheduled")
+        return
+
+    def _finish(status: str, result: str) -> None:
+        log = logger.info if status == "completed" else logger.error
+        log(f"Scheduled launch {schedule_id}: {result}")
+        schedule_db.update_scheduled_launch_status(
+            schedule_id=schedule_id,
+            status=status,
+            execution_result=result,
+        )
+
+    try:
+        provider = main.app.config["LABLINK_PROVIDER"]
+        if not provider.can_provision_hosts:
+            _finish("failed", "Provider does not support host provisioning.")
+            return
+        if not main.allocator_ip or not main.key_name:
+            _finish("failed", "Allocator outputs not found.")
+            return
+
+        statuses = main.database.get_all_vm_status() or {}
+        seats = sum(1 for s in statuses.values() if s in _SEAT_STATUSES)
+        needed = schedule["target_seats"] - seats
+        if needed <= 0:
+            _finish("completed", f"Already {seats} seat(s); nothing to launch")
+            return
+
+        try:
+            job_id = main.operations_worker.submit(
+                op_type="apply",
+                fn=functools.partial(launch_clients, provider, needed),
+                params=json.dumps(
+                    {"num_vms": needed, "schedule_id": schedule_id}
+                ),
+                created_by=schedule["created_by"] or "scheduler",
+            )
+        except OperationInProgress as exc:
+            now = datetime.now(timezone.utc)
+            ready_by = schedule["ready_by"].replace(tzinfo=timezone.utc)
+            if now < ready_by:
+                logger.info(
+                    f"Scheduled launch {schedule_id} waiting for operation "
+                    f"#{exc.job_id}; retrying in {LAUNCH_RETRY_SECONDS}s"
+                )
+                main.scheduler_service._add_launch_job(
+                    schedule_id, now + timedelta(seconds=LAUNCH_RETRY_SECONDS)
+                )
+                return
+            _finish(
+                "failed",
+                f"Skipped: operation #{exc.job_id} was still in progress "
+                f"at the ready-by time",
+            )
+            return
+
+        _finish(
+            "completed", f"Submitted launch job #{job_id} for {needed} VM(s)"
+        )
+
+    except Exception as e:
+        _finish("failed", f"Launch failed: {e}")
+
+
 class ScheduledDestructionService:
     def __init__(
         self,
         schedule_db: ScheduleDatabase,
         db_url: str,
         tofu_dir: Optional[str] = None,
+        database=None,
     ):
         """Initialize the scheduler service.
 
@@ -180,9 +291,13 @@ class ScheduledDestructionService:
             schedule_db: ScheduleDatabase instance
             db_url: PostgreSQL connection URL for APScheduler job store
             tofu_dir: Path to OpenTofu directory (optional, auto-detected if None)
+            database: VmDatabase the startup durations for scheduled
+                launches' lead time come from (optional; without it the
+                default lead time is used)
         """
         self.schedule_db: ScheduleDatabase = schedule_db
         self.db_url = db_url
+        self.database = database
 
         self.tofu_dir = tofu_dir or os.path.join(
             os.path.dirname(__file__), "terraform"
@@ -213,6 +328,8 @@ class ScheduledDestructionService:
 
         # Load existing schedules from the database
         self._load_scheduled_destructions()
+        self.schedule_db.ensure_scheduled_launches_table()
+        self._load_scheduled_launches()
 
     def stop(self):
         """Stop the scheduler."""
@@ -379,3 +496,110 @@ class ScheduledDestructionService:
             )
 
         logger.info(f"Loaded {len(pending_schedules)} scheduled destructions")
+
+    def launch_lead_seconds(self) -> int:
+        """How long before its ready-by time a scheduled launch starts.
+
+        The p90 of TotalStartupDurationSeconds (tofu apply + cloud-init +
+        container start) across the VM table, plus
+        LAUNCH_LEAD_MARGIN_SECONDS. Falls back to the last p90 seen, then
+        to DEFAULT_LAUNCH_LEAD_SECONDS.
+        """
+        p90 = None
+        if self.database is not None:
+            p90 = self.database.get_startup_duration_percentile(0.9)
+            try:
+                if p90 is not None:
+                    self.database.set_setting(_LAUNCH_LEAD_SETTING, str(p90))
+                else:
+                    stored = self.database.get_setting(_LAUNCH_LEAD_SETTING)
+                    p90 = float(stored) if stored is not None else None
+            except Exception as e:
+                logger.warning(f"Could not read/store launch lead time: {e}")
+        if p90 is None:
+            p90 = DEFAULT_LAUNCH_LEAD_SECONDS
+        return math.ceil(p90) + LAUNCH_LEAD_MARGIN_SECONDS
+
+    def schedule_launch(
+        self,
+        schedule_name: str,
+        ready_by: datetime,
+        target_seats: int,
+        created_by: Optional[str] = None,
+    ) -> dict:
+        """Schedule a launch so `target_seats` seats are up by `ready_by`.
+
+        The job runs launch_lead_seconds() before ready_by, or right away
+        if that is already past.
+
+        Returns:
+            dict with schedule_id, launch_time and lead_seconds
+        """
+        if ready_by.tzinfo is None:
+            ready_by = ready_by.replace(tzinfo=timezone.utc)
+        lead_seconds = self.launch_lead_seconds()
+        launch_time = max(
+            ready_by - timedelta(seconds=lead_seconds),
+            datetime.now(timezone.utc),
+        )
+
+        # Raises ValueError for duplicate names or RuntimeError for other
+        # DB errors
+        schedule_id = self.schedule_db.create_scheduled_launch(
+            schedule_name=schedule_name,
+            ready_by=ready_by,
+            target_seats=target_seats,
+            launch_time=launch_time,
+            lead_seconds=lead_seconds,
+            created_by=created_by,
+        )
+        self._add_launch_job(schedule_id, launch_time)
+
+        logger.info(
+            f"Scheduled launch '{schedule_name}' (ID: {schedule_id}) of "
+            f"{target_seats} seat(s) at {launch_time}, ready by {ready_by}"
+        )
+        return {
+            "schedule_id": schedule_id,
+            "launch_time": launch_time,
+            "lead_seconds": lead_seconds,
+        }
+
+    def cancel_scheduled_launch(self, schedule_id: int) -> None:
+        """Cancel a scheduled launch."""
+        job_id = f"launch_{schedule_id}"
+        if self.scheduler.get_job(job_id):
+            self.scheduler.remove_job(job_id)
+
+        self.schedule_db.cancel_scheduled_launch(schedule_id)
+
+        logger.info(f"Cancelled scheduled launch ID: {schedule_id}")
+
+    def _add_launch_job(self, schedule_id: int, run_date: datetime) -> None:
+        """Add (or move) a launch job in APScheduler."""
+        job_id = f"launch_{schedule_id}"
+        self.scheduler.add_job(
+            func=execute_scheduled_launch_job,
+            trigger=DateTrigger(run_date=run_date),
+            args=[schedule_id],
+            id=job_id,
+            name=f"Scheduled Launch {schedule_id}",
+            replace_existing=True,
+        )
+        logger.debug(f"Added APScheduler job: {job_id}")
+
+    def _load_scheduled_launches(self) -> None:
+        """Load pending scheduled launches from database on startup.
+
+        A launch whose time passed while the allocator was down runs right
+        away rather than being dropped as a misfire.
+        """
+        pending = self.schedule_db.get_all_scheduled_launches(
+            status="scheduled"
+        )
+        now = datetime.now(timezone.utc)
+        for schedule in pending:
+            launch_time = schedule["launch_time"].replace(tzinfo=timezone.utc)
+            self._add_launch_job(schedule["id"], max(launch_time, now))
+
+        logger.info(f"Loaded {len(pending)} scheduled launches")
@@ -0,0 +1,223 @@
+"""FIFO waiting room for students who ask for a seat while the pool is empty.
+
+Instead of a 503 that students answer by refreshing (each refresh another
+``assign_vm`` query), ``/api/request_vm`` hands out a ticket and the
+waiting-room page long-polls ``/api/seat_queue/<ticket>``. A single
+dispatcher thread assigns free seats to tickets strictly in arrival order.
+It runs when something frees a seat (a VM reporting 'running', an admin
+releasing one) and every few seconds as a fallback, and it only queries
+Postgres while someone is waiting. A student who arrives while others are
+waiting joins the back of the queue rather than racing them for the next
+seat.
+
+Once a ticket holds a seat, the page posts to
+``/api/seat_queue/<ticket>/claim``, which starts the session like a direct
+assignment. A session the student starts any other way (asking for a seat
+again, which rejoins the one they were handed) drops their ticket too.
+Tickets whose page stops polling are dropped, and a seat that isn't
+claimed in time goes back to the pool unless a session was started on
+it. Tickets live in memory, so an allocator restart empties the queue;
+students then just ask again.
+"""
+
+import logging
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Condition, Event, Thread
+from typing import Optional
+
+from lablink_allocator_service.db.vms import SeatNotReady, VmDatabase
+
+logger = logging.getLogger(__name__)
+
+# Longest a status poll is held open waiting for a change.
+POLL_TIMEOUT_SECONDS = 25
+
+
+@dataclass
+class Ticket:
+    """A student's place in the queue."""
+
+    id: str
+    email: str
+    last_polled: float
+    hostname: Optional[str] = None
+    assigned_at: Optional[float] = None
+
+
+class SeatQueue:
+    """In-memory FIFO of students waiting for a seat.
+
+    Args:
+        database: VmDatabase instance used to assign seats.
+        dispatch_interval_seconds: How often waiting tickets are offered
+            seats when nothing has signalled a free one.
+        abandon_seconds: A waiting ticket not polled for this long is
+            dropped (the student closed the page).
+        claim_seconds: A seat assigned to a ticket that isn't claimed
+            within this long is released back to the pool.
+    """
+
+    def __init__(
+        self,
+        database: VmDatabase,
+        dispatch_interval_seconds: int = 5,
+        abandon_seconds: int = 60,
+        claim_seconds: int = 120,
+    ):
+        self.database = database
+        self.dispatch_interval_seconds = dispatch_interval_seconds
+        self.abandon_seconds = abandon_seconds
+        self.claim_seconds = claim_seconds
+        self._tickets: OrderedDict[str, Ticket] = OrderedDict()
+        self._cond = Condition()
+        self._wake_event = Event()
+        self._stop_event = Event()
+        self._thread = None
+
+    def start(self):
+        """Start the dispatcher thread."""
+        self._stop_event.clear()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+        logger.info("Seat queue started")
+
+    def stop(self):
+        """Stop the dispatcher thread."""
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+        logger.info("Seat queue stopped")
+
+    def notify(self):
+        """Signal that a seat may have become free."""
+        self._wake_event.set()
+
+    def has_waiters(self) -> bool:
+        """Whether any student is still waiting for a seat."""
+        with self._cond:
+            return any(t.hostname is None for t in self._tickets.values())
+
+    def join(self, email: str) -> Ticket:
+        """Queue `email` for a seat, or return its existing ticket."""
+        with self._cond:
+            for ticket in self._tickets.values():
+                if ticket.email == email:
+                    ticket.last_polled = time.monotonic()
+                    return ticket
+            ticket = Ticket(
+                id=secrets.token_urlsafe(16),
+                email=email,
+                last_polled=time.monotonic(),
+            )
+            self._tickets[ticket.id] = ticket
+        logger.info(f"'{email}' is waiting for a seat")
+        self.notify()
+        return ticket
+
+    def status(
+        self, ticket_id: str, wait: float = 0
+    ) -> Optional[dict]:
+        """Report a ticket's state, waiting up to `wait` seconds for it to
+        be assigned.
+
+        Returns:
+            ``{"status": "assigned"}``, ``{"status": "waiting",
+            "position": n}`` (1 = next in line), or None for an unknown or
+            expired ticket.
+        """
+        deadline = time.monotonic() + min(wait, POLL_TIMEOUT_SECONDS)
+        with self._cond:
+            while True:
+                ticket = self._tickets.get(ticket_id)
+                if ticket is None:
+                    return None
+                ticket.last_polled = time.monotonic()
+                if ticket.hostname is not None:
+                    return {"status": "assigned"}
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return {
+                        "status": "waiting",
+                        "position": self._position(ticket_id),
+                    }
+                self._cond.wait(remaining)
+
+    def claim(self, ticket_id: str) -> Optional[tuple[str, str]]:
+        """Take the seat assigned to a ticket.
+
+        Returns:
+            ``(email, hostname)``, or None if the ticket is unknown or has
+            no seat yet.
+        """
+        with self._cond:
+            ticket = self._tickets.get(ticket_id)
+            if ticket is None or ticket.hostname is None:
+                return None
+            del self._tickets[ticket_id]
+            return ticket.email, ticket.hostname
+
+    def forget(self, email: str) -> None:
+        """Drop `email`'s ticket, if any: a session was started for them,
+        so the seat it holds is theirs to keep."""
+        with self._cond:
+            for ticket_id, ticket in list(self._tickets.items()):
+                if ticket.email == email:
+                    del self._tickets[ticket_id]
+                    self._cond.notify_all()
+
+    def _position(self, ticket_id: str) -> int:
+        waiting = [t.id for t in self._tickets.values() if t.hostname is None]
+        return waiting.index(ticket_id) + 1
+
+    def _run(self):
+        """Main loop that hands free seats to waiting tickets."""
+        while not self._stop_event.is_set():
+            try:
+                self._dispatch()
+            except Exception as e:
+                logger.error(f"Error in seat-queue dispatch: {e}", exc_info=True)
+            self._wake_event.wait(self.dispatch_interval_seconds)
+            self._wake_event.clear()
+
+    def _dispatch(self):
+        self._expire()
+        with self._cond:
+            waiting = [t for t in self._tickets.values() if t.hostname is None]
+        for ticket in waiting:
+            try:
+                hostname = self.database.assign_vm(email=ticket.email)
+            except SeatNotReady:
+                # Their own seat is rebooting; it is offered once running.
+                continue
+            except ValueError:
+                break
+            with self._cond:
+                ticket.hostname = hostname
+                ticket.assigned_at = time.monotonic()
+                self._cond.notify_all()
+            logger.info(f"Seat '{hostname}' assigned to waiting '{ticket.email}'")
+
+    def _expire(self):
+        now = time.monotonic()
+        unclaimed = []
+        with self._cond:
+            for ticket_id, ticket in list(self._tickets.items()):
+                if ticket.hostname is None:
+                    if now - ticket.last_polled > self.abandon_seconds:
+                        del self._tickets[ticket_id]
+                        logger.info(f"'{ticket.email}' left the seat queue")
+                elif now - ticket.assigned_at > self.claim_seconds:
+                    del self._tickets[ticket_id]
+                    unclaimed.append(ticket)
+        for ticket in unclaimed:
+            if self.database.release_unclaimed_seat(
+                hostname=ticket.hostname, email=ticket.email
+            ):
+                logger.info(
+                    f"Released unclaimed seat '{ticket.hostname}' "
+                    f"held for '{ticket.email}'"
+                )
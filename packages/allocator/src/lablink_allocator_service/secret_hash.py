@@ -9,6 +9,8 @@ from collections import OrderedDict
 from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError, VerificationError, InvalidHashError
 
+from lablink_allocator_service.instrumentation import ARGON2_VERIFY_SECONDS
+
 _ph = PasswordHasher()
 
 
@@ -20,10 +22,15 @@ def hash_secret(plaintext: str) -> str:
 def verify_secret(plaintext: str, hashed: str) -> bool:
     """True iff `plaintext` matches `hashed`. False on any mismatch or
     malformed hash (never raises)."""
+    started = time.perf_counter()
     try:
-        return _ph.verify(hashed, plaintext)
+        ok = _ph.verify(hashed, plaintext)
     except (VerifyMismatchError, VerificationError, InvalidHashError, TypeError):
-        return False
+        ok = False
+    ARGON2_VERIFY_SECONDS.observe(
+        time.perf_counter() - started, result="match" if ok else "mismatch"
+    )
+    return ok
 
 
 # Verify-result cache. argon2 verify is intentionally CPU-heavy
@@ -122,6 +129,9 @@ class TtlLruCache:
         # expiry or LRU eviction (those aren't "the value changed"
         # events). put() rejects stores whose observed version is stale.
         self._versions: dict = {}
+        # get() outcomes, for /metrics.
+        self.hits = 0
+        self.misses = 0
 
     def get(self, key):
         """Return ``(hit, value, version)``.
@@ -134,13 +144,16 @@ class TtlLruCache:
             version = self._versions.get(key, 0)
             entry = self._entries.get(key)
             if entry is None:
+                self.misses += 1
                 return False, None, version
             value, expires_at = entry
             if time.monotonic() >= expires_at:
                 del self._entries[key]
+                self.misses += 1
                 return False, None, version
             # LRU touch
             self._entries.move_to_end(key)
+            self.hits += 1
             return True, value, version
 
     def put(self, key, value, expected_version: int | None = None) -> bool:
@@ -0,0 +1,147 @@
+"""Background credential staging for free seats.
+
+Starting a session used to mean a synchronous ``POST /api/session/start``
+to the seat's agent (up to two 5 s attempts) before the student got a
+redirect, so a class clicking at once filled the Flask thread pool with
+threads waiting on agents. This service rotates the VNC password of every
+free seat ahead of time and keeps it in the seat's staged columns. A fresh
+assignment then only moves the staged credential into the session columns
+(``prepare_browser_session(use_staged=True)``). Rejoins, admin sessions
+and seats with nothing staged still rotate synchronously.
+
+Staging a seat also locks out whoever used it last, since the old password
+stops working as soon as the seat is free. A client that restarts reseeds
+its password, and its status report clears the stale staged one (see
+``VmDatabase.update_vm_status``).
+
+Seats are staged ``concurrency`` at a time, so a freshly launched class
+doesn't wait on each agent in turn. Seats pre-assigned from a roster are
+not free, so they are only staged when the roster upload asks for it
+(``stage_seats``).
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Thread
+
+from lablink_allocator_service.client_session import RotationFailed
+from lablink_allocator_service.db.vms import VmDatabase
+from lablink_allocator_service.instrumentation import timed_iteration
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStagingService:
+    """Background service that pre-rotates free seats' VNC passwords.
+
+    Args:
+        database: VmDatabase instance for querying/updating VM state.
+        connectivity: The provider's client connectivity, which knows how
+            to reach each seat's agent.
+        agent_token: Deployment agent-control token (``main.AGENT_TOKEN``).
+        check_interval_seconds: How often to look for unstaged seats when
+            nothing has signalled one.
+        retry_seconds: How long a seat whose staging failed is left alone.
+        concurrency: How many seats' agents are called at once.
+    """
+
+    def __init__(
+        self,
+        database: VmDatabase,
+        connectivity,
+        agent_token: str,
+        check_interval_seconds: int = 15,
+        retry_seconds: int = 60,
+        concurrency: int = 8,
+    ):
+        self.database = database
+        self.connectivity = connectivity
+        self.agent_token = agent_token
+        self.check_interval_seconds = check_interval_seconds
+        self.retry_seconds = retry_seconds
+        self.concurrency = concurrency
+        self._wake_event = Event()
+        self._stop_event = Event()
+        self._thread = None
+
+    def start(self):
+        """Start the staging thread."""
+        self.database.ensure_staging_columns()
+        self._stop_event.clear()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+        logger.info(
+            f"Session staging started (interval={self.check_interval_seconds}s)"
+        )
+
+    def stop(self):
+        """Stop the staging thread."""
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+        logger.info("Session staging stopped")
+
+    def notify(self):
+        """Signal that a seat may have become free."""
+        self._wake_event.set()
+
+    def _run(self):
+        """Main loop that stages credentials on free seats."""
+        while not self._stop_event.is_set():
+            try:
+                with timed_iteration("session_staging"):
+                    self._stage_free_seats()
+            except Exception as e:
+                logger.error(f"Error in session staging: {e}", exc_info=True)
+            self._wake_event.wait(self.check_interval_seconds)
+            self._wake_event.clear()
+
+    def _stage_free_seats(self):
+        while not self._stop_event.is_set():
+            batch = []
+            while len(batch) < self.concurrency:
+                hostname = self.database.claim_unstaged_seat(self.retry_seconds)
+                if hostname is None:
+                    break
+                batch.append(hostname)
+            if not batch:
+                return
+            if len(batch) == 1:
+                self._stage(batch[0])
+            else:
+                with ThreadPoolExecutor(max_workers=len(batch)) as pool:
+                    list(pool.map(self._stage, batch))
+            if len(batch) < self.concurrency:
+                return
+
+    def stage_seats(self, hostnames: list[str]) -> int:
+        """Stage credentials on roster-assigned seats nobody has joined.
+
+        Runs in the caller's thread, ``concurrency`` agents at a time.
+
+        Returns:
+            int: How many seats were staged.
+        """
+        claimed = self.database.claim_unstaged_preassigned_seats(hostnames)
+        if not claimed:
+            return 0
+        with ThreadPoolExecutor(
+            max_workers=min(self.concurrency, len(claimed))
+        ) as pool:
+            return sum(pool.map(self._stage, claimed))
+
+    def _stage(self, hostname: str) -> bool:
+        try:
+            self.connectivity.stage_browser_session(
+                database=self.database,
+                hostname=hostname,
+                agent_token=self.agent_token,
+            )
+        except RotationFailed as e:
+            # Left for a student's synchronous rotation to report (and
+            # mark Unhealthy) if the agent is really gone.
+            logger.info(f"Could not stage a session on '{hostname}': {e}")
+            return False
+        logger.debug(f"Staged a session credential on '{hostname}'")
+        return True
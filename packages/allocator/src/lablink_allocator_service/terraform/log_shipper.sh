@@ -29,12 +29,15 @@ else
     SOURCE_LABEL=$(basename "$SOURCE")
 fi
 
+HEADERS_FILE=$(mktemp)
+
 log() { echo "$(date -Is) [log_shipper:$SOURCE_LABEL] $*" >> "$SELF_LOG"; }
 
 send_batch() {
     local payload="$1"
     for attempt in $(seq 1 $MAX_RETRIES); do
         HTTP_CODE=$(curl -s -w "%{http_code}" -o /dev/null \
+            -D "$HEADERS_FILE" \
             -X POST "$ENDPOINT" \
             -H "Content-Type: application/json" \
             -H "Authorization: Bearer $CLIENT_SECRET" \
@@ -43,7 +46,16 @@ send_batch() {
             return 0
         fi
         log "POST failed (HTTP $HTTP_CODE), attempt $attempt/$MAX_RETRIES"
-        sleep $((attempt * 2))
+        DELAY=$((attempt * 2))
+        if [ "$HTTP_CODE" = "429" ]; then
+            # Rate limited: wait as long as the allocator asked.
+            RETRY_AFTER=$(tr -d '\r' < "$HEADERS_FILE" \
+                | awk -F': *' 'tolower($1) == "retry-after" {print $2}')
+            if [[ "$RETRY_AFTER" =~ ^[0-9]+$ ]] && [ "$RETRY_AFTER" -gt "$DELAY" ]; then
+                DELAY=$RETRY_AFTER
+            fi
+        fi
+        sleep "$DELAY"
     done
     log "Dropping batch after $MAX_RETRIES failures"
     return 0  # drop batch, don't crash
@@ -81,6 +93,7 @@ cleanup() {
     log "Signal received, flushing ${#BUFFER[@]} remaining lines..."
     flush_buffer
     log "Shutdown complete"
+    rm -f "$HEADERS_FILE"
     exit 0
 }
 trap cleanup SIGTERM SIGINT EXIT
@@ -3,11 +3,12 @@ provider "aws" {
 }
 
 resource "time_static" "start" {
-  count = var.instance_count
+  for_each = toset(local.instance_names)
 }
 
 # Security Group for the Client VM
 resource "aws_security_group" "lablink_sg" {
+  count       = local.manage_shared_resources ? 1 : 0
   name        = "${var.resource_prefix}-sg"
   description = "Allow SSH and Docker ports"
 
@@ -48,7 +49,8 @@ resource "aws_security_group" "lablink_sg" {
 
 # IAM Role for EC2 instances
 resource "aws_iam_role" "lablink_vm_role" {
-  name = "${var.resource_prefix}-vm-role"
+  count = local.manage_shared_resources ? 1 : 0
+  name  = "${var.resource_prefix}-vm-role"
 
   assume_role_policy = jsonencode({
     Version = "2012-10-17"
@@ -70,8 +72,9 @@ resource "aws_iam_role" "lablink_vm_role" {
 
 # Instance profile for EC2 instances
 resource "aws_iam_instance_profile" "lablink_instance_profile" {
-  name = "${var.resource_prefix}-instance-profile"
-  role = aws_iam_role.lablink_vm_role.name
+  count = local.manage_shared_resources ? 1 : 0
+  name  = "${var.resource_prefix}-instance-profile"
+  role  = aws_iam_role.lablink_vm_role[0].name
 
   tags = merge(local.common_tags, {
     Name = "${var.resource_prefix}-instance-profile"
@@ -80,12 +83,12 @@ resource "aws_iam_instance_profile" "lablink_instance_profile" {
 
 # EC2 Instance for the LabLink Client
 resource "aws_instance" "lablink_vm" {
-  count                  = var.instance_count
+  for_each               = toset(local.instance_names)
   ami                    = var.client_ami_id
   instance_type          = var.machine_type
-  vpc_security_group_ids = [aws_security_group.lablink_sg.id]
-  key_name               = aws_key_pair.lablink_key_pair.key_name
-  iam_instance_profile   = aws_iam_instance_profile.lablink_instance_profile.name
+  vpc_security_group_ids = [local.security_group_id]
+  key_name               = local.key_name
+  iam_instance_profile   = local.instance_profile_name
   root_block_device {
     volume_size = 80
     volume_type = "gp3"
@@ -114,7 +117,7 @@ resource "aws_instance" "lablink_vm" {
       repository                  = var.repository
       resource_prefix             = var.resource_prefix
       image_name                  = var.image_name
-      count_index                 = count.index + 1
+      vm_name                     = each.key
       subject_software            = var.subject_software
       gpu_support                 = var.gpu_support
       cloud_init_output_log_group = var.cloud_init_output_log_group
@@ -132,27 +135,29 @@ resource "aws_instance" "lablink_vm" {
   ]))
 
   tags = merge(local.common_tags, {
-    Name = "${var.resource_prefix}-vm-${count.index + 1}"
+    Name = each.key
   })
 }
 
 # TLS Private Key for SSH access
 resource "tls_private_key" "lablink_key" {
+  count     = local.manage_shared_resources ? 1 : 0
   algorithm = "RSA"
   rsa_bits  = 4096
 }
 
 # AWS Key Pair for SSH access
 resource "aws_key_pair" "lablink_key_pair" {
+  count      = local.manage_shared_resources ? 1 : 0
   key_name   = "${var.resource_prefix}-keypair"
-  public_key = tls_private_key.lablink_key.public_key_openssh
+  public_key = tls_private_key.lablink_key[0].public_key_openssh
   tags = merge(local.common_tags, {
     Name = "${var.resource_prefix}-keypair"
   })
 }
 
 resource "time_static" "end" {
-  count      = var.instance_count
+  for_each   = toset(local.instance_names)
   depends_on = [aws_instance.lablink_vm]
 }
 
@@ -162,39 +167,76 @@ locals {
     ManagedBy      = "terraform"
   }
 
-  per_instance_seconds = [
-    for i in range(var.instance_count) :
-    tonumber(time_static.end[i].unix) - tonumber(time_static.start[i].unix)
+  # Client VMs are keyed by hostname (for_each) rather than by position
+  # (count), so the allocator can add or remove individual hosts with
+  # targeted plans without renumbering the rest of the fleet. The
+  # allocator always passes instance_names explicitly; instance_count only
+  # backs the default naming for ad-hoc `tofu plan` runs.
+  instance_names = length(var.instance_names) > 0 ? var.instance_names : [
+    for i in range(var.instance_count) : "${var.resource_prefix}-vm-${i + 1}"
   ]
 
-  per_instance_hms = [
-    for s in local.per_instance_seconds :
-    format(
+  # The primary workspace owns the security group, key pair and instance
+  # profile. Shard workspaces (provisioning.shards > 1) are handed the
+  # primary's IDs and create only their own instances.
+  manage_shared_resources = var.shared_security_group_id == ""
+
+  security_group_id     = local.manage_shared_resources ? aws_security_group.lablink_sg[0].id : var.shared_security_group_id
+  key_name              = local.manage_shared_resources ? aws_key_pair.lablink_key_pair[0].key_name : var.shared_key_name
+  instance_profile_name = local.manage_shared_resources ? aws_iam_instance_profile.lablink_instance_profile[0].name : var.shared_instance_profile_name
+
+  per_instance_seconds = {
+    for name, t in time_static.end :
+    name => tonumber(t.unix) - tonumber(time_static.start[name].unix)
+  }
+
+  per_instance_hms = {
+    for name, s in local.per_instance_seconds :
+    name => format(
       "%02dh:%02dm:%02ds",
       floor(s / 3600),
       floor((s % 3600) / 60),
       s % 60
     )
-  ]
+  }
 
-  per_instance_end_time = [
-    for t in time_static.end :
-    t.rfc3339
-  ]
+  all_seconds = values(local.per_instance_seconds)
 
-  per_instance_start_time = [
-    for t in time_static.start :
-    t.rfc3339
-  ]
+  avg_seconds = length(local.all_seconds) > 0 ? floor(sum(local.all_seconds) / length(local.all_seconds)) : 0
 
-  avg_seconds = length(local.per_instance_seconds) > 0 ? floor(sum(local.per_instance_seconds) / length(local.per_instance_seconds)) : 0
+  max_seconds = length(local.all_seconds) > 0 ? max(local.all_seconds...) : 0
 
-  max_seconds = length(local.per_instance_seconds) > 0 ? max(local.per_instance_seconds...) : 0
-
-  min_seconds = length(local.per_instance_seconds) > 0 ? min(local.per_instance_seconds...) : 0
+  min_seconds = length(local.all_seconds) > 0 ? min(local.all_seconds...) : 0
 
   # Base64 encode startup script to avoid Terraform templatefile() interpolation issues
   # This preserves $, %, and other special characters in user scripts
   startup_content_raw = fileexists(var.custom_startup_script_path) ? file(var.custom_startup_script_path) : ""
   startup_content_b64 = local.startup_content_raw != "" ? base64encode(local.startup_content_raw) : ""
 }
+
+# The shared resources gained a count (so shard workspaces can skip them);
+# keep workspaces created before that from destroying and recreating them.
+moved {
+  from = aws_security_group.lablink_sg
+  to   = aws_security_group.lablink_sg[0]
+}
+
+moved {
+  from = aws_iam_role.lablink_vm_role
+  to   = aws_iam_role.lablink_vm_role[0]
+}
+
+moved {
+  from = aws_iam_instance_profile.lablink_instance_profile
+  to   = aws_iam_instance_profile.lablink_instance_profile[0]
+}
+
+moved {
+  from = tls_private_key.lablink_key
+  to   = tls_private_key.lablink_key[0]
+}
+
+moved {
+  from = aws_key_pair.lablink_key_pair
+  to   = aws_key_pair.lablink_key_pair[0]
+}
@@ -1,19 +1,39 @@
 output "vm_instance_ids" {
   description = "List of EC2 instance IDs created"
-  value       = aws_instance.lablink_vm[*].id
+  value       = [for instance in aws_instance.lablink_vm : instance.id]
 }
 
 output "vm_public_ips" {
   description = "List of public IPs assigned to the VMs"
-  value       = aws_instance.lablink_vm[*].public_ip
+  value       = [for instance in aws_instance.lablink_vm : instance.public_ip]
+}
+
+output "vm_private_ips" {
+  description = "List of private IPs the allocator reaches the VMs' agents on"
+  value       = [for instance in aws_instance.lablink_vm : instance.private_ip]
 }
 
 output "lablink_private_key_pem" {
   description = "Private key used to access EC2 instances"
-  value       = tls_private_key.lablink_key.private_key_pem
+  value       = local.manage_shared_resources ? tls_private_key.lablink_key[0].private_key_pem : ""
   sensitive   = true
 }
 
+output "security_group_id" {
+  description = "Security group attached to the client VMs"
+  value       = local.security_group_id
+}
+
+output "key_name" {
+  description = "Name of the key pair used by the client VMs"
+  value       = local.key_name
+}
+
+output "instance_profile_name" {
+  description = "IAM instance profile attached to the client VMs"
+  value       = local.instance_profile_name
+}
+
 output "vm_instance_names" {
   description = "List of names assigned to the EC2 instances"
   value       = [for instance in aws_instance.lablink_vm : instance.tags["Name"]]
@@ -35,12 +55,12 @@ output "terraform_apply_min_seconds" {
 output "instance_terraform_apply_times" {
   description = "The Terraform apply time to cloud-init finished per instance"
   value = {
-    for i in range(var.instance_count) :
-    aws_instance.lablink_vm[i].tags.Name => {
-      seconds = local.per_instance_seconds[i]
-      formatted = local.per_instance_hms[i]
-      start_time = local.per_instance_start_time[i]
-      end_time = local.per_instance_end_time[i]
+    for name, s in local.per_instance_seconds :
+    name => {
+      seconds = s
+      formatted = local.per_instance_hms[name]
+      start_time = time_static.start[name].rfc3339
+      end_time = time_static.end[name].rfc3339
     }
   }
 }
\ No newline at end of file
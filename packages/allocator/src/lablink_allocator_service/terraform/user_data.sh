@@ -7,14 +7,14 @@ CLOUD_INIT_START_TIME=$(date +%s)
 echo ">> Configuration:"
 echo "  - Allocator IP: ${allocator_ip}"
 echo "  - Resource Prefix: ${resource_prefix}"
-echo "  - Count Index: ${count_index}"
+echo "  - VM Name: ${vm_name}"
 echo "  - Subject Software: ${subject_software}"
 echo "  - Image Name: ${image_name}"
 echo "  - Machine Type GPU Support: ${gpu_support}"
 echo "  - GitHub Repository: ${repository}"
 echo "  - Log Group: ${cloud_init_output_log_group}"
 
-VM_NAME="${resource_prefix}-vm-${count_index}"
+VM_NAME="${vm_name}"
 ALLOCATOR_IP="${allocator_ip}"
 ALLOCATOR_URL="${allocator_url}"
 REGISTER_TOKEN="${register_token}"
@@ -176,7 +176,7 @@ if docker run -dit --restart unless-stopped $DOCKER_GPU_ARGS \
     -e ALLOCATOR_HOST="${allocator_ip}" \
     -e ALLOCATOR_URL="${allocator_url}" \
     -e TUTORIAL_REPO_TO_CLONE="${repository}" \
-    -e VM_NAME="${resource_prefix}-vm-${count_index}" \
+    -e VM_NAME="${vm_name}" \
     -e SUBJECT_SOFTWARE="${subject_software}" \
     -e STARTUP_ON_ERROR="${startup_on_error}" \
     -e STARTUP_MAX_ATTEMPTS="${startup_max_attempts}" \
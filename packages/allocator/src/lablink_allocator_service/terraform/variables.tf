@@ -3,6 +3,30 @@ variable "instance_count" {
   default = 1
 }
 
+variable "instance_names" {
+  description = "Hostnames of the client VMs; overrides instance_count when set"
+  type        = list(string)
+  default     = []
+}
+
+variable "shared_security_group_id" {
+  description = "Primary workspace's client security group; set only on shard workspaces"
+  type        = string
+  default     = ""
+}
+
+variable "shared_key_name" {
+  description = "Primary workspace's key pair name; set only on shard workspaces"
+  type        = string
+  default     = ""
+}
+
+variable "shared_instance_profile_name" {
+  description = "Primary workspace's instance profile name; set only on shard workspaces"
+  type        = string
+  default     = ""
+}
+
 variable "allocator_ip" {
   type        = string
   description = "IP address of the allocator server"
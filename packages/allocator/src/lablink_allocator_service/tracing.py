@@ -0,0 +1,399 @@
+"""Lightweight request tracing, kept in memory and optionally exported.
+
+Every HTTP request (routes/tracing.py) and every OperationsWorker job is
+the root span of a trace. While it runs, the code it calls adds child
+spans: each pooled-connection checkout and SQL statement (db/pool.py,
+db/query_stats.py), each agent call and address lookup in
+client_session, and each tofu subprocess in providers/aws.py. Span
+context lives in a ContextVar, so outside a trace (most background
+loops) the instrumented code only pays for one lookup.
+
+Finished traces at least ``tracing.min_duration_ms`` long go into a ring
+buffer of the last ``tracing.buffer_traces``, shown at /admin/traces, and
+are appended to ``tracing.otlp_file`` as OTLP/JSON, one
+ExportTraceServiceRequest per line, when that is set. Agent calls carry
+the W3C ``traceparent`` header, and a request that arrives with one joins
+the caller's trace.
+
+Nothing here imports Flask or psycopg2, so any module can use it.
+"""
+
+import json
+import logging
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT = "traceparent"
+SERVICE_NAME = "lablink-allocator"
+
+# OTLP SpanKind values.
+INTERNAL = 1
+SERVER = 2
+CLIENT = 3
+
+# A long operation can issue thousands of statements; spans past this are
+# counted but not kept.
+MAX_SPANS_PER_TRACE = 1000
+
+_TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits) or 1:0{bits // 4}x}"
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[tuple[str, str]]:
+    """(trace_id, parent span_id) from a W3C traceparent header, or None
+    if it is missing or malformed."""
+    m = _TRACEPARENT_RE.match((header or "").strip().lower())
+    if not m or set(m.group(1)) == {"0"} or set(m.group(2)) == {"0"}:
+        return None
+    return m.group(1), m.group(2)
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    kind: int
+    start_ns: int
+    end_ns: int = 0
+    attributes: dict = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        return max(self.end_ns - self.start_ns, 0) / 1e6
+
+
+class _Trace:
+    """Child spans collected while a root span is open."""
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: list[Span] = []
+        self.dropped = 0
+
+    def add(self, span: Span) -> None:
+        if len(self.spans) < MAX_SPANS_PER_TRACE:
+            self.spans.append(span)
+        else:
+            self.dropped += 1
+
+
+@dataclass
+class Root:
+    """An open root span, returned by Tracer.start for Tracer.finish."""
+
+    trace: _Trace
+    span: Span
+    token: object
+
+
+# (trace, innermost open span) for the code running now.
+_current: ContextVar[Optional[tuple]] = ContextVar("lablink_trace", default=None)
+
+
+class Tracer:
+    """Creates spans and keeps the finished traces.
+
+    Disabled until ``configure`` is called (main() does, from the
+    ``tracing`` config section); while disabled, ``start`` returns None and
+    no spans are recorded.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.buffer_traces = 500
+        self.min_duration_ms = 0.0
+        self.otlp_file = ""
+        self._lock = threading.Lock()
+        # trace_id -> {"spans": [...], "dropped": n}, oldest first
+        self._traces: OrderedDict[str, dict] = OrderedDict()
+
+    def configure(
+        self,
+        *,
+        enabled: bool = True,
+        buffer_traces: int = 500,
+        min_duration_ms: float = 0.0,
+        otlp_file: str = "",
+    ) -> None:
+        with self._lock:
+            self.enabled = enabled
+            self.buffer_traces = buffer_traces
+            self.min_duration_ms = min_duration_ms
+            self.otlp_file = otlp_file
+            while len(self._traces) > buffer_traces:
+                self._traces.popitem(last=False)
+
+    @staticmethod
+    def active() -> bool:
+        """True while the calling code runs inside a trace."""
+        return _current.get() is not None
+
+    @staticmethod
+    def traceparent() -> Optional[str]:
+        """W3C traceparent header for the current span, or None outside a
+        trace."""
+        current = _current.get()
+        if current is None:
+            return None
+        _, span = current
+        return f"00-{span.trace_id}-{span.span_id}-01"
+
+    def start(
+        self, name: str, *, kind: int = INTERNAL,
+        traceparent: Optional[str] = None, **attributes,
+    ) -> Optional[Root]:
+        """Open a root span and make it current. Continues the trace named
+        by `traceparent` when that is valid. Returns None when disabled.
+        Pair with ``finish`` in the same context."""
+        if not self.enabled:
+            return None
+        parent = parse_traceparent(traceparent)
+        trace_id, parent_id = parent if parent else (_new_id(128), None)
+        span = Span(
+            name=name,
+            trace_id=trace_id,
+            span_id=_new_id(64),
+            parent_id=parent_id,
+            kind=kind,
+            start_ns=time.time_ns(),
+            attributes=attributes,
+        )
+        trace = _Trace(trace_id)
+        return Root(trace=trace, span=span, token=_current.set((trace, span)))
+
+    def finish(self, root: Root, error: Optional[BaseException] = None) -> None:
+        """Close a root span and keep its trace if it ran long enough."""
+        root.span.end_ns = time.time_ns()
+        if error is not None and root.span.error is None:
+            root.span.error = f"{type(error).__name__}: {error}"
+        try:
+            _current.reset(root.token)
+        except ValueError:
+            # Finished from another context than it started in.
+            _current.set(None)
+        if root.span.duration_ms < self.min_duration_ms:
+            return
+        spans = [root.span, *root.trace.spans]
+        with self._lock:
+            kept = self._traces.pop(root.trace.trace_id, None)
+            if kept is None:
+                kept = {"spans": [], "dropped": 0}
+            # A trace continued across several requests collects them all.
+            kept["spans"].extend(spans)
+            kept["dropped"] += root.trace.dropped
+            self._traces[root.trace.trace_id] = kept
+            while len(self._traces) > self.buffer_traces:
+                self._traces.popitem(last=False)
+            otlp_file = self.otlp_file
+        if otlp_file:
+            self._export(otlp_file, spans)
+
+    @contextmanager
+    def trace(self, name: str, *, kind: int = INTERNAL, **attributes):
+        """Run the block as the root span of a new trace."""
+        root = self.start(name, kind=kind, **attributes)
+        if root is None:
+            yield None
+            return
+        try:
+            yield root.span
+        except BaseException as e:
+            self.finish(root, error=e)
+            raise
+        self.finish(root)
+
+    @contextmanager
+    def span(self, name: str, *, kind: int = INTERNAL, **attributes):
+        """Run the block as a child of the current span. Yields the span
+        (so the block can add attributes), or None outside a trace."""
+        current = _current.get()
+        if current is None:
+            yield None
+            return
+        trace, parent = current
+        span = Span(
+            name=name,
+            trace_id=trace.trace_id,
+            span_id=_new_id(64),
+            parent_id=parent.span_id,
+            kind=kind,
+            start_ns=time.time_ns(),
+            attributes=attributes,
+        )
+        token = _current.set((trace, span))
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current.reset(token)
+            span.end_ns = time.time_ns()
+            trace.add(span)
+
+    def record(
+        self, name: str, start_ns: int, end_ns: int, *,
+        kind: int = INTERNAL, error: Optional[str] = None, **attributes,
+    ) -> None:
+        """Add an already-timed child span to the current trace, if any.
+        For hot paths that time themselves anyway."""
+        current = _current.get()
+        if current is None:
+            return
+        trace, parent = current
+        trace.add(Span(
+            name=name,
+            trace_id=trace.trace_id,
+            span_id=_new_id(64),
+            parent_id=parent.span_id,
+            kind=kind,
+            start_ns=start_ns,
+            end_ns=end_ns,
+            attributes=attributes,
+            error=error,
+        ))
+
+    def recent(self, limit: int = 100) -> list[dict]:
+        """Summaries of the kept traces, newest first."""
+        with self._lock:
+            traces = list(self._traces.items())[-limit:]
+        summaries = []
+        for trace_id, kept in reversed(traces):
+            spans = kept["spans"]
+            ids = {s.span_id for s in spans}
+            roots = [s for s in spans if s.parent_id not in ids]
+            first = min(roots, key=lambda s: s.start_ns)
+            start = min(s.start_ns for s in spans)
+            end = max(s.end_ns for s in spans)
+            summaries.append({
+                "trace_id": trace_id,
+                "name": first.name,
+                "start": start / 1e9,
+                "duration_ms": round((end - start) / 1e6, 2),
+                "status_code": first.attributes.get("http.status_code"),
+                "spans": len(spans),
+                "dropped_spans": kept["dropped"],
+                "error": any(s.error for s in spans),
+            })
+        return summaries
+
+    def get(self, trace_id: str) -> Optional[list[Span]]:
+        """The kept spans of `trace_id`, by start time, or None."""
+        with self._lock:
+            kept = self._traces.get(trace_id)
+            spans = list(kept["spans"]) if kept else None
+        return sorted(spans, key=lambda s: s.start_ns) if spans else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._traces.clear()
+
+    def _export(self, path: str, spans: list[Span]) -> None:
+        line = json.dumps(to_otlp(spans), separators=(",", ":"))
+        try:
+            with self._lock, open(path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            logger.error(f"Disabling OTLP trace export to {path}: {e}")
+            with self._lock:
+                self.otlp_file = ""
+
+
+TRACER = Tracer()
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # int64 is a string in the protobuf JSON mapping.
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict) -> list[dict]:
+    return [
+        {"key": key, "value": _otlp_value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+def to_otlp(spans: list[Span]) -> dict:
+    """An OTLP/JSON ExportTraceServiceRequest holding `spans`."""
+    otlp_spans = []
+    for s in spans:
+        entry = {
+            "traceId": s.trace_id,
+            "spanId": s.span_id,
+            "name": s.name,
+            "kind": s.kind,
+            "startTimeUnixNano": str(s.start_ns),
+            "endTimeUnixNano": str(s.end_ns),
+            "attributes": _otlp_attributes(s.attributes),
+            # 2 = STATUS_CODE_ERROR, 0 = STATUS_CODE_UNSET
+            "status": {"code": 2, "message": s.error} if s.error else {},
+        }
+        if s.parent_id:
+            entry["parentSpanId"] = s.parent_id
+        otlp_spans.append(entry)
+    return {
+        "resourceSpans": [{
+            "resource": {
+                "attributes": _otlp_attributes({"service.name": SERVICE_NAME}),
+            },
+            "scopeSpans": [{
+                "scope": {"name": "lablink_allocator_service"},
+                "spans": otlp_spans,
+            }],
+        }],
+    }
+
+
+def waterfall(spans: list[Span]) -> list[dict]:
+    """Rows for a waterfall view: spans depth-first under their parents,
+    siblings by start time, with offsets and widths as percentages of the
+    whole trace."""
+    if not spans:
+        return []
+    start = min(s.start_ns for s in spans)
+    total = max(max(s.end_ns for s in spans) - start, 1)
+    ids = {s.span_id for s in spans}
+    children: dict = {}
+    for s in sorted(spans, key=lambda s: s.start_ns):
+        parent = s.parent_id if s.parent_id in ids else None
+        children.setdefault(parent, []).append(s)
+
+    rows = []
+    stack = [(s, 0) for s in reversed(children.get(None, []))]
+    while stack:
+        s, depth = stack.pop()
+        rows.append({
+            "name": s.name,
+            "depth": depth,
+            "offset_ms": round((s.start_ns - start) / 1e6, 2),
+            "duration_ms": round(s.duration_ms, 2),
+            "left_pct": round(100 * (s.start_ns - start) / total, 2),
+            "width_pct": round(max(100 * (s.end_ns - s.start_ns) / total, 0.2), 2),
+            "attributes": s.attributes,
+            "error": s.error,
+        })
+        stack.extend((c, depth + 1) for c in reversed(children.get(s.span_id, [])))
+    return rows
@@ -222,6 +222,67 @@ def stop_start_ec2_instance(instance_id: str, region: str = "us-west-2") -> bool
         return False
 
 
+def stop_ec2_instances(instance_ids: list[str], region: str = "us-west-2") -> bool:
+    """Stop EC2 instances without waiting for them to reach 'stopped'.
+
+    The instances keep their root volumes (and so the pulled client image
+    and container), which is what makes a later start fast.
+
+    Args:
+        instance_ids: The EC2 instance IDs.
+        region: The AWS region where the instances are located.
+
+    Returns:
+        True if the stop request was accepted, False otherwise.
+    """
+    kwargs = {
+        "region_name": region,
+        "aws_access_key_id": os.getenv("AWS_ACCESS_KEY_ID"),
+        "aws_secret_access_key": os.getenv("AWS_SECRET_ACCESS_KEY"),
+    }
+    if os.getenv("AWS_SESSION_TOKEN"):
+        kwargs["aws_session_token"] = os.getenv("AWS_SESSION_TOKEN")
+
+    ec2 = boto3.client("ec2", **kwargs)
+    try:
+        ec2.stop_instances(InstanceIds=instance_ids)
+        logger.info(f"Stop initiated for instances {instance_ids}")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to stop instances {instance_ids}: {e}")
+        return False
+
+
+def start_ec2_instances(
+    instance_ids: list[str], region: str = "us-west-2"
+) -> bool:
+    """Start stopped EC2 instances without waiting for them to boot.
+
+    Args:
+        instance_ids: The EC2 instance IDs.
+        region: The AWS region where the instances are located.
+
+    Returns:
+        True if the start request was accepted, False otherwise.
+    """
+    kwargs = {
+        "region_name": region,
+        "aws_access_key_id": os.getenv("AWS_ACCESS_KEY_ID"),
+        "aws_secret_access_key": os.getenv("AWS_SECRET_ACCESS_KEY"),
+    }
+    if os.getenv("AWS_SESSION_TOKEN"):
+        kwargs["aws_session_token"] = os.getenv("AWS_SESSION_TOKEN")
+
+    ec2 = boto3.client("ec2", **kwargs)
+    try:
+        ec2.start_instances(InstanceIds=instance_ids)
+        logger.info(f"Start initiated for instances {instance_ids}")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to start instances {instance_ids}: {e}")
+        return False
+
+
 def upload_to_s3(
     local_path: Path,
     env: str,
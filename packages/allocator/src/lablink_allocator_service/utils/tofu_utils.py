@@ -96,6 +96,38 @@ def get_instance_names(tofu_dir: str) -> list:
     return output
 
 
+def get_instance_private_ips(tofu_dir: str) -> list:
+    """Get the private IPs of the instances created by OpenTofu.
+    Args:
+        tofu_dir (str): The directory where the OpenTofu configuration is located.
+    Raises:
+        RuntimeError: Error running tofu output command.
+        RuntimeError: Error decoding JSON output.
+        ValueError: Expected output to be a list of private IPs.
+    Returns:
+        list: The instances' private IPs, in the same order as
+            get_instance_names.
+    """
+    tofu_dir = Path(tofu_dir)
+    try:
+        result = subprocess.run(
+            ["tofu", "output", "-json", "vm_private_ips"],
+            cwd=tofu_dir,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Error running tofu output: {e.stderr}")
+    try:
+        output = json.loads(result.stdout)
+    except json.JSONDecodeError as e:
+        raise RuntimeError(f"Error decoding JSON output: {e}")
+    if not isinstance(output, list):
+        raise ValueError("Expected output to be a list of private IPs")
+    return output
+
+
 def get_instance_timings(tofu_dir: str) -> dict:
     """Get the launch times of the instances created by OpenTofu.
     Args:
@@ -126,3 +158,105 @@ def get_instance_timings(tofu_dir: str) -> dict:
         raise ValueError("Expected output to be a dictionary of launch times.")
 
     return timing_data
+
+
+def get_state_addresses(tofu_dir: str) -> list:
+    """Get the resource addresses tracked in the OpenTofu state.
+    Args:
+        tofu_dir (str): The directory where the OpenTofu configuration is located.
+    Raises:
+        RuntimeError: Error running tofu state list command.
+    Returns:
+        list: Resource addresses such as 'aws_instance.lablink_vm["name"]'.
+            Empty if no state has been written yet.
+    """
+    tofu_dir = Path(tofu_dir)
+    result = subprocess.run(
+        ["tofu", "state", "list"],
+        cwd=tofu_dir,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        # A local backend with no prior apply reports a missing state file
+        # rather than an empty one; anything else is a real failure and
+        # must not be mistaken for an empty fleet.
+        if "No state file was found" in (result.stderr or ""):
+            return []
+        raise RuntimeError(f"Error running tofu state list: {result.stderr}")
+    return [line.strip() for line in result.stdout.splitlines() if line.strip()]
+
+
+def get_shared_resources(tofu_dir: str) -> dict:
+    """Get the IDs of the resources every client VM shares.
+    Args:
+        tofu_dir (str): The primary OpenTofu workspace, which owns them.
+    Raises:
+        RuntimeError: Error running tofu output command.
+        RuntimeError: Error decoding JSON output.
+    Returns:
+        dict: The security_group_id, key_name and instance_profile_name
+            outputs.
+    """
+    tofu_dir = Path(tofu_dir)
+    try:
+        result = subprocess.run(
+            ["tofu", "output", "-json"],
+            cwd=tofu_dir,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Error running tofu output: {e.stderr}")
+    try:
+        outputs = json.loads(result.stdout)
+    except json.JSONDecodeError as e:
+        raise RuntimeError(f"Error decoding JSON output: {e}")
+    return {
+        name: outputs.get(name, {}).get("value", "")
+        for name in ("security_group_id", "key_name", "instance_profile_name")
+    }
+
+
+# Configuration files a shard workspace shares with the primary one. State,
+# plan files, runtime tfvars and the .terraform directory stay per shard.
+_SHARD_CONFIG_SUFFIXES = (".tf", ".sh", ".hcl")
+
+
+def shard_dir(tofu_dir: str, index: int) -> Path:
+    """The working directory of a workspace shard, without creating it.
+    Args:
+        tofu_dir (str): The primary OpenTofu workspace.
+        index (int): Shard number, starting at 1.
+    Returns:
+        Path: ``<tofu_dir>/shards/<index>``.
+    """
+    return Path(tofu_dir) / "shards" / str(index)
+
+
+def prepare_shard_dir(tofu_dir: str, index: int) -> Path:
+    """Create (or refresh) the working directory of a workspace shard.
+
+    Shard directories live at ``<tofu_dir>/shards/<index>`` and symlink the
+    primary workspace's configuration, so each one can be initialized
+    against its own state key and planned/applied independently.
+    Args:
+        tofu_dir (str): The primary OpenTofu workspace.
+        index (int): Shard number, starting at 1 (0 is the primary itself).
+    Returns:
+        Path: The shard's working directory.
+    """
+    tofu_dir = Path(tofu_dir)
+    workdir = shard_dir(str(tofu_dir), index)
+    workdir.mkdir(parents=True, exist_ok=True)
+    for link in workdir.iterdir():
+        # e.g. backend.tf, which dev environments delete before `tofu init`
+        if link.is_symlink() and not link.exists():
+            link.unlink()
+    for src in tofu_dir.iterdir():
+        if src.is_file() and src.suffix in _SHARD_CONFIG_SUFFIXES:
+            link = workdir / src.name
+            if not link.is_symlink() and not link.exists():
+                link.symlink_to(src)
+    return workdir
@@ -24,8 +24,9 @@ logger = logging.getLogger(__name__)
 # Top-level provider field — must stay in sync with the providers registry
 # (DEFAULT_PROVIDER / get_provider). "manual" is the BYO-clients mode added
 # in PR D1/D2/D3 — no automated provisioning, clients self-register via the
-# `lablink client register` CLI.
-VALID_PROVIDERS = ("aws", "manual")
+# `lablink client register` CLI. "simulated" is a fake in-process fleet
+# for scale testing (providers/simulated.py).
+VALID_PROVIDERS = ("aws", "manual", "simulated")
 
 # manual.connectivity — must stay in sync with the connectivity registry
 # (_CONNECTIVITY_BUILTIN in providers/registry.py). "mesh_overlay" reaches
@@ -44,6 +45,16 @@ VALID_CONNECTIVITY = ("lan_direct", "mesh_overlay", "reverse_tunnel")
 # single value.
 VALID_PARTICIPANT_EXPOSURE = ("none", "tailscale_funnel", "cloudflare_tunnel")
 
+# placement.policy — must stay in sync with PLACEMENT_POLICIES in db/vms.py
+# (not imported from there, which would pull psycopg2 into this CLI).
+VALID_PLACEMENT_POLICIES = ("hostname", "random", "gpu", "disk", "stable")
+
+# cadence.heartbeat_max_interval_seconds ceiling: half of
+# STALE_HEARTBEAT_MINUTES in db/vms.py (not imported from there, which
+# would pull psycopg2 into this CLI), so a paced heartbeat never looks
+# like a silent VM to the auto-reboot service.
+MAX_HEARTBEAT_INTERVAL_SECONDS = 90
+
 # Deployment-example / commonly-typed weak values a Funnel-exposed admin
 # panel must never ship with — CT-log scanning finds a newly-published
 # Funnel host within minutes of publication (empirically confirmed
@@ -240,6 +251,118 @@ def get_config_errors(cfg) -> list:
                     "admin_password"
                 )
 
+    provisioning_cfg = getattr(cfg, "provisioning", None)
+    if provisioning_cfg is not None:
+        if getattr(provisioning_cfg, "shards", 1) < 1:
+            errors.append("provisioning.shards must be at least 1")
+        if getattr(provisioning_cfg, "parallelism", 10) < 1:
+            errors.append("provisioning.parallelism must be at least 1")
+        if getattr(provisioning_cfg, "warm_spares", 0) < 0:
+            errors.append("provisioning.warm_spares must not be negative")
+        if getattr(provisioning_cfg, "warm_check_interval_seconds", 60) < 1:
+            errors.append(
+                "provisioning.warm_check_interval_seconds must be at least 1"
+            )
+
+    autoscale_cfg = getattr(cfg, "autoscale", None)
+    if autoscale_cfg is not None:
+        if getattr(autoscale_cfg, "free_seats", 2) < 0:
+            errors.append("autoscale.free_seats must not be negative")
+        for name in (
+            "max_vms",
+            "demand_window_seconds",
+            "scale_down_after_seconds",
+            "check_interval_seconds",
+        ):
+            if getattr(autoscale_cfg, name, 1) < 1:
+                errors.append(f"autoscale.{name} must be at least 1")
+        if getattr(autoscale_cfg, "cooldown_seconds", 300) < 0:
+            errors.append("autoscale.cooldown_seconds must not be negative")
+
+    idle_cfg = getattr(cfg, "idle_reclaim", None)
+    if idle_cfg is not None:
+        for name in ("idle_minutes", "check_interval_seconds"):
+            if getattr(idle_cfg, name, 1) < 1:
+                errors.append(f"idle_reclaim.{name} must be at least 1")
+        if getattr(idle_cfg, "grace_minutes", 5) < 0:
+            errors.append("idle_reclaim.grace_minutes must not be negative")
+
+    staging_cfg = getattr(cfg, "session_staging", None)
+    if staging_cfg is not None:
+        if getattr(staging_cfg, "check_interval_seconds", 15) < 1:
+            errors.append(
+                "session_staging.check_interval_seconds must be at least 1"
+            )
+        if getattr(staging_cfg, "concurrency", 8) < 1:
+            errors.append("session_staging.concurrency must be at least 1")
+
+    placement_cfg = getattr(cfg, "placement", None)
+    if placement_cfg is not None:
+        policy = getattr(placement_cfg, "policy", "hostname")
+        if policy not in VALID_PLACEMENT_POLICIES:
+            errors.append(
+                f"placement.policy must be one of: "
+                f"{', '.join(VALID_PLACEMENT_POLICIES)} (got '{policy}')"
+            )
+
+    rate_cfg = getattr(cfg, "rate_limit", None)
+    if rate_cfg is not None and getattr(rate_cfg, "enabled", True):
+        if getattr(rate_cfg, "max_in_flight", 150) < 1:
+            errors.append("rate_limit.max_in_flight must be at least 1")
+        for name in ("public_rate", "client_rate"):
+            if getattr(rate_cfg, name, 1.0) <= 0:
+                errors.append(f"rate_limit.{name} must be greater than 0")
+        for name in ("public_burst", "client_burst"):
+            if getattr(rate_cfg, name, 1) < 1:
+                errors.append(f"rate_limit.{name} must be at least 1")
+
+    cadence_cfg = getattr(cfg, "cadence", None)
+    if cadence_cfg is not None and getattr(cadence_cfg, "enabled", True):
+        if getattr(cadence_cfg, "target_qps", 20.0) <= 0:
+            errors.append("cadence.target_qps must be greater than 0")
+        if getattr(cadence_cfg, "watch_interval_seconds", 5) < 1:
+            errors.append("cadence.watch_interval_seconds must be at least 1")
+        if getattr(cadence_cfg, "max_interval_seconds", 300) < 60:
+            # The slowest client reporter's base interval.
+            errors.append("cadence.max_interval_seconds must be at least 60")
+        if not 0 <= getattr(cadence_cfg, "jitter", 0.1) < 1:
+            errors.append("cadence.jitter must be between 0 and 1")
+        heartbeat_max = getattr(
+            cadence_cfg, "heartbeat_max_interval_seconds", 90
+        )
+        if not 30 <= heartbeat_max <= MAX_HEARTBEAT_INTERVAL_SECONDS:
+            # From the heartbeat's base interval to half the silence
+            # window after which a running VM is rebooted.
+            errors.append(
+                "cadence.heartbeat_max_interval_seconds must be between 30 "
+                f"and {MAX_HEARTBEAT_INTERVAL_SECONDS}"
+            )
+
+    memory_cfg = getattr(cfg, "memory_report", None)
+    if memory_cfg is not None and getattr(memory_cfg, "enabled", True):
+        for name in ("interval_minutes", "top_types"):
+            if getattr(memory_cfg, name, 1) < 1:
+                errors.append(f"memory_report.{name} must be at least 1")
+
+    tracing_cfg = getattr(cfg, "tracing", None)
+    if tracing_cfg is not None and getattr(tracing_cfg, "enabled", True):
+        if getattr(tracing_cfg, "buffer_traces", 1) < 1:
+            errors.append("tracing.buffer_traces must be at least 1")
+        if getattr(tracing_cfg, "min_duration_ms", 0) < 0:
+            errors.append("tracing.min_duration_ms must not be negative")
+
+    simulated_cfg = getattr(cfg, "simulated", None)
+    if simulated_cfg is not None and provider == "simulated":
+        for name in ("create_seconds", "boot_seconds", "destroy_seconds",
+                     "latency_spread"):
+            if getattr(simulated_cfg, name, 0) < 0:
+                errors.append(f"simulated.{name} must not be negative")
+        for name in ("create_failure_rate", "boot_failure_rate", "hang_rate"):
+            if not 0 <= getattr(simulated_cfg, name, 0) <= 1:
+                errors.append(f"simulated.{name} must be between 0 and 1")
+        if getattr(simulated_cfg, "heartbeat_seconds", 30) <= 0:
+            errors.append("simulated.heartbeat_seconds must be greater than 0")
+
     # DNS enabled requires non-empty domain
     if cfg.dns.enabled and not cfg.dns.domain:
         errors.append("DNS enabled requires non-empty domain field")
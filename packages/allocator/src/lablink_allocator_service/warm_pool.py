@@ -0,0 +1,190 @@
+"""Warm pool of stopped, already-initialized client VMs.
+
+Creating a client VM costs a tofu apply plus a full cloud-init run and
+image pull. Starting a stopped one only re-runs user_data's warm path,
+which restarts the existing container. The pool keeps
+``provisioning.warm_spares`` such VMs in status 'warm', so a launch can
+start them instead (see ``take``), and refills itself in the background
+through OperationsWorker.
+
+A spare is launched like any other client VM. It is parked (marked
+'warm' and stopped) once start.sh reports it 'running'. Until then it is
+an ordinary seat. If a student is assigned to it first, it stays in
+service and the next refill launches a replacement. Spares waiting to
+be parked are tracked in memory, so after an allocator restart they
+stay ordinary seats.
+
+The pool only refills while a fleet is up, i.e. while the VM table has
+rows other than spares, so destroying the fleet doesn't bring spares
+back.
+"""
+
+import functools
+import json
+import logging
+from threading import Event, Lock, Thread
+from typing import Callable, Optional
+
+from lablink_allocator_service.db.operations import OperationInProgress
+from lablink_allocator_service.db.vms import VmDatabase
+from lablink_allocator_service.instrumentation import timed_iteration
+from lablink_allocator_service.providers.protocol import ProvisionResult
+
+logger = logging.getLogger(__name__)
+
+
+class WarmPoolService:
+    """Background service that keeps a pool of stopped spare client VMs.
+
+    Args:
+        database: VmDatabase instance for querying/updating VM state.
+        provider: Compute provider; must have ``can_stop_hosts``.
+        operations_worker: OperationsWorker the refill launches run on.
+        provision: Called as ``provision(count, progress_callback,
+            output_callback)`` to create client VMs; returns a
+            ProvisionResult.
+        size: Number of spares to keep.
+        check_interval_seconds: How often to park and refill.
+    """
+
+    def __init__(
+        self,
+        database: VmDatabase,
+        provider,
+        operations_worker,
+        provision: Callable[..., ProvisionResult],
+        size: int,
+        check_interval_seconds: int = 60,
+    ):
+        self.database = database
+        self.provider = provider
+        self.operations_worker = operations_worker
+        self.provision = provision
+        self.size = size
+        self.check_interval_seconds = check_interval_seconds
+        self._pending: set[str] = set()
+        self._lock = Lock()
+        self._stop_event = Event()
+        self._thread = None
+
+    def start(self):
+        """Start the warm-pool thread."""
+        # take() stamps last_reboot_time on the spares it starts.
+        self.database.ensure_reboot_columns()
+        self._stop_event.clear()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+        logger.info(
+            f"Warm pool started (size={self.size}, "
+            f"interval={self.check_interval_seconds}s)"
+        )
+
+    def stop(self):
+        """Stop the warm-pool thread."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+        logger.info("Warm pool stopped")
+
+    def take(self, count: int) -> list[str]:
+        """Start up to `count` warm spares and return their hostnames.
+
+        The spares come back through the same 'rebooting' -> 'running'
+        path as a stop/start recovery. If the start request fails, the
+        auto-reboot service picks them up once they are stuck.
+        """
+        claimed = self.database.claim_warm_vms(count)
+        if not claimed:
+            return []
+        if not self.provider.start_hosts(self._handles(claimed)):
+            logger.error(f"Failed to start warm spares {claimed}")
+        logger.info(f"Started {len(claimed)} warm spare(s): {claimed}")
+        return claimed
+
+    def pending(self) -> set[str]:
+        """Hostnames of launched spares not yet parked. They run
+        unassigned meanwhile but are not meant as seats."""
+        with self._lock:
+            return set(self._pending)
+
+    def _run(self):
+        """Main loop that periodically parks and refills."""
+        while not self._stop_event.is_set():
+            try:
+                with timed_iteration("warm_pool"):
+                    self._check()
+            except Exception as e:
+                logger.error(f"Error in warm-pool check: {e}", exc_info=True)
+            self._stop_event.wait(self.check_interval_seconds)
+
+    def _check(self):
+        statuses = self.database.get_all_vm_status()
+        if not statuses:
+            return
+        for hostname in self._park_ready_spares(statuses):
+            statuses[hostname] = "warm"
+        self._refill(statuses)
+
+    def _handles(self, hostnames: list[str]) -> list:
+        known = {h.hostname: h for h in self.provider.list_hosts()}
+        return [known[h] for h in hostnames if h in known]
+
+    def _park_ready_spares(self, statuses: dict) -> list[str]:
+        """Stop pending spares that have finished initializing and return
+        the hostnames parked."""
+        with self._lock:
+            # Spares get a row when their tofu timings are recorded, so
+            # one without a row has been destroyed.
+            self._pending.intersection_update(statuses)
+            ready = sorted(
+                h for h in self._pending if statuses.get(h) == "running"
+            )
+            self._pending.difference_update(ready)
+        if not ready:
+            return []
+        # Any ready spare not returned here was assigned or reserved in
+        # the meantime and stays in service as an ordinary seat.
+        parked = self.database.mark_warm(ready)
+        if not parked:
+            return []
+        if not self.provider.stop_hosts(self._handles(parked)):
+            logger.error(f"Failed to stop warm spares {parked}")
+            for hostname in parked:
+                self.database.update_vm_status(hostname, "running")
+            return []
+        logger.info(f"Parked {len(parked)} warm spare(s): {parked}")
+        return parked
+
+    def _refill(self, statuses: dict):
+        """Launch enough spares to bring the pool back up to size."""
+        warm = sum(1 for status in statuses.values() if status == "warm")
+        if warm == len(statuses):
+            return
+        with self._lock:
+            pending = len(self._pending)
+        deficit = self.size - warm - pending
+        if deficit <= 0:
+            return
+        try:
+            job_id = self.operations_worker.submit(
+                op_type="apply",
+                fn=functools.partial(self._launch_spares, deficit),
+                params=json.dumps({"num_vms": deficit, "warm_spares": True}),
+                created_by="warm-pool",
+            )
+        except OperationInProgress:
+            logger.debug("Warm-pool refill deferred: operation in progress")
+            return
+        logger.info(f"Refilling warm pool with {deficit} VM(s) (job #{job_id})")
+
+    def _launch_spares(
+        self,
+        count: int,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        output_callback: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """Runs on OperationsWorker's background thread."""
+        result = self.provision(count, progress_callback, output_callback)
+        with self._lock:
+            self._pending.update(h.hostname for h in result.handles)
+        return result.apply_stdout
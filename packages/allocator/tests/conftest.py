@@ -40,6 +40,16 @@ def omega_config():
                 "connectivity": "lan_direct",
                 "overlay_tailnet": "",
             },
+            "simulated": {
+                "create_seconds": 40.0,
+                "boot_seconds": 120.0,
+                "destroy_seconds": 30.0,
+                "latency_spread": 0.25,
+                "create_failure_rate": 0.0,
+                "boot_failure_rate": 0.0,
+                "hang_rate": 0.0,
+                "heartbeat_seconds": 30.0,
+            },
             "eip": {
                 "strategy": "dynamic",
             },
@@ -57,6 +67,59 @@ def omega_config():
                 "base_delay_seconds": 30,
                 "success_check": "",
             },
+            "provisioning": {
+                "shards": 1,
+                "parallelism": 10,
+                "warm_spares": 0,
+                "warm_check_interval_seconds": 60,
+            },
+            "autoscale": {
+                "enabled": False,
+                "free_seats": 2,
+                "max_vms": 20,
+                "demand_window_seconds": 300,
+                "cooldown_seconds": 300,
+                "scale_down_after_seconds": 900,
+                "check_interval_seconds": 30,
+            },
+            "idle_reclaim": {
+                "enabled": False,
+                "idle_minutes": 30,
+                "grace_minutes": 5,
+                "check_interval_seconds": 60,
+            },
+            "session_staging": {
+                "enabled": True,
+                "check_interval_seconds": 15,
+                "concurrency": 8,
+            },
+            "placement": {"policy": "hostname"},
+            "rate_limit": {
+                "enabled": True,
+                "max_in_flight": 150,
+                "public_rate": 20.0,
+                "public_burst": 100,
+                "client_rate": 1.0,
+                "client_burst": 10,
+            },
+            "cadence": {
+                "enabled": True,
+                "target_qps": 20.0,
+                "max_interval_seconds": 300,
+                "watch_interval_seconds": 5,
+                "jitter": 0.1,
+            },
+            "memory_report": {
+                "enabled": True,
+                "interval_minutes": 15,
+                "top_types": 5,
+            },
+            "tracing": {
+                "enabled": True,
+                "buffer_traces": 500,
+                "min_duration_ms": 100.0,
+                "otlp_file": "",
+            },
             "monitoring": {
                 "enabled": False,
                 "subject_window_patterns": [],
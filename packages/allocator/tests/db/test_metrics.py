@@ -58,6 +58,10 @@ def test_update_session_metrics_writes_columns(fake_db):
     update_sql = next(s for s in sql_calls if "UPDATE" in s.upper())
     assert "SecondsInSubjectSoftware" in update_sql
     assert "SessionMetricsSealedAt IS NULL" in update_sql
+    # Progress counters, not time-in-window, decide LastActivityAt.
+    assert "LastActivityAt" in update_sql
+    params = fake_db._cursor_mock.execute.call_args.args[1]
+    assert params[:3] == (80, 480, 35)
     # No follow-up existence SELECT needed on the happy path.
     assert fake_db._cursor_mock.execute.call_count == 1
 
@@ -86,6 +90,13 @@ def test_bulk_seal_session_metrics_targets_all_unsealed(fake_db):
     assert "SessionMetricsSealedAt IS NULL" in sql
 
 
+def test_bulk_seal_session_metrics_restricts_to_hostnames(fake_db):
+    fake_db.bulk_seal_session_metrics(hostnames=["vm-2"])
+    sql, params = fake_db._cursor_mock.execute.call_args.args
+    assert "HostName = ANY(%s)" in sql
+    assert params == (["vm-2"],)
+
+
 def test_get_session_metrics_summary_returns_funnel_counts(fake_db):
     # Columns match _SUMMARY_COLUMNS order: host_name, started_at,
     # to_first_label, to_first_train, to_first_track, in_subject,
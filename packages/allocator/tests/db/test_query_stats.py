@@ -0,0 +1,152 @@
+"""Tests for per-statement timing (db/query_stats.py)."""
+
+import logging
+from unittest.mock import MagicMock
+
+import pytest
+
+from lablink_allocator_service.db import query_stats
+from lablink_allocator_service.db.pool import PooledCursor
+from lablink_allocator_service.db.query_stats import (
+    OVERFLOW,
+    QueryStats,
+    TimedCursor,
+    fingerprint,
+)
+
+
+@pytest.mark.parametrize(
+    "sql, expected",
+    [
+        (
+            "SELECT * FROM vms\n   WHERE hostname = %s",
+            "SELECT * FROM vms WHERE hostname = ?",
+        ),
+        (
+            "UPDATE vms SET status = 'running' WHERE id = 42",
+            "UPDATE vms SET status = ? WHERE id = ?",
+        ),
+        (
+            "SELECT 1 FROM vms WHERE hostname IN (%s, %s, %s)",
+            "SELECT ? FROM vms WHERE hostname IN (?...)",
+        ),
+        (
+            b"INSERT INTO t (a, b) VALUES ('x', 1), ('y', 2), ('z', 3)",
+            "INSERT INTO t (a, b) VALUES (?...), ...",
+        ),
+        ("SELECT vm1 FROM t WHERE n = %(limit)s", "SELECT vm1 FROM t WHERE n = ?"),
+    ],
+)
+def test_fingerprint(sql, expected):
+    assert fingerprint(sql) == expected
+
+
+def test_top_orders_by_total_time():
+    stats = QueryStats()
+    stats.record("a", 0.010, 1, False)
+    stats.record("b", 0.030, 0, False)
+    stats.record("a", 0.030, 2, True)
+
+    top = stats.top()
+
+    assert [s["fingerprint"] for s in top] == ["a", "b"]
+    assert top[0]["calls"] == 2
+    assert top[0]["total_ms"] == pytest.approx(40)
+    assert top[0]["max_ms"] == pytest.approx(30)
+    assert (top[0]["rows"], top[0]["errors"]) == (3, 1)
+
+
+def test_fingerprints_past_the_cap_are_pooled():
+    stats = QueryStats(max_fingerprints=2)
+    for fp in ("a", "b", "c", "d"):
+        stats.record(fp, 0.001, 0, False)
+
+    assert {s["fingerprint"]: s["calls"] for s in stats.top()} == {
+        "a": 1,
+        "b": 1,
+        OVERFLOW: 2,
+    }
+
+
+def test_reset_clears():
+    stats = QueryStats()
+    stats.record("a", 0.001, 0, False)
+
+    stats.reset()
+
+    assert stats.top() == []
+
+
+def test_timed_cursor_records_and_delegates():
+    raw = MagicMock(rowcount=3)
+    raw.fetchall.return_value = [(1,)]
+    stats = QueryStats()
+    cursor = TimedCursor(raw, stats)
+
+    cursor.execute("SELECT a FROM t WHERE b = %s", (7,))
+
+    raw.execute.assert_called_once_with("SELECT a FROM t WHERE b = %s", (7,))
+    assert cursor.fetchall() == [(1,)]
+    [entry] = stats.top()
+    assert entry["fingerprint"] == "SELECT a FROM t WHERE b = ?"
+    assert (entry["calls"], entry["rows"], entry["errors"]) == (1, 3, 0)
+
+
+def test_timed_cursor_records_failures():
+    raw = MagicMock(rowcount=-1)
+    raw.execute.side_effect = RuntimeError("relation does not exist")
+    stats = QueryStats()
+
+    with pytest.raises(RuntimeError):
+        TimedCursor(raw, stats).execute("SELECT * FROM missing")
+
+    assert stats.top()[0]["errors"] == 1
+    assert stats.top()[0]["rows"] == 0
+
+
+def test_slow_query_logged_with_call_site(monkeypatch, caplog):
+    monkeypatch.setattr(query_stats, "SLOW_QUERY_MS", 0)
+    cursor = TimedCursor(MagicMock(rowcount=1), QueryStats())
+
+    with caplog.at_level(logging.WARNING, logger=query_stats.__name__):
+        cursor.execute("DELETE FROM t WHERE id = 5")
+
+    [record] = caplog.records
+    assert "Slow query" in record.message
+    assert "DELETE FROM t WHERE id = ?" in record.message
+    assert "test_query_stats.py" in record.message
+    assert "test_slow_query_logged_with_call_site" in record.message
+
+
+def test_fast_query_not_logged(monkeypatch, caplog):
+    monkeypatch.setattr(query_stats, "SLOW_QUERY_MS", 10_000)
+
+    with caplog.at_level(logging.WARNING, logger=query_stats.__name__):
+        TimedCursor(MagicMock(rowcount=1), QueryStats()).execute("SELECT 1")
+
+    assert caplog.records == []
+
+
+def test_pooled_cursor_hands_out_timed_cursor():
+    pool = MagicMock()
+    raw = pool.getconn.return_value.cursor.return_value
+
+    with PooledCursor(pool) as cursor:
+        assert isinstance(cursor, TimedCursor)
+        cursor.execute("SELECT 1")
+
+    raw.execute.assert_called_once_with("SELECT 1")
+    raw.close.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "raw, expected", [(None, 250.0), ("", 250.0), ("40", 40.0), ("0", 0.0),
+                      ("abc", 250.0), ("-5", 250.0)]
+)
+def test_slow_query_ms_from_env(monkeypatch, raw, expected):
+    if raw is None:
+        monkeypatch.delenv("LABLINK_SLOW_QUERY_MS", raising=False)
+    else:
+        monkeypatch.setenv("LABLINK_SLOW_QUERY_MS", raw)
+
+    assert query_stats._slow_query_ms_from_env(default=250.0) == expected
@@ -260,3 +260,71 @@ def test_cancel_scheduled_destruction(schedule_db_instance):
         "UPDATE scheduled_destructions SET status = 'cancelled' WHERE id = %s;",
         (schedule_id,),
     )
+
+
+def test_create_scheduled_launch(schedule_db_instance):
+    from datetime import datetime, timezone
+
+    ready_by = datetime(2025, 12, 1, 9, 0, tzinfo=timezone.utc)
+    launch_time = datetime(2025, 12, 1, 8, 30, tzinfo=timezone.utc)
+    schedule_db_instance.cursor.fetchone.return_value = (3,)
+
+    schedule_id = schedule_db_instance.create_scheduled_launch(
+        schedule_name="Monday class",
+        ready_by=ready_by,
+        target_seats=30,
+        launch_time=launch_time,
+        lead_seconds=1800,
+        created_by="admin",
+    )
+
+    assert schedule_id == 3
+    query, params = schedule_db_instance.cursor.execute.call_args[0]
+    assert "INSERT INTO scheduled_launches" in query
+    assert params == (
+        "Monday class",
+        ready_by.replace(tzinfo=None),
+        30,
+        launch_time.replace(tzinfo=None),
+        1800,
+        "admin",
+    )
+
+
+def test_create_scheduled_launch_duplicate_name(schedule_db_instance):
+    from datetime import datetime
+
+    import psycopg2
+    import pytest
+
+    schedule_db_instance.cursor.execute.side_effect = psycopg2.IntegrityError(
+        "duplicate key value violates unique constraint"
+    )
+    with pytest.raises(ValueError, match="already exists"):
+        schedule_db_instance.create_scheduled_launch(
+            schedule_name="dup",
+            ready_by=datetime(2025, 12, 1, 9, 0),
+            target_seats=1,
+            launch_time=datetime(2025, 12, 1, 8, 0),
+            lead_seconds=3600,
+        )
+
+
+def test_get_scheduled_launch_maps_columns(schedule_db_instance):
+    from lablink_allocator_service.db.schedules import _LAUNCH_COLUMNS
+
+    row = tuple(range(len(_LAUNCH_COLUMNS)))
+    schedule_db_instance.cursor.fetchone.return_value = row
+
+    result = schedule_db_instance.get_scheduled_launch(1)
+
+    assert result == dict(zip(_LAUNCH_COLUMNS, row))
+    query = schedule_db_instance.cursor.execute.call_args[0][0]
+    assert "FROM scheduled_launches WHERE id = %s" in query
+
+
+def test_ensure_scheduled_launches_table(schedule_db_instance):
+    schedule_db_instance.ensure_scheduled_launches_table()
+
+    query = schedule_db_instance.cursor.execute.call_args[0][0]
+    assert "CREATE TABLE IF NOT EXISTS scheduled_launches" in query
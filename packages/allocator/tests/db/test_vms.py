@@ -8,7 +8,7 @@ from unittest.mock import MagicMock, patch, ANY
 # needs any psycopg2 mocking to construct (db_instance injects a mock pool
 # via VmDatabase(..., pool=...)), so this is a plain, ordinary
 # import — no sys.modules patching, no collection-order sensitivity.
-from lablink_allocator_service.db.vms import VmDatabase
+from lablink_allocator_service.db.vms import SeatNotReady, VmDatabase
 
 
 def test_get_row_count(db_instance):
@@ -78,17 +78,212 @@ def test_assign_vm(db_instance):
     """assign_vm atomically claims a VM and returns its hostname."""
     email = "new-user@example.com"
     hostname = "available-vm"
-    db_instance.cursor.fetchone.return_value = (hostname,)
+    db_instance.cursor.fetchone.return_value = (hostname, "running", False)
 
     result = db_instance.assign_vm(email)
 
     assert result == hostname
-    # Single atomic claim, parameterized by email only (no separate SELECT).
-    db_instance.cursor.execute.assert_called_with(ANY, (email,))
-    sql = db_instance.cursor.execute.call_args[0][0]
+    # One atomic claim, parameterized by email only (no separate SELECT).
+    db_instance.cursor.execute.assert_called_once()
+    sql, params = db_instance.cursor.execute.call_args[0]
+    assert params == (email, email)
     assert "FOR UPDATE SKIP LOCKED" in sql
     assert "RETURNING hostname" in sql
     assert "adminreservedat IS NULL" in sql
+    assert "pg_advisory" not in sql
+    # Staged seats first; seats mid-staging are skipped.
+    assert "ORDER BY stagedvncpassword IS NULL, hostname" in sql
+    assert "stagingat < NOW() - INTERVAL '30 seconds'" in sql
+
+
+def test_preassign_seats(db_instance):
+    """The whole roster is seated by one statement."""
+    db_instance.cursor.fetchall.return_value = [
+        ("a@example.com", "vm-1"), ("b@example.com", "vm-2"),
+    ]
+
+    seated = db_instance.preassign_seats(
+        ["a@example.com", "b@example.com", "c@example.com"]
+    )
+
+    assert seated == {"a@example.com": "vm-1", "b@example.com": "vm-2"}
+    db_instance.cursor.execute.assert_called_once()
+    sql, params = db_instance.cursor.execute.call_args[0]
+    assert params == (["a@example.com", "b@example.com", "c@example.com"],)
+    assert "unnest(%s::text[]) WITH ORDINALITY" in sql
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "FROM free JOIN pending USING (n)" in sql
+    # Same seat preference and exclusions as assign_vm.
+    assert "ORDER BY stagedvncpassword IS NULL,\n" in sql
+    assert "adminreservedat IS NULL" in sql
+    assert "< NOW() - INTERVAL '30 seconds'" in sql
+
+
+def test_preassign_seats_skips_emails_holding_any_seat(db_instance):
+    """The roster uses assign_vm's definition of a held seat."""
+    db_instance.cursor.fetchall.return_value = []
+
+    db_instance.preassign_seats(["a@example.com"])
+
+    sql = db_instance.cursor.execute.call_args[0][0]
+    assert (
+        "WHERE NOT EXISTS (SELECT hostname, status FROM vms "
+        "WHERE useremail = r.email)"
+    ) in sql
+
+
+def test_preassign_seats_retries_after_unique_violation(db_instance):
+    """A student seated by their own join mid-statement trips the
+    useremail index; the statement runs again and skips them."""
+    import psycopg2
+
+    db_instance.cursor.execute.side_effect = [
+        psycopg2.IntegrityError("duplicate key"), None,
+    ]
+    db_instance.cursor.fetchall.return_value = [("b@example.com", "vm-2")]
+
+    seated = db_instance.preassign_seats(["a@example.com", "b@example.com"])
+
+    assert seated == {"b@example.com": "vm-2"}
+    assert db_instance.cursor.execute.call_count == 2
+
+
+def test_preassign_seats_empty_roster_skips_query(db_instance):
+    assert db_instance.preassign_seats([]) == {}
+    db_instance.cursor.execute.assert_not_called()
+
+
+def test_get_seats_for_emails(db_instance):
+    db_instance.cursor.fetchall.return_value = [("a@example.com", "vm-1")]
+
+    seats = db_instance.get_seats_for_emails(["a@example.com", "z@x.org"])
+
+    assert seats == {"a@example.com": "vm-1"}
+    sql, params = db_instance.cursor.execute.call_args[0]
+    assert "useremail = ANY(%s)" in sql
+    assert params == (["a@example.com", "z@x.org"],)
+
+
+def test_claim_unstaged_preassigned_seats(db_instance):
+    db_instance.cursor.fetchall.return_value = [("vm-2",), ("vm-1",)]
+
+    claimed = db_instance.claim_unstaged_preassigned_seats(["vm-1", "vm-2"])
+
+    assert claimed == ["vm-1", "vm-2"]
+    sql, params = db_instance.cursor.execute.call_args[0]
+    assert "SET stagingat = NOW()" in sql
+    assert "sessionid IS NULL" in sql
+    assert "stagedvncpassword IS NULL" in sql
+    assert params == (["vm-1", "vm-2"],)
+
+
+@pytest.mark.parametrize(
+    "policy, order",
+    [
+        ("random", "ORDER BY stagedvncpassword IS NULL, random()"),
+        ("gpu", "stagedvncpassword IS NULL, gpu_present IS NOT TRUE, hostname"),
+        ("disk", "IS NULL, disk_free_pct DESC NULLS LAST, hostname"),
+        ("stable", "IS NULL, COALESCE(reboot_count, 0), "
+                   "totalstartupdurationseconds NULLS LAST, hostname"),
+    ],
+)
+def test_assign_vm_follows_placement_policy(db_instance, policy, order):
+    db_instance.placement_policy = policy
+    db_instance.cursor.fetchone.return_value = ("vm-3", "running", False)
+
+    assert db_instance.assign_vm("a@example.com") == "vm-3"
+
+    sql = db_instance.cursor.execute.call_args[0][0]
+    assert order in sql
+    assert "FOR UPDATE SKIP LOCKED" in sql
+
+
+def test_unknown_placement_policy_is_rejected():
+    with pytest.raises(ValueError, match="Unknown placement policy"):
+        VmDatabase(
+            dbname="d", user="u", password="p", host="h", port=5432,
+            table_name="vms", pool=MagicMock(), placement_policy="nearest",
+        )
+
+
+def test_claim_unstaged_seat(db_instance):
+    db_instance.cursor.fetchone.return_value = ("vm-2",)
+
+    assert db_instance.claim_unstaged_seat(retry_seconds=120) == "vm-2"
+
+    sql, params = db_instance.cursor.execute.call_args[0]
+    assert "SET stagingat = NOW()" in sql
+    assert "stagedvncpassword IS NULL" in sql
+    assert "useremail IS NULL" in sql
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert params == (120,)
+
+
+def test_claim_unstaged_seat_retry_never_shorter_than_lease(db_instance):
+    db_instance.cursor.fetchone.return_value = None
+
+    assert db_instance.claim_unstaged_seat(retry_seconds=5) is None
+    assert db_instance.cursor.execute.call_args[0][1] == (30,)
+
+
+def test_ensure_staging_columns(db_instance):
+    db_instance.ensure_staging_columns()
+
+    calls = [c[0][0] for c in db_instance.cursor.execute.call_args_list]
+    assert len(calls) == 3
+    for column in ("stagedvncpassword", "stagedupstream", "stagingat"):
+        assert any(column in c for c in calls)
+
+
+def test_update_vm_status_drops_staged_credential_on_restart(db_instance):
+    db_instance.update_vm_status("vm-1", "initializing")
+
+    sql = db_instance.cursor.execute.call_args[0][0]
+    assert "stagedvncpassword = CASE WHEN EXCLUDED.status = 'running'" in sql
+    assert "stagedupstream = CASE WHEN EXCLUDED.status = 'running'" in sql
+
+
+def test_assign_vm_returns_seat_already_held(db_instance, caplog):
+    """An email that already holds a running seat gets that seat back
+    instead of claiming a second one."""
+    db_instance.cursor.fetchone.return_value = ("vm-7", "running", True)
+
+    with caplog.at_level("INFO"):
+        assert db_instance.assign_vm("a@example.com") == "vm-7"
+
+    sql = db_instance.cursor.execute.call_args[0][0]
+    assert "WHERE NOT EXISTS (SELECT 1 FROM held)" in sql
+    # Held in any status, not just running.
+    assert "WHERE useremail = %s\n" in sql
+    assert "already holds VM 'vm-7'" in caplog.text
+
+
+def test_assign_vm_held_seat_not_running(db_instance):
+    """A held seat that is rebooting is neither handed out nor replaced."""
+    db_instance.cursor.fetchone.return_value = ("vm-7", "rebooting", True)
+
+    with pytest.raises(SeatNotReady) as excinfo:
+        db_instance.assign_vm("a@example.com")
+
+    assert excinfo.value.hostname == "vm-7"
+    assert excinfo.value.status == "rebooting"
+
+
+def test_assign_vm_unique_violation_rereads_held_seat(db_instance):
+    """Losing a same-email race on the useremail index returns the seat
+    the winning claim took."""
+    import psycopg2
+
+    db_instance.cursor.execute.side_effect = [
+        psycopg2.IntegrityError("duplicate key"), None,
+    ]
+    db_instance.cursor.fetchone.return_value = ("vm-3", "running")
+
+    assert db_instance.assign_vm("a@example.com") == "vm-3"
+
+    sql, params = db_instance.cursor.execute.call_args[0]
+    assert "WHERE useremail = %s" in sql
+    assert params == ("a@example.com",)
 
 
 def test_assign_vm_no_available(db_instance):
@@ -98,16 +293,242 @@ def test_assign_vm_no_available(db_instance):
         db_instance.assign_vm("user@example.com")
 
 
+def test_mark_warm_only_takes_idle_running_vms(db_instance):
+    """mark_warm claims in one statement and returns what it took."""
+    db_instance.cursor.fetchall.return_value = [("vm-1",)]
+
+    result = db_instance.mark_warm(["vm-1", "vm-2"])
+
+    assert result == ["vm-1"]
+    sql, params = db_instance.cursor.execute.call_args[0]
+    assert "SET status = 'warm'" in sql
+    assert "status = 'running'" in sql
+    assert "useremail IS NULL" in sql
+    assert "adminreservedat IS NULL" in sql
+    assert params == (["vm-1", "vm-2"],)
+
+
+def test_mark_warm_empty_is_noop(db_instance):
+    db_instance.cursor.execute.reset_mock()
+    assert db_instance.mark_warm([]) == []
+    db_instance.cursor.execute.assert_not_called()
+
+
+def test_claim_warm_vms(db_instance):
+    """Claimed spares go to 'rebooting' without bumping reboot_count."""
+    db_instance.cursor.fetchall.return_value = [("vm-2",), ("vm-1",)]
+
+    result = db_instance.claim_warm_vms(2)
+
+    assert result == ["vm-1", "vm-2"]
+    sql, params = db_instance.cursor.execute.call_args[0]
+    assert "status = 'warm'" in sql
+    assert "SET status = 'rebooting'" in sql
+    assert "last_reboot_time = NOW()" in sql
+    assert "reboot_count" not in sql
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert params == (2,)
+
+
+def test_mark_draining_only_takes_idle_running_vms(db_instance):
+    db_instance.cursor.fetchall.return_value = [("vm-3",), ("vm-2",)]
+
+    result = db_instance.mark_draining(["vm-2", "vm-3", "vm-4"])
+
+    assert result == ["vm-2", "vm-3"]
+    sql, params = db_instance.cursor.execute.call_args[0]
+    assert "SET status = 'draining'" in sql
+    assert "status = 'running'" in sql
+    assert "useremail IS NULL" in sql
+    assert "adminreservedat IS NULL" in sql
+    assert params == (["vm-2", "vm-3", "vm-4"],)
+
+
+def test_count_starting_vms(db_instance):
+    db_instance.cursor.fetchone.return_value = (3,)
+
+    assert db_instance.count_starting_vms() == 3
+
+    sql = db_instance.cursor.execute.call_args[0][0]
+    assert "status IN ('initializing', 'rebooting')" in sql
+    assert "useremail IS NULL" in sql
+
+
+def test_get_fleet_counts(db_instance):
+    db_instance.cursor.fetchall.return_value = [
+        ("running", 5, 2, 3, 1),
+        ("initializing", 2, 0, 0, 0),
+    ]
+
+    assert db_instance.get_fleet_counts() == {
+        "status": {"running": 5, "initializing": 2},
+        "free": 2,
+        "assigned": 3,
+        "unhealthy": 1,
+    }
+
+    sql = db_instance.cursor.execute.call_args[0][0]
+    assert "GROUP BY 1" in sql
+    assert "healthy <> 'Unhealthy'" in sql
+
+
+def test_get_statement_stats(db_instance):
+    db_instance.cursor.fetchone.return_value = (True,)
+    db_instance.cursor.fetchall.return_value = [("SELECT 1", 10, 5.0, 0.5, 10)]
+
+    assert db_instance.get_statement_stats(5) == [
+        {
+            "query": "SELECT 1",
+            "calls": 10,
+            "total_ms": 5.0,
+            "mean_ms": 0.5,
+            "rows": 10,
+        }
+    ]
+    sql, params = db_instance.cursor.execute.call_args[0]
+    assert "FROM pg_stat_statements" in sql
+    assert params == (5,)
+
+
+def test_get_statement_stats_without_extension(db_instance):
+    db_instance.cursor.fetchone.return_value = (False,)
+
+    assert db_instance.get_statement_stats() is None
+    assert db_instance.cursor.execute.call_count == 1
+
+
+def test_get_startup_duration_percentile(db_instance):
+    db_instance.cursor.fetchone.return_value = (612.5,)
+
+    assert db_instance.get_startup_duration_percentile(0.9) == 612.5
+
+    sql, params = db_instance.cursor.execute.call_args[0]
+    assert "percentile_cont(%s)" in sql
+    assert "TotalStartupDurationSeconds > 0" in sql
+    assert params == (0.9,)
+
+
+def test_get_startup_duration_percentile_without_history(db_instance):
+    db_instance.cursor.fetchone.return_value = (None,)
+
+    assert db_instance.get_startup_duration_percentile() is None
+
+
+def test_get_startup_report_groups_rows_by_launch(db_instance):
+    from datetime import datetime
+
+    started = datetime(2026, 10, 19, 9, 0)
+    db_instance.cursor.fetchall.side_effect = [
+        [
+            (12, started, None, "admin", '{"num_vms": 8}', "total",
+             8, 300.04, 350.0, 400.0, 410.0),
+            (12, started, None, "admin", '{"num_vms": 8}', "tofu_apply",
+             8, 60.0, 70.0, 75.0, 76.0),
+            (None, None, None, None, None, "total", 2, 90.0, 95.0, 99.0, 100.0),
+        ],
+        [(12, "vm-7", "total", 410.0, 380.0)],
+    ]
+
+    report = db_instance.get_startup_report(launches=5)
+
+    assert [launch["operation_id"] for launch in report] == [12, None]
+    newest = report[0]
+    assert (newest["started_at"], newest["created_by"]) == (started, "admin")
+    assert (newest["num_vms"], newest["hosts"]) == (8, 8)
+    # Phases come back in STARTUP_PHASES order, whatever order SQL used.
+    assert list(newest["phases"]) == ["tofu_apply", "total"]
+    assert newest["phases"]["total"] == {
+        "hosts": 8, "p50": 300.0, "p90": 350.0, "p99": 400.0, "max": 410.0,
+    }
+    assert newest["outliers"] == [
+        {"hostname": "vm-7", "phase": "total", "seconds": 410.0, "fence": 380.0}
+    ]
+    assert report[1]["num_vms"] is None and report[1]["outliers"] == []
+
+    (stats_sql, stats_params), (outliers_sql, outliers_params) = [
+        c.args for c in db_instance.cursor.execute.call_args_list
+    ]
+    assert "percentile_cont(0.99) WITHIN GROUP" in stats_sql
+    assert "op_type = 'apply' AND started_at <= v.CreatedAt" in stats_sql
+    assert stats_params == (5,)
+    assert outliers_params == (5, 10, 4, 10)
+
+
+def test_get_startup_report_returns_none_on_failure(db_instance):
+    db_instance.cursor.execute.side_effect = Exception("no operations table")
+
+    assert db_instance.get_startup_report() is None
+
+
 def test_update_vm_in_use(db_instance):
     """Test updating the in-use status of a VM."""
     hostname = "vm-to-update"
     in_use = True
     db_instance.update_vm_in_use(hostname, in_use)
     db_instance.cursor.execute.assert_called_with(
-        "UPDATE vms SET inuse = %s WHERE hostname = %s", (in_use, hostname)
+        "UPDATE vms SET inuse = %s, lastactivityat = NOW() WHERE hostname = %s",
+        (in_use, hostname),
     )
 
 
+def test_ensure_idle_columns(db_instance):
+    db_instance.ensure_idle_columns()
+
+    calls = [c[0][0] for c in db_instance.cursor.execute.call_args_list]
+    assert len(calls) == 2
+    assert any("lastactivityat TIMESTAMPTZ" in c for c in calls)
+    assert any("idlewarnedat TIMESTAMPTZ" in c for c in calls)
+
+
+def test_get_idle_seats(db_instance):
+    db_instance.cursor.fetchall.return_value = [
+        ("vm-1", "a@example.com", False, False),
+        ("vm-2", "b@example.com", True, True),
+    ]
+
+    seats = db_instance.get_idle_seats(30, 5)
+
+    assert seats == [
+        {
+            "hostname": "vm-1", "useremail": "a@example.com",
+            "warned": False, "grace_over": False,
+        },
+        {
+            "hostname": "vm-2", "useremail": "b@example.com",
+            "warned": True, "grace_over": True,
+        },
+    ]
+    sql, params = db_instance.cursor.execute.call_args[0]
+    assert "GREATEST(lastactivityat, sessionstartedat)" in sql
+    assert "inuse IS NOT TRUE" in sql
+    assert "adminreservedat IS NULL" in sql
+    # Roster seats nobody has joined yet are never idle.
+    assert "sessionstartedat IS NOT NULL" in sql
+    assert "status = 'running'" in sql
+    assert params == (5, 30)
+
+
+def test_reclaim_idle_seat_rechecks_idleness(db_instance):
+    db_instance.cursor.fetchone.return_value = ("vm-1",)
+
+    assert db_instance.reclaim_idle_seat("vm-1", "a@example.com", 5) is True
+
+    sql, params = db_instance.cursor.execute.call_args[0]
+    assert "useremail = NULL" in sql
+    assert "status = 'rebooting'" in sql
+    assert "reboot_count" not in sql
+    assert "AND useremail = %s" in sql
+    assert "inuse IS NOT TRUE" in sql
+    assert "idlewarnedat > COALESCE(" in sql
+    assert params == ("vm-1", "a@example.com", 5)
+
+
+def test_reclaim_idle_seat_lost_race(db_instance):
+    db_instance.cursor.fetchone.return_value = None
+
+    assert db_instance.reclaim_idle_seat("vm-1", "a@example.com", 5) is False
+
+
 def test_clear_database(db_instance):
     """Test clearing all VMs from the database."""
     db_instance.clear_database()
@@ -744,7 +1165,7 @@ def test_update_vm_metrics_atomic_container_only(db_instance):
 
 def test_get_assigned_vm_for_email_found(db_instance):
     """Test looking up an email that already owns a VM."""
-    db_instance.cursor.fetchone.return_value = ("vm-7", "running", 0)
+    db_instance.cursor.fetchone.return_value = ("vm-7", "running", 0, True)
 
     result = db_instance.get_assigned_vm_for_email("student@test.edu")
 
@@ -752,6 +1173,7 @@ def test_get_assigned_vm_for_email_found(db_instance):
         "hostname": "vm-7",
         "status": "running",
         "reboot_count": 0,
+        "session_started": True,
     }
     # Query should filter on useremail and bind the email parameter
     query = db_instance.cursor.execute.call_args[0][0]
@@ -910,6 +1332,55 @@ def test_release_seat_clears_per_session_columns(real_db):
     assert row == (None, None, None, None, None, None, None, None, None)
 
 
+def test_release_unclaimed_seat_spares_a_started_session(real_db):
+    """release_unclaimed_seat() only frees a seat still held by the given
+    email with no session on it."""
+    with real_db._cursor as cur:
+        cur.execute(
+            "ALTER TABLE vms "
+            "ADD COLUMN IF NOT EXISTS useremail TEXT, "
+            "ADD COLUMN IF NOT EXISTS sessionid UUID, "
+            "ADD COLUMN IF NOT EXISTS browsertoken TEXT, "
+            "ADD COLUMN IF NOT EXISTS vncpassword TEXT, "
+            "ADD COLUMN IF NOT EXISTS upstream TEXT, "
+            "ADD COLUMN IF NOT EXISTS browser_ws_url TEXT, "
+            "ADD COLUMN IF NOT EXISTS browser_credential TEXT, "
+            "ADD COLUMN IF NOT EXISTS sessionstartedat TIMESTAMPTZ, "
+            "ADD COLUMN IF NOT EXISTS adminreservedat TIMESTAMPTZ"
+        )
+        cur.execute(
+            "DELETE FROM vms WHERE hostname IN ('host-idle', 'host-live')"
+        )
+        cur.execute(
+            "INSERT INTO vms (hostname, useremail, sessionid) VALUES "
+            "('host-idle', 'sam@x.com', NULL), "
+            "('host-live', 'kim@x.com', "
+            " '11111111-1111-1111-1111-111111111111')"
+        )
+
+    assert not real_db.release_unclaimed_seat(
+        hostname="host-idle", email="kim@x.com"
+    )
+    assert not real_db.release_unclaimed_seat(
+        hostname="host-live", email="kim@x.com"
+    )
+    assert real_db.release_unclaimed_seat(
+        hostname="host-idle", email="sam@x.com"
+    )
+
+    with real_db._cursor as cur:
+        cur.execute(
+            "SELECT hostname, useremail FROM vms "
+            "WHERE hostname IN ('host-idle', 'host-live') ORDER BY hostname"
+        )
+        rows = cur.fetchall()
+        cur.execute(
+            "DELETE FROM vms WHERE hostname IN ('host-idle', 'host-live')"
+        )
+
+    assert rows == [("host-idle", None), ("host-live", "kim@x.com")]
+
+
 def _seed_race_table(real_db, hostnames):
     """Create the columns assign_vm needs and seed the given running VMs."""
     with real_db._cursor as cur:
@@ -919,12 +1390,17 @@ def _seed_race_table(real_db, hostnames):
             "ADD COLUMN IF NOT EXISTS useremail TEXT, "
             "ADD COLUMN IF NOT EXISTS healthy TEXT, "
             "ADD COLUMN IF NOT EXISTS inuse BOOLEAN, "
-            "ADD COLUMN IF NOT EXISTS adminreservedat TIMESTAMPTZ"
+            "ADD COLUMN IF NOT EXISTS adminreservedat TIMESTAMPTZ, "
+            "ADD COLUMN IF NOT EXISTS stagedvncpassword TEXT, "
+            "ADD COLUMN IF NOT EXISTS stagingat TIMESTAMPTZ"
         )
         # Clean slate: the seeded VMs must be the ONLY claimable rows, so a
         # leftover available row from another real_db test can't be claimed
         # and skew the distinct-VM count.
         cur.execute("DELETE FROM vms")
+    # The one-seat-per-email index assign_vm relies on, as in production.
+    real_db.ensure_seat_index()
+    with real_db._cursor as cur:
         for h in hostnames:
             cur.execute(
                 "INSERT INTO vms (hostname, status, useremail, healthy) "
@@ -933,6 +1409,43 @@ def _seed_race_table(real_db, hostnames):
             )
 
 
+def _drop_race_table(real_db):
+    """Remove the seeded VMs and the seat index, which the other real_db
+    tests' fixtures (several seats for one email) would trip over."""
+    with real_db._cursor as cur:
+        cur.execute("DELETE FROM vms WHERE hostname LIKE 'race-vm-%'")
+        cur.execute("DROP INDEX IF EXISTS vms_useremail_idx")
+
+
+def test_preassign_seats_pairs_roster_in_placement_order(real_db):
+    """The first roster email gets the seat the placement policy ranks
+    first, not the lowest hostname."""
+    hostnames = ["race-vm-1", "race-vm-2", "race-vm-3"]
+    try:
+        _seed_race_table(real_db, hostnames)
+        with real_db._cursor as cur:
+            cur.execute(
+                "ALTER TABLE vms ADD COLUMN IF NOT EXISTS disk_free_pct SMALLINT"
+            )
+            cur.executemany(
+                "UPDATE vms SET disk_free_pct = %s WHERE hostname = %s",
+                [(10, "race-vm-1"), (90, "race-vm-2"), (50, "race-vm-3")],
+            )
+        real_db.placement_policy = "disk"
+
+        seated = real_db.preassign_seats(
+            ["first@example.com", "second@example.com", "third@example.com"]
+        )
+    finally:
+        _drop_race_table(real_db)
+
+    assert seated == {
+        "first@example.com": "race-vm-2",
+        "second@example.com": "race-vm-3",
+        "third@example.com": "race-vm-1",
+    }
+
+
 def _assigned_rows(real_db):
     with real_db._cursor as cur:
         cur.execute(
@@ -993,8 +1506,7 @@ def test_assign_vm_concurrent_no_double_assignment(real_db):
         assert len(assigned) == n
         assert set(assigned) == distinct_vms
     finally:
-        with real_db._cursor as cur:
-            cur.execute("DELETE FROM vms WHERE hostname LIKE 'race-vm-%'")
+        _drop_race_table(real_db)
 
 
 def test_assign_vm_concurrent_oversubscribed(real_db):
@@ -1044,8 +1556,90 @@ def test_assign_vm_concurrent_oversubscribed(real_db):
         assert set(assigned) == distinct_vms
         assert len(no_seat) == n_req - n_vms
     finally:
-        with real_db._cursor as cur:
-            cur.execute("DELETE FROM vms WHERE hostname LIKE 'race-vm-%'")
+        _drop_race_table(real_db)
+
+
+def test_assign_vm_concurrent_same_email_gets_one_seat(real_db):
+    """A join double-clicked (or retried) before the first claim lands
+    must not seat the same student twice: every concurrent claim for one
+    email returns the same VM, and only that VM is taken."""
+    import threading
+
+    n = 6
+    _seed_race_table(real_db, [f"race-vm-{i:02d}" for i in range(n)])
+
+    barrier = threading.Barrier(n)
+    assigned: list = []
+    errors: list[BaseException] = []
+    lock = threading.Lock()
+
+    def claim():
+        try:
+            barrier.wait(timeout=5)
+            hostname = real_db.assign_vm(email="twice@example.com")
+            with lock:
+                assigned.append(hostname)
+        except BaseException as e:  # noqa: BLE001
+            with lock:
+                errors.append(e)
+
+    threads = [threading.Thread(target=claim) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=10)
+
+    try:
+        assert not errors, f"Unexpected errors: {errors}"
+        rows = _assigned_rows(real_db)
+        assert len(rows) == 1, f"One email holds {len(rows)} seats: {rows}"
+        assert assigned == [rows[0][0]] * n
+    finally:
+        _drop_race_table(real_db)
+
+
+def test_assign_vm_concurrent_same_email_held_seat_rebooting(real_db):
+    """A student whose seat is rebooting keeps it: concurrent joins for
+    that email all get SeatNotReady, and no free seat is taken."""
+    import threading
+
+    n = 6
+    _seed_race_table(real_db, [f"race-vm-{i:02d}" for i in range(n)])
+    with real_db._cursor as cur:
+        cur.execute(
+            "UPDATE vms SET status = 'rebooting', useremail = %s "
+            "WHERE hostname = 'race-vm-00'",
+            ("held@example.com",),
+        )
+
+    barrier = threading.Barrier(n)
+    not_ready: list = []
+    errors: list = []
+    lock = threading.Lock()
+
+    def claim():
+        try:
+            barrier.wait(timeout=5)
+            real_db.assign_vm(email="held@example.com")
+        except SeatNotReady as e:
+            with lock:
+                not_ready.append(e.hostname)
+        except BaseException as e:  # noqa: BLE001
+            with lock:
+                errors.append(e)
+
+    threads = [threading.Thread(target=claim) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=10)
+
+    try:
+        assert not errors, f"Unexpected errors (or seats claimed): {errors}"
+        assert not_ready == ["race-vm-00"] * n
+        assert _assigned_rows(real_db) == [("race-vm-00", "held@example.com")]
+    finally:
+        _drop_race_table(real_db)
 
 
 def test_get_session_for_peek_found(db_instance):
@@ -1097,7 +1691,8 @@ def test_admin_reserve_vm_concurrent_only_one_wins(real_db):
             "ALTER TABLE vms "
             "ADD COLUMN IF NOT EXISTS status TEXT, "
             "ADD COLUMN IF NOT EXISTS useremail TEXT, "
-            "ADD COLUMN IF NOT EXISTS adminreservedat TIMESTAMPTZ"
+            "ADD COLUMN IF NOT EXISTS adminreservedat TIMESTAMPTZ, "
+            "ADD COLUMN IF NOT EXISTS stagingat TIMESTAMPTZ"
         )
         cur.execute("DELETE FROM vms WHERE hostname = 'host-race-admin'")
         cur.execute(
@@ -48,3 +48,44 @@ def test_prepare_browser_session_lan_direct(monkeypatch):
     assert posted["bearer"] == "agenttok"
     assert "browser_ws_url" in executed["sql"]
     assert "browser_credential" in executed["sql"]
+
+
+def test_lan_direct_staged_session(monkeypatch):
+    import lablink_allocator_service.client_session as cs
+    from lablink_allocator_service.providers.connectivity.lan_direct import (
+        LANDirectClientConnectivity,
+    )
+    posted = {}
+    monkeypatch.setattr(cs, "_post_rotate",
+                        lambda url, body, *, bearer: posted.update(
+                            url=url, body=body, bearer=bearer))
+    executed = []
+    class _Cur:
+        rows = []
+        def __enter__(self): return self
+        def __exit__(self, *a): return False
+        def execute(self, sql, params):
+            executed.append((sql, params))
+        def fetchone(self): return self.rows.pop(0)
+    class _DB:
+        table_name = "vms"
+        _cursor = _Cur()
+        def get_lan_ip(self, hostname): return "10.0.0.9"
+
+    db = _DB()
+    conn = LANDirectClientConnectivity()
+    conn.stage_browser_session(database=db, hostname="vm-1", agent_token="at")
+    password = posted["body"]["password"]
+    assert len(password) == 8
+    assert executed[-1][1] == (password, "10.0.0.9:6080", "vm-1")
+
+    posted.clear()
+    _Cur.rows = [("ws://10.0.0.9:6080", password)]
+    t = conn.prepare_browser_session(
+        database=db, hostname="vm-1", session_id=uuid.uuid4(),
+        browser_token="btok", agent_token="at", use_staged=True,
+    )
+    assert posted == {}
+    assert t.ws_url == "ws://10.0.0.9:6080"
+    assert t.browser_credential == password
+    assert "browser_credential = stagedvncpassword" in executed[-1][0]
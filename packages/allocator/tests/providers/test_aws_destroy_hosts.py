@@ -197,3 +197,68 @@ def test_destroy_hosts_reports_progress_via_callback(aws_provider_with_tfvars):
     assert progress_calls[0] == (0, 2)
     assert progress_calls[-1] == (2, 2)
     assert len(progress_calls) == 3
+
+
+def test_destroy_hosts_without_handles_destroys_whole_workspace(
+    aws_provider_with_tfvars,
+):
+    with patch(
+        "lablink_allocator_service.providers.aws.subprocess.run",
+        side_effect=_fake_run_factory(),
+    ) as run_mock, patch(
+        "lablink_allocator_service.providers.aws.subprocess.Popen",
+        return_value=_FakeCompletedPopen(stdout_text="ok"),
+    ), patch(
+        "lablink_allocator_service.providers.aws.current_instance_security_group",
+        return_value="sg-foo",
+    ):
+        aws_provider_with_tfvars.destroy_hosts([])
+    plan_cmd = run_mock.call_args_list[0].args[0]
+    assert not any(arg.startswith("-target=") for arg in plan_cmd)
+
+
+def test_destroy_hosts_targets_handles_and_updates_tfvars(tmp_path):
+    """A targeted destroy addresses only the given hosts and drops them
+    from instance_names so the next launch doesn't plan them back."""
+    runtime_file = tmp_path / "terraform.runtime.tfvars"
+    runtime_file.write_text(
+        'resource_prefix = "p"\n'
+        'instance_names = ["p-vm-1", "p-vm-2", "p-vm-3"]\n'
+    )
+    provider = AWSProvider(region="us-west-2", tofu_dir=tmp_path)
+
+    def fake_run(cmd, **kwargs):
+        result = MagicMock()
+        if cmd[1:3] == ["state", "list"]:
+            # Post-destroy state: p-vm-2 is gone.
+            result.stdout = (
+                'aws_instance.lablink_vm["p-vm-1"]\n'
+                'aws_instance.lablink_vm["p-vm-3"]\n'
+            )
+        else:
+            result.stdout = '{"resource_changes": []}' if "show" in cmd else "OK"
+        result.stderr = ""
+        result.returncode = 0
+        return result
+
+    with patch(
+        "lablink_allocator_service.providers.aws.subprocess.run",
+        side_effect=fake_run,
+    ) as run_mock, patch(
+        "lablink_allocator_service.providers.aws.subprocess.Popen",
+        return_value=_FakeCompletedPopen(stdout_text="ok"),
+    ), patch(
+        "lablink_allocator_service.providers.aws.current_instance_security_group",
+        return_value="sg-foo",
+    ):
+        provider.destroy_hosts([ClientHandle(id="i-2", hostname="p-vm-2")])
+
+    plan_cmd = run_mock.call_args_list[0].args[0]
+    assert [a for a in plan_cmd if a.startswith("-target=")] == [
+        '-target=aws_instance.lablink_vm["p-vm-2"]',
+        '-target=time_static.start["p-vm-2"]',
+        '-target=time_static.end["p-vm-2"]',
+    ]
+    content = runtime_file.read_text()
+    assert 'instance_names = ["p-vm-1", "p-vm-3"]' in content
+    assert 'resource_prefix = "p"' in content
@@ -20,6 +20,7 @@ def test_satisfies_protocol_and_flags():
     assert p.can_provision_hosts is True
     assert p.can_destroy_hosts is True
     assert p.can_recover_hosts is True
+    assert p.can_stop_hosts is True
     assert p.client_connectivity.name == "allocator_proxied"
 
 
@@ -54,6 +55,30 @@ def test_recover_hosts_returns_false_if_any_recycle_fails():
     assert m.call_count == 2
 
 
+def test_stop_and_start_hosts_batch_instance_ids_per_region():
+    p = make_provider()
+    handles = [
+        ClientHandle(id="i-1", hostname="vm-1", provider_metadata={"region": "eu-1"}),
+        ClientHandle(id="i-2", hostname="vm-2", provider_metadata={}),
+        ClientHandle(id="i-3", hostname="vm-3", provider_metadata={}),
+    ]
+    with patch(
+        "lablink_allocator_service.providers.aws.stop_ec2_instances",
+        return_value=True,
+    ) as stop, patch(
+        "lablink_allocator_service.providers.aws.start_ec2_instances",
+        side_effect=[True, False],
+    ) as start:
+        assert p.stop_hosts(handles) is True
+        assert p.start_hosts(handles) is False
+    assert [(c.args, c.kwargs) for c in stop.call_args_list] == [
+        ((["i-1"],), {"region": "eu-1"}),
+        ((["i-2", "i-3"],), {"region": "us-west-2"}),
+    ]
+    # Every region is attempted even after one fails.
+    assert start.call_count == 2
+
+
 def test_list_hosts_maps_tofu_outputs():
     p = make_provider()
     with patch(
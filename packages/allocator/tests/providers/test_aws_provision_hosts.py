@@ -102,7 +102,11 @@ def all_aws_mocks():
         ),
         "get_instance_names": patch(
             "lablink_allocator_service.providers.aws.get_instance_names",
-            return_value=["host-1"],
+            return_value=["sleap-lablink-test-vm-1"],
+        ),
+        "get_instance_private_ips": patch(
+            "lablink_allocator_service.providers.aws.get_instance_private_ips",
+            return_value=["10.0.1.5"],
         ),
         "audit_tofu_plan": patch(
             "lablink_allocator_service.providers.aws.audit_tofu_plan",
@@ -123,7 +127,23 @@ def test_provision_hosts_returns_provision_result(aws_provider, all_aws_mocks):
     assert isinstance(result, ProvisionResult)
     assert all(isinstance(h, ClientHandle) for h in result.handles)
     assert result.handles[0].id == "i-1"
-    assert result.handles[0].hostname == "host-1"
+    assert result.handles[0].hostname == "sleap-lablink-test-vm-1"
+
+
+def test_provision_hosts_reports_private_ips(aws_provider, all_aws_mocks):
+    """The vm_private_ips output rides along in provider_metadata so the
+    agent-address cache can be seeded without an EC2 lookup."""
+    result = aws_provider.provision_hosts(count=1, spec=_make_spec())
+    assert result.handles[0].provider_metadata == {
+        "region": "us-west-2", "private_ip": "10.0.1.5",
+    }
+
+
+def test_provision_hosts_without_private_ip_output(aws_provider, all_aws_mocks):
+    """State applied before the output existed just seeds nothing."""
+    all_aws_mocks["get_instance_private_ips"].side_effect = RuntimeError("x")
+    result = aws_provider.provision_hosts(count=1, spec=_make_spec())
+    assert result.handles[0].provider_metadata == {"region": "us-west-2"}
 
 
 def test_provision_hosts_writes_runtime_tfvars(aws_provider, all_aws_mocks, tmp_path):
@@ -261,16 +281,126 @@ def test_provision_hosts_uploads_to_s3(aws_provider, all_aws_mocks):
     all_aws_mocks["upload_to_s3"].assert_called_once()
 
 
-def test_provision_hosts_passes_count_to_tofu(aws_provider, all_aws_mocks):
-    aws_provider.provision_hosts(count=5, spec=_make_spec())
-    cmds = [list(c.args[0]) for c in all_aws_mocks["subprocess_run"].call_args_list
+def _tofu_cmds(run_mock):
+    return [list(c.args[0]) for c in run_mock.call_args_list
             if c.args and isinstance(c.args[0], list)]
-    # Find any tofu invocation that has the instance_count var
-    has_count = any(
-        any("-var=instance_count=5" == arg for arg in cmd)
-        for cmd in cmds
-    )
-    assert has_count, f"-var=instance_count=5 not passed: {cmds}"
+
+
+def _plan_cmd(run_mock):
+    return next(c for c in _tofu_cmds(run_mock) if "plan" in c)
+
+
+def _state_list_run(addresses, show_json='{"resource_changes": []}'):
+    """subprocess.run side_effect whose `tofu state list` reports
+    `addresses` (one per line) and whose `show` returns `show_json`."""
+    def fake_run(cmd, **kwargs):
+        result = MagicMock()
+        if cmd[1:3] == ["state", "list"]:
+            result.stdout = "".join(f"{a}\n" for a in addresses)
+        elif "show" in cmd:
+            result.stdout = show_json
+        else:
+            result.stdout = "OK"
+        result.stderr = ""
+        result.returncode = 0
+        return result
+    return fake_run
+
+
+def test_provision_hosts_targets_only_new_hosts(aws_provider, all_aws_mocks):
+    aws_provider.provision_hosts(count=5, spec=_make_spec())
+    plan = _plan_cmd(all_aws_mocks["subprocess_run"])
+    targets = [a for a in plan if a.startswith("-target=")]
+    assert len(targets) == 15  # instance + start/end timestamps per host
+    assert '-target=aws_instance.lablink_vm["sleap-lablink-test-vm-5"]' in plan
+    assert not any(a.startswith("-var=instance_count") for a in plan)
+
+
+def test_provision_hosts_appends_after_existing_hosts(
+    aws_provider, all_aws_mocks, tmp_path,
+):
+    all_aws_mocks["subprocess_run"].side_effect = _state_list_run([
+        "aws_iam_role.lablink_vm_role",
+        'aws_instance.lablink_vm["sleap-lablink-test-vm-1"]',
+        'aws_instance.lablink_vm["sleap-lablink-test-vm-3"]',
+    ])
+    all_aws_mocks["get_instance_ids"].return_value = ["i-1", "i-3", "i-4"]
+    all_aws_mocks["get_instance_names"].return_value = [
+        "sleap-lablink-test-vm-1",
+        "sleap-lablink-test-vm-3",
+        "sleap-lablink-test-vm-4",
+    ]
+    all_aws_mocks["get_instance_timings"].return_value = {
+        "sleap-lablink-test-vm-1": {"seconds": 1.0},
+        "sleap-lablink-test-vm-4": {"seconds": 4.0},
+    }
+
+    result = aws_provider.provision_hosts(count=1, spec=_make_spec())
+
+    plan = _plan_cmd(all_aws_mocks["subprocess_run"])
+    targets = [a for a in plan if a.startswith("-target=")]
+    assert all('"sleap-lablink-test-vm-4"' in t for t in targets)
+    tfvars = (tmp_path / "terraform.runtime.tfvars").read_text()
+    assert (
+        'instance_names = ["sleap-lablink-test-vm-1", '
+        '"sleap-lablink-test-vm-3", "sleap-lablink-test-vm-4"]'
+    ) in tfvars
+    assert [h.hostname for h in result.handles] == ["sleap-lablink-test-vm-4"]
+    assert list(result.timings) == ["sleap-lablink-test-vm-4"]
+
+
+def test_provision_hosts_migrates_count_indexed_state(
+    aws_provider, all_aws_mocks,
+):
+    """Workspaces created under `count` get their [N] addresses moved to
+    hostname keys before planning, so existing VMs are kept."""
+    state = [
+        "aws_instance.lablink_vm[0]",
+        "time_static.start[0]",
+        "time_static.end[0]",
+    ]
+    calls = {"list": 0}
+
+    def fake_run(cmd, **kwargs):
+        if cmd[1:3] == ["state", "list"]:
+            calls["list"] += 1
+            if calls["list"] > 1:
+                return _state_list_run([
+                    'aws_instance.lablink_vm["sleap-lablink-test-vm-1"]',
+                ])(cmd, **kwargs)
+            return _state_list_run(state)(cmd, **kwargs)
+        return _state_list_run([])(cmd, **kwargs)
+
+    all_aws_mocks["subprocess_run"].side_effect = fake_run
+    aws_provider.provision_hosts(count=1, spec=_make_spec())
+
+    moves = [c for c in _tofu_cmds(all_aws_mocks["subprocess_run"])
+             if c[1:3] == ["state", "mv"]]
+    assert moves == [
+        ["tofu", "state", "mv", "aws_instance.lablink_vm[0]",
+         'aws_instance.lablink_vm["sleap-lablink-test-vm-1"]'],
+        ["tofu", "state", "mv", "time_static.start[0]",
+         'time_static.start["sleap-lablink-test-vm-1"]'],
+        ["tofu", "state", "mv", "time_static.end[0]",
+         'time_static.end["sleap-lablink-test-vm-1"]'],
+    ]
+    plan = _plan_cmd(all_aws_mocks["subprocess_run"])
+    assert '-target=aws_instance.lablink_vm["sleap-lablink-test-vm-2"]' in plan
+
+
+def test_provision_hosts_fails_when_state_unreadable(aws_provider, all_aws_mocks):
+    """An unreadable state must not be mistaken for an empty fleet —
+    that would reuse hostnames already running."""
+    def fake_run(cmd, **kwargs):
+        result = MagicMock()
+        result.stdout, result.stderr = "", "Error: failed to get state lock"
+        result.returncode = 1
+        return result
+
+    all_aws_mocks["subprocess_run"].side_effect = fake_run
+    with pytest.raises(RuntimeError, match="state list"):
+        aws_provider.provision_hosts(count=1, spec=_make_spec())
+    all_aws_mocks["subprocess_popen"].assert_not_called()
 
 
 def test_provision_hosts_skips_sg_id_off_ec2(aws_provider):
@@ -0,0 +1,284 @@
+"""AWSProvider with provisioning.shards > 1: new hosts are spread over
+several tofu workspaces whose applies run concurrently, reporting into
+one (completed, total) progress count.
+
+Runs the provider against the fake tofu executable in fake_tofu/ rather
+than mocking subprocess, so the shards' commands really are separate
+processes working on separate state files."""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from lablink_allocator_service.providers.aws import AWSProvider
+from lablink_allocator_service.providers.protocol import ClientHandle
+
+_PREFIX = "sleap-lablink-test"
+_SHARED = (
+    "aws_security_group.lablink_sg[0]",
+    "aws_key_pair.lablink_key_pair[0]",
+    "aws_iam_instance_profile.lablink_instance_profile[0]",
+)
+
+
+def _make_spec():
+    return {
+        "allocator_ip": "1.2.3.4",
+        "allocator_url": "https://example",
+        "machine_type": "g4dn.xlarge",
+        "image_name": "img:tag",
+        "repository": "repo",
+        "client_ami_id": "ami-abc",
+        "subject_software": "sleap",
+        "resource_prefix": _PREFIX,
+        "cloud_init_output_log_group": "lg",
+        "startup_on_error": "continue",
+        "startup_max_attempts": 3,
+        "startup_base_delay_seconds": 30,
+        "startup_success_check_b64": "",
+        "agent_token": "agent-tok",
+        "register_token": "reg-tok",
+        "deployment_name": "test",
+        "bucket_name": "test-bucket",
+        "environment": "test",
+    }
+
+
+_FAKE_TOFU_DIR = Path(__file__).parent / "fake_tofu"
+
+
+class _FakeTofu:
+    """Drives tests/providers/fake_tofu/tofu, an executable stand-in put
+    first on PATH, so every tofu command runs as its own process with its
+    own per-workspace state file, as it would against OpenTofu.
+    """
+
+    def __init__(self, log: Path, barrier_dir: Path, monkeypatch):
+        self._log = log
+        self._barrier_dir = barrier_dir
+        self._monkeypatch = monkeypatch
+
+    def commands(self) -> list[tuple[Path, list[str]]]:
+        if not self._log.exists():
+            return []
+        return [
+            (Path(entry["cwd"]), entry["argv"])
+            for entry in map(json.loads, self._log.read_text().splitlines())
+        ]
+
+    @property
+    def applies(self) -> list[Path]:
+        return [cwd for cwd, argv in self.commands() if argv[0] == "apply"]
+
+    def forget_commands(self):
+        self._log.unlink(missing_ok=True)
+
+    def expect_concurrent_applies(self, n: int):
+        """Make every apply wait until n have started, which only succeeds
+        if they actually run concurrently."""
+        self._barrier_dir.mkdir()
+        self._monkeypatch.setenv(
+            "FAKE_TOFU_APPLY_BARRIER", f"{self._barrier_dir}:{n}"
+        )
+
+    def seed(self, workdir, addresses):
+        (Path(workdir) / "terraform.tfstate").write_text(
+            json.dumps(sorted(addresses))
+        )
+
+    def state(self, workdir) -> set[str]:
+        path = Path(workdir) / "terraform.tfstate"
+        return set(json.loads(path.read_text())) if path.exists() else set()
+
+    def hosts(self, workdir):
+        return sorted(
+            a.split('"')[1] for a in self.state(workdir)
+            if a.startswith("aws_instance.")
+        )
+
+
+@pytest.fixture
+def fake_tofu(tmp_path_factory, monkeypatch):
+    scratch = tmp_path_factory.mktemp("fake_tofu")
+    monkeypatch.setenv(
+        "PATH", f"{_FAKE_TOFU_DIR}{os.pathsep}{os.environ.get('PATH', '')}"
+    )
+    monkeypatch.setenv("FAKE_TOFU_LOG", str(scratch / "commands.jsonl"))
+    tofu = _FakeTofu(
+        scratch / "commands.jsonl", scratch / "barrier", monkeypatch
+    )
+    patches = [
+        patch("lablink_allocator_service.providers.aws.upload_to_s3"),
+        patch(
+            "lablink_allocator_service.providers.aws.current_instance_security_group",
+            return_value="sg-allocator",
+        ),
+        patch(
+            "lablink_allocator_service.providers.aws.check_support_nvidia",
+            return_value=False,
+        ),
+        patch(
+            "lablink_allocator_service.providers.aws.audit_tofu_plan",
+            return_value=None,
+        ),
+    ]
+    for p in patches:
+        p.start()
+    yield tofu
+    for p in patches:
+        p.stop()
+
+
+@pytest.fixture
+def provider(tmp_path):
+    return AWSProvider(
+        region="us-west-2", tofu_dir=tmp_path, shards=2, parallelism=4,
+    )
+
+
+def test_provision_spreads_hosts_and_applies_shards_concurrently(
+    provider, fake_tofu, tmp_path,
+):
+    shard = tmp_path / "shards" / "1"
+    # Shared resources already exist, so the only applies are the two
+    # shards' host applies, which must overlap.
+    fake_tofu.seed(tmp_path, _SHARED)
+    fake_tofu.expect_concurrent_applies(2)
+    progress = []
+
+    result = provider.provision_hosts(
+        count=4, spec=_make_spec(),
+        progress_callback=lambda done, total: progress.append((done, total)),
+    )
+
+    assert fake_tofu.hosts(tmp_path) == [
+        f"{_PREFIX}-vm-1", f"{_PREFIX}-vm-3",
+    ]
+    assert fake_tofu.hosts(shard) == [f"{_PREFIX}-vm-2", f"{_PREFIX}-vm-4"]
+    assert sorted(h.hostname for h in result.handles) == [
+        f"{_PREFIX}-vm-{n}" for n in range(1, 5)
+    ]
+    assert set(result.timings) == {h.hostname for h in result.handles}
+    assert all(
+        "-parallelism=4" in argv
+        for _, argv in fake_tofu.commands() if argv[0] == "apply"
+    )
+    # Both shards' resources feed one count: 4 hosts x 3 resources.
+    assert progress[0] == (0, 12)
+    assert progress[-1] == (12, 12)
+    assert [done for done, _ in progress] == list(range(13))
+
+
+def test_provision_hands_shared_resources_to_shards(
+    provider, fake_tofu, tmp_path,
+):
+    provider.provision_hosts(count=2, spec=_make_spec())
+
+    # Fresh deployment: the primary applied its shared resources first.
+    assert fake_tofu.applies[0] == tmp_path
+    assert set(_SHARED) <= fake_tofu.state(tmp_path)
+    shard_tfvars = (
+        tmp_path / "shards" / "1" / "terraform.runtime.tfvars"
+    ).read_text()
+    assert 'shared_security_group_id = "sg-shared"' in shard_tfvars
+    assert 'shared_key_name = "key-shared"' in shard_tfvars
+    assert 'shared_instance_profile_name = "profile-shared"' in shard_tfvars
+    assert f'instance_names = ["{_PREFIX}-vm-2"]' in shard_tfvars
+    primary_tfvars = (tmp_path / "terraform.runtime.tfvars").read_text()
+    assert "shared_" not in primary_tfvars
+    assert f'instance_names = ["{_PREFIX}-vm-1"]' in primary_tfvars
+
+
+def test_targeted_destroy_only_touches_owning_shard(
+    provider, fake_tofu, tmp_path,
+):
+    provider.provision_hosts(count=4, spec=_make_spec())
+    fake_tofu.forget_commands()
+
+    provider.destroy_hosts([
+        ClientHandle(id="i-x", hostname=f"{_PREFIX}-vm-2",
+                     provider_metadata={}),
+    ])
+
+    shard = tmp_path / "shards" / "1"
+    assert fake_tofu.applies == [shard]
+    assert fake_tofu.hosts(shard) == [f"{_PREFIX}-vm-4"]
+    assert len(fake_tofu.hosts(tmp_path)) == 2
+    assert f'instance_names = ["{_PREFIX}-vm-4"]' in (
+        shard / "terraform.runtime.tfvars"
+    ).read_text()
+
+
+def test_destroying_the_newest_host_does_not_free_its_name(
+    provider, fake_tofu, tmp_path,
+):
+    """The highest number handed out is reported before anything is
+    created, and a later launch numbers after it even once that host is
+    gone from state."""
+    marks = []
+    provider.provision_hosts(
+        count=2, spec=_make_spec(), vm_number_callback=marks.append,
+    )
+    provider.destroy_hosts([
+        ClientHandle(id="i-x", hostname=f"{_PREFIX}-vm-2",
+                     provider_metadata={}),
+    ])
+
+    result = provider.provision_hosts(
+        count=1,
+        spec={**_make_spec(), "last_vm_number": marks[-1]},
+        vm_number_callback=marks.append,
+    )
+
+    assert [h.hostname for h in result.handles] == [f"{_PREFIX}-vm-3"]
+    assert marks == [2, 3]
+
+
+def test_full_destroy_empties_shards_before_primary(
+    provider, fake_tofu, tmp_path,
+):
+    provider.provision_hosts(count=4, spec=_make_spec())
+    fake_tofu.forget_commands()
+    progress = []
+
+    provider.destroy_hosts(
+        [], progress_callback=lambda done, total: progress.append((done, total)),
+    )
+
+    # The primary owns the security group the shard's instances use.
+    assert fake_tofu.applies == [tmp_path / "shards" / "1", tmp_path]
+    assert fake_tofu.state(tmp_path) == set()
+    assert fake_tofu.state(tmp_path / "shards" / "1") == set()
+    assert progress[-1] == (15, 15)
+    assert provider.list_hosts() == []
+
+
+def test_list_hosts_unions_launched_shards(provider, fake_tofu, tmp_path):
+    provider.provision_hosts(count=3, spec=_make_spec())
+
+    assert sorted(h.hostname for h in provider.list_hosts()) == [
+        f"{_PREFIX}-vm-{n}" for n in range(1, 4)
+    ]
+
+
+def test_tofu_workspaces_name_shard_state_keys(provider, tmp_path):
+    (tmp_path / "main.tf").write_text("")
+
+    workspaces = provider.tofu_workspaces()
+
+    assert workspaces == [
+        (tmp_path, "client"),
+        (tmp_path / "shards" / "1", "client/shard-1"),
+    ]
+    assert (tmp_path / "shards" / "1" / "main.tf").resolve() == (
+        tmp_path / "main.tf"
+    ).resolve()
+
+
+def test_listing_hosts_does_not_create_shard_dirs(provider, fake_tofu, tmp_path):
+    assert provider.list_hosts() == []
+    assert not (tmp_path / "shards").exists()
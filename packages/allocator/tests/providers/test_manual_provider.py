@@ -11,6 +11,7 @@ def test_manual_provider_flags_and_connectivity():
     assert p.can_provision_hosts is False
     assert p.can_destroy_hosts is False
     assert p.can_recover_hosts is False
+    assert p.can_stop_hosts is False
     assert isinstance(p.client_connectivity, LANDirectClientConnectivity)
 
 
@@ -22,7 +23,9 @@ def test_manual_provider_lifecycle_raises():
     p = ManualProvider()
     for call in (lambda: p.provision_hosts(1, {}),
                  lambda: p.destroy_hosts([]),
-                 lambda: p.recover_hosts([])):
+                 lambda: p.recover_hosts([]),
+                 lambda: p.stop_hosts([]),
+                 lambda: p.start_hosts([])):
         with pytest.raises(ProvisioningNotSupported):
             call()
 
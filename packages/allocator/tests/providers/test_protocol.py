@@ -31,6 +31,8 @@ def test_protocols_are_runtime_checkable():
         def prepare_browser_session(self, **kwargs):
             return BrowserSessionTarget(ws_url="proxy/tok", browser_credential=None)
 
+        def stage_browser_session(self, **kwargs): ...
+
         def make_join_material(self, **kwargs): ...
 
     class GoodProvider:
@@ -39,10 +41,13 @@ def test_protocols_are_runtime_checkable():
         can_provision_hosts = True
         can_destroy_hosts = True
         can_recover_hosts = True
+        can_stop_hosts = True
 
         def provision_hosts(self, count, spec): ...
         def destroy_hosts(self, handles): ...
         def recover_hosts(self, handles): ...
+        def stop_hosts(self, handles): ...
+        def start_hosts(self, handles): ...
         def list_hosts(self): return []
         def get_host_access(self, hostname): return (None, None, None)
 
@@ -82,8 +87,38 @@ def test_client_connectivity_protocol_requires_make_join_material():
         def prepare_browser_session(self, **kwargs):
             ...
 
+        def stage_browser_session(self, **kwargs):
+            ...
+
         def make_join_material(self, **kwargs):
             ...
 
     assert not isinstance(Missing(), ClientConnectivity)
     assert isinstance(Complete(), ClientConnectivity)
+
+
+def test_client_connectivity_protocol_requires_stage_browser_session():
+    class NoStaging:
+        name = "x"
+        requires_tailscale_check = False
+
+        def prepare_browser_session(self, **kwargs):
+            ...
+
+        def make_join_material(self, **kwargs):
+            ...
+
+    assert not isinstance(NoStaging(), ClientConnectivity)
+
+
+def test_shipped_connectivities_implement_protocol():
+    from lablink_allocator_service.providers.connectivity.allocator_proxied import (
+        AllocatorProxiedClientConnectivity,
+    )
+    from lablink_allocator_service.providers.registry import (
+        _CONNECTIVITY_BUILTIN,
+    )
+
+    classes = [AllocatorProxiedClientConnectivity, *_CONNECTIVITY_BUILTIN.values()]
+    for cls in classes:
+        assert isinstance(cls(), ClientConnectivity), cls.__name__
@@ -18,6 +18,14 @@ def test_get_provider_aws_returns_constructed_instance():
     assert isinstance(p, ComputeProvider)
 
 
+def test_get_provider_aws_passes_provisioning_settings():
+    p = get_provider(
+        "aws", region="us-west-2", tofu_dir="/tf", shards=3, parallelism=20,
+    )
+    assert p._shards == 3
+    assert p._parallelism == 20
+
+
 def test_get_provider_default_when_none():
     p = get_provider(None, region="us-west-2", tofu_dir="/tf")
     assert isinstance(p, AWSProvider)
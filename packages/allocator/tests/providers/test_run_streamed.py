@@ -251,3 +251,27 @@ def test_run_streamed_kills_process_and_still_cleans_up_when_callback_raises():
     assert fake_popen.wait_called is True
     assert len(started_threads) == 1
     assert not started_threads[0].is_alive()
+
+
+def test_run_streamed_passes_each_clean_line_to_on_line():
+    stdout_text = (
+        "\x1b[1maws_instance.client[0]: Creating...\x1b[0m\n"
+        "aws_instance.client[0]: Creation complete after 12s [id=i-1]\n"
+    )
+    lines = []
+    with patch(
+        "lablink_allocator_service.providers.aws.subprocess.Popen",
+        return_value=_FakePopen(stdout_text=stdout_text, returncode=0),
+    ):
+        result = _run_streamed(
+            ["tofu", "apply"],
+            cwd="/tmp",
+            resource_complete_re=_CREATE_COMPLETE_RE,
+            on_line=lines.append,
+        )
+
+    assert lines == [
+        "aws_instance.client[0]: Creating...",
+        "aws_instance.client[0]: Creation complete after 12s [id=i-1]",
+    ]
+    assert result.stdout == stdout_text
@@ -0,0 +1,226 @@
+import random
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+
+from lablink_allocator_service.providers import simulated as sim
+from lablink_allocator_service.providers.protocol import (
+    ClientHandle,
+    ComputeProvider,
+)
+
+SPEC = {"resource_prefix": "sleap-lablink-client-test"}
+
+
+@pytest.fixture
+def db(monkeypatch):
+    database = MagicMock()
+    monkeypatch.setattr(sim, "_db", lambda: database)
+    return database
+
+
+@pytest.fixture
+def now():
+    return [0.0]
+
+
+def _provider(now, **kwargs):
+    kwargs.setdefault("latency_spread", 0.0)
+    p = sim.SimulatedProvider(
+        clock=lambda: now[0],
+        sleep=lambda seconds: None,
+        rng=random.Random(0),
+        **kwargs,
+    )
+    # Tests drive the fleet with _tick() instead of the background thread.
+    p._ensure_running = lambda: None
+    return p
+
+
+def _statuses(db):
+    return [c.args for c in db.update_vm_status.call_args_list]
+
+
+def test_flags_and_connectivity():
+    from lablink_allocator_service.providers.connectivity.simulated import (
+        SimulatedClientConnectivity,
+    )
+    p = sim.SimulatedProvider()
+    assert p.name == "simulated"
+    assert p.can_provision_hosts and p.can_destroy_hosts
+    assert p.can_recover_hosts and p.can_stop_hosts
+    assert isinstance(p, ComputeProvider)
+    assert isinstance(p.client_connectivity, SimulatedClientConnectivity)
+    assert p.tofu_workspaces() == []
+
+
+def test_registry_passes_simulation_settings():
+    from lablink_allocator_service.providers.registry import get_provider
+
+    p = get_provider(
+        "simulated", region="us-west-2", tofu_dir="/tf", parallelism=50,
+        simulation={"boot_seconds": 5.0, "hang_rate": 0.1},
+    )
+    assert isinstance(p, sim.SimulatedProvider)
+    assert p._parallelism == 50
+    assert p.boot_seconds == 5.0
+    assert p.hang_rate == 0.1
+
+
+def test_provision_registers_hosts_and_streams_progress(db, now):
+    p = _provider(now, create_seconds=40.0, parallelism=2)
+    progress, lines = [], []
+    result = p.provision_hosts(
+        3, SPEC, progress_callback=lambda c, t: progress.append((c, t)),
+        output_callback=lines.append,
+    )
+
+    names = [f"sleap-lablink-client-test-vm-{i}" for i in (1, 2, 3)]
+    assert sorted(h.hostname for h in result.handles) == names
+    assert progress[0] == (0, 3) and progress[-1] == (3, 3)
+    assert sum("Creation complete after 40s" in line for line in lines) == 3
+    assert lines[-1].startswith("Apply complete! Resources: 3 added")
+    assert result.apply_stdout.splitlines() == lines
+    assert set(result.timings) == set(names)
+    assert result.timings[names[0]]["seconds"] == 40.0
+    assert result.timings[names[0]]["start_time"].endswith("Z")
+
+    kwargs = db.register_client.call_args.kwargs
+    assert kwargs["provider"] == "simulated"
+    assert kwargs["machine_identity"] == kwargs["provider_metadata"]["instance_id"]
+    assert sorted(_statuses(db)) == [(n, "initializing") for n in names]
+    assert sorted(h.hostname for h in p.list_hosts()) == names
+
+
+def test_hostnames_are_never_reused(db, now):
+    p = _provider(now)
+    first = p.provision_hosts(2, SPEC).handles
+    p.destroy_hosts([h for h in first if h.hostname.endswith("vm-2")])
+    second = p.provision_hosts(1, SPEC).handles
+    assert second[0].hostname == "sleap-lablink-client-test-vm-3"
+
+
+def test_boot_then_heartbeats(db, now):
+    p = _provider(now, boot_seconds=100.0, heartbeat_seconds=30.0)
+    hostname = p.provision_hosts(1, SPEC).handles[0].hostname
+    db.reset_mock()
+
+    now[0] = 99.0
+    p._tick()
+    db.record_heartbeat.assert_not_called()
+
+    now[0] = 100.0
+    p._tick()
+    assert _statuses(db) == [(hostname, "running")]
+    db.update_health.assert_called_once_with(hostname, "Healthy")
+    assert db.record_heartbeat.call_count == 1
+
+    now[0] = 120.0
+    p._tick()
+    assert db.record_heartbeat.call_count == 1
+    now[0] = 130.0
+    p._tick()
+    assert db.record_heartbeat.call_count == 2
+    assert db.record_heartbeat.call_args.args[0] == hostname
+
+
+def test_create_failure_keeps_the_hosts_that_came_up(db, now):
+    p = _provider(now, create_failure_rate=1.0)
+    lines = []
+    with pytest.raises(RuntimeError, match="failed for 2 of 2"):
+        p.provision_hosts(2, SPEC, output_callback=lines.append)
+    assert p.list_hosts() == []
+    db.register_client.assert_not_called()
+    assert sum(line.startswith("Error: creating") for line in lines) == 2
+
+
+def test_boot_failure_reports_error_and_recovers(db, now):
+    p = _provider(now, boot_seconds=10.0, boot_failure_rate=1.0)
+    handle = p.provision_hosts(1, SPEC).handles[0]
+    db.reset_mock()
+    now[0] = 10.0
+    p._tick()
+    assert _statuses(db) == [(handle.hostname, "error")]
+    db.record_heartbeat.assert_not_called()
+
+    p.boot_failure_rate = 0.0
+    assert p.recover_hosts([handle]) is True
+    now[0] = 20.0
+    p._tick()
+    assert _statuses(db)[-1] == (handle.hostname, "running")
+
+
+def test_hung_host_goes_silent_until_recovered(db, now):
+    p = _provider(now, boot_seconds=0.0, heartbeat_seconds=30.0, hang_rate=1.0)
+    handle = p.provision_hosts(1, SPEC).handles[0]
+    p._tick()  # boots; the first heartbeat is not a hang check
+    boot_id = db.record_heartbeat.call_args.args[1]
+    db.reset_mock()
+
+    for t in (30.0, 60.0, 90.0):
+        now[0] = t
+        p._tick()
+    db.record_heartbeat.assert_not_called()
+
+    p.hang_rate = 0.0
+    assert p.recover_hosts([handle]) is True
+    p._tick()
+    assert db.record_heartbeat.call_args.args[1] != boot_id
+
+
+def test_stop_and_start(db, now):
+    p = _provider(now, boot_seconds=0.0, heartbeat_seconds=30.0)
+    handle = p.provision_hosts(1, SPEC).handles[0]
+    p._tick()
+    assert p.stop_hosts([handle]) is True
+    db.reset_mock()
+    now[0] = 60.0
+    p._tick()
+    db.record_heartbeat.assert_not_called()
+
+    assert p.start_hosts([handle]) is True
+    p._tick()
+    assert _statuses(db) == [(handle.hostname, "running")]
+    # Only a stopped host can be started, and only a known one stopped.
+    assert p.start_hosts([handle]) is False
+    assert p.stop_hosts([ClientHandle(id="x", hostname="nope")]) is False
+
+
+def test_destroy_subset_and_all(db, now):
+    p = _provider(now, destroy_seconds=30.0)
+    handles = p.provision_hosts(3, SPEC).handles
+    progress = []
+    result = p.destroy_hosts(
+        handles[:1], progress_callback=lambda c, t: progress.append((c, t)),
+    )
+    assert progress == [(0, 1), (1, 1)]
+    assert "Destruction complete after 30s" in result.stdout
+    assert len(p.list_hosts()) == 2
+
+    result = p.destroy_hosts([])
+    assert "Destroy complete! Resources: 2 destroyed." in result.stdout
+    assert p.list_hosts() == []
+
+
+def test_get_host_access(db, now):
+    p = _provider(now)
+    handle = p.provision_hosts(1, SPEC).handles[0]
+    assert p.get_host_access(handle.hostname) == (handle.id, None, None)
+    assert p.get_host_access("unknown") == (None, None, None)
+
+
+def test_connectivity_records_session_without_agent_call():
+    from lablink_allocator_service.providers.connectivity.simulated import (
+        SimulatedClientConnectivity,
+    )
+    database = MagicMock()
+    database.table_name = "vms"
+    cursor = database._cursor.__enter__.return_value
+    target = SimulatedClientConnectivity().prepare_browser_session(
+        database=database, hostname="vm-1", session_id=uuid.uuid4(),
+        browser_token="b", agent_token="a",
+    )
+    assert target.ws_url == "ws://vm-1.invalid:6080"
+    params = cursor.execute.call_args.args[1]
+    assert params[2:] == (target.ws_url, target.browser_credential, "vm-1")
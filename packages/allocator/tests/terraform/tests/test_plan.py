@@ -164,7 +164,7 @@ def test_lablink_vm(plan):
 
 def test_lablink_security_group(plan):
     rmap = _resource_map(plan)
-    resource = rmap["aws_security_group.lablink_sg"]
+    resource = rmap["aws_security_group.lablink_sg[0]"]
     assert resource["type"] == "aws_security_group"
     v = resource["values"]
 
@@ -203,7 +203,7 @@ def test_lablink_security_group(plan):
 
 def test_lablink_key_pair(plan):
     rmap = _resource_map(plan)
-    resource = rmap["aws_key_pair.lablink_key_pair"]
+    resource = rmap["aws_key_pair.lablink_key_pair[0]"]
     assert resource["type"] == "aws_key_pair"
     assert resource["values"]["key_name"] == "test-software-lablink-client-ci-test-keypair"
 
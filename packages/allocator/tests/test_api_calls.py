@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -23,6 +23,7 @@ VM_STATUS_UPDATE_ENDPOINT = "/api/vm-status"
 VM_LOGS_ENDPOINT = "/api/vm-logs"
 METRICS_ENDPOINT = "/api/vm-metrics"
 SCHEDULE_DESTRUCTION_ENDPOINT = "/api/schedule-destruction"
+SCHEDULE_LAUNCH_ENDPOINT = "/api/schedule-launch"
 HEARTBEAT_ENDPOINT = "/api/heartbeat"
 
 
@@ -216,6 +217,7 @@ def test_request_vm_success(client, monkeypatch):
         "hostname": "host1",
         "status": "running",
         "reboot_count": 0,
+        "session_started": True,
     }
     # The handler also borrows a raw connection to read the cookie secret.
     fake_conn = MagicMock()
@@ -223,9 +225,10 @@ def test_request_vm_success(client, monkeypatch):
     monkeypatch.setattr(
         "lablink_allocator_service.main.database", fake_db, raising=True
     )
+    captured = {}
     monkeypatch.setattr(
         "lablink_allocator_service.providers.connectivity.allocator_proxied.prepare_browser_session",
-        lambda **kw: None,
+        lambda **kw: captured.update(kw),
     )
     monkeypatch.setattr(
         "lablink_allocator_service.routes.session_cookie.get_or_create_cookie_secret",
@@ -240,12 +243,52 @@ def test_request_vm_success(client, monkeypatch):
 
     assert resp.status_code == 303
     assert resp.headers["Location"].endswith("/desktop")
+    # A rejoin always rotates; the staged credential is for fresh seats.
+    assert captured["use_staged"] is False
     set_cookie = resp.headers.get("Set-Cookie", "")
     assert "lablink_session=" in set_cookie
     assert "HttpOnly" in set_cookie
     assert "SameSite=Strict" in set_cookie
 
 
+def test_request_vm_preassigned_seat_uses_staged_credential(
+    client, monkeypatch
+):
+    """The first arrival on a roster pre-assigned seat is a lookup, not an
+    assignment, and may take the seat's staged credential."""
+    fake_db = MagicMock()
+    fake_db.get_assigned_vm_for_email.return_value = {
+        "hostname": "host-roster",
+        "status": "running",
+        "reboot_count": 0,
+        "session_started": False,
+    }
+    fake_db._pool.getconn.return_value = MagicMock()
+    monkeypatch.setattr(
+        "lablink_allocator_service.main.database", fake_db, raising=True
+    )
+    captured = {}
+    monkeypatch.setattr(
+        "lablink_allocator_service.providers.connectivity.allocator_proxied.prepare_browser_session",
+        lambda **kw: captured.update(kw),
+    )
+    monkeypatch.setattr(
+        "lablink_allocator_service.routes.session_cookie.get_or_create_cookie_secret",
+        lambda conn: "test-secret",
+    )
+
+    resp = client.post(
+        "/api/request_vm",
+        data={"email": "rostered@example.com"},
+        follow_redirects=False,
+    )
+
+    assert resp.status_code == 303
+    assert captured["hostname"] == "host-roster"
+    assert captured["use_staged"] is True
+    fake_db.assign_vm.assert_not_called()
+
+
 def test_request_vm_fresh_assignment_uses_returned_hostname(client, monkeypatch):
     """Fresh assignment (no existing seat) uses the hostname assign_vm
     returns directly — there is no second lookup-by-email, which is the
@@ -284,11 +327,61 @@ def test_request_vm_fresh_assignment_uses_returned_hostname(client, monkeypatch)
     assert resp.headers["Location"].endswith("/desktop")
     # The hostname handed to session-prep is exactly what assign_vm returned.
     assert captured["hostname"] == "host-fresh"
+    # A fresh seat may start on its pre-staged credential.
+    assert captured["use_staged"] is True
     fake_db.assign_vm.assert_called_once_with(email="fresh@example.com")
     # Only the initial idempotency check ran — no second re-lookup by email.
     fake_db.get_assigned_vm_for_email.assert_called_once()
 
 
+def test_request_vm_held_seat_rebooting_waits(client, monkeypatch):
+    """An email whose seat is rebooting keeps it: the student is asked to
+    try again, and no second seat is claimed."""
+    fake_db = MagicMock()
+    fake_db.get_assigned_vm_for_email.return_value = {
+        "hostname": "host-held",
+        "status": "rebooting",
+        "reboot_count": 1,
+        "session_started": True,
+    }
+    monkeypatch.setattr(
+        "lablink_allocator_service.main.database", fake_db, raising=True
+    )
+
+    resp = client.post(
+        "/api/request_vm",
+        data={"email": "held@example.com"},
+        follow_redirects=False,
+    )
+
+    assert resp.status_code == 503
+    assert b"Your desktop is restarting" in resp.data
+    fake_db.assign_vm.assert_not_called()
+
+
+def test_request_vm_claim_finds_held_seat_not_ready(client, monkeypatch):
+    """assign_vm's SeatNotReady (the held seat appeared after the lookup)
+    gets the same wait page."""
+    from lablink_allocator_service.db.vms import SeatNotReady
+
+    fake_db = MagicMock()
+    fake_db.get_assigned_vm_for_email.return_value = None
+    fake_db.assign_vm.side_effect = SeatNotReady("host-held", "initializing")
+    monkeypatch.setattr(
+        "lablink_allocator_service.main.database", fake_db, raising=True
+    )
+    monkeypatch.setattr("lablink_allocator_service.main.seat_queue", None)
+
+    resp = client.post(
+        "/api/request_vm",
+        data={"email": "held@example.com"},
+        follow_redirects=False,
+    )
+
+    assert resp.status_code == 503
+    assert b"Your desktop is restarting" in resp.data
+
+
 def test_request_vm_missing(client, monkeypatch):
     """POST /api/request_vm with missing email -> index.html with error."""
     fake_db = MagicMock()
@@ -325,6 +418,172 @@ def test_request_vm_no_vm_available(client, monkeypatch):
     assert b"No seats available" in resp.data
 
 
+def test_request_vm_empty_pool_wakes_autoscaler(client, monkeypatch):
+    """An empty pool is reported to the autoscaler so it checks at once."""
+    fake_db = MagicMock()
+    fake_db.get_assigned_vm_for_email.return_value = None
+    fake_db.assign_vm.side_effect = ValueError("No available VMs to assign.")
+    fake_autoscaler = MagicMock()
+    monkeypatch.setattr(
+        "lablink_allocator_service.main.database", fake_db, raising=True
+    )
+    monkeypatch.setattr(
+        "lablink_allocator_service.main.autoscaler", fake_autoscaler
+    )
+
+    resp = client.post(
+        "/api/request_vm",
+        data={"email": "user@example.com"},
+        follow_redirects=False,
+    )
+
+    assert resp.status_code == 503
+    fake_autoscaler.record_seat_request.assert_called_once_with(pool_empty=True)
+
+
+def test_request_vm_empty_pool_joins_seat_queue(client, monkeypatch):
+    """With the seat queue running, an empty pool queues the student and
+    renders the waiting room instead of a 503."""
+    from lablink_allocator_service.seat_queue import SeatQueue
+
+    fake_db = MagicMock()
+    fake_db.get_assigned_vm_for_email.return_value = None
+    fake_db.assign_vm.side_effect = ValueError("No available VMs to assign.")
+    queue = SeatQueue(database=fake_db)
+    monkeypatch.setattr(
+        "lablink_allocator_service.main.database", fake_db, raising=True
+    )
+    monkeypatch.setattr("lablink_allocator_service.main.seat_queue", queue)
+
+    resp = client.post(
+        "/api/request_vm",
+        data={"email": "user@example.com"},
+        follow_redirects=False,
+    )
+
+    assert resp.status_code == 202
+    assert b"Waiting for a seat" in resp.data
+    assert queue.has_waiters()
+    ticket = next(iter(queue._tickets))
+    assert f"/api/seat_queue/{ticket}/claim".encode() in resp.data
+
+    poll = client.get(f"/api/seat_queue/{ticket}")
+    assert poll.status_code == 200
+    assert poll.get_json() == {"status": "waiting", "position": 1}
+
+
+def test_request_vm_queues_behind_waiting_students(client, monkeypatch):
+    """A newcomer doesn't get a seat ahead of students already waiting."""
+    fake_db = MagicMock()
+    fake_db.get_assigned_vm_for_email.return_value = None
+    queue = MagicMock()
+    queue.has_waiters.return_value = True
+    queue.join.return_value = MagicMock(id="t-1")
+    queue.status.return_value = {"status": "waiting", "position": 3}
+    monkeypatch.setattr(
+        "lablink_allocator_service.main.database", fake_db, raising=True
+    )
+    monkeypatch.setattr("lablink_allocator_service.main.seat_queue", queue)
+
+    resp = client.post(
+        "/api/request_vm",
+        data={"email": "late@example.com"},
+        follow_redirects=False,
+    )
+
+    assert resp.status_code == 202
+    fake_db.assign_vm.assert_not_called()
+    queue.join.assert_called_once_with("late@example.com")
+
+
+def test_request_vm_rejoin_then_ticket_expiry_keeps_session(
+    client, monkeypatch
+):
+    """A queued student handed a seat who asks again instead of claiming
+    rejoins it; their ticket is dropped, so its claim timeout can't
+    release the seat under the live session."""
+    from lablink_allocator_service.seat_queue import SeatQueue
+
+    fake_db = MagicMock()
+    fake_db.assign_vm.return_value = "host1"
+    fake_db.get_assigned_vm_for_email.return_value = {
+        "hostname": "host1",
+        "status": "running",
+        "reboot_count": 0,
+        "session_started": False,
+    }
+    queue = SeatQueue(database=fake_db, claim_seconds=120)
+    ticket = queue.join("user@example.com")
+    queue._dispatch()
+    monkeypatch.setattr(
+        "lablink_allocator_service.main.database", fake_db, raising=True
+    )
+    monkeypatch.setattr("lablink_allocator_service.main.seat_queue", queue)
+    monkeypatch.setattr(
+        "lablink_allocator_service.providers.connectivity.allocator_proxied.prepare_browser_session",
+        lambda **kw: None,
+    )
+    monkeypatch.setattr(
+        "lablink_allocator_service.routes.session_cookie.get_or_create_cookie_secret",
+        lambda conn: "test-secret",
+    )
+
+    resp = client.post(
+        "/api/request_vm",
+        data={"email": "user@example.com"},
+        follow_redirects=False,
+    )
+    assert resp.status_code == 303
+
+    for queued in queue._tickets.values():
+        queued.assigned_at -= 121
+    queue._dispatch()
+
+    assert queue.status(ticket.id) is None
+    fake_db.release_unclaimed_seat.assert_not_called()
+    fake_db.release_seat.assert_not_called()
+
+
+def test_seat_queue_status_unknown_ticket(client, monkeypatch):
+    from lablink_allocator_service.seat_queue import SeatQueue
+
+    monkeypatch.setattr(
+        "lablink_allocator_service.main.seat_queue", SeatQueue(MagicMock())
+    )
+
+    resp = client.get("/api/seat_queue/nope")
+
+    assert resp.status_code == 404
+    assert resp.get_json() == {"status": "expired"}
+
+
+def test_claim_queued_seat_starts_session(client, monkeypatch):
+    queue = MagicMock()
+    queue.claim.return_value = ("user@example.com", "vm-7")
+    monkeypatch.setattr("lablink_allocator_service.main.seat_queue", queue)
+
+    with patch(
+        "lablink_allocator_service.routes.public._start_session",
+        return_value="session started",
+    ) as start:
+        resp = client.post("/api/seat_queue/t-1/claim")
+
+    assert resp.data == b"session started"
+    queue.claim.assert_called_once_with("t-1")
+    assert start.call_args.args[1:] == ("user@example.com", "vm-7")
+
+
+def test_claim_queued_seat_expired_ticket(client, monkeypatch):
+    queue = MagicMock()
+    queue.claim.return_value = None
+    monkeypatch.setattr("lablink_allocator_service.main.seat_queue", queue)
+
+    resp = client.post("/api/seat_queue/t-1/claim")
+
+    assert resp.status_code == 200
+    assert b"expired" in resp.data
+
+
 def test_request_vm_database_internal_failure(client, monkeypatch):
     """When the database lookup raises -> generic index.html error page."""
     fake_db = MagicMock()
@@ -361,6 +620,7 @@ def test_request_vm_rotation_failure_marks_unhealthy(client, monkeypatch):
         "hostname": "host1",
         "status": "running",
         "reboot_count": 0,
+        "session_started": True,
     }
     monkeypatch.setattr(
         "lablink_allocator_service.main.database", fake_db, raising=True
@@ -1552,6 +1812,165 @@ def test_create_scheduled_destruction_duplicate_name(
     fake_scheduler.schedule_destruction.assert_called_once()
 
 
+def test_create_scheduled_launch_success(client, admin_headers, monkeypatch):
+    """Test scheduling a launch for a class start time."""
+    from datetime import datetime, timedelta, timezone
+
+    ready_by = datetime.now(timezone.utc) + timedelta(days=1)
+    launch_time = ready_by - timedelta(seconds=1800)
+    fake_scheduler = MagicMock()
+    fake_scheduler.schedule_launch.return_value = {
+        "schedule_id": 7,
+        "launch_time": launch_time,
+        "lead_seconds": 1800,
+    }
+    monkeypatch.setattr(
+        "lablink_allocator_service.main.scheduler_service",
+        fake_scheduler,
+        raising=False,
+    )
+
+    data = {
+        "schedule_name": "Monday class",
+        "ready_by": ready_by.isoformat(),
+        "target_seats": 30,
+    }
+    resp = client.post(SCHEDULE_LAUNCH_ENDPOINT, json=data, headers=admin_headers)
+
+    assert resp.status_code == 200
+    json_data = resp.get_json()
+    assert json_data["success"] is True
+    assert json_data["schedule_id"] == 7
+    assert json_data["launch_time"] == launch_time.isoformat()
+    assert json_data["lead_seconds"] == 1800
+    call_kwargs = fake_scheduler.schedule_launch.call_args.kwargs
+    assert call_kwargs["schedule_name"] == "Monday class"
+    assert call_kwargs["ready_by"] == ready_by
+    assert call_kwargs["target_seats"] == 30
+
+
+@pytest.mark.parametrize(
+    "data,message",
+    [
+        ({"ready_by": "2999-01-01T09:00:00Z", "target_seats": 1},
+         "schedule_name is required"),
+        ({"schedule_name": "x", "target_seats": 1}, "ready_by is required"),
+        ({"schedule_name": "x", "ready_by": "2999-01-01T09:00:00Z"},
+         "target_seats must be a positive integer"),
+        ({"schedule_name": "x", "ready_by": "2999-01-01T09:00:00Z",
+          "target_seats": 0},
+         "target_seats must be a positive integer"),
+        ({"schedule_name": "x", "ready_by": "soon", "target_seats": 1},
+         "Invalid ready_by format"),
+        ({"schedule_name": "x", "ready_by": "2020-01-01T09:00:00Z",
+          "target_seats": 1},
+         "ready_by must be in the future"),
+    ],
+)
+def test_create_scheduled_launch_validation(
+    client, admin_headers, monkeypatch, data, message
+):
+    """Test that invalid scheduled launch requests are rejected."""
+    fake_scheduler = MagicMock()
+    monkeypatch.setattr(
+        "lablink_allocator_service.main.scheduler_service",
+        fake_scheduler,
+        raising=False,
+    )
+
+    resp = client.post(SCHEDULE_LAUNCH_ENDPOINT, json=data, headers=admin_headers)
+
+    assert resp.status_code == 400
+    assert message in resp.get_json()["message"]
+    fake_scheduler.schedule_launch.assert_not_called()
+
+
+def test_create_scheduled_launch_duplicate_name(client, admin_headers, monkeypatch):
+    """Test that a duplicate scheduled launch name returns 409."""
+    fake_scheduler = MagicMock()
+    fake_scheduler.schedule_launch.side_effect = ValueError(
+        "Schedule 'Monday class' already exists"
+    )
+    monkeypatch.setattr(
+        "lablink_allocator_service.main.scheduler_service",
+        fake_scheduler,
+        raising=False,
+    )
+
+    data = {
+        "schedule_name": "Monday class",
+        "ready_by": "2999-01-01T09:00:00Z",
+        "target_seats": 3,
+    }
+    resp = client.post(SCHEDULE_LAUNCH_ENDPOINT, json=data, headers=admin_headers)
+
+    assert resp.status_code == 409
+    assert "already exists" in resp.get_json()["message"]
+
+
+def test_cancel_scheduled_launch_success(client, admin_headers, monkeypatch):
+    """Test cancelling a pending scheduled launch."""
+    fake_db = MagicMock()
+    fake_db.get_scheduled_launch.return_value = {"id": 7, "status": "scheduled"}
+    fake_scheduler = MagicMock()
+    monkeypatch.setattr(
+        "lablink_allocator_service.main.schedule_db", fake_db, raising=False
+    )
+    monkeypatch.setattr(
+        "lablink_allocator_service.main.scheduler_service",
+        fake_scheduler,
+        raising=False,
+    )
+
+    resp = client.delete(f"{SCHEDULE_LAUNCH_ENDPOINT}/7", headers=admin_headers)
+
+    assert resp.status_code == 200
+    assert resp.get_json()["success"] is True
+    fake_scheduler.cancel_scheduled_launch.assert_called_once_with(7)
+
+
+def test_cancel_scheduled_launch_already_completed(
+    client, admin_headers, monkeypatch
+):
+    """Test that a scheduled launch that already ran can't be cancelled."""
+    fake_db = MagicMock()
+    fake_db.get_scheduled_launch.return_value = {"id": 7, "status": "completed"}
+    fake_scheduler = MagicMock()
+    monkeypatch.setattr(
+        "lablink_allocator_service.main.schedule_db", fake_db, raising=False
+    )
+    monkeypatch.setattr(
+        "lablink_allocator_service.main.scheduler_service",
+        fake_scheduler,
+        raising=False,
+    )
+
+    resp = client.delete(f"{SCHEDULE_LAUNCH_ENDPOINT}/7", headers=admin_headers)
+
+    assert resp.status_code == 400
+    assert "completed" in resp.get_json()["message"]
+    fake_scheduler.cancel_scheduled_launch.assert_not_called()
+
+
+def test_list_scheduled_launches(client, admin_headers, monkeypatch):
+    """Test listing scheduled launches filtered by status."""
+    fake_db = MagicMock()
+    fake_db.get_all_scheduled_launches.return_value = [
+        {"id": 1, "schedule_name": "Monday class", "status": "scheduled"},
+    ]
+    monkeypatch.setattr(
+        "lablink_allocator_service.main.schedule_db", fake_db, raising=False
+    )
+
+    resp = client.get(
+        f"{SCHEDULE_LAUNCH_ENDPOINT}?status=scheduled", headers=admin_headers
+    )
+
+    assert resp.status_code == 200
+    assert resp.get_json()["schedules"][0]["schedule_name"] == "Monday class"
+    fake_db.get_all_scheduled_launches.assert_called_once_with(status="scheduled")
+
+
 # ──────────────────────────────────────────────────────────────────────
 # Bearer token authentication tests
 # ──────────────────────────────────────────────────────────────────────
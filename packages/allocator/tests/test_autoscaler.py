@@ -0,0 +1,184 @@
+"""Tests for the demand-driven free-seat autoscaler."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from lablink_allocator_service.autoscaler import AutoscalerService
+from lablink_allocator_service.db.operations import OperationInProgress
+
+
+@pytest.fixture
+def service():
+    database = MagicMock()
+    database.get_all_vm_status.return_value = {
+        "vm-1": "running", "vm-2": "running", "vm-3": "running",
+    }
+    database.get_unassigned_vms.return_value = []
+    database.count_starting_vms.return_value = 0
+    return AutoscalerService(
+        database=database,
+        operations_worker=MagicMock(),
+        launch=MagicMock(return_value="launched"),
+        destroy=MagicMock(return_value="destroyed"),
+        free_seats=2,
+        max_vms=10,
+        demand_window_seconds=300,
+        cooldown_seconds=300,
+        scale_down_after_seconds=900,
+    )
+
+
+def _submitted(service):
+    return service.operations_worker.submit.call_args.kwargs
+
+
+def test_launches_to_restore_free_buffer(service):
+    service.database.get_unassigned_vms.return_value = ["vm-3"]
+
+    service._check()
+
+    kwargs = _submitted(service)
+    assert kwargs["op_type"] == "apply"
+    assert kwargs["created_by"] == "autoscaler"
+    assert json.loads(kwargs["params"]) == {"num_vms": 1, "autoscale": True}
+    assert kwargs["fn"](None, None) == "launched"
+    service.launch.assert_called_once_with(1, None, None)
+
+
+def test_starting_vms_count_toward_buffer(service):
+    service.database.get_unassigned_vms.return_value = ["vm-3"]
+    service.database.count_starting_vms.return_value = 1
+
+    service._check()
+
+    service.operations_worker.submit.assert_not_called()
+
+
+def test_burst_of_requests_grows_buffer(service):
+    for _ in range(5):
+        service.record_seat_request()
+
+    service._check()
+
+    assert json.loads(_submitted(service)["params"])["num_vms"] == 5
+
+
+def test_launch_capped_at_max_vms(service):
+    service.max_vms = 4
+    for _ in range(6):
+        service.record_seat_request()
+
+    service._check()
+
+    # 3 VMs already, so only 1 more fits.
+    assert json.loads(_submitted(service)["params"])["num_vms"] == 1
+
+
+def test_fleet_at_max_vms_launches_nothing(service):
+    service.max_vms = 3
+
+    service._check()
+
+    service.operations_worker.submit.assert_not_called()
+
+
+def test_no_fleet_no_scaling(service):
+    service.database.get_all_vm_status.return_value = {}
+    service._check()
+    service.database.get_all_vm_status.return_value = {"vm-1": "warm"}
+    service._check()
+
+    service.operations_worker.submit.assert_not_called()
+
+
+def test_cooldown_between_actions(service):
+    service._check()
+    service.operations_worker.submit.reset_mock()
+
+    service._check()
+    service.operations_worker.submit.assert_not_called()
+
+    service._last_action -= 301
+    service._check()
+    service.operations_worker.submit.assert_called_once()
+
+
+def test_operation_in_progress_defers_without_cooldown(service):
+    service.operations_worker.submit.side_effect = OperationInProgress(job_id=3)
+
+    service._check()  # does not raise
+
+    assert service._last_action is None
+
+
+def test_warm_pool_pending_spares_are_not_seats(service):
+    service.warm_pool = MagicMock()
+    service.warm_pool.pending.return_value = {"vm-2", "vm-3"}
+    service.database.get_unassigned_vms.return_value = ["vm-2", "vm-3"]
+
+    service._check()
+
+    assert json.loads(_submitted(service)["params"])["num_vms"] == 2
+
+
+def test_scales_down_extra_seats_after_quiet_period(service):
+    service.database.get_unassigned_vms.return_value = ["vm-1", "vm-2", "vm-3"]
+    service.database.mark_draining.return_value = ["vm-3"]
+
+    service._check()
+    service.database.mark_draining.assert_not_called()
+
+    service._last_request -= 901
+    service._check()
+
+    service.database.mark_draining.assert_called_once_with(["vm-3"])
+    kwargs = _submitted(service)
+    assert kwargs["op_type"] == "destroy"
+    assert json.loads(kwargs["params"]) == {
+        "hostnames": ["vm-3"], "autoscale": True,
+    }
+    assert kwargs["fn"](None, None) == "destroyed"
+    service.destroy.assert_called_once_with(["vm-3"], None, None)
+
+
+def test_failed_scale_down_returns_seats_to_service(service):
+    service.database.get_unassigned_vms.return_value = ["vm-1", "vm-2", "vm-3"]
+    service.database.mark_draining.return_value = ["vm-3"]
+    service.destroy.side_effect = RuntimeError("tofu failed")
+    service._last_request -= 901
+
+    service._check()
+    with pytest.raises(RuntimeError):
+        _submitted(service)["fn"](None, None)
+
+    service.database.update_vm_status.assert_called_once_with("vm-3", "running")
+
+
+def test_scale_down_deferred_undrains(service):
+    service.database.get_unassigned_vms.return_value = ["vm-1", "vm-2", "vm-3"]
+    service.database.mark_draining.return_value = ["vm-3"]
+    service.operations_worker.submit.side_effect = OperationInProgress(job_id=3)
+    service._last_request -= 901
+
+    service._check()
+
+    service.database.update_vm_status.assert_called_once_with("vm-3", "running")
+
+
+def test_old_requests_leave_demand_window(service):
+    with patch(
+        "lablink_allocator_service.autoscaler.time.monotonic",
+        return_value=1000.0,
+    ):
+        for _ in range(5):
+            service.record_seat_request()
+
+    assert service._recent_requests(1299.0) == 5
+    assert service._recent_requests(1301.0) == 0
+
+
+def test_empty_pool_request_wakes_loop(service):
+    service.record_seat_request(pool_empty=True)
+    assert service._wake_event.is_set()
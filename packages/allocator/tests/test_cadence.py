@@ -0,0 +1,198 @@
+"""Tests for server-driven client report cadence (cadence.py)."""
+
+import random
+from unittest.mock import MagicMock
+
+import pytest
+
+from lablink_allocator_service.cadence import (
+    HEADER,
+    HEARTBEAT_MAX_SECONDS,
+    REPORT_INTERVALS,
+    TelemetryCadence,
+)
+from lablink_allocator_service.db.vms import STALE_HEARTBEAT_MINUTES
+
+HEARTBEAT = "vm_telemetry.heartbeat"
+GPU = "vm_telemetry.update_gpu_health"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_small_fleet_keeps_base_interval(clock):
+    cadence = TelemetryCadence(target_qps=20.0, jitter=0.0, clock=clock)
+
+    assert cadence.next_interval(HEARTBEAT, "vm-1") == 30
+    assert cadence.next_interval("vm_telemetry.update_vm_status", "vm-1") is None
+
+
+def test_large_fleet_is_stretched_to_target(clock):
+    cadence = TelemetryCadence(target_qps=10.0, jitter=0.0, clock=clock)
+    # 600 heartbeating VMs at 30s would be 20 req/s, twice the target.
+    for n in range(600):
+        cadence.next_interval(HEARTBEAT, f"vm-{n}")
+    clock.now = 1.0
+
+    assert cadence.next_interval(HEARTBEAT, "vm-0") == 60
+    assert cadence.factor == pytest.approx(2.0)
+
+
+def test_stretch_is_capped(clock):
+    cadence = TelemetryCadence(
+        target_qps=1.0, max_interval_seconds=100, jitter=0.0, clock=clock
+    )
+    for n in range(600):
+        cadence.next_interval(GPU, f"vm-{n}")
+    clock.now = 1.0
+
+    assert cadence.next_interval(GPU, "vm-0") == 100
+
+
+def test_heartbeat_stays_inside_the_reboot_window(clock):
+    """However loaded the fleet, a heartbeat interval (jitter included)
+    is at most half the silence window after which get_failed_vms has a
+    running VM rebooted."""
+    assert HEARTBEAT_MAX_SECONDS <= STALE_HEARTBEAT_MINUTES * 60 / 2
+    cadence = TelemetryCadence(
+        heartbeat_max_interval_seconds=3600, clock=clock, rng=random.Random(1)
+    )
+    # 1000 VMs on every paced route: 1000/30 + 1000/20 + 1000/60 req/s
+    # against the default target of 20, a factor of 5.
+    for n in range(1000):
+        for endpoint in REPORT_INTERVALS:
+            cadence.next_interval(endpoint, f"vm-{n}")
+    clock.now = 1.0
+
+    heartbeats = [
+        cadence.next_interval(HEARTBEAT, f"vm-{n}") for n in range(1000)
+    ]
+    gpu = cadence.next_interval(GPU, "vm-0")
+
+    assert cadence.factor == pytest.approx(5.0)
+    assert max(heartbeats) <= HEARTBEAT_MAX_SECONDS
+    assert min(heartbeats) < max(heartbeats)
+    assert gpu > HEARTBEAT_MAX_SECONDS
+
+
+def test_inuse_reports_are_not_paced(clock):
+    """The in-use reporter only posts on a state change, so it neither
+    gets an interval nor counts toward fleet demand."""
+    cadence = TelemetryCadence(target_qps=1.0, jitter=0.0, clock=clock)
+    for n in range(600):
+        inuse = cadence.next_interval("vm_telemetry.update_inuse_status", f"vm-{n}")
+        assert inuse is None
+    clock.now = 1.0
+
+    assert cadence.next_interval(HEARTBEAT, "vm-0") == 30
+    assert cadence.factor == 1.0
+
+
+def test_departed_clients_stop_counting(clock):
+    cadence = TelemetryCadence(
+        target_qps=10.0, max_interval_seconds=60, jitter=0.0, clock=clock
+    )
+    for n in range(600):
+        cadence.next_interval(HEARTBEAT, f"vm-{n}")
+    clock.now = 3 * 60 + 1.0
+
+    assert cadence.next_interval(HEARTBEAT, "vm-new") == 30
+
+
+def test_watched_vm_reports_fast_until_expiry(clock):
+    cadence = TelemetryCadence(
+        watch_interval_seconds=5, jitter=0.0, clock=clock
+    )
+    cadence.watch("vm-1", 60)
+
+    assert cadence.next_interval(HEARTBEAT, "vm-1") == 5
+    assert cadence.next_interval(HEARTBEAT, "vm-2") == 30
+    assert cadence.watched() == {"vm-1": 60}
+    clock.now = 61.0
+    assert cadence.next_interval(HEARTBEAT, "vm-1") == 30
+    assert cadence.watched() == {}
+
+
+def test_jitter_spreads_intervals(clock):
+    cadence = TelemetryCadence(jitter=0.2, clock=clock, rng=random.Random(1))
+
+    intervals = {cadence.next_interval(HEARTBEAT, "vm-1") for _ in range(50)}
+
+    assert len(intervals) > 1
+    assert all(24 <= i <= 36 for i in intervals)
+
+
+def test_report_routes_exist(app):
+    endpoints = {rule.endpoint for rule in app.url_map.iter_rules()}
+
+    assert set(REPORT_INTERVALS) - endpoints == set()
+
+
+@pytest.fixture
+def cadence(app, monkeypatch):
+    from lablink_allocator_service import main
+
+    control = TelemetryCadence(jitter=0.0)
+    monkeypatch.setattr(main, "telemetry_cadence", control)
+    return control
+
+
+def test_report_response_carries_interval(cadence, client, monkeypatch):
+    from lablink_allocator_service import main
+    from lablink_allocator_service.secret_hash import hash_secret
+
+    db = MagicMock()
+    db.get_client_secret_hash.return_value = hash_secret("tok")
+    monkeypatch.setattr(main, "database", db)
+    cadence.watch("vm-1", 60)
+
+    resp = client.post(
+        "/api/heartbeat",
+        json={"vm_id": "vm-1"},
+        headers={"Authorization": "Bearer tok"},
+    )
+
+    assert resp.headers[HEADER] == "5"
+
+
+def test_other_responses_have_no_interval(cadence, client):
+    resp = client.get("/api/health")
+
+    assert HEADER not in resp.headers
+
+
+def test_watch_vm_endpoint(cadence, client, admin_headers):
+    resp = client.post(
+        "/api/vm-watch/vm-1", json={"minutes": 2}, headers=admin_headers
+    )
+
+    assert resp.status_code == 200
+    assert resp.get_json()["watched"] == {"vm-1": pytest.approx(120, abs=1)}
+
+
+def test_watch_vm_rejects_bad_minutes(cadence, client, admin_headers):
+    resp = client.post(
+        "/api/vm-watch/vm-1", json={"minutes": "ten"}, headers=admin_headers
+    )
+
+    assert resp.status_code == 400
+
+
+def test_watch_vm_when_disabled(client, admin_headers):
+    resp = client.post("/api/vm-watch/vm-1", headers=admin_headers)
+
+    assert resp.status_code == 409
+
+
+def test_watch_vm_requires_auth(cadence, client):
+    assert client.post("/api/vm-watch/vm-1").status_code == 401
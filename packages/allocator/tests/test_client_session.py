@@ -31,6 +31,8 @@ def vms_full_schema(real_db):
             "ADD COLUMN IF NOT EXISTS browser_ws_url TEXT, "
             "ADD COLUMN IF NOT EXISTS browser_credential TEXT, "
             "ADD COLUMN IF NOT EXISTS sessionstartedat TIMESTAMPTZ, "
+            "ADD COLUMN IF NOT EXISTS stagedvncpassword TEXT, "
+            "ADD COLUMN IF NOT EXISTS stagedupstream TEXT, "
             "ADD COLUMN IF NOT EXISTS provider TEXT, "
             "ADD COLUMN IF NOT EXISTS endpoint_url TEXT, "
             "ADD COLUMN IF NOT EXISTS provider_metadata JSONB"
@@ -55,7 +57,7 @@ def test_happy_path_rotates_and_persists(vms_full_schema):
     )
 
     with patch(
-        "lablink_allocator_service.client_session.requests.post"
+        "lablink_allocator_service.client_session._agent_http.post"
     ) as mock_post:
         mock_post.return_value = MagicMock(
             status_code=200, raise_for_status=lambda: None
@@ -111,7 +113,7 @@ def test_one_retry_then_raises(vms_full_schema):
     )
 
     with patch(
-        "lablink_allocator_service.client_session.requests.post",
+        "lablink_allocator_service.client_session._agent_http.post",
         side_effect=requests.RequestException("boom"),
     ) as mock_post:
         with pytest.raises(RotationFailed):
@@ -187,7 +189,7 @@ def test_byo_row_uses_stored_lan_ip_without_ec2_lookup(vms_full_schema):
         raise AssertionError("fallback_fn should not be called for BYO rows")
 
     with patch(
-        "lablink_allocator_service.client_session.requests.post"
+        "lablink_allocator_service.client_session._agent_http.post"
     ) as mock_post:
         mock_post.return_value = MagicMock(
             status_code=200, raise_for_status=lambda: None
@@ -256,3 +258,276 @@ def test_raises_when_instance_id_not_found(vms_full_schema):
             agent_token=AGENT_TOKEN,
             fallback_fn=_not_found,
         )
+
+
+class _RecordingCursor:
+    """Cursor double that records every statement and answers fetchone
+    from a queue."""
+
+    def __init__(self, rows=()):
+        self.executed = []
+        self._rows = list(rows)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *a):
+        return False
+
+    def execute(self, sql, params):
+        self.executed.append((sql, params))
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+
+def _fake_db(cursor):
+    class _DB:
+        table_name = "vms"
+        _cursor = cursor
+
+        def get_lan_ip(self, hostname):
+            return "10.0.0.5"
+
+    return _DB()
+
+
+def test_use_staged_skips_agent_round_trip(monkeypatch):
+    import lablink_allocator_service.client_session as cs
+
+    def _no_rotate(*a, **kw):
+        raise AssertionError("staged session must not call the agent")
+
+    monkeypatch.setattr(cs, "_post_rotate", _no_rotate)
+    cur = _RecordingCursor(rows=[("vm-1",)])
+
+    t = cs.prepare_browser_session(
+        database=_fake_db(cur), hostname="vm-1", session_id=uuid.uuid4(),
+        browser_token="btok", agent_token="agenttok", use_staged=True,
+    )
+
+    assert t.ws_url == "proxy/btok"
+    assert t.browser_credential is None
+    (sql, params), = cur.executed
+    assert "vncpassword = stagedvncpassword" in sql
+    assert "upstream = stagedupstream" in sql
+    assert "stagedvncpassword = NULL" in sql
+    assert "stagedvncpassword IS NOT NULL" in sql
+    assert params[1:] == ("btok", "proxy/btok", "vm-1")
+
+
+def test_use_staged_without_staged_credential_rotates(monkeypatch):
+    import lablink_allocator_service.client_session as cs
+
+    posted = {}
+    monkeypatch.setattr(cs, "_post_rotate",
+                        lambda url, body, *, bearer: posted.update(body=body))
+    cur = _RecordingCursor(rows=[None])
+
+    cs.prepare_browser_session(
+        database=_fake_db(cur), hostname="vm-1", session_id=uuid.uuid4(),
+        browser_token="btok", agent_token="agenttok", use_staged=True,
+    )
+
+    assert len(cur.executed) == 2
+    sql, params = cur.executed[1]
+    assert params[2] == posted["body"]["password"]
+    # The rotation replaced whatever was staged.
+    assert "stagedvncpassword = NULL" in sql
+
+
+def test_stage_browser_session_rotates_and_stores(monkeypatch):
+    import lablink_allocator_service.client_session as cs
+
+    posted = {}
+    monkeypatch.setattr(cs, "_post_rotate",
+                        lambda url, body, *, bearer: posted.update(
+                            url=url, body=body, bearer=bearer))
+    cur = _RecordingCursor()
+
+    cs.stage_browser_session(
+        database=_fake_db(cur), hostname="vm-1", agent_token="agenttok",
+    )
+
+    assert posted["url"] == "http://10.0.0.5:7070/api/session/start"
+    assert posted["bearer"] == "agenttok"
+    (sql, params), = cur.executed
+    assert "stagingat = NULL" in sql
+    # Never staged onto a seat whose session started meanwhile. A roster
+    # pre-assignment (useremail set, no session yet) may be staged.
+    assert "sessionid IS NULL" in sql
+    assert params == (posted["body"]["password"], "10.0.0.5:6080", "vm-1")
+
+
+def test_staged_credential_reaches_session(vms_full_schema):
+    """A credential staged on a free seat becomes the session's password
+    once the seat is assigned, without a second agent call."""
+    with vms_full_schema._cursor as cur:
+        cur.execute(
+            "ALTER TABLE vms "
+            "ADD COLUMN IF NOT EXISTS adminreservedat TIMESTAMPTZ, "
+            "ADD COLUMN IF NOT EXISTS stagingat TIMESTAMPTZ"
+        )
+        cur.execute("DELETE FROM vms WHERE hostname = 'host-staged'")
+        cur.execute(
+            "INSERT INTO vms (hostname, status, provider_metadata) "
+            "VALUES ('host-staged', 'running', "
+            "        '{\"lan_ip\": \"10.0.0.7\"}'::jsonb)"
+        )
+
+    from lablink_allocator_service.client_session import (
+        prepare_browser_session,
+        stage_browser_session,
+    )
+
+    with patch(
+        "lablink_allocator_service.client_session._agent_http.post"
+    ) as mock_post:
+        mock_post.return_value = MagicMock(
+            status_code=200, raise_for_status=lambda: None
+        )
+        stage_browser_session(
+            database=vms_full_schema,
+            hostname="host-staged",
+            agent_token=AGENT_TOKEN,
+        )
+        staged_password = mock_post.call_args.kwargs["json"]["password"]
+
+        with vms_full_schema._cursor as cur:
+            cur.execute(
+                "UPDATE vms SET useremail = 'kim@x.com' "
+                "WHERE hostname = 'host-staged'"
+            )
+        prepare_browser_session(
+            database=vms_full_schema,
+            hostname="host-staged",
+            session_id=uuid.uuid4(),
+            browser_token="staged-tok",
+            agent_token=AGENT_TOKEN,
+            use_staged=True,
+        )
+
+    assert mock_post.call_count == 1
+    with vms_full_schema._cursor as cur:
+        cur.execute(
+            "SELECT vncpassword, upstream, stagedvncpassword FROM vms "
+            "WHERE hostname = 'host-staged'"
+        )
+        row = cur.fetchone()
+    assert row == (staged_password, "10.0.0.7:6080", None)
+
+
+def _unrecorded_db(cursor):
+    class _DB:
+        table_name = "vms"
+        _cursor = cursor
+
+        def get_lan_ip(self, hostname):
+            return None
+
+    return _DB()
+
+
+def test_fallback_address_is_cached(monkeypatch):
+    """The provider's resolver (an EC2 API call on AWS) runs once per
+    host, not once per session."""
+    import lablink_allocator_service.client_session as cs
+
+    monkeypatch.setattr(cs, "_private_ips", {})
+    monkeypatch.setattr(cs, "_post_rotate", lambda url, body, *, bearer: None)
+    lookups = []
+
+    def _fallback(hostname):
+        lookups.append(hostname)
+        return "10.0.1.5"
+
+    for _ in range(2):
+        cs.stage_browser_session(
+            database=_unrecorded_db(_RecordingCursor()), hostname="vm-1",
+            agent_token="agenttok", fallback_fn=_fallback,
+        )
+
+    assert lookups == ["vm-1"]
+
+
+def test_seeded_address_skips_fallback(monkeypatch):
+    import lablink_allocator_service.client_session as cs
+
+    monkeypatch.setattr(cs, "_private_ips", {})
+    posted = {}
+    monkeypatch.setattr(cs, "_post_rotate",
+                        lambda url, body, *, bearer: posted.update(url=url))
+    cs.remember_private_ip("vm-1", "10.0.1.5")
+
+    def _fallback(hostname):
+        raise AssertionError("seeded address must be used")
+
+    cs.stage_browser_session(
+        database=_unrecorded_db(_RecordingCursor()), hostname="vm-1",
+        agent_token="agenttok", fallback_fn=_fallback,
+    )
+
+    assert posted["url"] == "http://10.0.1.5:7070/api/session/start"
+
+
+def test_stored_lan_ip_wins_over_cache(monkeypatch):
+    """A registration's recorded LAN IP stays authoritative."""
+    import lablink_allocator_service.client_session as cs
+
+    monkeypatch.setattr(cs, "_private_ips", {"vm-1": "10.9.9.9"})
+    posted = {}
+    monkeypatch.setattr(cs, "_post_rotate",
+                        lambda url, body, *, bearer: posted.update(url=url))
+
+    cs.stage_browser_session(
+        database=_fake_db(_RecordingCursor()), hostname="vm-1",
+        agent_token="agenttok",
+    )
+
+    assert posted["url"] == "http://10.0.0.5:7070/api/session/start"
+
+
+def test_failed_rotation_forgets_address(monkeypatch):
+    import lablink_allocator_service.client_session as cs
+
+    monkeypatch.setattr(cs, "_private_ips", {"vm-1": "10.0.1.5"})
+
+    def _unreachable(url, body, *, bearer):
+        raise cs.RotationFailed("connection refused")
+
+    monkeypatch.setattr(cs, "_post_rotate", _unreachable)
+
+    with pytest.raises(cs.RotationFailed):
+        cs.stage_browser_session(
+            database=_unrecorded_db(_RecordingCursor()), hostname="vm-1",
+            agent_token="agenttok",
+        )
+
+    assert cs._private_ips == {}
+
+
+def test_forget_without_hostname_clears_cache(monkeypatch):
+    import lablink_allocator_service.client_session as cs
+
+    monkeypatch.setattr(cs, "_private_ips", {"vm-1": "a", "vm-2": "b"})
+    cs.forget_private_ip("vm-1")
+    assert cs._private_ips == {"vm-2": "b"}
+    cs.forget_private_ip()
+    assert cs._private_ips == {}
+
+
+def test_agent_calls_share_a_keep_alive_session():
+    """Rotations go through one long-lived requests.Session, so a
+    seat's agent connection is reused rather than reopened each time."""
+    import lablink_allocator_service.client_session as cs
+
+    with patch.object(cs._agent_http, "post") as mock_post:
+        mock_post.return_value = MagicMock(raise_for_status=lambda: None)
+        cs._post_rotate(
+            "http://10.0.1.5:7070/api/session/start", {"password": "p"},
+            bearer=AGENT_TOKEN,
+        )
+
+    mock_post.assert_called_once()
+    adapter = cs._agent_http.get_adapter("http://10.0.1.5:7070/")
+    assert adapter._pool_connections == cs.AGENT_POOL_HOSTS
@@ -193,6 +193,71 @@ def test_destroy_closure_strips_ansi_from_output(
     assert "\x1b[" not in output
 
 
+@patch("lablink_allocator_service.providers.aws.get_instance_names",
+       return_value=["vm-1", "vm-2", "vm-3"])
+@patch("lablink_allocator_service.providers.aws.get_instance_ids",
+       return_value=["i-1", "i-2", "i-3"])
+@patch("lablink_allocator_service.providers.aws.current_instance_security_group",
+       return_value="sg-allocator-test")
+@patch("lablink_allocator_service.providers.aws.subprocess.Popen")
+@patch("lablink_allocator_service.providers.aws.subprocess.run")
+def test_destroy_closure_targets_named_hosts_only(
+    mock_run, mock_popen, mock_sg, mock_ids, mock_names,
+    destroy_setup, client, admin_headers, monkeypatch,
+):
+    """`hostname` form fields narrow the destroy to those VMs: only their
+    resources are targeted, sealed and removed from the database."""
+    from lablink_allocator_service import client_session
+
+    monkeypatch.setattr(
+        client_session, "_private_ips", {"vm-1": "10.0.1.5", "vm-2": "10.0.1.6"}
+    )
+    mock_run.side_effect = _fake_run
+    mock_popen.return_value = _FakeCompletedPopen(stdout_text="ok\n")
+
+    with patch("lablink_allocator_service.main.operations_worker") as mock_worker:
+        mock_worker.submit.return_value = 1
+        r = client.post(
+            "/destroy", headers=admin_headers, data={"hostname": ["vm-2"]},
+        )
+        assert r.status_code == 302
+        call_kwargs = mock_worker.submit.call_args.kwargs
+        assert call_kwargs["params"] == '{"hostnames": ["vm-2"]}'
+        call_kwargs["fn"]()
+
+    plan_cmd = mock_run.call_args_list[0].args[0]
+    targets = [a for a in plan_cmd if a.startswith("-target=")]
+    assert targets and all('["vm-2"]' in t for t in targets)
+
+    destroy_setup["metrics_db"].bulk_seal_session_metrics.assert_called_once_with(
+        ["vm-2"]
+    )
+    destroy_setup["database"].unregister_client.assert_called_once_with("vm-2")
+    destroy_setup["database"].clear_database.assert_not_called()
+    assert client_session._private_ips == {"vm-1": "10.0.1.5"}
+
+
+@patch("lablink_allocator_service.providers.aws.get_instance_names",
+       return_value=["vm-1"])
+@patch("lablink_allocator_service.providers.aws.get_instance_ids",
+       return_value=["i-1"])
+@patch("lablink_allocator_service.providers.aws.subprocess.run")
+def test_destroy_closure_rejects_unknown_hostname(
+    mock_run, mock_ids, mock_names, destroy_setup, client, admin_headers,
+):
+    with patch("lablink_allocator_service.main.operations_worker") as mock_worker:
+        mock_worker.submit.return_value = 1
+        client.post(
+            "/destroy", headers=admin_headers, data={"hostname": ["vm-9"]},
+        )
+        fn = mock_worker.submit.call_args.kwargs["fn"]
+        with pytest.raises(RuntimeError, match="Unknown client VM.*vm-9"):
+            fn()
+
+    mock_run.assert_not_called()
+    destroy_setup["database"].unregister_client.assert_not_called()
+
+
 def test_destroy_closure_fails_when_no_runtime_tfvars(
     monkeypatch, tmp_path, client, admin_headers,
 ):
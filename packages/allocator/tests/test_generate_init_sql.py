@@ -135,3 +135,20 @@ def test_operations_single_flight_index_present():
     sql = build_init_sql()
     assert "operations_single_flight" in sql
     assert "WHERE status IN ('queued', 'running')" in sql
+
+
+def test_scheduled_launches_table_present():
+    from lablink_allocator_service.db.schedules import _LAUNCH_COLUMNS
+
+    sql = build_init_sql()
+    assert "CREATE TABLE IF NOT EXISTS scheduled_launches" in sql
+    table = sql.split("CREATE TABLE IF NOT EXISTS scheduled_launches")[1]
+    table = table.split(");")[0]
+    for column in _LAUNCH_COLUMNS:
+        assert f"    {column} " in table
+
+
+def test_one_seat_per_email_index():
+    sql = build_init_sql()
+    assert "_useremail_idx" in sql
+    assert "(UserEmail) WHERE UserEmail IS NOT NULL" in sql
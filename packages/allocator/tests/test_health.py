@@ -578,3 +578,64 @@ class TestAdminPanelConnectionLine:
 
         assert "DB connections unavailable" in html
         assert "View Current Instances" in html
+
+
+class TestQueryStats:
+    """GET /api/health/queries and the /admin/query-stats page."""
+
+    @pytest.fixture
+    def stats(self, monkeypatch):
+        from lablink_allocator_service.db.query_stats import QUERY_STATS
+
+        QUERY_STATS.reset()
+        QUERY_STATS.record("SELECT * FROM vms WHERE hostname = ?", 0.2, 1, False)
+        yield QUERY_STATS
+        QUERY_STATS.reset()
+
+    def _patch_pg(self, monkeypatch, value):
+        import lablink_allocator_service.routes.admin_pages as admin_mod
+        import lablink_allocator_service.routes.health as health_mod
+
+        for mod in (health_mod, admin_mod):
+            monkeypatch.setattr(mod, "pg_statement_stats", lambda limit: value)
+
+    def test_requires_admin_auth(self, client):
+        assert client.get("/api/health/queries").status_code == 401
+        assert client.post("/api/health/queries/reset").status_code == 401
+        assert client.get("/admin/query-stats").status_code == 401
+
+    def test_returns_both_tables(self, client, admin_headers, monkeypatch, stats):
+        pg = [{"query": "SELECT 1", "calls": 1, "total_ms": 1.0,
+               "mean_ms": 1.0, "rows": 1}]
+        self._patch_pg(monkeypatch, pg)
+
+        body = client.get("/api/health/queries", headers=admin_headers).get_json()
+
+        [entry] = body["statements"]
+        assert entry["fingerprint"] == "SELECT * FROM vms WHERE hostname = ?"
+        assert entry["calls"] == 1
+        assert body["pg_stat_statements"] == pg
+
+    def test_reset(self, client, admin_headers, stats):
+        resp = client.post("/api/health/queries/reset", headers=admin_headers)
+
+        assert resp.status_code == 200
+        assert stats.top() == []
+
+    def test_pg_stats_degrade_to_none(self, monkeypatch, app):
+        import lablink_allocator_service.routes.health as health_mod
+        from lablink_allocator_service import main
+
+        db = MagicMock()
+        db.get_statement_stats.side_effect = RuntimeError("permission denied")
+        monkeypatch.setattr(main, "database", db)
+
+        assert health_mod.pg_statement_stats() is None
+
+    def test_page_renders(self, client, admin_headers, monkeypatch, stats):
+        self._patch_pg(monkeypatch, None)
+
+        html = client.get("/admin/query-stats", headers=admin_headers).data.decode()
+
+        assert "SELECT * FROM vms WHERE hostname = ?" in html
+        assert "CREATE EXTENSION pg_stat_statements" in html
@@ -0,0 +1,115 @@
+"""Tests for idle-seat reclamation."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from lablink_allocator_service.idle_reclaim import IdleReclaimService
+
+
+@pytest.fixture
+def service():
+    database = MagicMock()
+    database.reclaim_idle_seat.return_value = True
+    return IdleReclaimService(
+        database=database,
+        reboot_service=MagicMock(),
+        seat_queue=MagicMock(),
+        idle_minutes=30,
+        grace_minutes=5,
+    )
+
+
+def _seat(hostname, warned=False, grace_over=False):
+    return {
+        "hostname": hostname,
+        "useremail": f"{hostname}@example.com",
+        "warned": warned,
+        "grace_over": grace_over,
+    }
+
+
+def test_idle_seat_is_warned_first(service):
+    service.database.get_idle_seats.return_value = [_seat("vm-1")]
+
+    service._check()
+
+    service.database.get_idle_seats.assert_called_once_with(30, 5)
+    service.database.mark_idle_warned.assert_called_once_with("vm-1")
+    service.database.reclaim_idle_seat.assert_not_called()
+
+
+def test_warned_seat_waits_out_grace_period(service):
+    service.database.get_idle_seats.return_value = [_seat("vm-1", warned=True)]
+
+    service._check()
+
+    service.database.mark_idle_warned.assert_not_called()
+    service.database.reclaim_idle_seat.assert_not_called()
+
+
+def test_seat_reclaimed_and_recycled_after_grace(service):
+    service.database.get_idle_seats.return_value = [
+        _seat("vm-1", warned=True, grace_over=True),
+    ]
+    service.reboot_service.recycle.return_value = True
+
+    service._check()
+
+    service.database.reclaim_idle_seat.assert_called_once_with(
+        "vm-1", "vm-1@example.com", 5
+    )
+    service.reboot_service.recycle.assert_called_once_with("vm-1")
+    service.database.update_vm_status.assert_not_called()
+    service.seat_queue.notify.assert_called_once()
+
+
+def test_student_returning_before_reclaim_keeps_seat(service):
+    service.database.get_idle_seats.return_value = [
+        _seat("vm-1", warned=True, grace_over=True),
+    ]
+    service.database.reclaim_idle_seat.return_value = False
+
+    service._check()
+
+    service.reboot_service.recycle.assert_not_called()
+    service.seat_queue.notify.assert_not_called()
+
+
+@pytest.mark.parametrize("outcome", [False, RuntimeError("ssh")])
+def test_unrecycled_vm_goes_straight_back_to_pool(service, outcome):
+    service.database.get_idle_seats.return_value = [
+        _seat("vm-1", warned=True, grace_over=True),
+    ]
+    if isinstance(outcome, Exception):
+        service.reboot_service.recycle.side_effect = outcome
+    else:
+        service.reboot_service.recycle.return_value = outcome
+
+    service._check()
+
+    service.database.update_vm_status.assert_called_once_with("vm-1", "running")
+    service.seat_queue.notify.assert_called_once()
+
+
+def test_without_reboot_service_or_queue(service):
+    service.reboot_service = None
+    service.seat_queue = None
+    service.database.get_idle_seats.return_value = [
+        _seat("vm-1", warned=True, grace_over=True),
+    ]
+
+    service._check()
+
+    service.database.update_vm_status.assert_called_once_with("vm-1", "running")
+
+
+def test_start_ensures_columns_and_stop_joins(service):
+    service.check_interval_seconds = 3600
+    service.database.get_idle_seats.return_value = []
+
+    service.start()
+    service.stop()
+
+    service.database.ensure_idle_columns.assert_called_once()
+    assert not service._thread.is_alive()
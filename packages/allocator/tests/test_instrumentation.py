@@ -0,0 +1,115 @@
+"""Tests for the in-process metrics registry (instrumentation.py)."""
+
+from unittest.mock import MagicMock
+
+import psycopg2.pool
+import pytest
+
+from lablink_allocator_service import instrumentation
+from lablink_allocator_service.instrumentation import Registry, timed_iteration
+
+
+def test_counter_and_gauge_render():
+    registry = Registry()
+    hits = registry.counter("x_hits_total", "Hits.", ("route",))
+    depth = registry.gauge("x_depth", "Depth.")
+    hits.inc(route='a"b')
+    hits.inc(2, route='a"b')
+    depth.set(4.5)
+
+    text = registry.render()
+
+    assert "# TYPE x_hits_total counter" in text
+    assert 'x_hits_total{route="a\\"b"} 3' in text
+    assert "# TYPE x_depth gauge" in text
+    assert "x_depth 4.5" in text
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    latency = registry.histogram("x_seconds", "Latency.", buckets=(0.1, 1))
+    for value in (0.05, 0.5, 5):
+        latency.observe(value)
+
+    text = registry.render()
+
+    assert 'x_seconds_bucket{le="0.1"} 1' in text
+    assert 'x_seconds_bucket{le="1"} 2' in text
+    assert 'x_seconds_bucket{le="+Inf"} 3' in text
+    assert "x_seconds_sum 5.55" in text
+    assert "x_seconds_count 3" in text
+    assert latency.count() == 3
+    assert latency.sum() == pytest.approx(5.55)
+
+
+def test_wrong_labels_rejected():
+    counter = Registry().counter("x_total", "X.", ("route",))
+
+    with pytest.raises(ValueError):
+        counter.inc(path="/")
+
+
+def test_failing_collector_does_not_break_scrape():
+    registry = Registry()
+    registry.gauge("x_up", "Up.").set(1)
+    registry.add_collector(MagicMock(side_effect=RuntimeError("db down")))
+
+    assert "x_up 1" in registry.render()
+
+
+def test_timed_iteration_records_outcome():
+    before_ok = instrumentation.LOOP_SECONDS.count(loop="t", outcome="ok")
+
+    with timed_iteration("t"):
+        pass
+    with pytest.raises(RuntimeError):
+        with timed_iteration("t"):
+            raise RuntimeError("boom")
+
+    assert instrumentation.LOOP_SECONDS.count(loop="t", outcome="ok") == (
+        before_ok + 1
+    )
+    assert instrumentation.LOOP_SECONDS.count(loop="t", outcome="error") >= 1
+
+
+def test_pooled_cursor_times_checkout_and_counts_exhaustion():
+    from lablink_allocator_service.db.pool import PooledCursor
+
+    before = instrumentation.POOL_CHECKOUT_SECONDS.count()
+    exhausted = instrumentation.POOL_EXHAUSTED.value()
+    pool = MagicMock()
+
+    with PooledCursor(pool):
+        pass
+    pool.getconn.side_effect = psycopg2.pool.PoolError("exhausted")
+    with pytest.raises(psycopg2.pool.PoolError):
+        with PooledCursor(pool):
+            pass
+
+    assert instrumentation.POOL_CHECKOUT_SECONDS.count() == before + 2
+    assert instrumentation.POOL_EXHAUSTED.value() == exhausted + 1
+    assert instrumentation.POOL_WAITING.value() == 0
+
+
+def test_cache_counts_hits_and_misses():
+    from lablink_allocator_service.secret_hash import TtlLruCache
+
+    cache = TtlLruCache(ttl=60, max_size=4)
+    cache.get("a")
+    cache.put("a", 1)
+    cache.get("a")
+
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_verify_secret_is_timed():
+    from lablink_allocator_service.secret_hash import hash_secret, verify_secret
+
+    hashed = hash_secret("s3cret")
+    before = instrumentation.ARGON2_VERIFY_SECONDS.count(result="mismatch")
+
+    assert not verify_secret("wrong", hashed)
+
+    assert instrumentation.ARGON2_VERIFY_SECONDS.count(result="mismatch") == (
+        before + 1
+    )
@@ -70,7 +70,7 @@ _CLEAN_PLAN_JSON = json.dumps({
 })
 
 _TIMING_DATA = {
-    "vm-1": {
+    "sleap-lablink-client-test-vm-1": {
         "start_time": "2025-10-30T12:00:00Z",
         "end_time": "2025-10-30T12:01:00Z",
         "seconds": 60.0,
@@ -112,11 +112,13 @@ class _FakeCompletedPopen:
 def _provider_subprocess_side_effects(plan_json=_CLEAN_PLAN_JSON):
     """Return FakeResult objects in the order AWSProvider.provision_hosts
     calls subprocess.run:
-    1. tofu plan -no-color -out tfplan.binary ...
-    2. tofu show -json tfplan.binary
+    1. tofu state list (existing hosts; none here)
+    2. tofu plan -no-color -out tfplan.binary ...
+    3. tofu show -json tfplan.binary
     (apply now streams via subprocess.Popen — see _FakeCompletedPopen.)
     """
     return [
+        _FakeResult(""),               # state list
         _FakeResult("OK"),             # plan
         _FakeResult(plan_json),        # show -json → SG audit
     ]
@@ -201,6 +203,8 @@ def launch_setup(app, monkeypatch, tmp_path):
     fake_db = MagicMock()
     fake_db.get_row_count.return_value = 0
     fake_db.update_tofu_timing = MagicMock()
+    # No launch has handed out a VM number yet.
+    fake_db.get_setting.return_value = None
     monkeypatch.setattr(main, "database", fake_db, raising=False)
 
     return {"tmp_path": tmp_path, "database": fake_db}
@@ -291,6 +295,33 @@ def test_launch_closure_calls_aws_utils_and_writes_timings(
     assert db.update_tofu_timing.call_count == 1
 
 
+def test_provision_seeds_agent_address_cache(launch_setup, monkeypatch):
+    """Private IPs from the tofu outputs are cached so the first session
+    on a new VM doesn't need an EC2 lookup to reach its agent."""
+    from lablink_allocator_service import client_session
+    from lablink_allocator_service.providers.protocol import (
+        ClientHandle,
+        ProvisionResult,
+    )
+    from lablink_allocator_service.routes.provisioning import provision_clients
+
+    monkeypatch.setattr(client_session, "_private_ips", {})
+    provider = MagicMock()
+    provider.provision_hosts.return_value = ProvisionResult(
+        handles=[
+            ClientHandle(id="i-1", hostname="vm-1",
+                         provider_metadata={"private_ip": "10.0.1.5"}),
+            ClientHandle(id="i-2", hostname="vm-2"),
+        ],
+        timings={},
+        apply_stdout="",
+    )
+
+    provision_clients(provider, 2)
+
+    assert client_session._private_ips == {"vm-1": "10.0.1.5"}
+
+
 def test_launch_closure_runs_plan_show_apply_in_order(
     launch_setup, client, admin_headers,
 ):
@@ -510,7 +541,10 @@ def test_launch_closure_base64_encodes_success_check(
     class _FakeProvider:
         can_provision_hosts = True
 
-        def provision_hosts(self, count, spec, progress_callback=None):
+        def provision_hosts(
+            self, count, spec, progress_callback=None, output_callback=None,
+            vm_number_callback=None,
+        ):
             captured["spec"] = spec
             return ProvisionResult(handles=[], timings={}, apply_stdout="ok")
 
@@ -526,3 +560,36 @@ def test_launch_closure_base64_encodes_success_check(
         base64.b64decode(captured["spec"]["startup_success_check_b64"])
         == b"sleap --version"
     )
+
+
+def test_launch_persists_the_highest_vm_number(
+    launch_setup, client, admin_headers, monkeypatch,
+):
+    """The spec carries the stored highest VM number, and the provider's
+    report of the new one is written back to settings."""
+    from lablink_allocator_service import main
+    from lablink_allocator_service.providers.protocol import ProvisionResult
+
+    captured = {}
+
+    class _FakeProvider:
+        can_provision_hosts = True
+
+        def provision_hosts(
+            self, count, spec, progress_callback=None, output_callback=None,
+            vm_number_callback=None,
+        ):
+            captured["spec"] = spec
+            vm_number_callback(spec["last_vm_number"] + count)
+            return ProvisionResult(handles=[], timings={}, apply_stdout="ok")
+
+    db = launch_setup["database"]
+    db.get_setting.return_value = "5"
+    monkeypatch.setitem(main.app.config, "LABLINK_PROVIDER", _FakeProvider())
+
+    with patch("lablink_allocator_service.main.operations_worker") as mock_worker:
+        client.post("/api/launch", headers=admin_headers, data={"num_vms": "2"})
+        mock_worker.submit.call_args.kwargs["fn"]()
+
+    assert captured["spec"]["last_vm_number"] == 5
+    db.set_setting.assert_called_once_with("last_vm_number", "7")
@@ -0,0 +1,155 @@
+"""Tests for memory diagnostics (memory.py) and the /api/memory routes."""
+
+import logging
+import tracemalloc
+
+import pytest
+
+from lablink_allocator_service import memory
+from lablink_allocator_service.memory import MemoryReportService, SnapshotStore
+
+_hoard = []
+
+
+def _allocate():
+    _hoard.append([bytearray(1024) for _ in range(200)])
+
+
+@pytest.fixture
+def store():
+    store = SnapshotStore(max_snapshots=3)
+    yield store
+    store.stop()
+    _hoard.clear()
+
+
+@pytest.fixture
+def snapshots(monkeypatch, store):
+    monkeypatch.setattr(memory, "SNAPSHOTS", store)
+    import lablink_allocator_service.routes.memory as routes_mod
+
+    monkeypatch.setattr(routes_mod, "SNAPSHOTS", store)
+    return store
+
+
+def test_rss_bytes_reads_proc():
+    rss = memory.rss_bytes()
+
+    assert rss is None or rss > 1_000_000
+
+
+def test_object_counts():
+    total, common = memory.object_counts(3)
+
+    assert total > 1000
+    assert len(common) == 3
+    assert all(isinstance(name, str) and n > 0 for name, n in common)
+
+
+def test_take_requires_tracing(store):
+    with pytest.raises(RuntimeError):
+        store.take("before")
+
+
+def test_diff_finds_the_growing_site(store):
+    store.start(frames=5)
+    store.take("before")
+    _allocate()
+    store.take("after")
+
+    rows = store.diff("before", "after", limit=5)
+
+    assert "test_memory.py" in rows[0]["site"]
+    assert rows[0]["size_diff_kb"] > 150
+    assert rows[0]["count_diff"] >= 200
+
+
+def test_diff_against_now_and_by_traceback(store):
+    store.start(frames=5)
+    store.take("before")
+    _allocate()
+
+    [row] = store.diff("before", limit=1, group_by="traceback")
+
+    assert any("_allocate" in line or "test_memory.py" in line
+               for line in row["traceback"])
+
+
+def test_snapshots_survive_stop_and_are_capped(store):
+    store.start()
+    for name in ("a", "b", "c", "d"):
+        store.take(name)
+    store.stop()
+
+    assert not tracemalloc.is_tracing()
+    assert [s["name"] for s in store.summaries()] == ["b", "c", "d"]
+    assert isinstance(store.diff("b", "d"), list)
+    with pytest.raises(KeyError):
+        store.diff("a", "d")
+
+
+def test_report_logs_summary(caplog):
+    service = MemoryReportService(top_types=2)
+    service._baseline_rss = memory.rss_bytes()
+
+    with caplog.at_level(logging.INFO, logger=memory.__name__):
+        service._report()
+
+    [record] = caplog.records
+    assert record.message.startswith("Memory: ")
+    assert "gc objects=" in record.message
+    assert "top types: " in record.message
+
+
+def test_routes_require_admin(client):
+    assert client.get("/api/memory").status_code == 401
+    assert client.post("/api/memory/tracing/start").status_code == 401
+    assert client.post("/api/memory/snapshots").status_code == 401
+    assert client.get("/api/memory/diff?base=x").status_code == 401
+
+
+def test_leak_hunt_through_the_api(client, admin_headers, snapshots):
+    def post(url, body=None):
+        return client.post(url, json=body or {}, headers=admin_headers)
+
+    assert post("/api/memory/snapshots", {"name": "x"}).status_code == 409
+    assert post("/api/memory/tracing/start", {"frames": 5}).status_code == 200
+    resp = post("/api/memory/snapshots", {"name": "before"})
+    assert resp.status_code == 201
+    assert resp.get_json()["name"] == "before"
+    _allocate()
+
+    resp = client.get("/api/memory/diff?base=before&limit=3", headers=admin_headers)
+
+    assert resp.status_code == 200
+    assert len(resp.get_json()["top"]) <= 3
+    status = client.get("/api/memory", headers=admin_headers).get_json()
+    assert status["tracing"] is True
+    assert [s["name"] for s in status["snapshots"]] == ["before"]
+    assert post("/api/memory/tracing/stop").get_json() == {"tracing": False}
+
+
+@pytest.mark.parametrize(
+    "url, status",
+    [
+        ("/api/memory/diff", 400),
+        ("/api/memory/diff?base=before&group_by=module", 400),
+        ("/api/memory/diff?base=missing&current=before", 404),
+        ("/api/memory/diff?base=before", 409),
+    ],
+)
+def test_diff_errors(client, admin_headers, snapshots, url, status):
+    snapshots.start()
+    snapshots.take("before")
+    snapshots.stop()
+
+    assert client.get(url, headers=admin_headers).status_code == status
+
+
+def test_start_rejects_bad_frames(client, admin_headers, snapshots):
+    resp = client.post(
+        "/api/memory/tracing/start", json={"frames": 0}, headers=admin_headers
+    )
+
+    assert resp.status_code == 400
+    assert not snapshots.tracing
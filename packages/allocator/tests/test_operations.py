@@ -1,12 +1,16 @@
 """Tests for OperationsWorker."""
 from __future__ import annotations
 
+import threading
 import time
 from unittest.mock import MagicMock
 
 import pytest
 
-from lablink_allocator_service.operations import OperationsWorker
+from lablink_allocator_service.operations import (
+    OperationEvents,
+    OperationsWorker,
+)
 from lablink_allocator_service.db.operations import OperationInProgress
 
 
@@ -115,7 +119,7 @@ def test_submit_does_not_block_caller_on_slow_fn(worker, mock_database):
     mock_database.create_operation.return_value = 3
     started = time.monotonic()
 
-    def slow_fn(progress_callback):
+    def slow_fn(progress_callback, output_callback):
         time.sleep(0.3)
         return "done"
 
@@ -134,7 +138,7 @@ def test_submit_passes_progress_callback_that_updates_database(
     mock_database.create_operation.return_value = 3
     captured = {}
 
-    def fn(progress_callback):
+    def fn(progress_callback, output_callback):
         captured["callback"] = progress_callback
         progress_callback(2, 5)
         return "done"
@@ -159,7 +163,7 @@ def test_progress_callback_write_failure_does_not_abort_operation(
     )
     captured = {}
 
-    def fn(progress_callback):
+    def fn(progress_callback, output_callback):
         captured["callback"] = progress_callback
         progress_callback(1, 5)  # must not raise
         progress_callback(2, 5)  # still disabled, must not raise either
@@ -174,3 +178,100 @@ def test_progress_callback_write_failure_does_not_abort_operation(
     # Only the first attempt is tried — once it fails, further progress
     # writes for this operation are skipped rather than retried per call.
     mock_database.update_operation_progress.assert_called_once_with(6, 1, 5)
+
+
+def test_submit_publishes_output_progress_and_status_events(
+    worker, mock_database
+):
+    mock_database.create_operation.return_value = 8
+
+    def fn(progress_callback, output_callback):
+        output_callback("aws_instance.lablink_vm: Creating...")
+        progress_callback(1, 3)
+        return "done"
+
+    worker.submit(op_type="apply", fn=fn, params=None, created_by="admin")
+
+    assert _wait_until(lambda: worker.events.read(8, timeout=0)[1])
+    events, closed = worker.events.read(8, timeout=0)
+    assert closed
+    assert [(e["id"], e["event"], e["data"]) for e in events] == [
+        (1, "status", {"status": "running"}),
+        (2, "output", {"line": "aws_instance.lablink_vm: Creating..."}),
+        (3, "progress", {"completed": 1, "total": 3}),
+        (4, "status", {"status": "succeeded"}),
+    ]
+
+
+def test_submit_publishes_failure_status(worker, mock_database):
+    mock_database.create_operation.return_value = 9
+    fn = MagicMock(side_effect=RuntimeError("tofu exploded"))
+
+    worker.submit(op_type="apply", fn=fn, params=None, created_by="admin")
+
+    assert _wait_until(lambda: worker.events.read(9, timeout=0)[1])
+    events, _ = worker.events.read(9, timeout=0)
+    assert events[-1]["data"] == {"status": "failed", "error": "tofu exploded"}
+
+
+class TestOperationEvents:
+    def test_read_returns_only_events_after_cursor(self):
+        events = OperationEvents()
+        events.open(1)
+        for n in range(3):
+            events.publish(1, "output", {"line": f"l{n}"})
+
+        batch, closed = events.read(1, after=1, timeout=0)
+
+        assert [e["id"] for e in batch] == [2, 3]
+        assert closed is False
+
+    def test_read_waits_for_the_next_event(self):
+        events = OperationEvents()
+        events.open(1)
+        threading.Timer(
+            0.05, events.publish, args=(1, "output", {"line": "x"})
+        ).start()
+
+        batch, _ = events.read(1, after=0, timeout=2)
+
+        assert [e["data"] for e in batch] == [{"line": "x"}]
+
+    def test_read_times_out_empty(self):
+        events = OperationEvents()
+        events.open(1)
+
+        assert events.read(1, after=0, timeout=0.01) == ([], False)
+
+    def test_ring_buffer_keeps_newest_events(self):
+        events = OperationEvents(max_events=2)
+        events.open(1)
+        for n in range(5):
+            events.publish(1, "output", {"line": f"l{n}"})
+
+        batch, _ = events.read(1, after=0, timeout=0)
+
+        assert [e["id"] for e in batch] == [4, 5]
+
+    def test_close_ends_reads_and_ignores_later_publishes(self):
+        events = OperationEvents()
+        events.open(1)
+        events.close(1)
+        events.publish(1, "output", {"line": "late"})
+
+        assert events.read(1, after=0, timeout=5) == ([], True)
+
+    def test_unknown_operation_reads_none(self):
+        assert OperationEvents().read(42, timeout=0) is None
+
+    def test_only_newest_finished_buffers_are_kept(self):
+        events = OperationEvents(keep_finished=2)
+        for op_id in (1, 2, 3):
+            events.open(op_id)
+            events.close(op_id)
+        events.open(4)  # still running: never evicted
+
+        assert events.read(1, timeout=0) is None
+        assert events.read(2, timeout=0) == ([], True)
+        assert events.read(3, timeout=0) == ([], True)
+        assert events.read(4, timeout=0) == ([], False)
@@ -1,6 +1,7 @@
 """Tests for the GET /api/operations read endpoints."""
 from __future__ import annotations
 
+import json
 from unittest.mock import MagicMock
 
 import pytest
@@ -93,3 +94,114 @@ def test_get_operation_404_when_missing(
 def test_get_operation_requires_auth(fake_operations_db, client):
     resp = client.get("/api/operations/7")
     assert resp.status_code == 401
+
+
+@pytest.fixture
+def fake_events(app, monkeypatch):
+    """Wire main.operations_worker to a real OperationEvents buffer."""
+    from lablink_allocator_service import main
+    from lablink_allocator_service.operations import OperationEvents
+
+    events = OperationEvents()
+    monkeypatch.setattr(
+        main, "operations_worker", MagicMock(events=events), raising=False,
+    )
+    return events
+
+
+def _parse_sse(body: str) -> list[dict]:
+    parsed = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(
+            line.split(": ", 1) for line in block.split("\n")
+            if not line.startswith(":")
+        )
+        if fields:
+            parsed.append(fields)
+    return parsed
+
+
+def test_stream_operation_relays_events_until_terminal_status(
+    fake_operations_db, fake_events, client, admin_headers,
+):
+    fake_operations_db.get_operation.return_value = {
+        "id": 7, "op_type": "apply", "status": "running",
+    }
+    fake_events.open(7)
+    fake_events.publish(7, "output", {"line": "Plan: 3 to add"})
+    fake_events.publish(7, "progress", {"completed": 3, "total": 3})
+    fake_events.publish(7, "status", {"status": "succeeded"})
+
+    resp = client.get("/api/operations/7/stream", headers=admin_headers)
+
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/event-stream"
+    assert resp.headers["X-Accel-Buffering"] == "no"
+    events = _parse_sse(resp.get_data(as_text=True))
+    assert [(e["id"], e["event"]) for e in events] == [
+        ("1", "output"), ("2", "progress"), ("3", "status"),
+    ]
+    assert json.loads(events[0]["data"]) == {"line": "Plan: 3 to add"}
+
+
+def test_stream_operation_resumes_after_last_event_id(
+    fake_operations_db, fake_events, client, admin_headers,
+):
+    fake_operations_db.get_operation.return_value = {"id": 7}
+    fake_events.open(7)
+    fake_events.publish(7, "output", {"line": "seen"})
+    fake_events.publish(7, "status", {"status": "failed", "error": "boom"})
+
+    resp = client.get(
+        "/api/operations/7/stream",
+        headers={**admin_headers, "Last-Event-ID": "1"},
+    )
+
+    events = _parse_sse(resp.get_data(as_text=True))
+    assert [e["id"] for e in events] == ["2"]
+    assert json.loads(events[0]["data"])["error"] == "boom"
+
+
+def test_stream_operation_falls_back_to_stored_status(
+    fake_operations_db, fake_events, client, admin_headers,
+):
+    """An operation run by an earlier allocator process has no buffer:
+    the stream reports the row's terminal status and ends."""
+    fake_operations_db.get_operation.return_value = {
+        "id": 3, "status": "interrupted", "error": None,
+    }
+
+    resp = client.get("/api/operations/3/stream", headers=admin_headers)
+
+    events = _parse_sse(resp.get_data(as_text=True))
+    assert [e["event"] for e in events] == ["status"]
+    assert json.loads(events[0]["data"]) == {"status": "interrupted"}
+
+
+def test_stream_operation_unavailable_for_unbuffered_running_job(
+    fake_operations_db, fake_events, client, admin_headers,
+):
+    fake_operations_db.get_operation.return_value = {
+        "id": 3, "status": "running",
+    }
+
+    resp = client.get("/api/operations/3/stream", headers=admin_headers)
+
+    assert [e["event"] for e in _parse_sse(resp.get_data(as_text=True))] == [
+        "unavailable",
+    ]
+
+
+def test_stream_operation_404_when_missing(
+    fake_operations_db, fake_events, client, admin_headers,
+):
+    fake_operations_db.get_operation.return_value = None
+
+    resp = client.get("/api/operations/999/stream", headers=admin_headers)
+
+    assert resp.status_code == 404
+
+
+def test_stream_operation_requires_auth(fake_operations_db, client):
+    resp = client.get("/api/operations/7/stream")
+    assert resp.status_code == 401
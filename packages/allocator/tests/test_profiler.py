@@ -0,0 +1,118 @@
+"""Tests for the sampling profiler (profiler.py) and GET /api/profile."""
+
+import threading
+from collections import Counter
+from xml.etree import ElementTree
+
+import pytest
+
+from lablink_allocator_service import profiler
+
+
+def _spin(stop):
+    while not stop.is_set():
+        sum(range(100))
+
+
+@pytest.fixture
+def busy_thread():
+    stop = threading.Event()
+    thread = threading.Thread(target=_spin, args=(stop,), name="busy-worker")
+    thread.start()
+    yield thread
+    stop.set()
+    thread.join()
+
+
+def test_sample_sees_other_threads(busy_thread):
+    counts = profiler.sample(0.2, 0.005)
+
+    busy = [stack for stack in counts if stack[0] == "busy-worker"]
+    assert busy
+    assert any("_spin (test_profiler.py" in label for label in busy[0])
+    # Root first, innermost last.
+    assert busy[0][1].startswith("_bootstrap ")
+
+
+def test_sample_skips_calling_and_idle_threads():
+    stop = threading.Event()
+    parked = threading.Thread(target=stop.wait, name="parked")
+    parked.start()
+    try:
+        default = profiler.sample(0.05, 0.005)
+        with_idle = profiler.sample(0.05, 0.005, include_idle=True)
+    finally:
+        stop.set()
+        parked.join()
+
+    own = threading.current_thread().name
+    assert all(stack[0] not in (own, "parked") for stack in default)
+    assert any(stack[0] == "parked" for stack in with_idle)
+
+
+def test_sample_runs_for_the_requested_time():
+    ticks = iter([0.0, 0.0, 0.4, 0.8, 1.2])
+    sleeps = []
+
+    profiler.sample(1.0, 0.4, clock=lambda: next(ticks), sleep=sleeps.append)
+
+    assert sleeps == [0.4, 0.4, 0.4]
+
+
+def test_collapse_heaviest_first():
+    counts = Counter({("t", "a", "b"): 2, ("t", "a", "c"): 5})
+
+    assert profiler.collapse(counts) == "t;a;c 5\nt;a;b 2\n"
+
+
+def test_flamegraph_is_valid_svg():
+    counts = Counter({("t", "main", "<hash & verify>"): 3, ("t", "main"): 1})
+
+    svg = profiler.render_flamegraph(counts)
+
+    root = ElementTree.fromstring(svg)
+    titles = [el.text for el in root.iter("{http://www.w3.org/2000/svg}title")]
+    assert "all (4 samples, 100.0%)" in titles
+    assert "<hash & verify> (3 samples, 75.0%)" in titles
+
+
+def test_endpoint_requires_admin(client):
+    assert client.get("/api/profile?seconds=0.05").status_code == 401
+
+
+def test_endpoint_returns_collapsed(client, admin_headers, busy_thread):
+    resp = client.get(
+        "/api/profile?seconds=0.1&interval_ms=5&format=collapsed",
+        headers=admin_headers,
+    )
+
+    assert resp.status_code == 200
+    assert resp.content_type.startswith("text/plain")
+    assert "busy-worker;" in resp.get_data(as_text=True)
+
+
+def test_endpoint_returns_svg(client, admin_headers):
+    resp = client.get("/api/profile?seconds=0.05", headers=admin_headers)
+
+    assert resp.status_code == 200
+    assert resp.content_type == "image/svg+xml"
+    assert resp.get_data(as_text=True).startswith("<svg")
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["seconds=0", "seconds=61", "interval_ms=0", "format=pdf"],
+)
+def test_endpoint_rejects_bad_arguments(client, admin_headers, query):
+    resp = client.get(f"/api/profile?{query}", headers=admin_headers)
+
+    assert resp.status_code == 400
+
+
+def test_endpoint_refuses_overlapping_profiles(client, admin_headers):
+    from lablink_allocator_service.routes import profiling
+
+    with profiling._running:
+        resp = client.get("/api/profile?seconds=0.05", headers=admin_headers)
+
+    assert resp.status_code == 409
@@ -0,0 +1,80 @@
+"""Tests for GET /metrics (routes/prometheus.py)."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+REMOTE = {"REMOTE_ADDR": "203.0.113.9"}
+
+
+@pytest.fixture
+def fake_db(app, monkeypatch):
+    from lablink_allocator_service import main
+
+    db = MagicMock()
+    db.pool._used = {1: object(), 2: object()}
+    db.pool._pool = [object()]
+    db.pool.maxconn = 200
+    db._secret_hash_cache = MagicMock(hits=7, misses=3, __len__=lambda self: 2)
+    db.get_fleet_counts.return_value = {
+        "status": {"running": 4, "initializing": 1},
+        "free": 2,
+        "assigned": 2,
+        "unhealthy": 1,
+    }
+    monkeypatch.setattr(main, "database", db)
+    return db
+
+
+def test_local_scrape_needs_no_auth(fake_db, client):
+    resp = client.get("/metrics")
+
+    assert resp.status_code == 200
+    assert resp.content_type.startswith("text/plain; version=0.0.4")
+    text = resp.get_data(as_text=True)
+    assert 'lablink_db_pool_connections{state="in_use"} 2' in text
+    assert "lablink_db_pool_max_connections 200" in text
+    assert 'lablink_cache_hits_total{cache="secret_hash"} 7' in text
+    assert 'lablink_vms{status="running"} 4' in text
+    assert 'lablink_seats{state="free"} 2' in text
+    assert 'lablink_seats{state="unhealthy"} 1' in text
+    assert "lablink_process_resident_memory_bytes " in text
+
+
+def test_requests_are_counted_and_timed(fake_db, client):
+    client.get("/metrics")
+
+    text = client.get("/metrics").get_data(as_text=True)
+
+    assert (
+        'lablink_http_requests_total{endpoint="prometheus.metrics",'
+        'method="GET",status="200"}'
+    ) in text
+    assert (
+        'lablink_http_request_duration_seconds_count'
+        '{endpoint="prometheus.metrics"}'
+    ) in text
+
+
+def test_remote_scrape_requires_admin(fake_db, client, admin_headers):
+    assert client.get("/metrics", environ_base=REMOTE).status_code == 401
+
+    resp = client.get("/metrics", environ_base=REMOTE, headers=admin_headers)
+    assert resp.status_code == 200
+
+
+def test_proxied_scrape_is_not_local(fake_db, client):
+    """nginx relays outside requests from loopback; its forwarding header
+    must keep them from passing as local."""
+    resp = client.get("/metrics", headers={"X-Forwarded-For": "203.0.113.9"})
+
+    assert resp.status_code == 401
+
+
+def test_fleet_query_failure_still_serves(fake_db, client):
+    fake_db.get_fleet_counts.side_effect = RuntimeError("db down")
+
+    resp = client.get("/metrics")
+
+    assert resp.status_code == 200
+    assert "lablink_db_pool_max_connections 200" in resp.get_data(as_text=True)
@@ -0,0 +1,168 @@
+"""Tests for request admission control (rate_limit.py)."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from lablink_allocator_service.rate_limit import (
+    ADMIN,
+    EXEMPT_ENDPOINTS,
+    PUBLIC,
+    PUBLIC_ENDPOINTS,
+    TELEMETRY,
+    TELEMETRY_ENDPOINTS,
+    AdmissionControl,
+    TokenBucket,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_token_bucket_refills_at_rate():
+    bucket = TokenBucket(rate=2.0, burst=2, now=0.0)
+
+    assert bucket.take(0.0) == 0
+    assert bucket.take(0.0) == 0
+    assert bucket.take(0.0) == pytest.approx(0.5)
+    assert bucket.take(0.5) == 0
+
+
+def test_public_bucket_is_shared_per_route(clock):
+    control = AdmissionControl(public_rate=1.0, public_burst=2, clock=clock)
+
+    assert control.admit(PUBLIC, "public.home") is None
+    assert control.admit(PUBLIC, "public.home") is None
+    assert control.admit(PUBLIC, "public.home") == 1
+    # Another route has its own bucket.
+    assert control.admit(PUBLIC, "public.submit_vm_details") is None
+    assert control.rejected[PUBLIC] == 1
+
+
+def test_telemetry_bucket_is_per_client(clock):
+    control = AdmissionControl(client_rate=0.1, client_burst=1, clock=clock)
+    endpoint = "vm_telemetry.heartbeat"
+
+    assert control.admit_client(endpoint, "vm-1") is None
+    assert control.admit_client(endpoint, "vm-1") == 10
+    assert control.admit_client(endpoint, "vm-2") is None
+    clock.now = 10.0
+    assert control.admit_client(endpoint, "vm-1") is None
+
+
+def test_in_flight_cap_keeps_room_for_admin(clock):
+    control = AdmissionControl(
+        max_in_flight=10, public_burst=100, client_burst=100, clock=clock
+    )
+    for n in range(5):
+        assert control.admit(TELEMETRY, "vm_telemetry.heartbeat") is None
+
+    assert control.admit(TELEMETRY, "vm_telemetry.heartbeat") == 1
+    for _ in range(3):
+        assert control.admit(PUBLIC, "public.home") is None
+    assert control.admit(PUBLIC, "public.home") == 1
+    assert control.admit(ADMIN, "admin_pages.admin") is None
+    assert control.admit(ADMIN, "admin_pages.admin") is None
+    assert control.admit(ADMIN, "admin_pages.admin") == 1
+    assert control.in_flight == 10
+
+    control.release()
+    assert control.admit(ADMIN, "admin_pages.admin") is None
+
+
+def test_classified_endpoints_exist(app):
+    endpoints = {rule.endpoint for rule in app.url_map.iter_rules()}
+
+    listed = PUBLIC_ENDPOINTS | TELEMETRY_ENDPOINTS | EXEMPT_ENDPOINTS
+    assert listed - endpoints == set()
+
+
+@pytest.fixture
+def admission(app, monkeypatch):
+    from lablink_allocator_service import main
+
+    control = AdmissionControl(public_rate=0.01, public_burst=1)
+    monkeypatch.setattr(main, "admission", control)
+    db = MagicMock()
+    db.get_unassigned_vms.return_value = []
+    monkeypatch.setattr(main, "database", db)
+    return control
+
+
+def test_refused_request_gets_429_with_retry_after(admission, client):
+    assert client.get("/api/unassigned_vms_count").status_code == 200
+
+    resp = client.get("/api/unassigned_vms_count")
+
+    assert resp.status_code == 429
+    assert int(resp.headers["Retry-After"]) >= 1
+    assert resp.get_json() == {"error": "Too many requests."}
+    assert admission.in_flight == 0  # the admitted request was released
+
+
+def test_refused_landing_page_renders_html(admission, client):
+    client.get("/")
+
+    resp = client.get("/")
+
+    assert resp.status_code == 429
+    assert "Retry-After" in resp.headers
+    assert b"try again" in resp.data
+
+
+def test_admin_requests_are_not_rate_limited(admission, client, admin_headers):
+    for _ in range(5):
+        resp = client.get("/admin", headers=admin_headers)
+        assert resp.status_code != 429
+
+
+@pytest.fixture
+def client_admission(app, monkeypatch):
+    from lablink_allocator_service import main
+    from lablink_allocator_service.secret_hash import hash_secret
+
+    control = AdmissionControl(client_rate=0.01, client_burst=2)
+    monkeypatch.setattr(main, "admission", control)
+    db = MagicMock()
+    db.get_client_secret_hash.return_value = hash_secret("tok")
+    monkeypatch.setattr(main, "database", db)
+    return control
+
+
+def _heartbeat(client, token):
+    return client.post(
+        "/api/heartbeat",
+        json={"vm_id": "vm-1"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+
+def test_authenticated_client_is_held_to_its_bucket(client_admission, client):
+    assert _heartbeat(client, "tok").status_code == 200
+    assert _heartbeat(client, "tok").status_code == 200
+
+    resp = _heartbeat(client, "tok")
+
+    assert resp.status_code == 429
+    assert int(resp.headers["Retry-After"]) >= 1
+    assert client_admission.in_flight == 0
+
+
+def test_unauthenticated_caller_cannot_drain_another_clients_bucket(
+    client_admission, client
+):
+    for _ in range(20):
+        assert _heartbeat(client, "wrong").status_code == 401
+
+    assert _heartbeat(client, "tok").status_code == 200
+    assert client_admission.rejected[TELEMETRY] == 0
@@ -196,6 +196,16 @@ def test_get_failed_vms_includes_stuck_rebooting(db_instance):
     assert "10 minutes" in query
 
 
+def test_get_failed_vms_ignores_warm_and_draining_vms(db_instance):
+    """Warm spares are stopped on purpose and draining VMs are about to be
+    destroyed; an old Unhealthy mark must not get them rebooted."""
+    db_instance.cursor.fetchall.return_value = []
+    db_instance.get_failed_vms()
+
+    query = db_instance.cursor.execute.call_args[0][0]
+    assert "status NOT IN ('rebooting', 'error', 'warm', 'draining')" in query
+
+
 def test_get_failed_vms_includes_silent_running_vm(db_instance):
     """Running VM with stale last_seen_at is flagged for reboot."""
     stale = datetime(2025, 1, 1, tzinfo=timezone.utc)
@@ -680,6 +690,27 @@ def test_reboot_vm_uses_cold_reboot_for_unassigned_vm(monkeypatch):
     mock_db.record_reboot.assert_called_once_with("vm-1")
 
 
+def test_recycle_cold_reboots_without_recording_attempt(monkeypatch):
+    """recycle() wipes the container but doesn't count toward max_attempts."""
+    mock_provider = MagicMock(can_recover_hosts=True)
+    mock_provider.get_host_access.return_value = ("i-12345", "1.2.3.4", "/tmp/key.pem")
+
+    mock_db = MagicMock()
+    service = AutoRebootService(
+        database=mock_db,
+        region="us-west-2",
+        provider=mock_provider,
+    )
+
+    mock_run = MagicMock()
+    mock_run.return_value.returncode = 0
+    monkeypatch.setattr(reboot_mod.subprocess, "run", mock_run)
+
+    assert service.recycle("vm-1") is True
+    assert "cloud-init clean" in mock_run.call_args[0][0][-1]
+    mock_db.record_reboot.assert_not_called()
+
+
 @patch.object(AutoRebootService, "_reboot_vm")
 def test_check_and_reboot_releases_on_max_attempts(mock_reboot):
     """Test that VMs exceeding max attempts have their assignment released."""
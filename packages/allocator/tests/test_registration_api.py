@@ -119,6 +119,22 @@ def test_register_success_mints_secret(reg_client):
     assert kw["machine_identity"] == "i-1"
 
 
+def test_register_drops_cached_agent_address(reg_client, monkeypatch):
+    """A re-registering host may have a new address; the next rotation
+    must resolve it afresh."""
+    from lablink_allocator_service import client_session
+
+    monkeypatch.setattr(client_session, "_private_ips", {"vm-1": "10.0.1.5"})
+    client, _ = reg_client
+    r = client.post(
+        "/api/v1/clients/register",
+        json={"hostname": "vm-1", "machine_identity": "i-1"},
+        headers={"Authorization": "Bearer tk_test_register"},
+    )
+    assert r.status_code == 200
+    assert client_session._private_ips == {}
+
+
 def test_register_client_image_is_machine_image_only(reg_client):
     """cfg.machine.repository is the tutorial-repo-to-clone URL (see the
     AWS spec dict in main.py and TUTORIAL_REPO_TO_CLONE in client/start.sh)
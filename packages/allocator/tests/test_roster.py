@@ -0,0 +1,87 @@
+"""Tests for POST /api/roster (roster seat pre-assignment)."""
+from unittest.mock import MagicMock
+
+import pytest
+
+
+@pytest.fixture
+def fake_db(app, monkeypatch):
+    from lablink_allocator_service import main
+
+    db = MagicMock()
+    db.preassign_seats.return_value = {"b@example.com": "vm-2"}
+    db.get_seats_for_emails.return_value = {
+        "a@example.com": "vm-1", "b@example.com": "vm-2",
+    }
+    monkeypatch.setattr(main, "database", db)
+    monkeypatch.setattr(main, "session_staging", None, raising=False)
+    return db
+
+
+def test_roster_seats_normalized_emails(fake_db, client, admin_headers):
+    resp = client.post(
+        "/api/roster",
+        json={"emails": [
+            " A@Example.com", "b@example.com", "", "a@example.com",
+            "c@example.com",
+        ]},
+        headers=admin_headers,
+    )
+
+    assert resp.status_code == 200
+    body = resp.get_json()
+    roster = ["a@example.com", "b@example.com", "c@example.com"]
+    fake_db.preassign_seats.assert_called_once_with(roster)
+    fake_db.get_seats_for_emails.assert_called_once_with(roster)
+    assert body["seats"] == {"a@example.com": "vm-1", "b@example.com": "vm-2"}
+    assert body["assigned"] == 1
+    assert body["unseated"] == ["c@example.com"]
+    assert body["staged"] == 0
+
+
+def test_roster_prestages_held_seats(fake_db, client, admin_headers, monkeypatch):
+    from lablink_allocator_service import main
+
+    staging = MagicMock()
+    staging.stage_seats.return_value = 2
+    monkeypatch.setattr(main, "session_staging", staging)
+
+    resp = client.post(
+        "/api/roster",
+        json={"emails": ["a@example.com", "b@example.com"], "prestage": True},
+        headers=admin_headers,
+    )
+
+    assert resp.status_code == 200
+    staging.stage_seats.assert_called_once_with(["vm-1", "vm-2"])
+    assert resp.get_json()["staged"] == 2
+
+
+def test_roster_prestage_requires_session_staging(
+    fake_db, client, admin_headers
+):
+    resp = client.post(
+        "/api/roster",
+        json={"emails": ["a@example.com"], "prestage": True},
+        headers=admin_headers,
+    )
+
+    assert resp.status_code == 400
+    fake_db.preassign_seats.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "payload", [{}, {"emails": "a@example.com"}, {"emails": [" "]}]
+)
+def test_roster_rejects_bad_payload(fake_db, client, admin_headers, payload):
+    resp = client.post("/api/roster", json=payload, headers=admin_headers)
+
+    assert resp.status_code == 400
+    assert resp.get_json()["status"] == "error"
+    fake_db.preassign_seats.assert_not_called()
+
+
+def test_roster_requires_auth(fake_db, client):
+    resp = client.post("/api/roster", json={"emails": ["a@example.com"]})
+
+    assert resp.status_code == 401
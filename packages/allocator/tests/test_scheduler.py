@@ -576,3 +576,215 @@ def test_load_scheduled_destructions_empty(scheduler_service, mock_schedule_db):
 
     # Verify no jobs were added
     scheduler_service.scheduler.add_job.assert_not_called()
+
+
+# --- Scheduled launches ----------------------------------------------------
+
+
+def test_launch_lead_uses_p90_startup_duration(scheduler_service):
+    from lablink_allocator_service.scheduler import LAUNCH_LEAD_MARGIN_SECONDS
+
+    vm_db = MagicMock()
+    vm_db.get_startup_duration_percentile.return_value = 612.4
+    scheduler_service.database = vm_db
+
+    assert scheduler_service.launch_lead_seconds() == (
+        613 + LAUNCH_LEAD_MARGIN_SECONDS
+    )
+    vm_db.get_startup_duration_percentile.assert_called_once_with(0.9)
+    # Remembered for after the fleet (and its timings) is destroyed.
+    vm_db.set_setting.assert_called_once_with(
+        "launch_lead_p90_seconds", "612.4"
+    )
+
+
+def test_launch_lead_falls_back_to_last_p90_then_default(scheduler_service):
+    from lablink_allocator_service.scheduler import (
+        DEFAULT_LAUNCH_LEAD_SECONDS,
+        LAUNCH_LEAD_MARGIN_SECONDS,
+    )
+
+    vm_db = MagicMock()
+    vm_db.get_startup_duration_percentile.return_value = None
+    vm_db.get_setting.return_value = "480"
+    scheduler_service.database = vm_db
+    assert scheduler_service.launch_lead_seconds() == (
+        480 + LAUNCH_LEAD_MARGIN_SECONDS
+    )
+
+    vm_db.get_setting.return_value = None
+    assert scheduler_service.launch_lead_seconds() == (
+        DEFAULT_LAUNCH_LEAD_SECONDS + LAUNCH_LEAD_MARGIN_SECONDS
+    )
+
+
+def test_schedule_launch_starts_lead_time_before_ready_by(
+    scheduler_service, mock_schedule_db
+):
+    from datetime import timedelta
+
+    mock_schedule_db.create_scheduled_launch.return_value = 9
+    ready_by = datetime.now(timezone.utc) + timedelta(hours=3)
+
+    with patch.object(scheduler_service, "launch_lead_seconds", return_value=1800):
+        result = scheduler_service.schedule_launch(
+            schedule_name="Monday class",
+            ready_by=ready_by,
+            target_seats=30,
+            created_by="admin",
+        )
+
+    launch_time = ready_by - timedelta(seconds=1800)
+    assert result == {
+        "schedule_id": 9, "launch_time": launch_time, "lead_seconds": 1800,
+    }
+    kwargs = mock_schedule_db.create_scheduled_launch.call_args.kwargs
+    assert kwargs["target_seats"] == 30
+    assert kwargs["launch_time"] == launch_time
+    job = scheduler_service.scheduler.add_job.call_args.kwargs
+    assert job["id"] == "launch_9"
+    assert job["args"] == [9]
+
+
+def test_schedule_launch_too_close_runs_now(scheduler_service, mock_schedule_db):
+    from datetime import timedelta
+
+    mock_schedule_db.create_scheduled_launch.return_value = 1
+    before = datetime.now(timezone.utc)
+    ready_by = before + timedelta(minutes=5)
+
+    with patch.object(scheduler_service, "launch_lead_seconds", return_value=1800):
+        result = scheduler_service.schedule_launch(
+            schedule_name="Soon", ready_by=ready_by, target_seats=2,
+        )
+
+    assert before <= result["launch_time"] <= datetime.now(timezone.utc)
+
+
+def test_load_scheduled_launches_runs_overdue_now(
+    scheduler_service, mock_schedule_db
+):
+    mock_schedule_db.get_all_scheduled_launches.return_value = [
+        {"id": 1, "launch_time": datetime(2020, 1, 1, 8, 0)},
+        {"id": 2, "launch_time": datetime(2999, 1, 1, 8, 0)},
+    ]
+
+    scheduler_service._load_scheduled_launches()
+
+    mock_schedule_db.get_all_scheduled_launches.assert_called_once_with(
+        status="scheduled"
+    )
+    assert scheduler_service.scheduler.add_job.call_count == 2
+
+
+def test_cancel_scheduled_launch(scheduler_service, mock_schedule_db):
+    scheduler_service.scheduler.get_job.return_value = MagicMock()
+
+    scheduler_service.cancel_scheduled_launch(4)
+
+    scheduler_service.scheduler.remove_job.assert_called_once_with("launch_4")
+    mock_schedule_db.cancel_scheduled_launch.assert_called_once_with(4)
+
+
+@pytest.fixture
+def launch_main(monkeypatch):
+    """The live-allocator globals execute_scheduled_launch_job reads."""
+    from lablink_allocator_service import main
+
+    schedule_db = MagicMock()
+    schedule_db.get_scheduled_launch.return_value = {
+        "id": 5,
+        "status": "scheduled",
+        "target_seats": 4,
+        "ready_by": datetime(2999, 1, 1, 9, 0),
+        "created_by": "admin",
+    }
+    provider = MagicMock(can_provision_hosts=True)
+    database = MagicMock()
+    database.get_all_vm_status.return_value = {
+        "vm-1": "running", "vm-2": "initializing", "vm-3": "error",
+        "vm-4": "warm",
+    }
+    monkeypatch.setattr(main, "schedule_db", schedule_db, raising=False)
+    monkeypatch.setattr(main, "database", database, raising=False)
+    monkeypatch.setattr(main, "operations_worker", MagicMock())
+    monkeypatch.setattr(main, "scheduler_service", MagicMock())
+    monkeypatch.setattr(main, "allocator_ip", "1.2.3.4", raising=False)
+    monkeypatch.setattr(main, "key_name", "key", raising=False)
+    monkeypatch.setitem(main.app.config, "LABLINK_PROVIDER", provider)
+    return main
+
+
+def test_execute_scheduled_launch_tops_up_to_target(launch_main):
+    from lablink_allocator_service.scheduler import execute_scheduled_launch_job
+
+    launch_main.operations_worker.submit.return_value = 77
+
+    execute_scheduled_launch_job(5)
+
+    kwargs = launch_main.operations_worker.submit.call_args.kwargs
+    # 2 of the 4 target seats are up or coming up; error and warm rows
+    # are not seats.
+    assert kwargs["params"] == '{"num_vms": 2, "schedule_id": 5}'
+    assert kwargs["fn"].args[1] == 2
+    assert kwargs["created_by"] == "admin"
+    launch_main.schedule_db.update_scheduled_launch_status.assert_called_once_with(
+        schedule_id=5,
+        status="completed",
+        execution_result="Submitted launch job #77 for 2 VM(s)",
+    )
+
+
+def test_execute_scheduled_launch_nothing_needed(launch_main):
+    from lablink_allocator_service.scheduler import execute_scheduled_launch_job
+
+    launch_main.schedule_db.get_scheduled_launch.return_value["target_seats"] = 2
+
+    execute_scheduled_launch_job(5)
+
+    launch_main.operations_worker.submit.assert_not_called()
+    kwargs = launch_main.schedule_db.update_scheduled_launch_status.call_args.kwargs
+    assert kwargs["status"] == "completed"
+
+
+def test_execute_scheduled_launch_retries_while_operation_runs(launch_main):
+    from lablink_allocator_service.db.operations import OperationInProgress
+    from lablink_allocator_service.scheduler import execute_scheduled_launch_job
+
+    launch_main.operations_worker.submit.side_effect = OperationInProgress(3)
+
+    execute_scheduled_launch_job(5)
+
+    launch_main.scheduler_service._add_launch_job.assert_called_once()
+    assert launch_main.scheduler_service._add_launch_job.call_args.args[0] == 5
+    launch_main.schedule_db.update_scheduled_launch_status.assert_not_called()
+
+
+def test_execute_scheduled_launch_gives_up_at_ready_by(launch_main):
+    from lablink_allocator_service.db.operations import OperationInProgress
+    from lablink_allocator_service.scheduler import execute_scheduled_launch_job
+
+    launch_main.schedule_db.get_scheduled_launch.return_value["ready_by"] = (
+        datetime(2020, 1, 1, 9, 0)
+    )
+    launch_main.operations_worker.submit.side_effect = OperationInProgress(3)
+
+    execute_scheduled_launch_job(5)
+
+    launch_main.scheduler_service._add_launch_job.assert_not_called()
+    kwargs = launch_main.schedule_db.update_scheduled_launch_status.call_args.kwargs
+    assert kwargs["status"] == "failed"
+    assert "#3" in kwargs["execution_result"]
+
+
+def test_execute_scheduled_launch_skips_cancelled(launch_main):
+    from lablink_allocator_service.scheduler import execute_scheduled_launch_job
+
+    launch_main.schedule_db.get_scheduled_launch.return_value["status"] = (
+        "cancelled"
+    )
+
+    execute_scheduled_launch_job(5)
+
+    launch_main.operations_worker.submit.assert_not_called()
+    launch_main.schedule_db.update_scheduled_launch_status.assert_not_called()
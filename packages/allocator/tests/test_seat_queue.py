@@ -0,0 +1,145 @@
+"""Tests for the FIFO seat-queue waiting room."""
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from lablink_allocator_service.db.vms import SeatNotReady
+from lablink_allocator_service.seat_queue import SeatQueue
+
+
+@pytest.fixture
+def queue():
+    return SeatQueue(
+        database=MagicMock(), abandon_seconds=60, claim_seconds=120,
+    )
+
+
+def _seats(*hostnames):
+    """assign_vm side effect handing out `hostnames`, then an empty pool."""
+    free = list(hostnames)
+
+    def assign_vm(email):
+        if not free:
+            raise ValueError("No available VMs to assign.")
+        return free.pop(0)
+
+    return assign_vm
+
+
+def test_seats_go_to_tickets_in_arrival_order(queue):
+    first = queue.join("a@example.com")
+    second = queue.join("b@example.com")
+    third = queue.join("c@example.com")
+    queue.database.assign_vm.side_effect = _seats("vm-1", "vm-2")
+
+    queue._dispatch()
+
+    assert [c.kwargs["email"] for c in queue.database.assign_vm.call_args_list] == [
+        "a@example.com", "b@example.com", "c@example.com",
+    ]
+    assert queue.claim(first.id) == ("a@example.com", "vm-1")
+    assert queue.claim(second.id) == ("b@example.com", "vm-2")
+    assert queue.status(third.id) == {"status": "waiting", "position": 1}
+    assert queue.claim(third.id) is None
+
+
+def test_join_is_idempotent_per_email(queue):
+    ticket = queue.join("a@example.com")
+    queue.join("b@example.com")
+
+    assert queue.join("a@example.com") is ticket
+    assert queue.status(ticket.id) == {"status": "waiting", "position": 1}
+
+
+def test_has_waiters_ignores_assigned_tickets(queue):
+    assert not queue.has_waiters()
+    queue.join("a@example.com")
+    assert queue.has_waiters()
+
+    queue.database.assign_vm.side_effect = _seats("vm-1")
+    queue._dispatch()
+
+    assert not queue.has_waiters()
+
+
+def test_ticket_whose_seat_is_rebooting_keeps_waiting(queue):
+    first = queue.join("a@example.com")
+    second = queue.join("b@example.com")
+
+    def assign_vm(email):
+        if email == "a@example.com":
+            raise SeatNotReady("vm-7", "rebooting")
+        return "vm-1"
+
+    queue.database.assign_vm.side_effect = assign_vm
+    queue._dispatch()
+
+    assert queue.status(first.id) == {"status": "waiting", "position": 1}
+    assert queue.claim(second.id) == ("b@example.com", "vm-1")
+
+
+def test_dispatch_without_waiters_skips_database(queue):
+    queue._dispatch()
+    queue.database.assign_vm.assert_not_called()
+
+
+def test_long_poll_returns_when_seat_assigned(queue):
+    ticket = queue.join("a@example.com")
+    queue.database.assign_vm.side_effect = _seats("vm-1")
+    results = []
+    poller = threading.Thread(
+        target=lambda: results.append(queue.status(ticket.id, wait=10)),
+    )
+
+    poller.start()
+    queue._dispatch()
+    poller.join(timeout=5)
+
+    assert results == [{"status": "assigned"}]
+
+
+def test_unknown_ticket_status_is_none(queue):
+    assert queue.status("nope") is None
+
+
+def test_abandoned_ticket_is_dropped(queue):
+    ticket = queue.join("a@example.com")
+    queue._tickets[ticket.id].last_polled -= 61
+
+    queue._dispatch()
+
+    assert queue.status(ticket.id) is None
+    queue.database.assign_vm.assert_not_called()
+
+
+def test_unclaimed_seat_goes_to_next_in_line(queue):
+    first = queue.join("a@example.com")
+    second = queue.join("b@example.com")
+    queue.database.assign_vm.side_effect = _seats("vm-1")
+    queue._dispatch()
+
+    queue._tickets[first.id].assigned_at -= 121
+    queue.database.assign_vm.side_effect = _seats("vm-1")
+    queue._dispatch()
+
+    queue.database.release_unclaimed_seat.assert_called_once_with(
+        hostname="vm-1", email="a@example.com"
+    )
+    assert queue.status(first.id) is None
+    assert queue.claim(second.id) == ("b@example.com", "vm-1")
+
+
+def test_forgotten_ticket_never_releases_its_seat(queue):
+    """A student who started a session on their seat some other way
+    (asking again instead of claiming) keeps it past claim_seconds."""
+    ticket = queue.join("a@example.com")
+    queue.database.assign_vm.side_effect = _seats("vm-1")
+    queue._dispatch()
+
+    queue.forget("a@example.com")
+    queue._dispatch()
+
+    assert queue.status(ticket.id) is None
+    queue.database.release_unclaimed_seat.assert_not_called()
@@ -0,0 +1,119 @@
+"""Tests for background session-credential staging."""
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from lablink_allocator_service.client_session import RotationFailed
+from lablink_allocator_service.session_staging import SessionStagingService
+
+
+@pytest.fixture
+def service():
+    return SessionStagingService(
+        database=MagicMock(),
+        connectivity=MagicMock(),
+        agent_token="agent-token",
+        retry_seconds=60,
+    )
+
+
+def test_stages_every_unstaged_seat(service):
+    service.database.claim_unstaged_seat.side_effect = ["vm-1", "vm-2", None]
+
+    service._stage_free_seats()
+
+    service.database.claim_unstaged_seat.assert_called_with(60)
+    staged = {
+        c.kwargs["hostname"]
+        for c in service.connectivity.stage_browser_session.call_args_list
+    }
+    assert staged == {"vm-1", "vm-2"}
+    kwargs = service.connectivity.stage_browser_session.call_args.kwargs
+    assert kwargs["agent_token"] == "agent-token"
+    assert kwargs["database"] is service.database
+
+
+def test_unreachable_agent_does_not_stop_the_pass(service):
+    service.database.claim_unstaged_seat.side_effect = ["vm-1", "vm-2", None]
+    service.connectivity.stage_browser_session.side_effect = [
+        RotationFailed("agent down"), None,
+    ]
+
+    service._stage_free_seats()
+
+    assert service.connectivity.stage_browser_session.call_count == 2
+
+
+def test_seats_are_staged_concurrently(service):
+    """A batch's agent calls overlap instead of running one after
+    another."""
+    service.concurrency = 2
+    service.database.claim_unstaged_seat.side_effect = ["vm-1", "vm-2", None]
+    both_in_flight = threading.Barrier(2, timeout=5)
+    service.connectivity.stage_browser_session.side_effect = (
+        lambda **kwargs: both_in_flight.wait()
+    )
+
+    service._stage_free_seats()
+
+    assert service.connectivity.stage_browser_session.call_count == 2
+    assert service.database.claim_unstaged_seat.call_count == 3
+
+
+def test_batch_is_capped_at_concurrency(service):
+    service.concurrency = 2
+    service.database.claim_unstaged_seat.side_effect = [
+        "vm-1", "vm-2", "vm-3", None,
+    ]
+    claimed_before_staging = []
+    service.connectivity.stage_browser_session.side_effect = (
+        lambda **kwargs: claimed_before_staging.append(
+            service.database.claim_unstaged_seat.call_count
+        )
+    )
+
+    service._stage_free_seats()
+
+    assert sorted(claimed_before_staging) == [2, 2, 4]
+
+
+def test_stage_seats_stages_claimed_roster_seats(service):
+    service.database.claim_unstaged_preassigned_seats.return_value = [
+        "vm-1", "vm-2",
+    ]
+    service.connectivity.stage_browser_session.side_effect = [
+        None, RotationFailed("agent down"),
+    ]
+
+    staged = service.stage_seats(["vm-1", "vm-2", "vm-3"])
+
+    service.database.claim_unstaged_preassigned_seats.assert_called_once_with(
+        ["vm-1", "vm-2", "vm-3"]
+    )
+    assert staged == 1
+    assert service.connectivity.stage_browser_session.call_count == 2
+
+
+def test_stage_seats_with_nothing_to_stage(service):
+    service.database.claim_unstaged_preassigned_seats.return_value = []
+
+    assert service.stage_seats(["vm-1"]) == 0
+    service.connectivity.stage_browser_session.assert_not_called()
+
+
+def test_notify_wakes_loop(service):
+    service.notify()
+    assert service._wake_event.is_set()
+
+
+def test_start_ensures_columns_and_stop_joins(service):
+    service.check_interval_seconds = 3600
+    service.database.claim_unstaged_seat.return_value = None
+
+    service.start()
+    service.stop()
+
+    service.database.ensure_staging_columns.assert_called_once()
+    assert not service._thread.is_alive()
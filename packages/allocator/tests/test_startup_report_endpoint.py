@@ -0,0 +1,90 @@
+"""GET /api/startup-report and /admin/startup-report — per-launch startup
+phase percentiles."""
+
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+
+def _launch(operation_id, total_p50, outliers=()):
+    return {
+        "operation_id": operation_id,
+        "started_at": datetime(2026, 10, 19, 9, operation_id),
+        "finished_at": None,
+        "created_by": "admin",
+        "num_vms": 8,
+        "hosts": 8,
+        "phases": {
+            "cloud_init": {"hosts": 8, "p50": 100.0, "p90": 120.0,
+                           "p99": 130.0, "max": 131.0},
+            "total": {"hosts": 8, "p50": total_p50, "p90": 350.0,
+                      "p99": 400.0, "max": 410.0},
+        },
+        "outliers": list(outliers),
+    }
+
+
+@pytest.fixture
+def fake_db(monkeypatch, app):
+    from lablink_allocator_service import main
+
+    db = MagicMock()
+    db.get_startup_report.return_value = [
+        _launch(12, 360.0, [{"hostname": "vm-7", "phase": "total",
+                             "seconds": 410.0, "fence": 380.0}]),
+        _launch(11, 300.0),
+    ]
+    monkeypatch.setattr(main, "database", db, raising=False)
+    return db
+
+
+def test_report_compares_each_launch_with_the_one_before(
+    fake_db, client, admin_headers
+):
+    resp = client.get("/api/startup-report", headers=admin_headers)
+    assert resp.status_code == 200, resp.get_data(as_text=True)[:500]
+    body = resp.get_json()
+
+    fake_db.get_startup_report.assert_called_once_with(10)
+    assert body["client_image"] == "test-custom-image"
+    newest, older = body["launches"]
+    assert newest["started_at"] == "2026-10-19T09:12:00"
+    assert newest["phases"]["total"]["p50_change_pct"] == 20.0
+    assert newest["phases"]["cloud_init"]["p50_change_pct"] == 0.0
+    assert older["phases"]["total"]["p50_change_pct"] is None
+    assert newest["outliers"][0]["hostname"] == "vm-7"
+
+
+def test_launches_argument_is_clamped(fake_db, client, admin_headers):
+    client.get("/api/startup-report?launches=500", headers=admin_headers)
+    fake_db.get_startup_report.assert_called_once_with(50)
+
+
+def test_query_failure_is_a_500(fake_db, client, admin_headers):
+    fake_db.get_startup_report.return_value = None
+    resp = client.get("/api/startup-report", headers=admin_headers)
+    assert resp.status_code == 500
+
+
+def test_requires_auth(fake_db, client):
+    assert client.get("/api/startup-report").status_code == 401
+    assert client.get("/admin/startup-report").status_code == 401
+
+
+def test_admin_page_renders(fake_db, client, admin_headers):
+    resp = client.get("/admin/startup-report", headers=admin_headers)
+    assert resp.status_code == 200
+    page = resp.get_data(as_text=True)
+    assert "Launch #12" in page and "Launch #11" in page
+    assert "+20.0%" in page
+    assert "vm-7" in page
+
+
+def test_admin_page_without_data(fake_db, client, admin_headers):
+    fake_db.get_startup_report.return_value = []
+    resp = client.get("/admin/startup-report", headers=admin_headers)
+    assert resp.status_code == 200
+    assert "No VM has reported a complete startup yet." in resp.get_data(
+        as_text=True
+    )
@@ -136,7 +136,12 @@ def test_launch_vm_success(
             self.stdout, self.stderr = out, ""
             self.returncode = 0
 
+    existing = "".join(
+        f'aws_instance.lablink_vm["sleap-lablink-client-test-vm-{i}"]\n'
+        for i in (1, 2, 3)
+    )
     mock_run.side_effect = [
+        R(existing),                         # tofu state list (3 hosts up)
         R("OK"),                             # tofu plan -out (writes plan file)
         R(CLEAN_PLAN_JSON),                  # tofu show -json (feeds the SG audit)
     ]
@@ -156,21 +161,29 @@ def test_launch_vm_success(
         fn = mock_worker.submit.call_args.kwargs["fn"]
         fn()
 
-    # Assert calls: plan + show -json via subprocess.run (2); apply via
-    # Popen (streamed, checked separately below).
-    assert mock_run.call_count == 2
+    # Assert calls: state list + plan + show -json via subprocess.run (3);
+    # apply via Popen (streamed, checked separately below).
+    assert mock_run.call_count == 3
+    assert mock_run.call_args_list[0].args[0] == ["tofu", "state", "list"]
 
-    # Check plan call (must come first; writes the plan file)
-    plan_args, plan_kwargs = mock_run.call_args_list[0]
+    # Check plan call (writes the plan file). Only the 2 new hosts are
+    # targeted; the 3 existing ones are not re-planned.
+    plan_args, plan_kwargs = mock_run.call_args_list[1]
     plan_cmd_list = plan_args[0]
     assert "plan" in plan_cmd_list
     assert "-no-color" in plan_cmd_list
     assert "-out" in plan_cmd_list
-    assert "-var=instance_count=5" in plan_cmd_list
+    targets = [a for a in plan_cmd_list if a.startswith("-target=")]
+    assert len(targets) == 6
+    assert all(
+        '"sleap-lablink-client-test-vm-4"]' in t
+        or '"sleap-lablink-client-test-vm-5"]' in t
+        for t in targets
+    )
     assert plan_kwargs["cwd"] == tofu_dir
 
     # Check show -json call (reads the plan back for the audit)
-    show_args, show_kwargs = mock_run.call_args_list[1]
+    show_args, show_kwargs = mock_run.call_args_list[2]
     show_cmd_list = show_args[0]
     assert show_cmd_list[1] == "show"
     assert "-json" in show_cmd_list
@@ -194,6 +207,9 @@ def test_launch_vm_success(
         f'subject_software = "{omega_config.machine.software}"',
         'resource_prefix = "sleap-lablink-client-test"',
         'gpu_support = "true"',
+        'instance_names = ["sleap-lablink-client-test-vm-1", '
+        '"sleap-lablink-client-test-vm-2", "sleap-lablink-client-test-vm-3", '
+        '"sleap-lablink-client-test-vm-4", "sleap-lablink-client-test-vm-5"]',
     ]
 
     # Assert tf vars
@@ -266,6 +282,7 @@ def test_launch_vm_appends_allocator_sg_id_var(
             self.stdout, self.stderr, self.returncode = out, "", 0
 
     mock_run.side_effect = [
+        R(""),                 # tofu state list (no hosts yet)
         R("OK"),               # tofu plan -out
         R(CLEAN_PLAN_JSON),    # tofu show -json
     ]
@@ -284,7 +301,7 @@ def test_launch_vm_appends_allocator_sg_id_var(
 
     # The allocator-SG var is supplied via tofu plan; apply runs
     # off the saved plan file and never sees -var flags directly.
-    plan_args, _ = mock_run.call_args_list[0]
+    plan_args, _ = mock_run.call_args_list[1]
     plan_cmd_list = plan_args[0]
     assert "plan" in plan_cmd_list
     assert "-var=allocator_sg_id=sg-fake-allocator" in plan_cmd_list
@@ -357,6 +374,7 @@ def test_launch_vm_skips_sg_var_when_not_on_ec2(
             self.stdout, self.stderr, self.returncode = out, "", 0
 
     mock_run.side_effect = [
+        R(""),                 # tofu state list (no hosts yet)
         R("OK"),               # tofu plan -out
         R(CLEAN_PLAN_JSON),    # tofu show -json
     ]
@@ -376,7 +394,7 @@ def test_launch_vm_skips_sg_var_when_not_on_ec2(
     # When IMDSv2 was unreachable, the plan must not include the
     # allocator-SG var. apply runs off the saved plan file and has
     # no -var flags at all.
-    plan_args, _ = mock_run.call_args_list[0]
+    plan_args, _ = mock_run.call_args_list[1]
     plan_cmd_list = plan_args[0]
     assert "plan" in plan_cmd_list
     assert not any(
@@ -445,6 +463,8 @@ def test_launch_apply_failure(
     def side_effect(cmd, **kwargs):
         if cmd[1] == "init":
             return MagicMock(stdout="OK", stderr="")
+        if cmd[1] == "state":
+            return MagicMock(stdout="", stderr="", returncode=0)
         if cmd[1] == "plan":
             # plan writes the plan file; stdout is ignored.
             return MagicMock(stdout="OK", stderr="", returncode=0)
@@ -779,6 +799,7 @@ def test_launch_json_success(
             self.returncode = 0
 
     mock_run.side_effect = [
+        R(""),                 # tofu state list (no hosts yet)
         R("OK"),               # tofu plan -out
         R(CLEAN_PLAN_JSON),    # tofu show -json
     ]
@@ -957,6 +978,7 @@ def test_launch_json_unexpected_error(
     # plan + show return a clean (audit-passing) plan; apply succeeds;
     # the S3 upload then blows up with AccessDenied (the path under test).
     mock_run.side_effect = [
+        R(""),                 # tofu state list (no hosts yet)
         R("OK"),               # tofu plan -out
         R(CLEAN_PLAN_JSON),    # tofu show -json
     ]
@@ -1055,6 +1077,7 @@ def test_launch_aborts_on_sg_audit_failure(
     # Plan succeeds (writes the file); show returns the violating JSON;
     # the audit then aborts the flow before apply is ever invoked.
     mock_run.side_effect = [
+        R(""),                 # tofu state list (no hosts yet)
         R("OK"),                  # tofu plan -out
         R(VIOLATING_PLAN_JSON),   # tofu show -json (fed to audit)
     ]
@@ -1079,10 +1102,10 @@ def test_launch_aborts_on_sg_audit_failure(
             fn()
         assert "6080" in str(excinfo.value)  # error mentions the offending port
 
-    # Confirm apply was not invoked — only plan + show ran.
-    assert mock_run.call_count == 2
-    assert mock_run.call_args_list[0][0][0][1] == "plan"
-    assert mock_run.call_args_list[1][0][0][1] == "show"
+    # Confirm apply was not invoked — only state list + plan + show ran.
+    assert mock_run.call_count == 3
+    assert mock_run.call_args_list[1][0][0][1] == "plan"
+    assert mock_run.call_args_list[2][0][0][1] == "show"
     # S3 upload also must not have been called when apply was skipped.
     mock_upload_to_s3.assert_not_called()
 
@@ -1128,6 +1151,7 @@ def test_launch_aborts_on_sg_audit_failure_html(
             self.stdout, self.stderr, self.returncode = out, "", 0
 
     mock_run.side_effect = [
+        R(""),                 # tofu state list (no hosts yet)
         R("OK"),                  # tofu plan -out
         R(VIOLATING_PLAN_JSON),   # tofu show -json (fed to audit)
     ]
@@ -1149,8 +1173,8 @@ def test_launch_aborts_on_sg_audit_failure_html(
             fn()
         assert "6080" in str(excinfo.value)
 
-    # Plan + show ran; apply did not.
-    assert mock_run.call_count == 2
+    # State list + plan + show ran; apply did not.
+    assert mock_run.call_count == 3
     mock_upload_to_s3.assert_not_called()
 
 
@@ -1208,6 +1232,7 @@ def test_launch_writes_register_token_to_tfvars(
             self.stdout, self.stderr, self.returncode = out, "", 0
 
     mock_run.side_effect = [
+        R(""),                 # tofu state list (no hosts yet)
         R("OK"),
         R(CLEAN_PLAN_JSON),
     ]
@@ -1283,6 +1308,7 @@ def test_launch_writes_agent_token_to_tfvars_additively(
             self.stdout, self.stderr, self.returncode = out, "", 0
 
     mock_run.side_effect = [
+        R(""),                 # tofu state list (no hosts yet)
         R("OK"),
         R(CLEAN_PLAN_JSON),
     ]
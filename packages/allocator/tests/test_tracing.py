@@ -0,0 +1,361 @@
+"""Tests for request tracing (tracing.py), the spans the DB, agent and
+tofu paths add, and the /api/traces + /admin/traces routes."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from lablink_allocator_service import tracing
+from lablink_allocator_service.tracing import (
+    CLIENT,
+    SERVER,
+    TRACER,
+    Tracer,
+    parse_traceparent,
+    to_otlp,
+    waterfall,
+)
+
+PARENT = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+
+@pytest.fixture
+def tracer():
+    """The global TRACER, on and keeping every trace, reset afterwards."""
+    TRACER.clear()
+    TRACER.configure(enabled=True, buffer_traces=500, min_duration_ms=0.0)
+    yield TRACER
+    TRACER.configure(enabled=False)
+    TRACER.clear()
+
+
+def _names(spans):
+    return [s.name for s in spans]
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (PARENT, ("4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7")),
+        (PARENT.upper(), ("4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7")),
+        (None, None),
+        ("garbage", None),
+        ("00-" + "0" * 32 + "-00f067aa0ba902b7-01", None),
+        ("00-4bf92f3577b34da6a3ce929d0e0e4736-" + "0" * 16 + "-01", None),
+    ],
+)
+def test_parse_traceparent(header, expected):
+    assert parse_traceparent(header) == expected
+
+
+def test_disabled_tracer_records_nothing():
+    t = Tracer()
+    assert t.start("GET /") is None
+    with t.trace("op") as root:
+        assert root is None
+        assert not t.active()
+        with t.span("child") as span:
+            assert span is None
+    assert t.recent() == []
+
+
+def test_spans_nest_under_the_root():
+    t = Tracer()
+    t.configure(min_duration_ms=0.0)
+    with t.trace("operation launch", **{"operation.id": 7}) as root:
+        assert t.active()
+        with t.span("outer") as outer:
+            assert t.traceparent() == f"00-{root.trace_id}-{outer.span_id}-01"
+            with t.span("inner"):
+                pass
+            t.record("db SELECT", 1, 2, **{"db.rows": 3})
+    assert not t.active()
+
+    [summary] = t.recent()
+    assert summary["name"] == "operation launch"
+    assert summary["spans"] == 4
+    assert summary["error"] is False
+    spans = {s.name: s for s in t.get(root.trace_id)}
+    assert spans["operation launch"].parent_id is None
+    assert spans["outer"].parent_id == root.span_id
+    assert spans["inner"].parent_id == outer.span_id
+    assert spans["db SELECT"].parent_id == outer.span_id
+    assert spans["db SELECT"].attributes == {"db.rows": 3}
+
+
+def test_errors_mark_the_span_and_the_trace():
+    t = Tracer()
+    t.configure(min_duration_ms=0.0)
+    with pytest.raises(ValueError):
+        with t.trace("op") as root:
+            with t.span("child"):
+                raise ValueError("boom")
+    spans = {s.name: s for s in t.get(root.trace_id)}
+    assert spans["child"].error == "ValueError: boom"
+    assert spans["op"].error == "ValueError: boom"
+    assert t.recent()[0]["error"] is True
+
+
+def test_short_traces_are_not_kept():
+    t = Tracer()
+    t.configure(min_duration_ms=60_000)
+    with t.trace("fast"):
+        pass
+    assert t.recent() == []
+
+
+def test_buffer_keeps_the_newest_traces():
+    t = Tracer()
+    t.configure(buffer_traces=2, min_duration_ms=0.0)
+    for name in ("a", "b", "c"):
+        with t.trace(name):
+            pass
+    assert [s["name"] for s in t.recent()] == ["c", "b"]
+    assert [s["name"] for s in t.recent(limit=1)] == ["c"]
+    t.clear()
+    assert t.recent() == []
+
+
+def test_spans_past_the_cap_are_counted(monkeypatch):
+    monkeypatch.setattr(tracing, "MAX_SPANS_PER_TRACE", 2)
+    t = Tracer()
+    t.configure(min_duration_ms=0.0)
+    with t.trace("op"):
+        for _ in range(5):
+            with t.span("db SELECT"):
+                pass
+    [summary] = t.recent()
+    assert (summary["spans"], summary["dropped_spans"]) == (3, 3)
+
+
+def test_continued_trace_collects_every_request():
+    t = Tracer()
+    t.configure(min_duration_ms=0.0)
+    for path in ("/a", "/b"):
+        root = t.start(f"GET {path}", kind=SERVER, traceparent=PARENT)
+        t.finish(root)
+    [summary] = t.recent()
+    assert summary["trace_id"] == "4bf92f3577b34da6a3ce929d0e0e4736"
+    spans = t.get(summary["trace_id"])
+    assert _names(spans) == ["GET /a", "GET /b"]
+    assert {s.parent_id for s in spans} == {"00f067aa0ba902b7"}
+
+
+def test_to_otlp_shape():
+    t = Tracer()
+    t.configure(min_duration_ms=0.0)
+    with t.trace("GET /x", kind=SERVER, **{"http.status_code": 200}) as root:
+        with t.span("agent POST /api/session/start", kind=CLIENT) as span:
+            span.error = "timed out"
+    payload = to_otlp(t.get(root.trace_id))
+
+    [resource] = payload["resourceSpans"]
+    assert resource["resource"]["attributes"] == [
+        {"key": "service.name", "value": {"stringValue": "lablink-allocator"}}
+    ]
+    server, client = resource["scopeSpans"][0]["spans"]
+    assert server["traceId"] == root.trace_id and "parentSpanId" not in server
+    assert server["kind"] == SERVER
+    assert server["attributes"] == [
+        {"key": "http.status_code", "value": {"intValue": "200"}}
+    ]
+    assert server["status"] == {}
+    assert int(server["endTimeUnixNano"]) >= int(server["startTimeUnixNano"])
+    assert client["parentSpanId"] == root.span_id
+    assert client["status"] == {"code": 2, "message": "timed out"}
+
+
+def test_kept_traces_are_exported_as_otlp_lines(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    t = Tracer()
+    t.configure(min_duration_ms=0.0, otlp_file=str(path))
+    for name in ("a", "b"):
+        with t.trace(name):
+            pass
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    spans = json.loads(lines[1])["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert spans[0]["name"] == "b"
+
+
+def test_export_failure_disables_export(tmp_path):
+    t = Tracer()
+    t.configure(min_duration_ms=0.0, otlp_file=str(tmp_path / "missing" / "x"))
+    with t.trace("a"):
+        pass
+    assert t.otlp_file == ""
+    assert len(t.recent()) == 1
+
+
+def test_waterfall_orders_depth_first():
+    def span(name, span_id, parent_id, start, end):
+        return tracing.Span(
+            name=name, trace_id="t", span_id=span_id, parent_id=parent_id,
+            kind=1, start_ns=start, end_ns=end,
+        )
+
+    spans = [
+        span("root", "r", None, 0, 100_000_000),
+        span("second", "b", "r", 50_000_000, 90_000_000),
+        span("first", "a", "r", 10_000_000, 40_000_000),
+        span("nested", "c", "a", 20_000_000, 30_000_000),
+    ]
+    rows = waterfall(spans)
+    assert [(r["name"], r["depth"]) for r in rows] == [
+        ("root", 0), ("first", 1), ("nested", 2), ("second", 1),
+    ]
+    second = rows[3]
+    assert (second["offset_ms"], second["duration_ms"]) == (50.0, 40.0)
+    assert (second["left_pct"], second["width_pct"]) == (50.0, 40.0)
+    assert waterfall([]) == []
+
+
+def test_db_statements_and_checkouts_are_spans(tracer):
+    from lablink_allocator_service.db.pool import PooledCursor
+
+    pool = MagicMock()
+    pool.getconn.return_value.cursor.return_value.rowcount = 2
+    with tracer.trace("op") as root:
+        with PooledCursor(pool) as cursor:
+            cursor.execute("UPDATE vms SET status = %s WHERE hostname = %s",
+                           ("running", "vm-1"))
+
+    spans = {s.name: s for s in tracer.get(root.trace_id)}
+    assert spans["db checkout"].parent_id == root.span_id
+    update = spans["db UPDATE"]
+    assert update.attributes["db.statement"] == (
+        "UPDATE vms SET status = ? WHERE hostname = ?"
+    )
+    assert update.attributes["db.rows"] == 2
+    assert "test_tracing.py" in update.attributes["code.caller"]
+
+
+def test_statements_outside_a_trace_cost_nothing(tracer, monkeypatch):
+    from lablink_allocator_service.db.query_stats import QueryStats, TimedCursor
+
+    record = MagicMock()
+    monkeypatch.setattr(tracer, "record", record)
+    TimedCursor(MagicMock(rowcount=1), QueryStats()).execute("SELECT 1")
+    record.assert_not_called()
+
+
+def test_agent_call_is_a_span_and_sends_traceparent(tracer, monkeypatch):
+    from lablink_allocator_service import client_session as cs
+
+    post = MagicMock()
+    post.return_value.status_code = 200
+    monkeypatch.setattr(cs._agent_http, "post", post)
+    with tracer.trace("POST /api/request_vm") as root:
+        cs._post_rotate(
+            "http://10.0.0.5:7070/api/session/start", {"password": "p"},
+            bearer="tok",
+        )
+
+    [span] = [s for s in tracer.get(root.trace_id) if s.kind == CLIENT]
+    assert span.name == "agent POST /api/session/start"
+    assert span.attributes["http.status_code"] == 200
+    headers = post.call_args.kwargs["headers"]
+    assert headers["traceparent"] == f"00-{root.trace_id}-{span.span_id}-01"
+    assert headers["Authorization"] == "Bearer tok"
+
+
+def test_agent_call_outside_a_trace_has_no_traceparent(monkeypatch):
+    from lablink_allocator_service import client_session as cs
+
+    post = MagicMock()
+    monkeypatch.setattr(cs._agent_http, "post", post)
+    cs._post_rotate("http://10.0.0.5:7070/x", {}, bearer="tok")
+    assert "traceparent" not in post.call_args.kwargs["headers"]
+
+
+def test_tofu_subprocess_is_a_span(tracer):
+    import io
+
+    from lablink_allocator_service.providers.aws import (
+        _CREATE_COMPLETE_RE,
+        _run_streamed,
+    )
+
+    proc = MagicMock()
+    proc.stdout = io.StringIO("Apply complete!\n")
+    proc.stderr.read.return_value = ""
+    proc.wait.return_value = 0
+    with tracer.trace("operation launch") as root:
+        with patch(
+            "lablink_allocator_service.providers.aws.subprocess.Popen",
+            return_value=proc,
+        ):
+            _run_streamed(
+                ["tofu", "apply", "-auto-approve"], cwd="/tmp",
+                resource_complete_re=_CREATE_COMPLETE_RE,
+            )
+
+    [span] = [s for s in tracer.get(root.trace_id) if s.name != "operation launch"]
+    assert span.name == "exec tofu apply"
+    assert span.attributes["process.command_line"] == "tofu apply -auto-approve"
+    assert span.attributes["process.exit_code"] == 0
+
+
+def test_request_gets_a_trace_id_header(client, admin_headers, tracer):
+    resp = client.get("/api/traces", headers=admin_headers)
+    trace_id = resp.headers["X-LabLink-Trace-Id"]
+    assert len(trace_id) == 32
+
+    listed = client.get("/api/traces", headers=admin_headers).get_json()
+    assert listed["enabled"] is True
+    [first] = [t for t in listed["traces"] if t["trace_id"] == trace_id]
+    assert first["name"] == "GET /api/traces"
+    assert first["status_code"] == 200
+
+
+def test_request_joins_the_callers_trace(client, admin_headers, tracer):
+    resp = client.get(
+        "/api/traces", headers={**admin_headers, "traceparent": PARENT}
+    )
+    assert resp.headers["X-LabLink-Trace-Id"] == PARENT.split("-")[1]
+
+
+def test_no_header_while_disabled(client, admin_headers):
+    resp = client.get("/api/traces", headers=admin_headers)
+    assert "X-LabLink-Trace-Id" not in resp.headers
+
+
+def test_trace_routes_require_auth(client):
+    assert client.get("/api/traces").status_code == 401
+    assert client.get("/api/traces/abc").status_code == 401
+    assert client.post("/api/traces/clear").status_code == 401
+    assert client.get("/admin/traces").status_code == 401
+
+
+def test_get_and_clear_trace(client, admin_headers, tracer):
+    trace_id = client.get("/api/traces", headers=admin_headers).headers[
+        "X-LabLink-Trace-Id"
+    ]
+
+    resp = client.get(f"/api/traces/{trace_id}", headers=admin_headers)
+    assert resp.status_code == 200
+    spans = resp.get_json()["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert spans[0]["name"] == "GET /api/traces"
+    assert spans[0]["kind"] == SERVER
+
+    page = client.get(f"/admin/traces/{trace_id}", headers=admin_headers)
+    assert page.status_code == 200
+    assert b"GET /api/traces" in page.data
+
+    assert client.post("/api/traces/clear", headers=admin_headers).status_code == 200
+    assert client.get(
+        f"/api/traces/{trace_id}", headers=admin_headers
+    ).status_code == 404
+    assert client.get(
+        f"/admin/traces/{trace_id}", headers=admin_headers
+    ).status_code == 404
+
+
+def test_traces_page_lists_traces(client, admin_headers, tracer):
+    trace_id = client.get("/api/traces", headers=admin_headers).headers[
+        "X-LabLink-Trace-Id"
+    ]
+    page = client.get("/admin/traces", headers=admin_headers)
+    assert page.status_code == 200
+    assert f"/admin/traces/{trace_id}".encode() in page.data
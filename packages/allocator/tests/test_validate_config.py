@@ -389,6 +389,13 @@ class TestProviderField:
         errors = get_config_errors(cfg)
         assert not any(self._PROVIDER_ERROR_PREFIX in e for e in errors)
 
+    def test_validator_accepts_simulated(self):
+        from lablink_allocator_service.validate_config import get_config_errors
+
+        cfg = self._make_cfg("simulated")
+        errors = get_config_errors(cfg)
+        assert not any(self._PROVIDER_ERROR_PREFIX in e for e in errors)
+
 
 class TestRegisterTokenLogging:
     """Regression test: gated log line format must match the CLI's
@@ -796,3 +803,247 @@ def test_funnel_lan_direct_error_still_fires():
     cfg.app.admin_user = "admin"
     cfg.app.admin_password = "a-strong-password-1"
     assert [e for e in get_config_errors(cfg) if "lan_direct" in e]
+
+
+@pytest.mark.parametrize(
+    "field", ["shards", "parallelism", "warm_check_interval_seconds"]
+)
+def test_provisioning_counts_must_be_positive(field):
+    from lablink_allocator_service.conf.structured_config import Config
+    from lablink_allocator_service.validate_config import get_config_errors
+
+    cfg = Config()
+    cfg.app.admin_user = "admin"
+    cfg.app.admin_password = "a-strong-password-1"
+    assert not [e for e in get_config_errors(cfg) if "provisioning" in e]
+    setattr(cfg.provisioning, field, 0)
+    assert f"provisioning.{field} must be at least 1" in get_config_errors(cfg)
+
+
+def test_provisioning_warm_spares_must_not_be_negative():
+    from lablink_allocator_service.conf.structured_config import Config
+    from lablink_allocator_service.validate_config import get_config_errors
+
+    cfg = Config()
+    cfg.app.admin_user = "admin"
+    cfg.app.admin_password = "a-strong-password-1"
+    cfg.provisioning.warm_spares = 0
+    assert not [e for e in get_config_errors(cfg) if "provisioning" in e]
+    cfg.provisioning.warm_spares = -1
+    assert "provisioning.warm_spares must not be negative" in get_config_errors(cfg)
+
+
+@pytest.mark.parametrize(
+    "field",
+    [
+        "max_vms",
+        "demand_window_seconds",
+        "scale_down_after_seconds",
+        "check_interval_seconds",
+    ],
+)
+def test_autoscale_counts_must_be_positive(field):
+    from lablink_allocator_service.conf.structured_config import Config
+    from lablink_allocator_service.validate_config import get_config_errors
+
+    cfg = Config()
+    cfg.app.admin_user = "admin"
+    cfg.app.admin_password = "a-strong-password-1"
+    assert not [e for e in get_config_errors(cfg) if "autoscale" in e]
+    setattr(cfg.autoscale, field, 0)
+    assert f"autoscale.{field} must be at least 1" in get_config_errors(cfg)
+
+
+def test_autoscale_free_seats_must_not_be_negative():
+    from lablink_allocator_service.conf.structured_config import Config
+    from lablink_allocator_service.validate_config import get_config_errors
+
+    cfg = Config()
+    cfg.app.admin_user = "admin"
+    cfg.app.admin_password = "a-strong-password-1"
+    cfg.autoscale.free_seats = 0
+    assert not [e for e in get_config_errors(cfg) if "autoscale" in e]
+    cfg.autoscale.free_seats = -1
+    assert "autoscale.free_seats must not be negative" in get_config_errors(cfg)
+
+
+@pytest.mark.parametrize("field", ["idle_minutes", "check_interval_seconds"])
+def test_idle_reclaim_counts_must_be_positive(field):
+    from lablink_allocator_service.conf.structured_config import Config
+    from lablink_allocator_service.validate_config import get_config_errors
+
+    cfg = Config()
+    cfg.app.admin_user = "admin"
+    cfg.app.admin_password = "a-strong-password-1"
+    assert not [e for e in get_config_errors(cfg) if "idle_reclaim" in e]
+    setattr(cfg.idle_reclaim, field, 0)
+    assert f"idle_reclaim.{field} must be at least 1" in get_config_errors(cfg)
+
+
+def test_idle_reclaim_grace_minutes_must_not_be_negative():
+    from lablink_allocator_service.conf.structured_config import Config
+    from lablink_allocator_service.validate_config import get_config_errors
+
+    cfg = Config()
+    cfg.app.admin_user = "admin"
+    cfg.app.admin_password = "a-strong-password-1"
+    cfg.idle_reclaim.grace_minutes = 0
+    assert not [e for e in get_config_errors(cfg) if "idle_reclaim" in e]
+    cfg.idle_reclaim.grace_minutes = -1
+    assert (
+        "idle_reclaim.grace_minutes must not be negative"
+        in get_config_errors(cfg)
+    )
+
+
+def test_session_staging_interval_must_be_positive():
+    from lablink_allocator_service.conf.structured_config import Config
+    from lablink_allocator_service.validate_config import get_config_errors
+
+    cfg = Config()
+    cfg.app.admin_user = "admin"
+    cfg.app.admin_password = "a-strong-password-1"
+    assert not [e for e in get_config_errors(cfg) if "session_staging" in e]
+    cfg.session_staging.check_interval_seconds = 0
+    assert (
+        "session_staging.check_interval_seconds must be at least 1"
+        in get_config_errors(cfg)
+    )
+
+
+def test_session_staging_concurrency_must_be_positive():
+    from lablink_allocator_service.conf.structured_config import Config
+    from lablink_allocator_service.validate_config import get_config_errors
+
+    cfg = Config()
+    cfg.app.admin_user = "admin"
+    cfg.app.admin_password = "a-strong-password-1"
+    cfg.session_staging.concurrency = 0
+    assert (
+        "session_staging.concurrency must be at least 1"
+        in get_config_errors(cfg)
+    )
+
+
+def test_placement_policy_must_be_known():
+    from lablink_allocator_service.conf.structured_config import Config
+    from lablink_allocator_service.db.vms import PLACEMENT_POLICIES
+    from lablink_allocator_service.validate_config import (
+        VALID_PLACEMENT_POLICIES,
+        get_config_errors,
+    )
+
+    assert set(VALID_PLACEMENT_POLICIES) == set(PLACEMENT_POLICIES)
+    cfg = Config()
+    cfg.app.admin_user = "admin"
+    cfg.app.admin_password = "a-strong-password-1"
+    assert not [e for e in get_config_errors(cfg) if "placement" in e]
+    cfg.placement.policy = "nearest"
+    assert any(
+        e.startswith("placement.policy must be one of:")
+        for e in get_config_errors(cfg)
+    )
+
+
+def test_rate_limit_values_must_be_positive():
+    from lablink_allocator_service.conf.structured_config import Config
+    from lablink_allocator_service.validate_config import get_config_errors
+
+    cfg = Config()
+    cfg.app.admin_user = "admin"
+    cfg.app.admin_password = "a-strong-password-1"
+    assert not [e for e in get_config_errors(cfg) if "rate_limit" in e]
+    cfg.rate_limit.max_in_flight = 0
+    cfg.rate_limit.client_rate = 0
+    errors = get_config_errors(cfg)
+    assert "rate_limit.max_in_flight must be at least 1" in errors
+    assert "rate_limit.client_rate must be greater than 0" in errors
+    cfg.rate_limit.enabled = False
+    assert not [e for e in get_config_errors(cfg) if "rate_limit" in e]
+
+
+def test_cadence_values_are_checked():
+    from lablink_allocator_service.conf.structured_config import Config
+    from lablink_allocator_service.validate_config import get_config_errors
+
+    cfg = Config()
+    cfg.app.admin_user = "admin"
+    cfg.app.admin_password = "a-strong-password-1"
+    assert not [e for e in get_config_errors(cfg) if "cadence" in e]
+    cfg.cadence.max_interval_seconds = 30
+    cfg.cadence.jitter = 1.5
+    errors = get_config_errors(cfg)
+    assert "cadence.max_interval_seconds must be at least 60" in errors
+    assert "cadence.jitter must be between 0 and 1" in errors
+
+
+def test_heartbeat_cap_must_fit_the_reboot_window():
+    """A heartbeat cap past half the stale-heartbeat window would let
+    pacing get healthy VMs rebooted."""
+    from lablink_allocator_service.conf.structured_config import Config
+    from lablink_allocator_service.db.vms import STALE_HEARTBEAT_MINUTES
+    from lablink_allocator_service.validate_config import (
+        MAX_HEARTBEAT_INTERVAL_SECONDS,
+        get_config_errors,
+    )
+
+    assert MAX_HEARTBEAT_INTERVAL_SECONDS == STALE_HEARTBEAT_MINUTES * 60 // 2
+    cfg = Config()
+    cfg.app.admin_user = "admin"
+    cfg.app.admin_password = "a-strong-password-1"
+    cfg.cadence.heartbeat_max_interval_seconds = MAX_HEARTBEAT_INTERVAL_SECONDS
+    assert not [e for e in get_config_errors(cfg) if "cadence" in e]
+    cfg.cadence.heartbeat_max_interval_seconds = 150
+    assert (
+        "cadence.heartbeat_max_interval_seconds must be between 30 and 90"
+        in get_config_errors(cfg)
+    )
+
+
+def test_memory_report_values_are_checked():
+    from lablink_allocator_service.conf.structured_config import Config
+    from lablink_allocator_service.validate_config import get_config_errors
+
+    cfg = Config()
+    cfg.app.admin_user = "admin"
+    cfg.app.admin_password = "a-strong-password-1"
+    assert not [e for e in get_config_errors(cfg) if "memory_report" in e]
+    cfg.memory_report.interval_minutes = 0
+    errors = get_config_errors(cfg)
+    assert "memory_report.interval_minutes must be at least 1" in errors
+    cfg.memory_report.enabled = False
+    assert not [e for e in get_config_errors(cfg) if "memory_report" in e]
+
+
+def test_tracing_values_are_checked():
+    from lablink_allocator_service.conf.structured_config import Config
+    from lablink_allocator_service.validate_config import get_config_errors
+
+    cfg = Config()
+    cfg.app.admin_user = "admin"
+    cfg.app.admin_password = "a-strong-password-1"
+    assert not [e for e in get_config_errors(cfg) if "tracing" in e]
+    cfg.tracing.buffer_traces = 0
+    cfg.tracing.min_duration_ms = -1.0
+    errors = get_config_errors(cfg)
+    assert "tracing.buffer_traces must be at least 1" in errors
+    assert "tracing.min_duration_ms must not be negative" in errors
+    cfg.tracing.enabled = False
+    assert not [e for e in get_config_errors(cfg) if "tracing" in e]
+
+
+def test_simulated_values_are_checked():
+    from lablink_allocator_service.conf.structured_config import Config
+    from lablink_allocator_service.validate_config import get_config_errors
+
+    cfg = Config()
+    cfg.app.admin_user = "admin"
+    cfg.app.admin_password = "a-strong-password-1"
+    cfg.simulated.hang_rate = 1.5
+    cfg.simulated.boot_seconds = -1
+    # Only checked when the simulated provider is selected.
+    assert not [e for e in get_config_errors(cfg) if "simulated" in e]
+    cfg.provider = "simulated"
+    errors = get_config_errors(cfg)
+    assert "simulated.hang_rate must be between 0 and 1" in errors
+    assert "simulated.boot_seconds must not be negative" in errors
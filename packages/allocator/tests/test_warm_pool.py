@@ -0,0 +1,198 @@
+"""Tests for the warm pool of stopped spare client VMs."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from lablink_allocator_service.db.operations import OperationInProgress
+from lablink_allocator_service.providers.protocol import (
+    ClientHandle,
+    ProvisionResult,
+)
+from lablink_allocator_service.warm_pool import WarmPoolService
+
+
+def _handle(hostname):
+    return ClientHandle(id=f"i-{hostname}", hostname=hostname)
+
+
+@pytest.fixture
+def provider():
+    provider = MagicMock(can_stop_hosts=True)
+    provider.list_hosts.return_value = [
+        _handle(h) for h in ("vm-1", "vm-2", "vm-3", "vm-4")
+    ]
+    provider.stop_hosts.return_value = True
+    provider.start_hosts.return_value = True
+    return provider
+
+
+@pytest.fixture
+def service(provider):
+    return WarmPoolService(
+        database=MagicMock(),
+        provider=provider,
+        operations_worker=MagicMock(),
+        provision=MagicMock(),
+        size=2,
+    )
+
+
+def _run_submitted(service, result):
+    """Run the refill job the service handed to operations_worker."""
+    service.provision.return_value = result
+    fn = service.operations_worker.submit.call_args.kwargs["fn"]
+    return fn(None, None)
+
+
+def test_refill_launches_shortfall_as_operation(service):
+    service.database.get_all_vm_status.return_value = {
+        "vm-1": "running", "vm-2": "warm",
+    }
+
+    service._check()
+
+    kwargs = service.operations_worker.submit.call_args.kwargs
+    assert kwargs["op_type"] == "apply"
+    assert kwargs["created_by"] == "warm-pool"
+    assert json.loads(kwargs["params"]) == {"num_vms": 1, "warm_spares": True}
+
+    out = _run_submitted(service, ProvisionResult(
+        handles=[_handle("vm-3")], timings={}, apply_stdout="applied",
+    ))
+    assert out == "applied"
+    service.provision.assert_called_once_with(1, None, None)
+
+    # The launched spare counts toward the pool while it initializes.
+    service.operations_worker.submit.reset_mock()
+    service.database.get_all_vm_status.return_value = {
+        "vm-1": "running", "vm-2": "warm", "vm-3": "initializing",
+    }
+    service._check()
+    service.operations_worker.submit.assert_not_called()
+
+
+def test_refill_skipped_without_a_fleet(service):
+    service.database.get_all_vm_status.return_value = {}
+    service._check()
+    service.database.get_all_vm_status.return_value = {"vm-1": "warm"}
+    service._check()
+
+    service.operations_worker.submit.assert_not_called()
+
+
+def test_refill_defers_to_operation_in_progress(service):
+    service.database.get_all_vm_status.return_value = {"vm-1": "running"}
+    service.operations_worker.submit.side_effect = OperationInProgress(job_id=3)
+
+    service._check()  # does not raise
+
+
+def test_ready_spares_are_marked_warm_then_stopped(service, provider):
+    service.database.get_all_vm_status.return_value = {"vm-1": "running"}
+    service._check()
+    _run_submitted(service, ProvisionResult(
+        handles=[_handle("vm-2"), _handle("vm-3")], timings={}, apply_stdout="",
+    ))
+    service.operations_worker.submit.reset_mock()
+    # vm-3 went to a student before it could be parked.
+    service.database.mark_warm.return_value = ["vm-2"]
+    service.database.get_all_vm_status.return_value = {
+        "vm-1": "running", "vm-2": "running", "vm-3": "running",
+    }
+
+    service._check()
+
+    service.database.mark_warm.assert_called_once_with(["vm-2", "vm-3"])
+    provider.stop_hosts.assert_called_once_with([_handle("vm-2")])
+    # vm-3 is an ordinary seat now, so the pool is one short again.
+    assert json.loads(
+        service.operations_worker.submit.call_args.kwargs["params"]
+    )["num_vms"] == 1
+
+
+def test_failed_stop_returns_spares_to_service(service, provider):
+    service.database.get_all_vm_status.return_value = {"vm-1": "running"}
+    service._check()
+    _run_submitted(service, ProvisionResult(
+        handles=[_handle("vm-2")], timings={}, apply_stdout="",
+    ))
+    service.database.mark_warm.return_value = ["vm-2"]
+    provider.stop_hosts.return_value = False
+    service.database.get_all_vm_status.return_value = {
+        "vm-1": "running", "vm-2": "running",
+    }
+
+    service._check()
+
+    service.database.update_vm_status.assert_called_once_with("vm-2", "running")
+
+
+def test_take_starts_claimed_spares(service, provider):
+    service.database.claim_warm_vms.return_value = ["vm-1", "vm-4"]
+
+    assert service.take(3) == ["vm-1", "vm-4"]
+
+    service.database.claim_warm_vms.assert_called_once_with(3)
+    provider.start_hosts.assert_called_once_with(
+        [_handle("vm-1"), _handle("vm-4")]
+    )
+
+
+def test_take_with_empty_pool_starts_nothing(service, provider):
+    service.database.claim_warm_vms.return_value = []
+
+    assert service.take(2) == []
+    provider.start_hosts.assert_not_called()
+
+
+@pytest.fixture
+def launch_with_pool(app, monkeypatch):
+    from lablink_allocator_service import main
+
+    monkeypatch.setattr(main, "allocator_ip", "1.2.3.4", raising=False)
+    monkeypatch.setattr(main, "key_name", "test-key", raising=False)
+    provider = MagicMock(can_provision_hosts=True)
+    provider.provision_hosts.return_value = ProvisionResult(
+        handles=[], timings={}, apply_stdout="applied",
+    )
+    monkeypatch.setitem(main.app.config, "LABLINK_PROVIDER", provider)
+    pool = MagicMock()
+    monkeypatch.setattr(main, "warm_pool", pool)
+    return provider, pool
+
+
+def _launch_fn(client, admin_headers, num_vms):
+    with patch("lablink_allocator_service.main.operations_worker") as worker:
+        client.post(
+            "/api/launch", headers=admin_headers, data={"num_vms": num_vms},
+        )
+        return worker.submit.call_args.kwargs["fn"]
+
+
+def test_launch_starts_warm_spares_before_provisioning(
+    launch_with_pool, client, admin_headers,
+):
+    provider, pool = launch_with_pool
+    pool.take.return_value = ["vm-1"]
+    lines = []
+
+    output = _launch_fn(client, admin_headers, "3")(None, lines.append)
+
+    pool.take.assert_called_once_with(3)
+    assert provider.provision_hosts.call_args.kwargs["count"] == 2
+    assert lines == ["Started warm spare vm-1"]
+    assert output == "Started warm spare vm-1\napplied"
+
+
+def test_launch_served_entirely_from_warm_pool(
+    launch_with_pool, client, admin_headers,
+):
+    provider, pool = launch_with_pool
+    pool.take.return_value = ["vm-1", "vm-2"]
+
+    output = _launch_fn(client, admin_headers, "2")()
+
+    provider.provision_hosts.assert_not_called()
+    assert output == "Started warm spare vm-1\nStarted warm spare vm-2"
@@ -268,6 +268,35 @@ def test_stop_start_ec2_instance_failure(mock_boto_client):
     assert result is False
 
 
+@patch("lablink_allocator_service.utils.aws_utils.boto3.client")
+def test_stop_and_start_ec2_instances_do_not_wait(mock_boto_client):
+    """Warm-pool stop/start only issues the requests."""
+    mock_ec2 = MagicMock()
+    mock_boto_client.return_value = mock_ec2
+
+    assert aws_utils.stop_ec2_instances(["i-1", "i-2"], region="eu-1") is True
+    assert aws_utils.start_ec2_instances(["i-1"], region="eu-1") is True
+
+    mock_ec2.stop_instances.assert_called_once_with(InstanceIds=["i-1", "i-2"])
+    mock_ec2.start_instances.assert_called_once_with(InstanceIds=["i-1"])
+    mock_ec2.get_waiter.assert_not_called()
+
+
+@patch("lablink_allocator_service.utils.aws_utils.boto3.client")
+def test_start_ec2_instances_failure(mock_boto_client):
+    """A rejected start request reports False."""
+    from botocore.exceptions import ClientError
+
+    mock_ec2 = MagicMock()
+    mock_ec2.start_instances.side_effect = ClientError(
+        {"Error": {"Code": "IncorrectInstanceState", "Message": "busy"}},
+        "StartInstances",
+    )
+    mock_boto_client.return_value = mock_ec2
+
+    assert aws_utils.start_ec2_instances(["i-1"]) is False
+
+
 @patch("lablink_allocator_service.utils.aws_utils.boto3")
 @patch("lablink_allocator_service.utils.aws_utils.requests")
 def test_current_instance_security_group_happy_path(mock_requests, mock_boto):
@@ -7,6 +7,7 @@ from lablink_allocator_service.utils.tofu_utils import (
     get_ssh_private_key,
     get_instance_names,
     get_instance_ids,
+    get_instance_private_ips,
     get_instance_timings,
 )
 
@@ -65,6 +66,29 @@ def test_get_instance_names_success(mock_run):
     mock_run.assert_called_once()
 
 
+@patch("subprocess.run")
+def test_get_instance_private_ips_success(mock_run):
+    """Test getting instance private IPs successfully."""
+    mock_run.return_value = subprocess.CompletedProcess(
+        args=["tofu", "output", "-json", "vm_private_ips"],
+        returncode=0,
+        stdout=json.dumps(["10.0.1.5", "10.0.1.6"]),
+        stderr="",
+    )
+    assert get_instance_private_ips("/fake/tofu/dir") == ["10.0.1.5", "10.0.1.6"]
+    assert mock_run.call_args[0][0] == [
+        "tofu", "output", "-json", "vm_private_ips",
+    ]
+
+
+@patch("subprocess.run")
+def test_get_instance_private_ips_failure(mock_run):
+    """Test handling failure when getting instance private IPs."""
+    mock_run.side_effect = subprocess.CalledProcessError(1, "cmd", stderr="error")
+    with pytest.raises(RuntimeError, match="Error running tofu output: error"):
+        get_instance_private_ips("/fake/tofu/dir")
+
+
 @patch("subprocess.run")
 def test_get_instance_ids_failure(mock_run):
     """Test handling failure when getting instance IDs."""
@@ -0,0 +1,51 @@
+"""Micro-benchmarks for the log shipper's per-line helpers.
+
+``parse_docker_line`` runs on every line ``docker logs --timestamps``
+hands the shipper; this times it over 1 MB of client container output.
+
+Run from the repository root with ``python benchmarks/micro.py cli``,
+which times each case against micro_baseline.json next to this file.
+"""
+
+import random
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from lablink_cli.log_shipper import parse_docker_line
+
+_MESSAGES = [
+    "[kasmvnc] websocket 42: got client connection from 10.0.0.7",
+    "[client] lablink_client_service.check_gpu - INFO - GPU status: Healthy",
+    "[start] \x1b[32m+ curl --retry-all-errors -sf http://alloc/api\x1b[0m",
+    "[sleap] INFO Labeled frame 118 of 1200",
+    '[client]   File "/app/update_inuse_status.py", line 104, in main',
+]
+
+
+def docker_lines(size: int = 1 << 20, seed: int = 0) -> list:
+    """Roughly `size` bytes of ``docker logs --timestamps`` output; a few
+    lines (continuations of a wrapped write) carry no timestamp."""
+    rng = random.Random(seed)
+    start = datetime(2026, 5, 28, 14, 0, tzinfo=timezone.utc)
+    lines, total = [], 0
+    while total < size:
+        ts = start + timedelta(microseconds=250_000 * len(lines))
+        message = rng.choice(_MESSAGES)
+        if rng.random() < 0.05:
+            line = message
+        else:
+            line = f"{ts:%Y-%m-%dT%H:%M:%S}.{ts.microsecond:06d}123Z {message}"
+        lines.append(line)
+        total += len(line) + 1
+    return lines
+
+
+@contextmanager
+def cases():
+    lines = docker_lines()
+
+    def parse_all():
+        for line in lines:
+            parse_docker_line(line)
+
+    yield {"parse_docker_line_1mb": parse_all}
@@ -6,7 +6,7 @@ import base64
 import json
 import ssl
 import time
-from typing import Callable, NoReturn
+from typing import Callable, Iterator, NoReturn
 from urllib.error import HTTPError, URLError
 from urllib.parse import urlencode
 from urllib.request import Request, urlopen
@@ -109,6 +109,9 @@ _REQUEST_TIMEOUT_SECONDS = 30
 _POLL_INTERVAL_SECONDS = 2.0
 _POLL_TIMEOUT_SECONDS = 1800
 
+# Status values after which an operation never changes again.
+_TERMINAL_STATUSES = ("succeeded", "failed", "interrupted")
+
 # The exact message providers/aws.py's destroy_hosts raises (wrapped by
 # main.py's /destroy route into a failed operation with this same text)
 # when no client VMs were ever launched. Matched here so destroy_vms()
@@ -140,6 +143,26 @@ class AllocatorOperationTimeout(AllocatorError):
     """An operation did not reach a terminal status within the poll deadline."""
 
 
+def _iter_sse(lines) -> Iterator[tuple[str, int | None, dict]]:
+    """Yield (event, id, data) for each event in a text/event-stream body
+    read line by line. Comment lines (keep-alives) are skipped."""
+    fields: dict[str, str] = {}
+    for raw in lines:
+        line = raw.decode().rstrip("\r\n")
+        if not line:
+            if "data" in fields:
+                event_id = fields.get("id")
+                yield (
+                    fields.get("event", "message"),
+                    int(event_id) if event_id else None,
+                    json.loads(fields["data"]),
+                )
+            fields = {}
+        elif not line.startswith(":"):
+            name, _, value = line.partition(":")
+            fields[name] = value[1:] if value.startswith(" ") else value
+
+
 class AllocatorAPI:
     """HTTP client for the allocator service."""
 
@@ -157,6 +180,7 @@ class AllocatorAPI:
     def destroy_vms(
         self,
         on_progress: Callable[[int | None, int | None], None] | None = None,
+        on_output: Callable[[str], None] | None = None,
     ) -> dict | None:
         """POST /destroy to tear down client VMs, then poll until the
         job reaches a terminal status.
@@ -167,13 +191,14 @@ class AllocatorAPI:
         AllocatorError/AllocatorOperationTimeout otherwise.
         """
         return self._submit_and_poll(
-            "POST", "/destroy", on_progress=on_progress,
+            "POST", "/destroy", on_progress=on_progress, on_output=on_output,
         )
 
     def launch_vms(
         self,
         num_vms: int,
         on_progress: Callable[[int | None, int | None], None] | None = None,
+        on_output: Callable[[str], None] | None = None,
     ) -> dict | None:
         """POST /api/launch to provision num_vms new client VMs, then
         poll until the job reaches a terminal status.
@@ -187,6 +212,20 @@ class AllocatorAPI:
             data,
             content_type="application/x-www-form-urlencoded",
             on_progress=on_progress,
+            on_output=on_output,
+        )
+
+    def preassign_roster(
+        self, emails: list[str], *, prestage: bool = False
+    ) -> dict | None:
+        """POST /api/roster to hold a seat for every email in a roster.
+
+        Returns the allocator's summary: ``seats`` (email -> hostname),
+        ``assigned``, ``unseated`` and ``staged``.
+        """
+        data = json.dumps({"emails": emails, "prestage": prestage}).encode()
+        return self._request(
+            "POST", "/api/roster", data, content_type="application/json"
         )
 
     def _submit_and_poll(
@@ -197,15 +236,23 @@ class AllocatorAPI:
         *,
         content_type: str | None = None,
         on_progress: Callable[[int | None, int | None], None] | None = None,
+        on_output: Callable[[str], None] | None = None,
     ) -> dict | None:
-        """Submit an async apply/destroy job and poll GET
-        /api/operations/<id> until it reaches a terminal status.
-
-        If on_progress is given, it's called once per poll tick with
-        (resources_completed, resources_total) read off the operation
-        response. Both are None if the allocator predates progress
-        reporting (the keys are simply absent from its response) —
-        callers must handle that, not assume real numbers."""
+        """Submit an async apply/destroy job and wait for it to reach a
+        terminal status.
+
+        Waits on the job's event stream (GET /api/operations/<id>/stream)
+        while it is available, then reads the finished operation from
+        GET /api/operations/<id>. If the stream is unavailable (older
+        allocator, connection lost) it polls that endpoint instead.
+
+        If on_progress is given, it's called with (resources_completed,
+        resources_total) on every progress event, or once per poll tick
+        from the operation response. Both are None if the allocator
+        predates progress reporting (the keys are simply absent from its
+        response) — callers must handle that, not assume real numbers.
+        on_output receives each line of OpenTofu output as it arrives;
+        it is only called while streaming."""
         submitted = self._request(
             method, path, data, content_type=content_type
         )
@@ -216,6 +263,7 @@ class AllocatorAPI:
         job_id = submitted["job_id"]
 
         deadline = time.monotonic() + _POLL_TIMEOUT_SECONDS
+        self._follow_stream(job_id, on_progress, on_output, deadline)
         while True:
             try:
                 op = self._request("GET", f"/api/operations/{job_id}")
@@ -253,6 +301,58 @@ class AllocatorAPI:
                 )
             time.sleep(_POLL_INTERVAL_SECONDS)
 
+    def _follow_stream(
+        self,
+        job_id: int,
+        on_progress: Callable[[int | None, int | None], None] | None,
+        on_output: Callable[[str], None] | None,
+        deadline: float,
+    ) -> bool:
+        """Relay the job's Server-Sent Events until a terminal status.
+
+        Reconnects with Last-Event-ID after a dropped connection as long
+        as the previous one delivered something. Returns True once a
+        terminal status was seen, False when streaming is unavailable —
+        the caller polls from there either way, so no error is raised.
+        """
+        last_id = 0
+        while time.monotonic() < deadline:
+            req = Request(
+                f"{self.base_url}/api/operations/{job_id}/stream",
+                method="GET",
+            )
+            req.add_header("User-Agent", USER_AGENT)
+            req.add_header("Authorization", self._auth_header)
+            req.add_header("Accept", "text/event-stream")
+            if last_id:
+                req.add_header("Last-Event-ID", str(last_id))
+            received = False
+            try:
+                # S310: same operator-supplied base URL as _read_body.
+                with urlopen(  # noqa: S310
+                    req, timeout=_REQUEST_TIMEOUT_SECONDS,
+                    context=self._ssl_ctx,
+                ) as resp:
+                    for event, event_id, data in _iter_sse(resp):
+                        received = True
+                        last_id = event_id or last_id
+                        if event == "unavailable":
+                            return False
+                        if event == "output" and on_output:
+                            on_output(data.get("line", ""))
+                        elif event == "progress" and on_progress:
+                            on_progress(data.get("completed"), data.get("total"))
+                        elif (
+                            event == "status"
+                            and data.get("status") in _TERMINAL_STATUSES
+                        ):
+                            return True
+            except (HTTPError, URLError, OSError, ValueError):
+                pass
+            if not received:
+                return False
+        return False
+
     def _request(
         self,
         method: str,
@@ -405,6 +405,36 @@ def destroy_client(
     run_client_destroy(_load_cfg(config), yes=yes, verbose=verbose)
 
 
+@client_app.command("roster")
+def roster_client(
+    roster_file: Path = typer.Argument(
+        ...,
+        help="File with one student email per line (a CSV export works too)",
+    ),
+    prestage: bool = typer.Option(
+        False,
+        "--prestage",
+        help="Also stage each held seat's session credential ahead of time.",
+    ),
+    config: str = typer.Option(
+        None,
+        "--config",
+        "-c",
+        help="Path to config.yaml (default: ~/.lablink/config.yaml)",
+    ),
+) -> None:
+    """Hold a seat for every student on a roster before class starts.
+
+    Seats are bound to the emails in one step on the allocator, so a
+    student's arrival only looks up the seat already held for them.
+    Re-running with the same roster is safe; students who already hold a
+    seat keep it.
+    """
+    from lablink_cli.commands.roster import run_roster
+
+    run_roster(_load_cfg(config), roster_file, prestage=prestage)
+
+
 @app.command(rich_help_panel="Operations")
 def status(
     config: str = typer.Option(
@@ -760,7 +790,12 @@ def _clear_deployments_cache(console, stale_only: bool = False) -> None:
         return
 
     all_records = list(cache_dir.glob("*.json"))
-    if not all_records:
+    # Launch startup records (`lablink stats --startup`) are never in
+    # progress, so --stale leaves them.
+    launch_records = (
+        [] if stale_only else list(deployment_metrics.launches_dir().glob("*.json"))
+    )
+    if not all_records and not launch_records:
         console.print("[dim]Deployments cache is empty.[/dim]")
         return
 
@@ -780,7 +815,7 @@ def _clear_deployments_cache(console, stale_only: bool = False) -> None:
             )
             return
     else:
-        records = all_records
+        records = all_records + launch_records
 
     for p in records:
         p.unlink()
@@ -927,8 +962,23 @@ def stats(
         "-c",
         help="Path to config.yaml (default: ~/.lablink/config.yaml)",
     ),
+    startup: bool = typer.Option(
+        False,
+        "--startup",
+        help=(
+            "Show client startup-phase percentiles per launch instead, "
+            "and compare the newest launch with earlier ones recorded "
+            "in ~/.lablink/deployments/launches/."
+        ),
+    ),
 ) -> None:
     """Show a cohort session-metrics summary in the terminal."""
+    if startup:
+        from lablink_cli.commands.stats import run_startup_stats
+
+        run_startup_stats(_load_cfg(config))
+        return
+
     from lablink_cli.commands.stats import run_stats
 
     run_stats(_load_cfg(config))
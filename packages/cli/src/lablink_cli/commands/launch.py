@@ -48,6 +48,16 @@ def _resolve_api(cfg: Config) -> tuple[AllocatorAPI, str]:
     return api, allocator_url
 
 
+# Longest OpenTofu line shown beside the progress bar.
+_OUTPUT_LINE_WIDTH = 60
+
+
+def _truncate(line: str) -> str:
+    if len(line) <= _OUTPUT_LINE_WIDTH:
+        return line
+    return line[: _OUTPUT_LINE_WIDTH - 1] + "…"
+
+
 def _run_fleet_op(
     api_call: Callable[..., dict | None],
     *,
@@ -55,10 +65,12 @@ def _run_fleet_op(
 ) -> tuple[dict | None, float]:
     """Run a client-fleet operation under a progress bar.
 
-    ``api_call`` is invoked as ``api_call(on_progress=cb)``; the callback
-    updates the bar with the allocator's resource counts. The allocator
-    reports (None, None) if it predates progress reporting, in which case
-    the bar stays indeterminate rather than rendering a literal "None".
+    ``api_call`` is invoked as ``api_call(on_progress=cb, on_output=cb)``;
+    the first callback updates the bar with the allocator's resource
+    counts, the second shows the latest OpenTofu output line beside it.
+    The allocator reports (None, None) if it predates progress reporting,
+    in which case the bar stays indeterminate rather than rendering a
+    literal "None".
 
     Returns ``(result, elapsed_seconds)``. Exceptions from ``api_call``
     propagate untouched — callers map them via ``_exit_fleet_error``.
@@ -68,10 +80,11 @@ def _run_fleet_op(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         BarColumn(),
+        TextColumn("{task.fields[line]}", markup=False, style="dim"),
         console=console,
         transient=True,
     ) as progress:
-        task = progress.add_task(description, total=None)
+        task = progress.add_task(description, total=None, line="")
 
         def _on_progress(done, total):
             if done is not None and total is not None:
@@ -82,7 +95,11 @@ def _run_fleet_op(
                     description=f"{description} ({done}/{total} resources)",
                 )
 
-        result = api_call(on_progress=_on_progress)
+        def _on_output(line):
+            if line.strip():
+                progress.update(task, line=_truncate(line.strip()))
+
+        result = api_call(on_progress=_on_progress, on_output=_on_output)
     return result, time.monotonic() - started
 
 
@@ -152,8 +169,8 @@ def run_launch(cfg: Config, num_vms: int, *, verbose: bool = False) -> None:
 
     try:
         result, elapsed = _run_fleet_op(
-            lambda on_progress: api.launch_vms(
-                num_vms, on_progress=on_progress
+            lambda on_progress, on_output: api.launch_vms(
+                num_vms, on_progress=on_progress, on_output=on_output
             ),
             description=f"[bold]Launching {num_vms} client VM(s)...[/bold]",
         )
@@ -213,7 +230,9 @@ def run_client_destroy(
 
     try:
         result, elapsed = _run_fleet_op(
-            lambda on_progress: api.destroy_vms(on_progress=on_progress),
+            lambda on_progress, on_output: api.destroy_vms(
+                on_progress=on_progress, on_output=on_output
+            ),
             description="[bold]Destroying client VMs...[/bold]",
         )
         _report(result, elapsed, label="client VMs destroyed", verbose=verbose)
@@ -0,0 +1,87 @@
+"""Pre-assign seats to a class roster via the allocator service."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+from lablink_allocator_service.conf.structured_config import Config
+
+from lablink_cli.api import AllocatorError
+from lablink_cli.commands.launch import _exit_fleet_error, _resolve_api
+
+console = Console()
+
+
+def read_roster(path: Path) -> list[str]:
+    """Read emails from a roster file.
+
+    One email per line; blank lines and ``#`` comments are skipped. A CSV
+    export works too: the first field on each line that looks like an
+    email is used, so a header row is skipped on its own.
+    """
+    emails = []
+    for line in path.read_text().splitlines():
+        line = line.split("#", 1)[0]
+        for field in line.split(","):
+            field = field.strip().strip('"')
+            if "@" in field:
+                emails.append(field)
+                break
+    return emails
+
+
+def run_roster(cfg: Config, roster_file: Path, *, prestage: bool = False) -> None:
+    """Hold a seat for every email in ``roster_file``.
+
+    Args:
+        cfg: Loaded LabLink config.
+        roster_file: File with one email per line (or a CSV export).
+        prestage: Also stage session credentials on the held seats.
+    """
+    try:
+        emails = read_roster(roster_file)
+    except OSError as e:
+        console.print(f"[red]Could not read roster:[/red] {e}")
+        raise SystemExit(1) from e
+    if not emails:
+        console.print(f"[red]No emails found in {roster_file}.[/red]")
+        raise SystemExit(1)
+
+    console.print()
+    api, allocator_url = _resolve_api(cfg)
+    console.print(f"  [dim]POST {allocator_url}/api/roster[/dim]")
+    console.print()
+
+    try:
+        with console.status(
+            f"[bold]Assigning seats to {len(emails)} email(s)...[/bold]"
+        ):
+            result = api.preassign_roster(emails, prestage=prestage) or {}
+    except AllocatorError as e:
+        _exit_fleet_error(e, label="Roster assignment failed")
+
+    seats = result.get("seats", {})
+    unseated = result.get("unseated", [])
+    console.print(
+        f"[green]✓ {len(seats)} seat(s) held[/green]  "
+        f"[dim]({result.get('assigned', 0)} newly assigned)[/dim]"
+    )
+    if prestage:
+        console.print(
+            f"  {result.get('staged', 0)} session(s) staged ahead of arrival"
+        )
+
+    if unseated:
+        console.print()
+        table = Table(title=f"No seat for {len(unseated)} email(s)")
+        table.add_column("Email")
+        for email in unseated:
+            table.add_row(email)
+        console.print(table)
+        console.print(
+            "[yellow]Launch more client VMs with 'lablink client launch' "
+            "and run this command again.[/yellow]"
+        )
@@ -4,15 +4,24 @@ Numbers come from the allocator's /api/session-metrics/summary endpoint —
 the same view model the admin web UI consumes. This keeps `lablink stats`
 and /admin/session-metrics from ever showing different aggregates for
 the same deployment state.
+
+``lablink stats --startup`` does the same for /api/startup-report (the
+view model behind /admin/startup-report), then records each launch in the
+local deployments cache and compares the newest launch with the ones
+recorded before it, so a slower client image or AMI shows up on its
+first launch.
 """
 
 from __future__ import annotations
 
+import statistics
+from datetime import datetime, timezone
 from urllib.error import HTTPError, URLError
 
 from rich.console import Console
 from rich.table import Table
 
+from lablink_cli import deployment_metrics
 from lablink_cli.api import authenticated_json_request
 from lablink_cli.commands.utils import (
     get_allocator_url,
@@ -22,8 +31,22 @@ from lablink_cli.commands.utils import (
 
 console = Console()
 
+# Startup phases in display order, as named by /api/startup-report.
+PHASE_LABELS = {
+    "tofu_apply": "OpenTofu apply",
+    "cloud_init": "Cloud-init",
+    "container": "Container start",
+    "total": "Total",
+}
+# How many earlier cached launches make up the comparison baseline.
+BASELINE_LAUNCHES = 5
+# A phase is flagged slower when its p50 is this much above the baseline
+# p50, both relatively and in seconds.
+REGRESSION_PCT = 20.0
+REGRESSION_MIN_SECONDS = 10.0
+
 
-def _fetch(cfg) -> dict:
+def _fetch(cfg, path: str = "/api/session-metrics/summary") -> dict:
     allocator_url = get_allocator_url(cfg)
     if not allocator_url:
         console.print("[red]Could not determine allocator URL.[/red]")
@@ -33,7 +56,7 @@ def _fetch(cfg) -> dict:
 
     try:
         return authenticated_json_request(
-            f"{allocator_url}/api/session-metrics/summary",
+            f"{allocator_url}{path}",
             admin_user,
             admin_pw,
             ssl_provider=cfg.ssl.provider,
@@ -131,3 +154,151 @@ def run_stats(cfg) -> None:
         str(epochs) if epochs is not None else "—",
     )
     console.print(t)
+
+
+def _fmt_seconds(seconds: int | float | None) -> str:
+    return "—" if seconds is None else f"{seconds:.1f}"
+
+
+def _record_launches(body: dict, deploy: str) -> None:
+    """Write each launch in the report to the cache, replacing the record
+    an earlier run wrote for the same launch."""
+    recorded_at = datetime.now(timezone.utc).isoformat()
+    for launch in body.get("launches") or []:
+        if launch.get("operation_id") is None or not launch.get("started_at"):
+            continue
+        record = deployment_metrics.LaunchStartupRecord(
+            deployment_name=deploy,
+            operation_id=launch["operation_id"],
+            started_at=launch["started_at"],
+            recorded_at=recorded_at,
+            client_image=body.get("client_image"),
+            ami_id=body.get("ami_id"),
+            machine_type=body.get("machine_type"),
+            hosts=launch.get("hosts", 0),
+            phases={
+                phase: {k: v for k, v in stats.items() if k != "p50_change_pct"}
+                for phase, stats in launch.get("phases", {}).items()
+            },
+        )
+        deployment_metrics.write_metrics(
+            deployment_metrics.launch_cache_path(record), record
+        )
+
+
+def _baseline(records: list[dict]) -> dict:
+    """Median p50 per phase across `records`."""
+    p50s: dict = {}
+    for record in records:
+        for phase, stats in (record.get("phases") or {}).items():
+            if stats.get("p50") is not None:
+                p50s.setdefault(phase, []).append(stats["p50"])
+    return {phase: statistics.median(values) for phase, values in p50s.items()}
+
+
+def _print_launch(launch: dict) -> None:
+    op = launch.get("operation_id")
+    title = f"Launch #{op}" if op is not None else "Not from a launch"
+    started = launch.get("started_at")
+    when = f", started {started[:19].replace('T', ' ')}" if started else ""
+    console.print(f"[bold]{title}[/bold]{when} — {launch.get('hosts', 0)} hosts")
+
+    t = Table(box=None)
+    t.add_column("Phase")
+    for col in ("p50", "p90", "p99", "max"):
+        t.add_column(f"{col} (s)", justify="right")
+    for phase, stats in launch.get("phases", {}).items():
+        t.add_row(
+            PHASE_LABELS.get(phase, phase),
+            *(_fmt_seconds(stats.get(col)) for col in ("p50", "p90", "p99", "max")),
+        )
+    console.print(t)
+    for o in launch.get("outliers") or []:
+        console.print(
+            f"  [yellow]outlier[/yellow] {o['hostname']}: "
+            f"{PHASE_LABELS.get(o['phase'], o['phase'])} took "
+            f"{o['seconds']:.1f}s (fence {o['fence']:.1f}s)"
+        )
+    console.print()
+
+
+def _print_comparison(newest: dict, body: dict, earlier: list[dict]) -> None:
+    baseline = _baseline(earlier)
+    console.print(
+        f"[bold]Launch #{newest['operation_id']} vs the previous "
+        f"{len(earlier)} recorded launch(es)[/bold]"
+    )
+    for key, label in (("client_image", "Client image"), ("ami_id", "AMI")):
+        before = earlier[-1].get(key)
+        now = body.get(key)
+        if before and now and before != now:
+            console.print(f"  [yellow]{label} changed:[/yellow] {before} → {now}")
+
+    t = Table(box=None)
+    t.add_column("Phase")
+    t.add_column("p50 now (s)", justify="right")
+    t.add_column("baseline p50 (s)", justify="right")
+    t.add_column("change", justify="right")
+    slower = []
+    for phase, stats in newest.get("phases", {}).items():
+        before = baseline.get(phase)
+        now = stats.get("p50")
+        if before is None or now is None or not before:
+            t.add_row(PHASE_LABELS.get(phase, phase), _fmt_seconds(now), "—", "—")
+            continue
+        pct = 100 * (now - before) / before
+        change = f"{pct:+.0f}%"
+        if pct >= REGRESSION_PCT and now - before >= REGRESSION_MIN_SECONDS:
+            change = f"[red]{change} slower[/red]"
+            slower.append(PHASE_LABELS.get(phase, phase))
+        t.add_row(
+            PHASE_LABELS.get(phase, phase),
+            _fmt_seconds(now),
+            _fmt_seconds(before),
+            change,
+        )
+    console.print(t)
+    if slower:
+        console.print(
+            f"[red]Startup regressed in: {', '.join(slower)}.[/red] "
+            "Check the client image and AMI above."
+        )
+
+
+def run_startup_stats(cfg) -> None:
+    body = _fetch(cfg, "/api/startup-report")
+    launches = body.get("launches") or []
+    if not launches:
+        console.print(
+            "[yellow]No VM has reported a complete startup yet.[/yellow]"
+        )
+        return
+
+    deploy = getattr(cfg, "deployment_name", "lablink")
+    console.print(
+        f"\n[bold]LabLink startup report — deploy \"{deploy}\"[/bold]\n"
+    )
+    for launch in launches:
+        _print_launch(launch)
+
+    _record_launches(body, deploy)
+    newest = next(
+        (launch for launch in launches
+         if launch.get("operation_id") is not None and launch.get("started_at")),
+        None,
+    )
+    if newest is None:
+        return
+    # Earlier by start time, whichever allocator they ran on.
+    earlier = [
+        record
+        for record in deployment_metrics.load_launch_records(deploy)
+        if (record.get("started_at") or "") < newest["started_at"]
+    ][-BASELINE_LAUNCHES:]
+    if not earlier:
+        console.print(
+            "[dim]No earlier launches recorded yet; later runs will compare "
+            "against this one.[/dim]"
+        )
+        return
+    _print_comparison(newest, body, earlier)
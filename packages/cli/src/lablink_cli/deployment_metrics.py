@@ -8,6 +8,11 @@ Records start life with ``status="in_progress"`` and are promoted to
 Plan-confirmation cancels and Ctrl-C leave the file in ``in_progress``
 indefinitely — use ``lablink cache-clear --deployments --stale`` to prune
 just those, or ``--deployments`` to wipe the whole cache.
+
+``lablink stats --startup`` also keeps one :class:`LaunchStartupRecord`
+per client launch under ``launches/`` here, so each launch's startup
+phases can be compared with earlier ones, including launches from
+allocators that have since been destroyed.
 """
 
 from __future__ import annotations
@@ -15,7 +20,7 @@ from __future__ import annotations
 import json
 import time
 from contextlib import contextmanager
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Iterator, Optional
@@ -52,6 +57,23 @@ class DeploymentMetrics:
     error: Optional[str] = None
 
 
+@dataclass
+class LaunchStartupRecord:
+    """Startup-phase percentiles of one client launch, as reported by the
+    allocator's /api/startup-report, plus the image and AMI it booted."""
+
+    deployment_name: str
+    operation_id: int
+    started_at: str
+    recorded_at: str
+    client_image: Optional[str] = None
+    ami_id: Optional[str] = None
+    machine_type: Optional[str] = None
+    hosts: int = 0
+    # phase name -> {"hosts", "p50", "p90", "p99", "max"}, in seconds
+    phases: dict = field(default_factory=dict)
+
+
 def _slugify_timestamp(dt: datetime) -> str:
     return dt.isoformat().replace(":", "-")
 
@@ -60,7 +82,22 @@ def cache_path_for(deployment_name: str, start_time: datetime) -> Path:
     return DEPLOYMENTS_DIR / f"{deployment_name}-{_slugify_timestamp(start_time)}.json"
 
 
-def write_metrics(path: Path, metrics: DeploymentMetrics) -> None:
+def launches_dir() -> Path:
+    return DEPLOYMENTS_DIR / "launches"
+
+
+def launch_cache_path(record: LaunchStartupRecord) -> Path:
+    # Operation IDs restart with each allocator, so the start time is part
+    # of the name; rewriting the same launch replaces its record.
+    stamp = record.started_at.replace(":", "-")
+    return launches_dir() / (
+        f"{record.deployment_name}-launch{record.operation_id}-{stamp}.json"
+    )
+
+
+def write_metrics(
+    path: Path, metrics: DeploymentMetrics | LaunchStartupRecord
+) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     tmp = path.with_suffix(".json.tmp")
     tmp.write_text(json.dumps(asdict(metrics), indent=2, sort_keys=True))
@@ -79,6 +116,22 @@ def load_all_metrics() -> list[dict]:
     return out
 
 
+def load_launch_records(deployment_name: str) -> list[dict]:
+    """Cached launch records for `deployment_name`, oldest first."""
+    directory = launches_dir()
+    if not directory.exists():
+        return []
+    out = []
+    for p in directory.glob(f"{deployment_name}-launch*.json"):
+        try:
+            record = json.loads(p.read_text())
+        except json.JSONDecodeError:
+            continue
+        if record.get("deployment_name") == deployment_name:
+            out.append(record)
+    return sorted(out, key=lambda r: r.get("started_at") or "")
+
+
 @contextmanager
 def phase_timer(
     metrics: DeploymentMetrics,
@@ -89,6 +89,7 @@ def post_batch(
 
     Returns ``"ok"`` on 2xx, ``"fatal"`` on 4xx (no retry — shipper should
     exit), and ``"drop"`` after MAX_RETRIES of 5xx or network failures.
+    A 429 (allocator rate limit) is retried after its Retry-After delay.
     """
     url = f"{allocator_url.rstrip('/')}/api/vm-logs/{vm_name}"
     body = json.dumps({"log_group": log_group, "messages": messages}).encode()
@@ -102,9 +103,11 @@ def post_batch(
         "User-Agent": USER_AGENT,
     }
 
+    retry_after = 0.0
     for attempt in range(MAX_RETRIES):
         if attempt > 0:
-            sleep(RETRY_BACKOFF_S[attempt - 1])
+            sleep(max(RETRY_BACKOFF_S[attempt - 1], retry_after))
+            retry_after = 0.0
         try:
             req = Request(url, data=body, headers=headers, method="POST")
             with urlopen(req, timeout=10) as resp:
@@ -112,6 +115,12 @@ def post_batch(
                     return "ok"
                 continue
         except HTTPError as e:
+            if e.code == 429:
+                try:
+                    retry_after = float(e.headers.get("Retry-After", 0))
+                except (TypeError, ValueError):
+                    retry_after = 0.0
+                continue
             if 400 <= e.code < 500:
                 return "fatal"  # bad secret / unknown hostname — exit
             continue
@@ -27,6 +27,12 @@ def _make_api(
     return AllocatorAPI(base_url, admin_user, admin_password, ssl_provider)
 
 
+def _no_stream() -> HTTPError:
+    """How an allocator without the operation event stream answers the
+    stream request — the client falls back to polling."""
+    return HTTPError("url", 404, "Not Found", {}, None)
+
+
 def _mock_response(body: dict) -> MagicMock:
     """Build a mock urlopen() context-manager response for a JSON body."""
     mock_resp = MagicMock()
@@ -42,6 +48,7 @@ class TestDestroyVms:
     def test_success(self, mock_urlopen, mock_sleep):
         mock_urlopen.side_effect = [
             _mock_response({"job_id": 7, "status": "queued"}),
+            _no_stream(),
             _mock_response(
                 {"id": 7, "status": "succeeded", "output": "Destroy complete!"}
             ),
@@ -55,7 +62,7 @@ class TestDestroyVms:
         assert submit_req.full_url == "https://allocator.example.com/destroy"
         assert submit_req.method == "POST"
         assert "Basic" in submit_req.get_header("Authorization")
-        poll_req = mock_urlopen.call_args_list[1][0][0]
+        poll_req = mock_urlopen.call_args_list[2][0][0]
         assert (
             poll_req.full_url
             == "https://allocator.example.com/api/operations/7"
@@ -67,6 +74,7 @@ class TestDestroyVms:
     def test_polls_while_queued_and_running(self, mock_urlopen, mock_sleep):
         mock_urlopen.side_effect = [
             _mock_response({"job_id": 7, "status": "queued"}),
+            _no_stream(),
             _mock_response({"id": 7, "status": "queued"}),
             _mock_response({"id": 7, "status": "running"}),
             _mock_response(
@@ -78,7 +86,7 @@ class TestDestroyVms:
         result = api.destroy_vms()
 
         assert result == {"status": "success", "output": "done"}
-        assert mock_urlopen.call_count == 4
+        assert mock_urlopen.call_count == 5
         assert mock_sleep.call_count == 2
 
     @patch("lablink_cli.api.time.sleep")
@@ -101,6 +109,7 @@ class TestDestroyVms:
         unchanged."""
         mock_urlopen.side_effect = [
             _mock_response({"job_id": 9, "status": "queued"}),
+            _no_stream(),
             _mock_response(
                 {
                     "id": 9,
@@ -123,6 +132,7 @@ class TestDestroyVms:
     ):
         mock_urlopen.side_effect = [
             _mock_response({"job_id": 9, "status": "queued"}),
+            _no_stream(),
             _mock_response(
                 {
                     "id": 9,
@@ -140,6 +150,7 @@ class TestDestroyVms:
     def test_interrupted_raises_allocator_error(self, mock_urlopen, mock_sleep):
         mock_urlopen.side_effect = [
             _mock_response({"job_id": 9, "status": "queued"}),
+            _no_stream(),
             _mock_response({"id": 9, "status": "interrupted"}),
         ]
         api = _make_api()
@@ -174,6 +185,7 @@ class TestDestroyVms:
         server-side regardless of whether our poll request succeeds."""
         mock_urlopen.side_effect = [
             _mock_response({"job_id": 7, "status": "queued"}),
+            _no_stream(),
             URLError("temporary network blip"),
             _mock_response(
                 {"id": 7, "status": "succeeded", "output": "done"}
@@ -182,7 +194,7 @@ class TestDestroyVms:
         api = _make_api()
         result = api.destroy_vms()
         assert result == {"status": "success", "output": "done"}
-        assert mock_urlopen.call_count == 3
+        assert mock_urlopen.call_count == 4
 
     @patch("lablink_cli.api.time.monotonic")
     @patch("lablink_cli.api.time.sleep")
@@ -190,11 +202,13 @@ class TestDestroyVms:
     def test_poll_timeout_raises(self, mock_urlopen, mock_sleep, mock_monotonic):
         mock_urlopen.side_effect = [
             _mock_response({"job_id": 7, "status": "queued"}),
+            _no_stream(),
             _mock_response({"id": 7, "status": "running"}),
         ]
-        # First monotonic() call establishes the deadline (t=0); the
-        # second (checked after the one poll above) is already past it.
-        mock_monotonic.side_effect = [0.0, 1801.0]
+        # First monotonic() call establishes the deadline (t=0), the
+        # second opens the stream; the third (checked after the one poll
+        # above) is already past it.
+        mock_monotonic.side_effect = [0.0, 0.0, 1801.0]
         api = _make_api()
         with pytest.raises(AllocatorOperationTimeout):
             api.destroy_vms()
@@ -204,11 +218,12 @@ class TestDestroyVms:
     def test_self_signed_ssl(self, mock_urlopen, mock_sleep):
         mock_urlopen.side_effect = [
             _mock_response({"job_id": 1, "status": "queued"}),
+            _no_stream(),
             _mock_response({"id": 1, "status": "succeeded", "output": ""}),
         ]
         api = _make_api(ssl_provider="self_signed")
         api.destroy_vms()
-        assert mock_urlopen.call_count == 2
+        assert mock_urlopen.call_count == 3
 
 
 class TestLaunchVms:
@@ -217,6 +232,7 @@ class TestLaunchVms:
     def test_success(self, mock_urlopen, mock_sleep):
         mock_urlopen.side_effect = [
             _mock_response({"job_id": 3, "status": "queued"}),
+            _no_stream(),
             _mock_response(
                 {"id": 3, "status": "succeeded", "output": "apply success"}
             ),
@@ -241,6 +257,7 @@ class TestLaunchVms:
     def test_failure_raises_allocator_error(self, mock_urlopen, mock_sleep):
         mock_urlopen.side_effect = [
             _mock_response({"job_id": 3, "status": "queued"}),
+            _no_stream(),
             _mock_response(
                 {
                     "id": 3,
@@ -278,6 +295,28 @@ class TestLaunchVms:
             api.launch_vms(1)
 
 
+class TestPreassignRoster:
+    @patch("lablink_cli.api.urlopen")
+    def test_posts_emails_as_json(self, mock_urlopen):
+        summary = {
+            "status": "success",
+            "seats": {"a@example.com": "vm-1"},
+            "assigned": 1,
+            "unseated": [],
+            "staged": 0,
+        }
+        mock_urlopen.return_value = _mock_response(summary)
+        api = _make_api()
+
+        assert api.preassign_roster(["a@example.com"]) == summary
+        req = mock_urlopen.call_args[0][0]
+        assert req.full_url == "https://allocator.example.com/api/roster"
+        assert req.get_header("Content-type") == "application/json"
+        assert json.loads(req.data) == {
+            "emails": ["a@example.com"], "prestage": False,
+        }
+
+
 class TestSubmitAndPollProgress:
     @patch("lablink_cli.api.time.sleep")
     @patch("lablink_cli.api.urlopen")
@@ -286,6 +325,7 @@ class TestSubmitAndPollProgress:
     ):
         mock_urlopen.side_effect = [
             _mock_response({"job_id": 7, "status": "queued"}),
+            _no_stream(),
             _mock_response({
                 "id": 7, "status": "running",
                 "resources_completed": 1, "resources_total": 3,
@@ -313,6 +353,7 @@ class TestSubmitAndPollProgress:
         not skipped or erroring."""
         mock_urlopen.side_effect = [
             _mock_response({"job_id": 7, "status": "queued"}),
+            _no_stream(),
             _mock_response({"id": 7, "status": "succeeded", "output": "done"}),
         ]
         calls = []
@@ -328,6 +369,7 @@ class TestSubmitAndPollProgress:
     def test_launch_vms_also_accepts_on_progress(self, mock_urlopen, mock_sleep):
         mock_urlopen.side_effect = [
             _mock_response({"job_id": 9, "status": "queued"}),
+            _no_stream(),
             _mock_response({
                 "id": 9, "status": "succeeded", "output": "ok",
                 "resources_completed": 2, "resources_total": 2,
@@ -340,3 +382,96 @@ class TestSubmitAndPollProgress:
         )
 
         assert calls == [(2, 2)]
+
+
+def _sse_response(*events: tuple[int, str, dict]) -> MagicMock:
+    """Mock urlopen() response streaming the given (id, event, data)
+    Server-Sent Events line by line, with a keep-alive comment first."""
+    lines = [b": keepalive\n", b"\n"]
+    for event_id, event, data in events:
+        lines += [
+            f"id: {event_id}\n".encode(),
+            f"event: {event}\n".encode(),
+            f"data: {json.dumps(data)}\n".encode(),
+            b"\n",
+        ]
+    mock_resp = MagicMock()
+    mock_resp.__iter__.return_value = iter(lines)
+    mock_resp.__enter__ = lambda s: s
+    mock_resp.__exit__ = MagicMock(return_value=False)
+    return mock_resp
+
+
+class TestOperationStream:
+    @patch("lablink_cli.api.time.sleep")
+    @patch("lablink_cli.api.urlopen")
+    def test_follows_stream_then_reads_final_operation(
+        self, mock_urlopen, mock_sleep,
+    ):
+        mock_urlopen.side_effect = [
+            _mock_response({"job_id": 7, "status": "queued"}),
+            _sse_response(
+                (1, "status", {"status": "running"}),
+                (2, "output", {"line": "aws_instance.x: Creating..."}),
+                (3, "progress", {"completed": 1, "total": 3}),
+                (4, "status", {"status": "succeeded"}),
+            ),
+            _mock_response({
+                "id": 7, "status": "succeeded", "output": "done",
+                "resources_completed": 3, "resources_total": 3,
+            }),
+        ]
+        progress, lines = [], []
+        api = _make_api()
+
+        result = api.launch_vms(
+            3,
+            on_progress=lambda done, total: progress.append((done, total)),
+            on_output=lines.append,
+        )
+
+        assert result == {"status": "success", "output": "done"}
+        stream_req = mock_urlopen.call_args_list[1][0][0]
+        assert stream_req.full_url == (
+            "https://allocator.example.com/api/operations/7/stream"
+        )
+        assert stream_req.get_header("Accept") == "text/event-stream"
+        assert lines == ["aws_instance.x: Creating..."]
+        assert progress == [(1, 3), (3, 3)]
+        mock_sleep.assert_not_called()
+
+    @patch("lablink_cli.api.time.sleep")
+    @patch("lablink_cli.api.urlopen")
+    def test_reconnects_from_last_event_id(self, mock_urlopen, mock_sleep):
+        mock_urlopen.side_effect = [
+            _mock_response({"job_id": 7, "status": "queued"}),
+            _sse_response((1, "status", {"status": "running"})),
+            _sse_response((2, "status", {"status": "failed", "error": "x"})),
+            _mock_response({"id": 7, "status": "failed", "error": "boom"}),
+        ]
+        api = _make_api()
+
+        with pytest.raises(AllocatorError, match="boom"):
+            api.destroy_vms()
+
+        retry_req = mock_urlopen.call_args_list[2][0][0]
+        assert retry_req.get_header("Last-event-id") == "1"
+        mock_sleep.assert_not_called()
+
+    @patch("lablink_cli.api.time.sleep")
+    @patch("lablink_cli.api.urlopen")
+    def test_unavailable_event_falls_back_to_polling(
+        self, mock_urlopen, mock_sleep,
+    ):
+        mock_urlopen.side_effect = [
+            _mock_response({"job_id": 7, "status": "queued"}),
+            _sse_response((0, "unavailable", {})),
+            _mock_response({"id": 7, "status": "running"}),
+            _mock_response({"id": 7, "status": "succeeded", "output": ""}),
+        ]
+        api = _make_api()
+
+        api.destroy_vms()
+
+        assert mock_urlopen.call_count == 4
+        assert mock_sleep.call_count == 1
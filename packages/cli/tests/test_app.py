@@ -252,6 +252,28 @@ class TestCacheClear:
         assert list(dep_dir.glob("*.json")) == []
         assert "cleared 2" in _plain(result.output).lower()
 
+    def test_cache_clear_deployments_removes_launch_records(self, tmp_path):
+        """--deployments also deletes `stats --startup` launch records,
+        but --stale leaves them."""
+        dep_dir = tmp_path / "deployments"
+        (dep_dir / "launches").mkdir(parents=True)
+        (dep_dir / "launches" / "mylab-launch1-x.json").write_text('{"x":1}')
+
+        with patch(
+            "lablink_cli.deployment_metrics.DEPLOYMENTS_DIR", dep_dir
+        ):
+            stale = runner.invoke(
+                app, ["cache-clear", "--deployments", "--stale"]
+            )
+            assert list((dep_dir / "launches").glob("*.json"))
+            result = runner.invoke(
+                app, ["cache-clear", "--deployments"]
+            )
+        assert stale.exit_code == 0
+        assert result.exit_code == 0
+        assert list((dep_dir / "launches").glob("*.json")) == []
+        assert "cleared 1" in _plain(result.output).lower()
+
     def test_cache_clear_deployments_does_not_touch_template_cache(
         self, tmp_path
     ):
@@ -131,3 +131,28 @@ def test_phase_timer_persists_on_exception(cache_dir, monkeypatch):
     assert metrics.allocator_tofu_apply_duration_seconds == 2.0
     on_disk = json.loads(target.read_text())
     assert on_disk["allocator_tofu_apply_duration_seconds"] == 2.0
+
+
+def test_launch_records_are_kept_apart_and_loaded_per_deployment(cache_dir):
+    from lablink_cli.deployment_metrics import (
+        LaunchStartupRecord,
+        launch_cache_path,
+        load_launch_records,
+    )
+
+    for name, op, started in (
+        ("prod-lab", 2, "2026-10-19T09:00:00"),
+        ("prod-lab", 7, "2026-09-01T09:00:00"),
+        ("prod-lab-2", 1, "2026-10-01T09:00:00"),
+    ):
+        record = LaunchStartupRecord(
+            deployment_name=name, operation_id=op, started_at=started,
+            recorded_at="2026-10-19T10:00:00+00:00",
+        )
+        write_metrics(launch_cache_path(record), record)
+
+    records = load_launch_records("prod-lab")
+    assert [r["operation_id"] for r in records] == [7, 2]
+    # Launch records never show up as deployment records.
+    assert load_all_metrics() == []
+    assert ":" not in launch_cache_path(record).name
@@ -47,6 +47,7 @@ class TestRunLaunch:
         mock_api.launch_vms.assert_called_once()
         assert mock_api.launch_vms.call_args.args == (2,)
         assert callable(mock_api.launch_vms.call_args.kwargs["on_progress"])
+        assert callable(mock_api.launch_vms.call_args.kwargs["on_output"])
 
     @patch("lablink_cli.commands.launch.AllocatorAPI")
     @patch("lablink_cli.commands.launch.resolve_admin_credentials")
@@ -133,7 +134,7 @@ class TestRunLaunch:
 
         captured = {}
 
-        def fake_launch_vms(num_vms, on_progress=None):
+        def fake_launch_vms(num_vms, on_progress=None, on_output=None):
             captured["on_progress"] = on_progress
             return {"status": "success", "output": ""}
 
@@ -171,7 +172,7 @@ class TestRunLaunch:
 
         captured = {}
 
-        def fake_launch_vms(num_vms, on_progress=None):
+        def fake_launch_vms(num_vms, on_progress=None, on_output=None):
             captured["on_progress"] = on_progress
             return {"status": "success", "output": ""}
 
@@ -203,7 +204,7 @@ class TestRunLaunch:
 
         captured = {}
 
-        def fake_launch_vms(num_vms, on_progress=None):
+        def fake_launch_vms(num_vms, on_progress=None, on_output=None):
             captured["on_progress"] = on_progress
             return {"status": "success", "output": ""}
 
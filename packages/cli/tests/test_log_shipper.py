@@ -232,6 +232,32 @@ class TestPostBatch:
         assert result == "fatal"
         assert urlopen.call_count == 1
 
+    def test_429_waits_retry_after_then_retries(self):
+        from io import BytesIO
+        from unittest.mock import MagicMock
+        from urllib.error import HTTPError
+        from lablink_cli.log_shipper import post_batch
+
+        ok_resp = MagicMock()
+        ok_resp.__enter__.return_value = ok_resp
+        ok_resp.__exit__.return_value = False
+        ok_resp.status = 200
+
+        urlopen = MagicMock(
+            side_effect=[
+                HTTPError(
+                    "u", 429, "slow down", {"Retry-After": "9"}, BytesIO(b"")
+                ),
+                ok_resp,
+            ]
+        )
+        sleep = MagicMock()
+
+        result = post_batch(**self._args(), urlopen=urlopen, sleep=sleep)
+
+        assert result == "ok"  # not fatal, unlike other 4xx
+        sleep.assert_called_once_with(9.0)
+
 
 class TestShouldFlush:
     def test_empty_buffer_never_flushes(self):
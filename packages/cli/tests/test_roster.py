@@ -0,0 +1,82 @@
+"""Tests for lablink_cli.commands.roster roster pre-assignment."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from lablink_cli.api import AllocatorAuthError
+from lablink_cli.commands.roster import read_roster, run_roster
+
+
+def test_read_roster_plain_and_csv(tmp_path):
+    roster = tmp_path / "roster.txt"
+    roster.write_text(
+        "# spring cohort\n"
+        "a@example.com\n"
+        "\n"
+        "name,email\n"
+        'Bea,"b@example.com"\n'
+    )
+
+    assert read_roster(roster) == ["a@example.com", "b@example.com"]
+
+
+class TestRunRoster:
+    @pytest.fixture
+    def roster(self, tmp_path):
+        path = tmp_path / "roster.txt"
+        path.write_text("a@example.com\nb@example.com\n")
+        return path
+
+    @patch("lablink_cli.commands.launch.AllocatorAPI")
+    @patch("lablink_cli.commands.launch.resolve_admin_credentials")
+    @patch("lablink_cli.commands.launch.get_allocator_url")
+    def test_posts_roster(
+        self, mock_url, mock_creds, mock_api_cls, mock_cfg, roster
+    ):
+        mock_url.return_value = "http://1.2.3.4"
+        mock_creds.return_value = ("admin", "password")
+        mock_api = MagicMock()
+        mock_api.preassign_roster.return_value = {
+            "status": "success",
+            "seats": {"a@example.com": "vm-1"},
+            "assigned": 1,
+            "unseated": ["b@example.com"],
+            "staged": 1,
+        }
+        mock_api_cls.return_value = mock_api
+
+        run_roster(mock_cfg, roster, prestage=True)
+
+        mock_api.preassign_roster.assert_called_once_with(
+            ["a@example.com", "b@example.com"], prestage=True
+        )
+
+    @patch("lablink_cli.commands.launch.AllocatorAPI")
+    @patch("lablink_cli.commands.launch.resolve_admin_credentials")
+    @patch("lablink_cli.commands.launch.get_allocator_url")
+    def test_auth_failure_exits(
+        self, mock_url, mock_creds, mock_api_cls, mock_cfg, roster
+    ):
+        mock_url.return_value = "http://1.2.3.4"
+        mock_creds.return_value = ("admin", "wrong")
+        mock_api_cls.return_value.preassign_roster.side_effect = (
+            AllocatorAuthError("Authentication failed")
+        )
+
+        with pytest.raises(SystemExit):
+            run_roster(mock_cfg, roster)
+
+    @patch("lablink_cli.commands.launch.get_allocator_url")
+    def test_empty_roster_exits_before_calling_allocator(
+        self, mock_url, mock_cfg, tmp_path
+    ):
+        empty = tmp_path / "empty.txt"
+        empty.write_text("# nobody yet\n")
+
+        with pytest.raises(SystemExit):
+            run_roster(mock_cfg, empty)
+
+        mock_url.assert_not_called()
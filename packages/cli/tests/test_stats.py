@@ -229,3 +229,122 @@ def test_stats_connection_error_still_reported(mock_cfg, capsys):
 
     assert exc.value.code == 1
     assert "connection refused" in capsys.readouterr().out
+
+
+# --- lablink stats --startup ---
+
+
+def _startup_launch(operation_id, started_at, total_p50, outliers=()):
+    return {
+        "operation_id": operation_id,
+        "started_at": started_at,
+        "finished_at": None,
+        "created_by": "admin",
+        "num_vms": 8,
+        "hosts": 8,
+        "phases": {
+            "cloud_init": {"hosts": 8, "p50": 100.0, "p90": 120.0,
+                           "p99": 130.0, "max": 131.0, "p50_change_pct": None},
+            "total": {"hosts": 8, "p50": total_p50, "p90": 350.0,
+                      "p99": 400.0, "max": 410.0, "p50_change_pct": None},
+        },
+        "outliers": list(outliers),
+    }
+
+
+def _startup_body(launches, image="ghcr.io/lab/client:v2"):
+    return {
+        "deployment_name": "spring-2026",
+        "client_image": image,
+        "ami_id": "ami-123",
+        "machine_type": "g4dn.xlarge",
+        "launches": launches,
+    }
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    from lablink_cli import deployment_metrics
+
+    d = tmp_path / "deployments"
+    monkeypatch.setattr(deployment_metrics, "DEPLOYMENTS_DIR", d)
+    return d
+
+
+def test_startup_renders_percentiles_and_records_launches(
+    mock_cfg, cache_dir, capsys
+):
+    from lablink_cli.commands.stats import run_startup_stats
+
+    body = _startup_body([
+        _startup_launch(2, "2026-10-19T09:00:00", 300.0, [
+            {"hostname": "vm-7", "phase": "total", "seconds": 410.0,
+             "fence": 380.0},
+        ]),
+        _startup_launch(None, None, 90.0),
+    ])
+    p1, p2, p3 = _patches(body)
+    with p1, p2, p3 as mock_urlopen:
+        run_startup_stats(mock_cfg)
+
+    assert mock_urlopen.call_args[0][0].full_url.endswith("/api/startup-report")
+    out = capsys.readouterr().out
+    assert "Launch #2" in out and "Not from a launch" in out
+    assert "Cloud-init" in out and "300.0" in out
+    assert "outlier" in out and "vm-7" in out
+    assert "No earlier launches recorded yet" in out
+
+    # Only the launch from an operation is cached.
+    [path] = (cache_dir / "launches").glob("*.json")
+    record = json.loads(path.read_text())
+    assert record["deployment_name"] == "spring-2026"
+    assert record["client_image"] == "ghcr.io/lab/client:v2"
+    assert record["phases"]["total"] == {
+        "hosts": 8, "p50": 300.0, "p90": 350.0, "p99": 400.0, "max": 410.0,
+    }
+
+
+def test_startup_flags_regression_against_earlier_launches(
+    mock_cfg, cache_dir, capsys
+):
+    from lablink_cli.commands.stats import run_startup_stats
+
+    # Two launches on an earlier allocator, recorded by an earlier run.
+    earlier = _startup_body(
+        [
+            _startup_launch(3, "2026-10-01T09:00:00", 310.0),
+            _startup_launch(2, "2026-09-01T09:00:00", 290.0),
+        ],
+        image="ghcr.io/lab/client:v1",
+    )
+    p1, p2, p3 = _patches(earlier)
+    with p1, p2, p3:
+        run_startup_stats(mock_cfg)
+    capsys.readouterr()
+
+    # A new allocator whose first launch is much slower on a new image.
+    now = _startup_body([_startup_launch(1, "2026-10-19T09:00:00", 420.0)])
+    p1, p2, p3 = _patches(now)
+    with p1, p2, p3:
+        run_startup_stats(mock_cfg)
+
+    out = capsys.readouterr().out
+    assert "vs the previous 2 recorded launch(es)" in out
+    assert "ghcr.io/lab/client:v1 → ghcr.io/lab/client:v2" in out
+    # Baseline total p50 is the median of 290 and 310.
+    assert "300.0" in out and "+40% slower" in out
+    assert "Startup regressed in: Total" in out
+    # Cloud-init did not change, so only Total is flagged.
+    assert "Cloud-init." not in out
+    assert len(list((cache_dir / "launches").glob("*.json"))) == 3
+
+
+def test_startup_with_no_reports(mock_cfg, cache_dir, capsys):
+    from lablink_cli.commands.stats import run_startup_stats
+
+    p1, p2, p3 = _patches(_startup_body([]))
+    with p1, p2, p3:
+        run_startup_stats(mock_cfg)
+
+    assert "No VM has reported a complete startup yet" in capsys.readouterr().out
+    assert not (cache_dir / "launches").exists()
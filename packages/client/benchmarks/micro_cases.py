@@ -0,0 +1,120 @@
+"""Micro-benchmarks for the monitoring agent's per-tick helpers.
+
+The agent runs these every sample interval (2 s by default) for the whole
+session, on the same VM the student is working on:
+
+* ``processes._classify`` over the argv of 500 processes, and
+  ``processes.sample`` walking a fake /proc holding those 500 (kernel
+  threads with empty cmdlines, the desktop stack, a SLEAP GUI; no
+  training or inference running, so the scan never stops early);
+* ``aggregator.apply_sample`` over an hour of 2 s samples.
+
+Run from the repository root with ``python benchmarks/micro.py client``,
+which times each case against micro_baseline.json next to this file.
+"""
+
+import os
+import random
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from lablink_client_service.conf.structured_config import MonitoringConfig
+from lablink_client_service.monitoring.aggregator import (
+    WINDOW_BUCKETS,
+    Sample,
+    apply_sample,
+    new_counters,
+)
+from lablink_client_service.monitoring.samplers import processes
+
+_DESKTOP = [
+    ["/sbin/init"],
+    ["/bin/bash", "/home/client/start.sh"],
+    ["/usr/bin/Xvnc", ":1", "-interface", "0.0.0.0", "-websocketPort", "6080"],
+    ["xfce4-session"],
+    ["xfwm4", "--replace"],
+    ["/usr/lib/firefox/firefox", "-contentproc", "-childID", "3", "tab"],
+    ["/usr/bin/python3", "-m", "lablink_client_service.monitoring"],
+    ["/usr/bin/python3", "/usr/local/bin/subscribe"],
+    ["/usr/bin/dbus-daemon", "--session", "--address=systemd:"],
+    ["sshd: client@pts/0"],
+]
+_SLEAP_GUI = [
+    "/home/client/.local/share/uv/tools/sleap/bin/python",
+    "/home/client/.local/bin/sleap-label",
+]
+
+
+def process_table(count: int = 500, seed: int = 0) -> list:
+    """argv of `count` processes; None stands for a kernel thread."""
+    rng = random.Random(seed)
+    table = [
+        None if rng.random() < 0.4 else list(rng.choice(_DESKTOP))
+        for _ in range(count - 1)
+    ]
+    table.insert(rng.randrange(count), list(_SLEAP_GUI))
+    return table
+
+
+def fake_proc(root: Path, table: list) -> None:
+    """Lay `table` out as /proc/<pid>/cmdline files under `root`."""
+    for pid, argv in enumerate(table, start=1):
+        (root / str(pid)).mkdir()
+        raw = b"" if argv is None else b"\x00".join(a.encode() for a in argv)
+        (root / str(pid) / "cmdline").write_bytes(raw + b"\x00" if raw else b"")
+    (root / "self").mkdir()
+    (root / "meminfo").write_text("MemTotal: 16384000 kB\n")
+
+
+def session_samples(seconds: int = 3600, seed: int = 0) -> list:
+    """One Sample per 2 s tick of a student's session."""
+    rng = random.Random(seed)
+    start = datetime(2026, 5, 28, 9, 0, tzinfo=timezone.utc)
+    samples = []
+    for tick in range(seconds // 2):
+        training = tick > 900
+        samples.append(Sample(
+            ts=start + timedelta(seconds=2 * tick),
+            sample_interval_seconds=2,
+            active_window_bucket=rng.choice(WINDOW_BUCKETS),
+            gpu_util_pct=rng.randint(60, 100) if training else rng.randint(0, 4),
+            vram_mb=rng.randint(2000, 9000) if training else 300,
+            processes_seen=(
+                {"sleap-label", "sleap-train"} if training else {"sleap-label"}
+            ),
+            max_labeled_frames=tick // 10,
+            training_epochs_completed=(tick - 900) // 60 if training else None,
+            training_final_loss=rng.random() if training else None,
+        ))
+    return samples
+
+
+@contextmanager
+def cases():
+    with tempfile.TemporaryDirectory() as tmp:
+        proc_root = Path(tmp)
+        allowlist = set(MonitoringConfig().process_allowlist)
+        table = process_table()
+        fake_proc(proc_root, table)
+        argvs = [argv for argv in table if argv is not None]
+        samples = session_samples()
+        started = samples[0].ts
+
+        def classify_all():
+            for argv in argvs:
+                processes._classify(argv, allowlist)
+
+        def apply_all():
+            counters = new_counters(started)
+            for s in samples:
+                apply_sample(counters, s)
+
+        yield {
+            "classify_500": classify_all,
+            "process_sample_500": lambda: processes.sample(
+                allowlist, proc_root=os.fspath(proc_root)
+            ),
+            "apply_sample_1h": apply_all,
+        }
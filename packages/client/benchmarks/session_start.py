@@ -0,0 +1,140 @@
+"""Benchmark the agent's POST /api/session/start latency.
+
+Drives the agent's Flask app in-process through its test client, so the
+numbers are the agent's own handling time (token check, password-file
+rotation, session anchor) with no network in the way. Two rotation paths
+can be timed:
+
+* ``native``: the in-process ``.kasmpasswd`` writer the agent uses now.
+* ``cli``: the previous implementation, which piped the password to the
+  bundled ``kasmvncpasswd`` CLI. The binary ships in the client image, so
+  run this mode inside the container (or point ``--kasmvncpasswd`` at a
+  copy) to get the "before" numbers.
+
+Usage::
+
+    python benchmarks/session_start.py
+    python benchmarks/session_start.py --mode both --requests 2000
+"""
+
+import argparse
+import json
+import os
+import secrets
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import nullcontext
+from unittest.mock import patch
+
+from lablink_client_service.agent import kasmvnc
+from lablink_client_service.agent.api import create_app
+
+AGENT_TOKEN = "benchmark-token"
+
+
+def _cli_rotator(binary: str):
+    """Return the pre-native ``_rotate_basic_auth``, shelling out to
+    ``binary``."""
+
+    def rotate(*, password: str) -> None:
+        result = subprocess.run(
+            [binary, "-u", kasmvnc.KASMVNC_USERNAME, "-rwo",
+             kasmvnc._password_file()],
+            input=f"{password}\n{password}\n",
+            text=True,
+            capture_output=True,
+            timeout=5,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"kasmvncpasswd failed (exit {result.returncode}): "
+                f"{result.stderr.strip() or result.stdout.strip()}"
+            )
+
+    return rotate
+
+
+def _percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def run(mode: str, requests: int, warmup: int, binary: str) -> dict:
+    """Time ``requests`` session starts and return latency stats in ms."""
+    client = create_app().test_client()
+    headers = {"Authorization": f"Bearer {AGENT_TOKEN}"}
+    if mode == "cli":
+        rotator = patch.object(
+            kasmvnc, "_rotate_basic_auth", _cli_rotator(binary)
+        )
+    else:
+        rotator = nullcontext()
+
+    samples = []
+    with rotator:
+        for i in range(warmup + requests):
+            # Same shape as the allocator's rotation passwords.
+            body = {"password": secrets.token_urlsafe(24)}
+            start = time.perf_counter()
+            resp = client.post(
+                "/api/session/start", json=body, headers=headers
+            )
+            elapsed = time.perf_counter() - start
+            if resp.status_code != 200:
+                raise RuntimeError(
+                    f"{mode}: session start failed: {resp.get_json()}"
+                )
+            if i >= warmup:
+                samples.append(elapsed * 1000)
+
+    return {
+        "mode": mode,
+        "requests": requests,
+        "p50_ms": round(_percentile(samples, 50), 3),
+        "p90_ms": round(_percentile(samples, 90), 3),
+        "p99_ms": round(_percentile(samples, 99), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--mode", choices=["native", "cli", "both"], default="both"
+    )
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument(
+        "--kasmvncpasswd", default="kasmvncpasswd",
+        help="kasmvncpasswd binary for --mode cli (default: from PATH)",
+    )
+    args = parser.parse_args()
+
+    modes = ["cli", "native"] if args.mode == "both" else [args.mode]
+    if "cli" in modes and shutil.which(args.kasmvncpasswd) is None:
+        if args.mode == "cli":
+            sys.exit(f"{args.kasmvncpasswd} not found")
+        print(
+            f"# skipping cli: {args.kasmvncpasswd} not found", file=sys.stderr
+        )
+        modes.remove("cli")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["AGENT_TOKEN"] = AGENT_TOKEN
+        os.environ["KASMVNC_PASSWORD_FILE"] = os.path.join(tmp, ".kasmpasswd")
+        os.environ["LABLINK_SESSION_ANCHOR_PATH"] = os.path.join(
+            tmp, "session-anchor"
+        )
+        os.environ.pop("CONNECTIVITY", None)
+        for mode in modes:
+            print(json.dumps(
+                run(mode, args.requests, args.warmup, args.kasmvncpasswd)
+            ))
+
+
+if __name__ == "__main__":
+    main()
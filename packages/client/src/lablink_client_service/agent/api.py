@@ -3,9 +3,10 @@
 Listens on :7070 inside the container. The allocator calls
 POST /api/session/start with a fresh KasmVNC password before
 handing the seat to a student; the agent rewrites the local
-`kasmvncpasswd` file. KasmVNC re-reads that file on each HTTP
-Basic Auth check, so no signal-based reload is needed (and SIGHUP
-would in fact terminate Xvnc — its reset path is unsupported).
+KasmVNC password file in-process (see ``agent/kasmvnc.py``).
+KasmVNC re-reads that file on each HTTP Basic Auth check, so no
+signal-based reload is needed (and SIGHUP would in fact terminate
+Xvnc — its reset path is unsupported).
 
 Auth: Bearer = deployment-wide agent-control token AGENT_TOKEN (same
 value the allocator generates at startup and bakes into the client
@@ -13,6 +14,10 @@ VM's docker env via OpenTofu). Any caller who knows the token
 can rotate the password; that's adequate because the token is only
 ever set on the client VM by OpenTofu and only ever sent by the
 allocator. /healthz is unauthenticated for ALB / Docker healthchecks.
+
+The allocator sends a W3C ``traceparent`` header with each call; the
+agent logs it so a rotation here can be matched to the allocator trace
+(/admin/traces) that asked for it.
 """
 import logging
 import os
@@ -50,10 +55,13 @@ def create_app() -> Flask:
         if not password:
             return jsonify(error="password required"), 400
 
+        traceparent = request.headers.get("traceparent", "none")
         try:
             rotate_kasmvnc_password(password=password)
         except Exception as exc:
-            logger.exception("KasmVNC password rotation failed")
+            logger.exception(
+                f"KasmVNC password rotation failed (traceparent {traceparent})"
+            )
             return jsonify(error=f"rotation failed: {exc}"), 500
 
         # Anchor the monitoring agent's session clock at user-assignment
@@ -67,6 +75,7 @@ def create_app() -> Flask:
                 "Failed to write session anchor; metrics may be misaligned"
             )
 
+        logger.info(f"Rotated KasmVNC password (traceparent {traceparent})")
         return jsonify(ok=True), 200
 
     @app.get("/healthz")
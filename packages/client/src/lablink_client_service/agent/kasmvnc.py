@@ -3,9 +3,13 @@
 Two output formats, picked by the client container's ``CONNECTIVITY`` env:
 
 * ``allocator_proxied`` (AWS path; default): KasmVNC's username-based
-  ``.kasmpasswd`` written by the bundled ``kasmvncpasswd`` CLI. The
-  browser never sees credentials; allocator nginx attaches HTTP Basic
-  Auth server-side via ``/internal/proxy_auth``.
+  ``.kasmpasswd``, one ``user:hash:perms`` line per user, where the hash
+  is ``crypt(3)`` SHA-256 (``$5$``) with KasmVNC's fixed ``kasm`` salt.
+  We write it here rather than shelling out to the bundled
+  ``kasmvncpasswd`` CLI, which cost a process spawn on every
+  ``/api/session/start``. The browser never sees credentials;
+  allocator nginx attaches HTTP Basic Auth server-side via
+  ``/internal/proxy_auth``.
 
 * ``lan_direct`` (manual/BYO path): the browser opens the WebSocket
   straight to ``ws://<lan_ip>:6080`` with no proxy, and modern browsers
@@ -21,8 +25,8 @@ The agent re-derives the file each session; no reload signal is needed
 (KasmVNC re-reads on each connection attempt, and SIGHUP would in fact
 terminate Xvnc via its unsupported reset path).
 """
+import hashlib
 import os
-import subprocess
 
 from cryptography.hazmat.primitives.ciphers import Cipher, modes
 
@@ -38,6 +42,23 @@ except ImportError:
 DEFAULT_PASSWORD_FILE = "/home/client/.kasmpasswd"
 DEFAULT_VNCAUTH_FILE = "/home/client/.vnc/passwd"
 KASMVNC_USERNAME = "kasm_user"
+# What ``kasmvncpasswd -rwo`` grants: read, write and owner.
+KASMVNC_PERMISSIONS = "rwo"
+
+# KasmVNC hashes every .kasmpasswd password with this fixed salt
+# (``crypt(pw, "$5$kasm$")`` in both kasmvncpasswd and Xvnc's Basic
+# Auth check), at SHA-crypt's default 5000 rounds.
+_KASMPASSWD_SALT = b"kasm"
+_SHA_CRYPT_ROUNDS = 5000
+_CRYPT_ALPHABET = (
+    "./0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+)
+# Digest byte order of the final encoding step (Drepper's SHA-crypt
+# spec, step 22e), as (byte2, byte1, byte0) groups.
+_SHA256_CRYPT_ORDER = (
+    (0, 10, 20), (21, 1, 11), (12, 22, 2), (3, 13, 23), (24, 4, 14),
+    (15, 25, 5), (6, 16, 26), (27, 7, 17), (18, 28, 8), (9, 19, 29),
+)
 
 # The fixed key TigerVNC / KasmVNC use to obfuscate the stored
 # password. Lifted verbatim from TigerVNC's `Password.cxx`
@@ -103,22 +124,92 @@ def _vncauth_blob(password: str) -> bytes:
     return enc.update(pw_bytes) + enc.finalize()
 
 
+def _sha256_crypt(password: str, salt: bytes) -> str:
+    """Return ``crypt(password, "$5$" + salt)`` (glibc SHA-256 crypt).
+
+    Python's ``crypt`` module is deprecated and gone in 3.13, so this
+    follows Drepper's "Unix crypt using SHA-256" spec directly. The
+    5000-round loop is the hot part: each round hashes either
+    ``P [S] [P] C`` or ``C [S] [P] P`` depending on the round number
+    mod 2, 3 and 7, so the fixed parts repeat every 42 rounds and are
+    joined once up front.
+    """
+    pw = password.encode("utf-8")
+    sha256 = hashlib.sha256
+
+    b = sha256(pw + salt + pw).digest()
+    a = sha256(pw + salt)
+    n = len(pw)
+    while n > 32:
+        a.update(b)
+        n -= 32
+    a.update(b[:n])
+    n = len(pw)
+    while n:
+        a.update(b if n & 1 else pw)
+        n >>= 1
+    c = a.digest()
+
+    p_bytes = (sha256(pw * len(pw)).digest() * (len(pw) // 32 + 1))[
+        : len(pw)
+    ]
+    ds = sha256(salt * (16 + c[0])).digest()
+    s_bytes = (ds * (len(salt) // 32 + 1))[: len(salt)]
+
+    cycle = []
+    for r in range(42):
+        middle = (s_bytes if r % 3 else b"") + (p_bytes if r % 7 else b"")
+        if r & 1:
+            cycle.append((True, p_bytes + middle))
+        else:
+            cycle.append((False, middle + p_bytes))
+    for r in range(_SHA_CRYPT_ROUNDS):
+        odd, fixed = cycle[r % 42]
+        c = sha256(fixed + c if odd else c + fixed).digest()
+
+    out = []
+    for i, j, k in _SHA256_CRYPT_ORDER:
+        w = (c[i] << 16) | (c[j] << 8) | c[k]
+        for _ in range(4):
+            out.append(_CRYPT_ALPHABET[w & 0x3F])
+            w >>= 6
+    w = (c[31] << 8) | c[30]
+    for _ in range(3):
+        out.append(_CRYPT_ALPHABET[w & 0x3F])
+        w >>= 6
+    return f"$5${salt.decode()}${''.join(out)}"
+
+
+def _kasmpasswd_line(password: str) -> str:
+    """Return the ``.kasmpasswd`` row ``kasmvncpasswd -u kasm_user -rwo``
+    would write for ``password``."""
+    hashed = _sha256_crypt(password, _KASMPASSWD_SALT)
+    return f"{KASMVNC_USERNAME}:{hashed}:{KASMVNC_PERMISSIONS}\n"
+
+
 def _rotate_basic_auth(*, password: str) -> None:
     pw_file = _password_file()
     pw_dir = os.path.dirname(pw_file) or "."
     os.makedirs(pw_dir, exist_ok=True)
-    result = subprocess.run(
-        ["kasmvncpasswd", "-u", KASMVNC_USERNAME, "-rwo", pw_file],
-        input=f"{password}\n{password}\n",
-        text=True,
-        capture_output=True,
-        timeout=5,
-    )
-    if result.returncode != 0:
-        raise RuntimeError(
-            f"kasmvncpasswd failed (exit {result.returncode}): "
-            f"{result.stderr.strip() or result.stdout.strip()}"
-        )
+    # Keep any other users' rows, as kasmvncpasswd does; our own row is
+    # rewritten whole so its permissions are always ``rwo`` (see the
+    # note on stale perms in start.sh).
+    try:
+        with open(pw_file) as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        lines = []
+    prefix = f"{KASMVNC_USERNAME}:"
+    lines = [line for line in lines if not line.startswith(prefix)]
+    lines.append(_kasmpasswd_line(password))
+    # Same tempfile + rename as _rotate_vncauth: KasmVNC re-reads this
+    # file on every Basic Auth check, so it must never see it half
+    # written.
+    tmp = pw_file + ".tmp"
+    with open(tmp, "w") as f:
+        f.writelines(lines)
+    os.chmod(tmp, 0o600)
+    os.replace(tmp, pw_file)
 
 
 def _rotate_vncauth(*, password: str) -> None:
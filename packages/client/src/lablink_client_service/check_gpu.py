@@ -11,6 +11,8 @@ from lablink_client_service.conf.structured_config import Config
 from lablink_client_service.http_utils import (
     get_auth_headers,
     get_client_env,
+    report_interval_seconds,
+    retry_after_seconds,
     sanitize_url,
 )
 
@@ -26,6 +28,7 @@ def check_gpu_health(allocator_url: str, interval: int = 20, client_secret: str
     Args:
         allocator_url (str): The base URL of the allocator service.
         interval (int, optional): The interval in seconds to check the GPU health.
+            The allocator's response to a report can change it.
         client_secret (str, optional): Per-client secret for Bearer auth.
     """
     logger.info("Starting GPU health monitoring")
@@ -73,6 +76,7 @@ def check_gpu_health(allocator_url: str, interval: int = 20, client_secret: str
             report_retry_count = 0
 
             while report_retry_count < MAX_REPORT_RETRIES:
+                retry_after = None
                 try:
                     response = requests.post(
                         f"{base_url}/api/gpu_health",
@@ -83,7 +87,9 @@ def check_gpu_health(allocator_url: str, interval: int = 20, client_secret: str
                         headers=headers,
                         timeout=(10, 20),
                     )
+                    retry_after = retry_after_seconds(response)
                     response.raise_for_status()
+                    interval = report_interval_seconds(response) or interval
                     logger.info(f"Reported GPU status: {curr_status}")
                     last_status = curr_status
                     break  # Break out of the report retry loop on success
@@ -106,7 +112,7 @@ def check_gpu_health(allocator_url: str, interval: int = 20, client_secret: str
                 report_retry_count += 1
                 if report_retry_count < MAX_REPORT_RETRIES:
                     jitter = random.uniform(0, 5)
-                    time.sleep(REPORT_RETRY_DELAY + jitter)
+                    time.sleep(max(REPORT_RETRY_DELAY, retry_after or 0) + jitter)
             else:
                 logger.error(
                     f"Failed to report GPU health after {MAX_REPORT_RETRIES} attempts"
@@ -19,6 +19,7 @@ from lablink_client_service.conf.structured_config import Config
 from lablink_client_service.http_utils import (
     get_auth_headers,
     get_client_env,
+    next_report_seconds,
     sanitize_url,
 )
 
@@ -66,11 +67,17 @@ def send_heartbeat(
     base_url: str,
     headers: dict,
     payload: dict,
-) -> None:
+    interval: float = HEARTBEAT_INTERVAL_SECONDS,
+) -> float | None:
     """POST one heartbeat. Swallows network errors — never raises.
 
     Heartbeat integrity is in the allocator noticing when we *stop*
     sending. A failed individual POST is not worth crashing the client.
+
+    Returns:
+        The seconds until the next heartbeat if the allocator recommended
+        an interval or rate limited us, else None. A rate-limited heartbeat
+        waits at least ``interval``.
     """
     try:
         response = requests.post(
@@ -84,8 +91,10 @@ def send_heartbeat(
                 f"Heartbeat POST returned {response.status_code}: "
                 f"{response.text[:200]}"
             )
+        return next_report_seconds(response, interval)
     except requests.exceptions.RequestException as e:
         logger.debug(f"Heartbeat POST failed: {e}")
+        return None
 
 
 def run_heartbeat_loop(
@@ -94,7 +103,8 @@ def run_heartbeat_loop(
     interval: int = HEARTBEAT_INTERVAL_SECONDS,
     stop_event: threading.Event | None = None,
 ) -> None:
-    """Long-running loop that sends a heartbeat every `interval` seconds.
+    """Long-running loop that sends a heartbeat every `interval` seconds,
+    or as often as the allocator's last response asked.
 
     Mirrors the AutoRebootService loop shape in reboot.py: an Event-driven
     sleep so callers can stop the loop, and an outer exception guard so a
@@ -113,12 +123,18 @@ def run_heartbeat_loop(
         stop_event = threading.Event()
 
     while not stop_event.is_set():
+        next_in = None
         try:
             payload = build_payload(vm_id=vm_id, boot_id=boot_id)
-            send_heartbeat(base_url=base_url, headers=headers, payload=payload)
+            next_in = send_heartbeat(
+                base_url=base_url,
+                headers=headers,
+                payload=payload,
+                interval=interval,
+            )
         except Exception:
             logger.exception("Heartbeat iteration failed; continuing")
-        stop_event.wait(interval)
+        stop_event.wait(interval if next_in is None else next_in)
 
 
 @hydra.main(version_base=None, config_name="config")
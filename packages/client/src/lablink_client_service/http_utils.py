@@ -24,6 +24,62 @@ def get_auth_headers(token: str) -> dict:
     return {"Authorization": f"Bearer {token}"}
 
 
+def retry_after_seconds(response) -> float | None:
+    """Seconds the allocator asked us to back off, or None.
+
+    Set when the allocator refuses a report with 429 Too Many Requests; the
+    Retry-After header carries the wait in whole seconds.
+    """
+    if response.status_code != 429:
+        return None
+    try:
+        return max(0.0, float(response.headers.get("Retry-After", "")))
+    except ValueError:
+        return None
+
+
+REPORT_INTERVAL_HEADER = "X-LabLink-Report-Interval"
+
+# Bounds on an allocator-recommended interval, so a bad header can neither
+# spin a reporter nor silence it.
+MIN_REPORT_INTERVAL = 1.0
+MAX_REPORT_INTERVAL = 3600.0
+
+
+def report_interval_seconds(response) -> float | None:
+    """The allocator's recommended seconds until the next report, or None.
+
+    Read from the report-interval header alone; a Retry-After on a 429 is a
+    one-off delay, not a new cadence.
+    """
+    value = response.headers.get(REPORT_INTERVAL_HEADER)
+    if not isinstance(value, str):
+        return None
+    try:
+        interval = float(value)
+    except ValueError:
+        return None
+    return min(MAX_REPORT_INTERVAL, max(MIN_REPORT_INTERVAL, interval))
+
+
+def next_report_seconds(response, interval: float) -> float | None:
+    """Seconds until the next report, as the allocator asked, or None.
+
+    ``interval`` is the reporter's own cadence. The allocator recommends
+    one on every telemetry response; on 429 the wait is the longest of
+    that recommendation, ``interval`` and Retry-After, so a short
+    Retry-After never makes a reporter speed up. None means keep
+    ``interval``.
+    """
+    recommended = report_interval_seconds(response)
+    retry_after = retry_after_seconds(response)
+    if retry_after is None:
+        return recommended
+    return min(
+        MAX_REPORT_INTERVAL, max(recommended or 0.0, interval, retry_after)
+    )
+
+
 def get_client_env(cfg) -> tuple:
     """Read common client environment variables with config fallback.
 
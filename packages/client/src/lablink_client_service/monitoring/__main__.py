@@ -39,6 +39,8 @@ logger = logging.getLogger(__name__)
 _stop_event = threading.Event()
 _counters: SessionCounters | None = None
 _cfg: dict = {}
+# Retry-After from a rate-limited push: holds off the next push only.
+_push_backoff: float = 0.0
 
 
 def _handle_sigterm(_signum, _frame) -> None:
@@ -100,6 +102,17 @@ def _maybe_reanchor(counters: SessionCounters) -> SessionCounters:
     return new_counters(session_started_at=on_disk)
 
 
+def _set_push_interval(seconds: float) -> None:
+    """Follow the allocator's recommended push cadence."""
+    _cfg["push_interval_seconds"] = seconds
+
+
+def _delay_next_push(seconds: float) -> None:
+    """Wait at least ``seconds`` before the next push, once."""
+    global _push_backoff
+    _push_backoff = seconds
+
+
 def _tick(cfg: dict, counters: SessionCounters) -> None:
     ts = datetime.now(timezone.utc)
     bucket = _sample_active_window(subject_patterns=_resolve_subject_patterns(cfg))
@@ -123,7 +136,7 @@ def _tick(cfg: dict, counters: SessionCounters) -> None:
 
 
 def main() -> None:
-    global _counters, _cfg
+    global _counters, _cfg, _push_backoff
     # Without basicConfig the root logger sits at WARNING and the
     # "agent started" / "push failed" messages get dropped — leaving
     # operators with no signal that the agent is alive. INFO is loud
@@ -145,14 +158,13 @@ def main() -> None:
         logger.debug("Skipping signal handler registration (not on main thread)")
 
     sample_int = _cfg["sample_interval_seconds"]
-    push_int = _cfg["push_interval_seconds"]
     last_push = 0.0
     elapsed = 0.0
 
     logger.info(
         "Monitoring agent started (sample=%ss push=%ss)",
         sample_int,
-        push_int,
+        _cfg["push_interval_seconds"],
     )
     while not _stop_event.is_set():
         _counters = _maybe_reanchor(_counters)
@@ -161,13 +173,18 @@ def main() -> None:
         except Exception:
             logger.exception("Sampler tick failed; continuing")
         elapsed += sample_int
-        if elapsed - last_push >= push_int:
+        if elapsed - last_push >= max(
+            _cfg["push_interval_seconds"], _push_backoff
+        ):
+            _push_backoff = 0.0
             try:
                 push_summary(
                     allocator_url=_cfg["allocator_url"],
                     hostname=_cfg["hostname"],
                     client_secret=_cfg["client_secret"],
                     counters=_counters,
+                    on_next_interval=_set_push_interval,
+                    on_retry_after=_delay_next_push,
                 )
                 last_push = elapsed
             except Exception:
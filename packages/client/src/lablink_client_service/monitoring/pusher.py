@@ -8,9 +8,14 @@ to stop the agent.
 
 import logging
 from dataclasses import asdict
+from typing import Callable
 
 import requests
 
+from lablink_client_service.http_utils import (
+    report_interval_seconds,
+    retry_after_seconds,
+)
 from lablink_client_service.monitoring.aggregator import SessionCounters
 
 logger = logging.getLogger(__name__)
@@ -29,8 +34,16 @@ def push_summary(
     hostname: str,
     client_secret: str,
     counters: SessionCounters,
+    on_next_interval: Callable[[float], None] | None = None,
+    on_retry_after: Callable[[float], None] | None = None,
 ) -> int | None:
-    """POST one summary. Returns the HTTP status code or None on network error."""
+    """POST one summary. Returns the HTTP status code or None on network error.
+
+    If the allocator recommends a push cadence, ``on_next_interval`` is
+    called with the seconds. If it rate limits the push,
+    ``on_retry_after`` is called with the Retry-After seconds, which only
+    delay the next push.
+    """
     body = _serialise_counters(counters)
     payload = {
         "session_started_at": body.pop("session_started_at"),
@@ -57,4 +70,10 @@ def push_summary(
             resp.status_code,
             resp.text[:200],
         )
+    next_in = report_interval_seconds(resp)
+    if next_in is not None and on_next_interval is not None:
+        on_next_interval(next_in)
+    retry_after = retry_after_seconds(resp)
+    if retry_after is not None and on_retry_after is not None:
+        on_retry_after(retry_after)
     return resp.status_code
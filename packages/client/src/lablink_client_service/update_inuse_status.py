@@ -8,7 +8,11 @@ import psutil
 import hydra
 
 from lablink_client_service.conf.structured_config import Config
-from lablink_client_service.http_utils import get_auth_headers, get_client_env
+from lablink_client_service.http_utils import (
+    get_auth_headers,
+    get_client_env,
+    retry_after_seconds,
+)
 
 # Default logger setup
 logger = logging.getLogger(__name__)
@@ -84,6 +88,7 @@ def call_api(process_name, url, client_secret=""):
     retry_count = 0
 
     while retry_count < MAX_API_RETRIES:
+        retry_after = None
         try:
             response = requests.post(
                 url,
@@ -91,6 +96,7 @@ def call_api(process_name, url, client_secret=""):
                 headers=headers,
                 timeout=(10, 20),
             )
+            retry_after = retry_after_seconds(response)
             response.raise_for_status()
             logger.info(f"Updated in-use status: {status}")
             break  # Success, exit retry loop
@@ -108,7 +114,7 @@ def call_api(process_name, url, client_secret=""):
         retry_count += 1
         if retry_count < MAX_API_RETRIES:
             jitter = random.uniform(0, 5)
-            time.sleep(API_RETRY_DELAY + jitter)
+            time.sleep(max(API_RETRY_DELAY, retry_after or 0) + jitter)
     else:
         logger.error(
             f"Failed to update in-use status after {MAX_API_RETRIES} attempts"
@@ -4,7 +4,7 @@ import json
 import signal
 import threading
 import time
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 
 def test_main_reads_config_file_and_starts_loop(tmp_path, monkeypatch):
@@ -108,3 +108,50 @@ def test_sigterm_triggers_final_flush(tmp_path, monkeypatch):
 
     # At least one push — the final flush.
     assert len(pushed) >= 1
+
+
+def test_retry_after_delays_only_the_next_push(tmp_path, monkeypatch):
+    cfg_path = tmp_path / "monitoring.json"
+    cfg_path.write_text(
+        json.dumps(
+            {
+                "allocator_url": "https://alloc.example",
+                "hostname": "vm-1",
+                "client_secret": "s3cret",
+                "process_allowlist": [],
+                "watch_dir": str(tmp_path),
+                "sample_interval_seconds": 10,
+                "push_interval_seconds": 10,
+            }
+        )
+    )
+    monkeypatch.setenv("LABLINK_MONITORING_CONFIG", str(cfg_path))
+
+    from lablink_client_service.monitoring import __main__ as entry
+
+    entry._counters = None
+    entry._cfg = {}
+    entry._push_backoff = 0.0
+
+    ticks: list = []
+    pushed_at: list = []
+
+    def fake_push(**kwargs):
+        pushed_at.append(len(ticks) * 10)
+        if len(pushed_at) == 1:
+            kwargs["on_retry_after"](35.0)
+        return 200
+
+    stop = MagicMock()
+    stop.is_set.side_effect = [False] * 7 + [True]
+    with (
+        patch.object(entry, "_stop_event", stop),
+        patch.object(entry, "push_summary", side_effect=fake_push),
+        patch.object(entry, "_tick", side_effect=lambda *a: ticks.append(1)),
+        patch.object(entry, "_maybe_reanchor", side_effect=lambda c: c),
+    ):
+        entry.main()
+
+    # Held off 35 s after the 429, then back on the 10 s cadence.
+    assert pushed_at == [10, 50, 60, 70]
+    assert entry._cfg["push_interval_seconds"] == 10
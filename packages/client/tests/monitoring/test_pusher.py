@@ -68,3 +68,41 @@ def test_push_summary_logs_warning_on_4xx(caplog):
         )
     assert rc == 409
     assert any("409" in rec.message for rec in caplog.records)
+
+
+def test_push_summary_reports_recommended_interval():
+    fake_resp = MagicMock(
+        status_code=200, text="", headers={"X-LabLink-Report-Interval": "90"}
+    )
+    seen = []
+    with patch(
+        "lablink_client_service.monitoring.pusher.requests.post",
+        return_value=fake_resp,
+    ):
+        push_summary(
+            allocator_url="https://alloc.example",
+            hostname="vm-1",
+            client_secret="s3cret",
+            counters=_counters(),
+            on_next_interval=seen.append,
+        )
+    assert seen == [90.0]
+
+
+def test_push_summary_retry_after_is_not_a_new_interval():
+    fake_resp = MagicMock(status_code=429, text="", headers={"Retry-After": "7"})
+    intervals, delays = [], []
+    with patch(
+        "lablink_client_service.monitoring.pusher.requests.post",
+        return_value=fake_resp,
+    ):
+        push_summary(
+            allocator_url="https://alloc.example",
+            hostname="vm-1",
+            client_secret="s3cret",
+            counters=_counters(),
+            on_next_interval=intervals.append,
+            on_retry_after=delays.append,
+        )
+    assert intervals == []
+    assert delays == [7.0]
@@ -20,7 +20,7 @@ def anchor_path(tmp_path, monkeypatch):
 @pytest.fixture
 def client(monkeypatch):
     """Flask test client with AGENT_TOKEN set and password rotation
-    patched out so tests don't shell out to `kasmvncpasswd`."""
+    patched out so tests don't write KasmVNC password files."""
     monkeypatch.setenv("AGENT_TOKEN", "test-token-123")
     app = create_app()
     app.config["TESTING"] = True
@@ -54,6 +54,20 @@ def test_session_start_rotates_password_on_valid_request(client, authed_headers)
     rotate.assert_called_once_with(password="hunter22")
 
 
+def test_session_start_logs_traceparent(client, authed_headers, caplog):
+    """The allocator's trace context is logged so the two sides line up."""
+    traceparent = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+    with patch("lablink_client_service.agent.api.rotate_kasmvnc_password"):
+        with caplog.at_level("INFO", logger="lablink_client_service.agent.api"):
+            resp = client.post(
+                "/api/session/start",
+                json={"password": "hunter22"},
+                headers={**authed_headers, "traceparent": traceparent},
+            )
+    assert resp.status_code == 200
+    assert traceparent in caplog.text
+
+
 def test_agent_validates_agent_token(monkeypatch):
     """AGENT_TOKEN accepted, wrong token rejected."""
     monkeypatch.setenv("AGENT_TOKEN", "good-agent")
@@ -1,50 +1,61 @@
-import subprocess
 from unittest.mock import patch
 
-import pytest
+
+def test_sha256_crypt_matches_glibc():
+    """The .kasmpasswd hash is glibc ``crypt(3)`` SHA-256, which both
+    kasmvncpasswd and Xvnc's Basic Auth check compute with the fixed
+    ``$5$kasm$`` salt. The first vector is from Drepper's SHA-crypt
+    spec; the ``kasm`` ones were cross-checked against
+    ``openssl passwd -5 -salt kasm`` and Python 3.11's ``crypt``."""
+    from lablink_client_service.agent.kasmvnc import _sha256_crypt
+    assert _sha256_crypt("Hello world!", b"saltstring") == (
+        "$5$saltstring$5B8vYYiY.CVt1RlTTf8KbXBH3hsxY/GNooZaBBGWEc5"
+    )
+    assert _sha256_crypt("hunter2", b"kasm") == (
+        "$5$kasm$f9rto5Rqsbc57m15BzM2DxzS4RPnJFXjzWUtMds9Bw/"
+    )
 
 
-def test_rotate_invokes_kasmvncpasswd(tmp_path, monkeypatch):
-    """allocator_proxied (default): rotate_kasmvnc_password shells out
-    to kasmvncpasswd with the fixed username, password piped on stdin
-    twice, and the configured target file. No reload signal is sent —
-    KasmVNC re-reads the file on each Basic Auth check, and SIGHUP
-    would terminate Xvnc via its unsupported reset path."""
-    pw_file = tmp_path / "kasmvncpasswd"
+def test_rotate_writes_kasmpasswd_natively(tmp_path, monkeypatch):
+    """allocator_proxied (default): rotate_kasmvnc_password writes the
+    ``kasm_user:<hash>:rwo`` row kasmvncpasswd would, mode 0600, without
+    spawning anything. No reload signal is sent — KasmVNC re-reads the
+    file on each Basic Auth check, and SIGHUP would terminate Xvnc via
+    its unsupported reset path."""
+    pw_file = tmp_path / ".kasmpasswd"
     monkeypatch.setenv("KASMVNC_PASSWORD_FILE", str(pw_file))
     monkeypatch.delenv("CONNECTIVITY", raising=False)
-    from lablink_client_service.agent.kasmvnc import (
-        KASMVNC_USERNAME,
-        rotate_kasmvnc_password,
-    )
-    with patch(
-        "lablink_client_service.agent.kasmvnc.subprocess.run"
-    ) as run:
-        run.return_value = subprocess.CompletedProcess(args=[], returncode=0)
+    from lablink_client_service.agent.kasmvnc import rotate_kasmvnc_password
+    with patch("subprocess.run") as run:
         rotate_kasmvnc_password(password="hunter2")
-    assert run.call_count == 1
-    args, kwargs = run.call_args
-    assert args[0] == [
-        "kasmvncpasswd", "-u", KASMVNC_USERNAME, "-rwo", str(pw_file),
-    ]
-    assert kwargs["input"] == "hunter2\nhunter2\n"
-    assert kwargs["text"] is True
+        run.assert_not_called()
+    assert pw_file.read_text() == (
+        "kasm_user:$5$kasm$f9rto5Rqsbc57m15BzM2DxzS4RPnJFXjzWUtMds9Bw/:rwo\n"
+    )
+    assert (pw_file.stat().st_mode & 0o777) == 0o600
+    assert not (tmp_path / ".kasmpasswd.tmp").exists()
 
 
-def test_rotate_raises_on_nonzero_exit(tmp_path, monkeypatch):
-    """If kasmvncpasswd exits non-zero, the rotation raises."""
-    pw_file = tmp_path / "kasmvncpasswd"
+def test_rotate_replaces_own_row_and_keeps_others(tmp_path, monkeypatch):
+    """Re-rotating rewrites the kasm_user row whole (so stale empty
+    perms can't survive, see start.sh) and leaves other users alone,
+    as kasmvncpasswd does."""
+    pw_file = tmp_path / ".kasmpasswd"
+    pw_file.write_text(
+        "kasm_user:$5$kasm$old:\n"
+        "viewer:$5$kasm$viewerhash:r\n"
+    )
     monkeypatch.setenv("KASMVNC_PASSWORD_FILE", str(pw_file))
     monkeypatch.delenv("CONNECTIVITY", raising=False)
-    from lablink_client_service.agent.kasmvnc import rotate_kasmvnc_password
-    with patch(
-        "lablink_client_service.agent.kasmvnc.subprocess.run"
-    ) as run:
-        run.return_value = subprocess.CompletedProcess(
-            args=[], returncode=1, stderr="invalid user", stdout=""
-        )
-        with pytest.raises(RuntimeError, match="kasmvncpasswd failed"):
-            rotate_kasmvnc_password(password="NEW")
+    from lablink_client_service.agent.kasmvnc import (
+        _kasmpasswd_line,
+        rotate_kasmvnc_password,
+    )
+    rotate_kasmvnc_password(password="NEW")
+    assert pw_file.read_text().splitlines(keepends=True) == [
+        "viewer:$5$kasm$viewerhash:r\n",
+        _kasmpasswd_line("NEW"),
+    ]
 
 
 def test_vncauth_blob_matches_tigervnc_vncpasswd():
@@ -79,20 +90,18 @@ def test_vncauth_blob_truncates_to_8_chars():
 
 def test_rotate_lan_direct_writes_vncauth_file(tmp_path, monkeypatch):
     """lan_direct: rotate_kasmvnc_password writes the 8-byte VncAuth
-    blob to the configured file (mode 0600) and does NOT invoke
-    kasmvncpasswd."""
+    blob to the configured file (mode 0600) and leaves the
+    .kasmpasswd file alone."""
     pw_file = tmp_path / "passwd"
     monkeypatch.setenv("KASMVNC_VNCAUTH_FILE", str(pw_file))
     monkeypatch.setenv("CONNECTIVITY", "lan_direct")
+    monkeypatch.setenv("KASMVNC_PASSWORD_FILE", str(tmp_path / ".kasmpasswd"))
     from lablink_client_service.agent.kasmvnc import (
         _vncauth_blob,
         rotate_kasmvnc_password,
     )
-    with patch(
-        "lablink_client_service.agent.kasmvnc.subprocess.run"
-    ) as run:
-        rotate_kasmvnc_password(password="pwfor8ch")
-        run.assert_not_called()
+    rotate_kasmvnc_password(password="pwfor8ch")
+    assert not (tmp_path / ".kasmpasswd").exists()
     assert pw_file.read_bytes() == _vncauth_blob("pwfor8ch")
     # mode bits low 9: rwxrwxrwx. 0600 = owner read+write only.
     assert (pw_file.stat().st_mode & 0o777) == 0o600
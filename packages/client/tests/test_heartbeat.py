@@ -104,6 +104,98 @@ def test_send_heartbeat_does_not_raise_on_4xx(mock_post):
     )
 
 
+@patch("lablink_client_service.heartbeat.requests.post")
+def test_send_heartbeat_returns_retry_after_on_429(mock_post):
+    mock_post.return_value = MagicMock(
+        status_code=429, text="", headers={"Retry-After": "12"}
+    )
+
+    assert heartbeat.send_heartbeat(
+        base_url="http://alloc",
+        headers={},
+        payload={"vm_id": "vm-1"},
+        interval=5,
+    ) == 12.0
+
+
+@patch("lablink_client_service.heartbeat.requests.post")
+def test_send_heartbeat_429_never_shortens_own_interval(mock_post):
+    mock_post.return_value = MagicMock(
+        status_code=429, text="", headers={"Retry-After": "1"}
+    )
+
+    assert heartbeat.send_heartbeat(
+        base_url="http://alloc",
+        headers={},
+        payload={"vm_id": "vm-1"},
+        interval=30,
+    ) == 30.0
+
+
+@patch(
+    "lablink_client_service.heartbeat.build_payload",
+    return_value={"vm_id": "vm-1"},
+)
+@patch("lablink_client_service.heartbeat.read_boot_id", return_value="bid-1")
+@patch("lablink_client_service.heartbeat.requests.post")
+def test_run_heartbeat_loop_short_retry_after_still_waits_interval(
+    mock_post, mock_boot, mock_build, vm_env
+):
+    """A 429 with Retry-After: 1 must not make the VM heartbeat faster."""
+    mock_post.return_value = MagicMock(
+        status_code=429, text="", headers={"Retry-After": "1"}
+    )
+    stop = MagicMock()
+    stop.is_set.side_effect = [False, True]
+
+    heartbeat.run_heartbeat_loop(
+        allocator_url="http://alloc", interval=30, stop_event=stop
+    )
+
+    (waited,), _ = stop.wait.call_args
+    assert waited >= 30
+
+
+@patch(
+    "lablink_client_service.heartbeat.build_payload",
+    return_value={"vm_id": "vm-1"},
+)
+@patch("lablink_client_service.heartbeat.read_boot_id", return_value="bid-1")
+def test_run_heartbeat_loop_waits_out_retry_after(mock_boot, mock_build, vm_env):
+    stop = MagicMock()
+    stop.is_set.side_effect = [False, True]
+
+    with patch(
+        "lablink_client_service.heartbeat.send_heartbeat", return_value=45.0
+    ):
+        heartbeat.run_heartbeat_loop(
+            allocator_url="http://alloc", interval=30, stop_event=stop
+        )
+
+    stop.wait.assert_called_once_with(45.0)
+
+
+@patch(
+    "lablink_client_service.heartbeat.build_payload",
+    return_value={"vm_id": "vm-1"},
+)
+@patch("lablink_client_service.heartbeat.read_boot_id", return_value="bid-1")
+def test_run_heartbeat_loop_follows_shorter_recommended_interval(
+    mock_boot, mock_build, vm_env
+):
+    stop = MagicMock()
+    stop.is_set.side_effect = [False, True]
+
+    with patch(
+        "lablink_client_service.heartbeat.send_heartbeat", return_value=5.0
+    ):
+        heartbeat.run_heartbeat_loop(
+            allocator_url="http://alloc", interval=30, stop_event=stop
+        )
+
+    stop.wait.assert_called_once_with(5.0)
+
+
 @patch(
     "lablink_client_service.heartbeat.build_payload",
     return_value={"vm_id": "vm-1"},
@@ -120,7 +212,7 @@ def test_run_heartbeat_loop_reads_boot_id_once_and_respects_stop_event(
     stop = threading.Event()
     calls = []
 
-    def capture(base_url, headers, payload):
+    def capture(base_url, headers, payload, interval):
         calls.append(payload)
         if len(calls) >= 2:
             stop.set()
@@ -164,7 +256,9 @@ def test_run_heartbeat_loop_logs_and_continues_on_unexpected_exception(
         "lablink_client_service.heartbeat.build_payload",
         side_effect=raise_then_stop,
     ):
-        with patch("lablink_client_service.heartbeat.send_heartbeat"):
+        with patch(
+            "lablink_client_service.heartbeat.send_heartbeat", return_value=None
+        ):
             heartbeat.run_heartbeat_loop(
                 allocator_url="http://alloc",
                 interval=0,
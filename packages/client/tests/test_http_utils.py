@@ -8,6 +8,9 @@ import pytest
 from lablink_client_service.http_utils import (
     get_auth_headers,
     get_client_env,
+    next_report_seconds,
+    report_interval_seconds,
+    retry_after_seconds,
     sanitize_url,
 )
 
@@ -32,6 +35,64 @@ class TestSanitizeUrl:
         assert sanitize_url("http://.example.com/") == "http://example.com"
 
 
+class TestRetryAfterSeconds:
+    def test_429_with_header(self):
+        resp = MagicMock(status_code=429, headers={"Retry-After": "7"})
+        assert retry_after_seconds(resp) == 7.0
+
+    def test_ignored_unless_429(self):
+        resp = MagicMock(status_code=503, headers={"Retry-After": "7"})
+        assert retry_after_seconds(resp) is None
+
+    def test_unparseable_header(self):
+        resp = MagicMock(status_code=429, headers={"Retry-After": "soon"})
+        assert retry_after_seconds(resp) is None
+
+
+class TestReportIntervalSeconds:
+    def test_recommended_interval(self):
+        resp = MagicMock(
+            status_code=200, headers={"X-LabLink-Report-Interval": "42"}
+        )
+        assert report_interval_seconds(resp) == 42.0
+
+    def test_no_header(self):
+        assert report_interval_seconds(MagicMock(headers={})) is None
+
+    def test_ignores_retry_after(self):
+        resp = MagicMock(status_code=429, headers={"Retry-After": "30"})
+        assert report_interval_seconds(resp) is None
+
+    def test_clamped(self):
+        resp = MagicMock(
+            status_code=200, headers={"X-LabLink-Report-Interval": "0"}
+        )
+        assert report_interval_seconds(resp) == 1.0
+
+
+class TestNextReportSeconds:
+    def test_recommended_interval(self):
+        resp = MagicMock(
+            status_code=200, headers={"X-LabLink-Report-Interval": "42"}
+        )
+        assert next_report_seconds(resp, 30) == 42.0
+
+    def test_no_header_keeps_own_interval(self):
+        resp = MagicMock(status_code=200, headers={})
+        assert next_report_seconds(resp, 30) is None
+
+    def test_retry_after_wins_when_longer(self):
+        resp = MagicMock(
+            status_code=429,
+            headers={"X-LabLink-Report-Interval": "5", "Retry-After": "30"},
+        )
+        assert next_report_seconds(resp, 10) == 30.0
+
+    def test_short_retry_after_keeps_own_interval(self):
+        resp = MagicMock(status_code=429, headers={"Retry-After": "1"})
+        assert next_report_seconds(resp, 30) == 30.0
+
+
 class TestGetAuthHeaders:
     def test_with_token(self):
         headers = get_auth_headers("my-token")
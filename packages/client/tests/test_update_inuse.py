@@ -60,6 +60,22 @@ def test_call_api_success(mock_post):
     mock_post.assert_called_once()
 
 
+@patch("lablink_client_service.update_inuse_status.random.uniform", return_value=0)
+@patch("lablink_client_service.update_inuse_status.time.sleep")
+@patch("requests.post")
+def test_call_api_waits_out_retry_after(mock_post, mock_sleep, mock_random):
+    """A 429 from the allocator stretches the retry delay to Retry-After."""
+    limited = MagicMock(status_code=429, headers={"Retry-After": "30"})
+    limited.raise_for_status.side_effect = requests.exceptions.HTTPError("429")
+    ok = MagicMock(status_code=200, raise_for_status=lambda: None)
+    mock_post.side_effect = [limited, ok]
+
+    call_api("myproc", "http://fake.url")
+
+    assert mock_post.call_count == 2
+    mock_sleep.assert_called_once_with(30.0)
+
+
 @patch("lablink_client_service.update_inuse_status.random.uniform", return_value=0)
 @patch("lablink_client_service.update_inuse_status.time.sleep")
 @patch("requests.post")